@@ -0,0 +1,60 @@
+"""Validation of a batch of site files: one at a time vs ``validate_batch``.
+
+The baseline validates the files one after the other, as when each site
+file is sent in its own request. ``validate_batch`` spreads them over 1 to
+N processes; the largest file goes last, so with several processes the
+other files do not wait for it. Speedup requires as many physical cores
+as workers.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_batch_validation.py [files] [rows_per_file] [max_workers]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from datagen import write_inventory_csv, write_inventory_xlsx
+
+from models import G4IT_COLUMN_SPECS, validate_batch, validate_path
+from models.parallel import get_executor
+
+REQUIRED_COLUMNS = [col for col, spec in G4IT_COLUMN_SPECS.items() if spec['required']]
+
+
+def main(file_count, rows, max_workers):
+    with tempfile.TemporaryDirectory() as tmp:
+        entries = []
+        for index in range(file_count):
+            # Un fichier Excel sur quatre, le dernier fichier quatre fois plus gros
+            extension = '.xlsx' if index % 4 == 3 else '.csv'
+            path = os.path.join(tmp, f"site_{index}{extension}")
+            size = rows * 4 if index == file_count - 1 else rows
+            (write_inventory_xlsx if extension == '.xlsx' else write_inventory_csv)(path, size, seed=index)
+            entries.append({"filename": os.path.basename(path), "extension": extension, "path": path})
+        print(f"{file_count} files of {rows} rows (last one {rows * 4}), {os.cpu_count()} CPU(s)")
+
+        start = time.perf_counter()
+        reference = [validate_path(entry["path"], entry["extension"], REQUIRED_COLUMNS) for entry in entries]
+        baseline = time.perf_counter() - start
+        print(f"  one at a time : {baseline:6.2f} s")
+
+        for workers in range(1, max_workers + 1):
+            if workers > 1:
+                # Démarrer les processus avant la mesure
+                executor = get_executor(workers)
+                for future in [executor.submit(os.getpid) for _ in range(workers)]:
+                    future.result()
+            start = time.perf_counter()
+            result = validate_batch(entries, REQUIRED_COLUMNS, workers=workers)
+            elapsed = time.perf_counter() - start
+            assert [{key: report[key] for key in expected} for report, expected in zip(result["files"], reference)] == reference
+            print(f"  batch x{workers:<2}     : {elapsed:6.2f} s  (speedup x{baseline / elapsed:.2f})")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 8,
+         args[1] if len(args) > 1 else 50_000,
+         args[2] if len(args) > 2 else (os.cpu_count() or 1))
@@ -0,0 +1,62 @@
+"""Checking cell fixes: full re-validation vs re-validation of the edited cells.
+
+The baseline is what the error-management page had to do: validate the
+whole file again after fixing cells. ``SessionStore.edit`` stores the edits
+as an overlay of the upload session and only runs the validators of the
+edited cells; its time includes loading the session. The edited values are
+not in the column yet, the slow case for dictionary-encoded columns. The
+last line reads the whole edited session, where the overlay is applied.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_cell_edits.py [rows] [edits ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from datagen import write_inventory_csv
+
+from models import G4IT_COLUMN_SPECS, SessionStore, iter_file_chunks, validate_csv_stream
+
+REQUIRED_COLUMNS = [col for col, spec in G4IT_COLUMN_SPECS.items() if spec['required']]
+
+
+def main(rows, edit_counts):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'inventory.csv')
+        size = write_inventory_csv(path, rows)
+        store = SessionStore(os.path.join(tmp, 'sessions'))
+        with open(path, 'rb') as f:
+            session_id = store.create(f, 'inventory.csv').id
+        print(f"{rows} rows, {size / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        with open(path, 'rb') as f:
+            validate_csv_stream(iter_file_chunks(f), REQUIRED_COLUMNS)
+        print(f"  full re-validation : {time.perf_counter() - start:8.3f} s")
+
+        rnd = random.Random(0)
+        for count in edit_counts:
+            # Valeurs absentes de la colonne (quantite ne contient que 1 à 9) : nouvelles catégories à chaque fois
+            edits = [{"row": rnd.randint(2, rows + 1), "column": "quantite",
+                      "value": str(rnd.randint(1000, 10 ** 9))} for _ in range(count)]
+            start = time.perf_counter()
+            delta = store.edit(session_id, edits)
+            elapsed = time.perf_counter() - start
+            print(f"  {count:>6} edits       : {elapsed:8.3f} s  ({delta['total_errors_delta']:+d} errors, "
+                  f"{delta['edits']} edited cells)")
+
+        # Lecture complète de la session modifiée (validation de la session, traitement des données)
+        start = time.perf_counter()
+        session = store.load(session_id)
+        for _ in session.iter_records():
+            pass
+        print(f"  load + read edited : {time.perf_counter() - start:8.3f} s")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 1_000_000, args[1:] or [1, 100, 10_000])
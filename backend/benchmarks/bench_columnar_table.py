@@ -0,0 +1,71 @@
+"""Memory of loaded rows: former list of dictionaries vs ``ColumnarTable``.
+
+Each measurement runs in a fresh subprocess. ``list`` reproduces the former
+``CsvHandler.load_data`` (one dict per row, one string object per cell);
+``table`` is the current ``load_data``, which encodes the rows column by
+column as they are read. The retained size is the traced memory still
+allocated once the rows are loaded, the peak RSS includes the interpreter
+and the transient parsing buffers.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_columnar_table.py [rows ...]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from datagen import write_inventory_csv
+
+from models import CsvHandler
+
+
+def as_list(path):
+    return list(CsvHandler(path).iter_rows())
+
+
+def as_table(path):
+    return CsvHandler(path).load_data()
+
+
+MODES = {'list': as_list, 'table': as_table}
+
+
+def measure(mode, path):
+    """Loads the file in a subprocess and returns (seconds, retained MB, peak RSS MB)."""
+    out = subprocess.check_output([sys.executable, __file__, '--run', mode, path], text=True)
+    seconds, retained, rss = out.split()[-3:]
+    return float(seconds), float(retained), float(rss)
+
+
+def main(sizes):
+    print(f"{'rows':>10} {'size MB':>8} {'mode':>6} {'load s':>8} {'retained MB':>12} {'peak RSS MB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"inventory_{rows}.csv")
+            # CsvHandler lit les fichiers séparés par des virgules
+            size = write_inventory_csv(path, rows, delimiter=',')
+            for mode in MODES:
+                seconds, retained, rss = measure(mode, path)
+                print(f"{rows:>10} {size / 1e6:>8.1f} {mode:>6} {seconds:>8.2f} {retained:>12.1f} {rss:>12.1f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--run':
+        start = time.perf_counter()
+        data = MODES[sys.argv[2]](sys.argv[3])
+        elapsed = time.perf_counter() - start
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        # Mesure séparée de la mémoire conservée (tracemalloc ralentit le chargement)
+        del data
+        tracemalloc.start()
+        data = MODES[sys.argv[2]](sys.argv[3])
+        retained = tracemalloc.get_traced_memory()[0] / 1e6
+        # ru_maxrss est en Ko sous Linux
+        print(elapsed, retained, peak_rss)
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
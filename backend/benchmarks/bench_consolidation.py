@@ -0,0 +1,75 @@
+"""Server-side consolidation: pandas group-by on the loaded file vs ``consolidate_rows``.
+
+Each measurement runs in a fresh subprocess and reports its time and peak
+RSS. Two groupings are measured: the default key columns (about a thousand
+groups) and ``nomEquipementPhysique`` (one group per row), which exceeds the
+in-memory budget of ``consolidate_rows`` and spills sorted runs to disk.
+``pandas`` loads the whole file before grouping, as a baseline.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_consolidation.py [rows ...]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+
+import pandas as pd
+
+from datagen import write_inventory_csv
+
+from models.consolidation import DEFAULT_KEY_COLUMNS, DEFAULT_MAX_GROUPS, consolidate_rows
+from models.streaming import open_file_rows
+
+GROUPINGS = {'default': DEFAULT_KEY_COLUMNS, 'per-row': ['nomEquipementPhysique']}
+
+
+def with_pandas(path, key_columns):
+    df = pd.read_csv(path, sep=';', dtype=str, keep_default_na=False)
+    df['quantite'] = pd.to_numeric(df['quantite'], errors='coerce').fillna(1)
+    groups = df.groupby(key_columns, sort=True)['quantite'].agg(['sum', 'size'])
+    return len(groups), 0
+
+
+def with_engine(path, key_columns):
+    with ExitStack() as stack:
+        header, rows, _ = open_file_rows(path, 'csv', stack)
+        aggregator, _ = consolidate_rows(header, rows, key_columns, max_groups=DEFAULT_MAX_GROUPS)
+        with aggregator:
+            return sum(1 for _ in aggregator.groups()), aggregator.spilled_runs
+
+
+MODES = {'pandas': with_pandas, 'engine': with_engine}
+
+
+def measure(mode, grouping, path):
+    """Consolidates the file in a subprocess and returns (seconds, peak RSS MB, groups, runs)."""
+    out = subprocess.check_output([sys.executable, __file__, '--run', mode, grouping, path], text=True)
+    seconds, rss, groups, runs = out.split()[-4:]
+    return float(seconds), float(rss), int(groups), int(runs)
+
+
+def main(sizes):
+    print(f"{'rows':>10} {'size MB':>8} {'grouping':>9} {'mode':>7} {'time s':>8} {'peak RSS MB':>12} {'groups':>10} {'runs':>5}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"inventory_{rows}.csv")
+            size = write_inventory_csv(path, rows)
+            for grouping in GROUPINGS:
+                for mode in MODES:
+                    seconds, rss, groups, runs = measure(mode, grouping, path)
+                    print(f"{rows:>10} {size / 1e6:>8.1f} {grouping:>9} {mode:>7} {seconds:>8.2f} {rss:>12.1f} {groups:>10} {runs:>5}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 5 and sys.argv[1] == '--run':
+        start = time.perf_counter()
+        groups, runs = MODES[sys.argv[2]](sys.argv[4], GROUPINGS[sys.argv[3]])
+        # ru_maxrss est en Ko sous Linux
+        print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, groups, runs)
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [1_000_000, 10_000_000])
@@ -0,0 +1,70 @@
+"""Header detection: former full parse vs bounded-prefix sniffing.
+
+The former ``/api/detect-headers`` copied the upload to disk, then read the
+first CSV line or ran ``pd.read_excel`` on the whole workbook. The sniffer
+reads the first 64 KB of a CSV file, or the first row of the sheet XML of
+an XLSX workbook, straight from the upload.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_detect_headers.py [rows ...]
+"""
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from datagen import write_inventory_csv, write_inventory_xlsx
+
+from models import sniff_headers
+
+
+def legacy_csv(path, tmp):
+    """Former endpoint: copy of the upload, then first line with the ';' heuristic."""
+    copy = os.path.join(tmp, 'copy.csv')
+    shutil.copyfile(path, copy)
+    with open(copy, 'r', encoding='utf-8', errors='replace') as f:
+        delimiter = ';' if ';' in f.readline() else ','
+    with open(copy, 'r', encoding='utf-8', errors='replace') as f:
+        return [h.strip() for h in next(csv.reader(f, delimiter=delimiter))]
+
+
+def legacy_xlsx(path, tmp):
+    """Former endpoint: copy of the upload, then ``pd.read_excel`` of the whole sheet."""
+    copy = os.path.join(tmp, 'copy.xlsx')
+    shutil.copyfile(path, copy)
+    return pd.read_excel(copy).columns.tolist()
+
+
+def sniffed(path, extension):
+    with open(path, 'rb') as f:
+        return sniff_headers(f, extension)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            for extension, write, legacy in (('.csv', write_inventory_csv, legacy_csv),
+                                             ('.xlsx', write_inventory_xlsx, legacy_xlsx)):
+                path = os.path.join(tmp, f'inventory{extension}')
+                write(path, rows)
+                legacy_headers, legacy_s = timed(legacy, path, tmp)
+                headers, sniff_s = timed(sniffed, path, extension)
+                assert headers == legacy_headers
+                size_mb = os.path.getsize(path) / 1e6
+                print(f"{rows:>9} rows {extension:<5} ({size_mb:6.1f} MB): "
+                      f"former {legacy_s * 1000:9.1f} ms, sniffer {sniff_s * 1000:6.2f} ms")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,94 @@
+"""Equipment pages: linear scan of a list vs the SQLite ``EquipmentStore``.
+
+Imports a generated inventory into a fresh store, then times page fetches
+(first page, deep page by cursor and by offset), filters and searches, with
+and without the total count. The baseline is the previous behaviour of
+``/api/equipments``: filter a list of dicts with ``find`` then slice it.
+Each query is timed as the median of several runs.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_equipment_store.py [rows]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+
+from datagen import write_inventory_csv
+
+from models.equipments import FIELDS, EquipmentStore, equipment_values
+from models.streaming import open_file_rows
+
+REPEAT = 5
+
+
+def median_ms(func):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def scan_page(equipments, limit, page=1, search=None, type=None):
+    # Ancien /api/equipments : filtrage linéaire puis découpage de la liste
+    filtered = equipments
+    if search:
+        search_lower = search.lower()
+        filtered = [eq for eq in filtered
+                    if eq["equipmentType"].lower().find(search_lower) != -1
+                    or eq["model"].lower().find(search_lower) != -1]
+    if type:
+        filtered = [eq for eq in filtered if eq["equipmentType"] == type]
+    return len(filtered), filtered[(page - 1) * limit:page * limit]
+
+
+def main(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'inventory.csv')
+        write_inventory_csv(path, rows)
+        store = EquipmentStore(os.path.join(tmp, 'equipments.sqlite3'))
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            header, data, _ = open_file_rows(path, 'csv', stack)
+            store.import_rows('bench', header, data, 'inventory.csv')
+        print(f"{rows} rows: import {time.perf_counter() - start:.1f} s, "
+              f"database {os.path.getsize(store.path) / 1024 / 1024:.0f} MB")
+
+        with ExitStack() as stack:
+            header, data, _ = open_file_rows(path, 'csv', stack)
+            equipments = [dict(zip([field for _, field in FIELDS], equipment_values(dict(zip(header, row)))))
+                          for row in data]
+        deep = rows - 100
+        cases = [
+            ("first page", lambda: store.page(20, count=False), lambda: scan_page(equipments, 20)),
+            ("first page + total", lambda: store.page(20), lambda: scan_page(equipments, 20)),
+            ("deep page, cursor", lambda: store.page(20, cursor=deep, count=False),
+             lambda: scan_page(equipments, 20, page=deep // 20)),
+            ("deep page, offset", lambda: store.page(20, offset=deep, count=False),
+             lambda: scan_page(equipments, 20, page=deep // 20)),
+            ("type filter", lambda: store.page(20, type='Serveur', count=False),
+             lambda: scan_page(equipments, 20, type='Serveur')),
+            ("type filter + total", lambda: store.page(20, type='Serveur'),
+             lambda: scan_page(equipments, 20, type='Serveur')),
+            ("search 'poweredge'", lambda: store.page(20, search='poweredge', count=False),
+             lambda: scan_page(equipments, 20, search='poweredge')),
+            ("search 'poweredge' + total", lambda: store.page(20, search='poweredge'),
+             lambda: scan_page(equipments, 20, search='poweredge')),
+            ("search 'thinksystem sr650', cursor", lambda: store.page(20, cursor=rows // 2, search='thinksystem sr650',
+                                                                      count=False),
+             lambda: scan_page(equipments, 20, search='thinksystem sr650')),
+        ]
+        print(f"{'query':<38} {'list scan':>10} {'store':>10}")
+        for name, with_store, with_scan in cases:
+            print(f"{name:<38} {median_ms(with_scan):>8.1f}ms {median_ms(with_store):>8.2f}ms")
+        store.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
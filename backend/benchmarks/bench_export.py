@@ -0,0 +1,118 @@
+"""Equipment export: previous double rendering vs the single-render pipeline.
+
+The previous ``/api/export`` rendered CSV into a ``StringIO``, wrote it to
+disk and encoded it again for the response; XLSX was rendered twice with
+pandas (file and ``BytesIO``) and column widths were computed with
+``astype(str).map(len)``. The pipeline renders CSV once, writing and
+yielding each encoded batch, and XLSX once in constant-memory mode, then
+streams the file. Each measurement runs in a fresh subprocess and reports
+its time and the memory added on top of the equipment list (peak RSS minus
+RSS once the list is built).
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_export.py [equipments ...]
+"""
+import io
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import datagen
+
+import pandas as pd
+
+from models.export import EXPORT_HEADER, export_row, iter_export, write_xlsx_export
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def equipments(count, seed=42):
+    rnd = random.Random(seed)
+    return [{
+        "equipmentType": rnd.choice(datagen.TYPES),
+        "manufacturer": "Non spécifié",
+        "model": rnd.choice(datagen.MODELS),
+        "quantity": rnd.randint(1, 50),
+        "cpu": str(rnd.choice([4, 8, 16])),
+        "purchaseYear": str(rnd.randint(2015, 2023)),
+        "originalIds": [f"eq-{index}", f"eq-{index + count}"],
+    } for index in range(count)]
+
+
+def previous(items, file_format, path):
+    # Ancien /api/export : rendu en mémoire, écrit sur disque puis rendu ou encodé une seconde fois
+    export_data = [dict(zip(EXPORT_HEADER, export_row(eq))) for eq in items]
+    if file_format == 'csv':
+        import csv
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=export_data[0].keys())
+        writer.writeheader()
+        writer.writerows(export_data)
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            f.write(output.getvalue())
+        return len(output.getvalue().encode('utf-8-sig'))
+    df = pd.DataFrame(export_data)
+    with pd.ExcelWriter(path, engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Équipements', index=False)
+        worksheet = writer.sheets['Équipements']
+        for i, col in enumerate(df.columns):
+            worksheet.set_column(i, i, max(df[col].astype(str).map(len).max(), len(col)) + 2)
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Équipements', index=False)
+    return len(output.getvalue())
+
+
+def single_render(items, file_format, path):
+    # Octets « envoyés » comptés au fil de l'eau, comme par StreamingResponse / FileResponse
+    if file_format == 'csv':
+        return sum(len(chunk) for chunk in iter_export(items, path))
+    write_xlsx_export(items, path)
+    sent = 0
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            sent += len(chunk)
+    return sent
+
+
+MODES = {'previous': previous, 'pipeline': single_render}
+
+
+def current_rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+def measure(mode, file_format, count):
+    """Exports in a subprocess and returns (seconds, extra memory MB, bytes sent)."""
+    out = subprocess.check_output([sys.executable, __file__, '--run', mode, file_format, str(count)], text=True)
+    seconds, extra, sent = out.split()[-3:]
+    return float(seconds), float(extra), int(sent)
+
+
+def main(sizes):
+    print(f"{'equipments':>10} {'format':>6} {'mode':>9} {'time s':>8} {'extra MB':>9} {'size MB':>8}")
+    for count in sizes:
+        for file_format in ('csv', 'xlsx'):
+            for mode in MODES:
+                seconds, extra, sent = measure(mode, file_format, count)
+                print(f"{count:>10} {file_format:>6} {mode:>9} {seconds:>8.2f} {extra:>9.1f} {sent / 1e6:>8.1f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 5 and sys.argv[1] == '--run':
+        items = equipments(int(sys.argv[4]))
+        baseline = current_rss_mb()
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            sent = MODES[sys.argv[2]](items, sys.argv[3], os.path.join(tmp, f"export.{sys.argv[3]}"))
+            seconds = time.perf_counter() - start
+        # ru_maxrss est en Ko sous Linux
+        print(seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 - baseline, sent)
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [100_000, 500_000])
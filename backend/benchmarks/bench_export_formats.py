@@ -0,0 +1,97 @@
+"""Export formats: size, write time and load time of the same consolidated data.
+
+A synthetic inventory is consolidated by type, model, core count and
+purchase date (``consolidate_rows``), then exported in every format of
+``/api/export``: CSV, XLSX, gzip-compressed CSV, NDJSON and, when pyarrow is
+installed, Parquet. The load time is that of reading the file back with
+pandas, as an analytics tool would.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_export_formats.py [inventory rows]
+"""
+import os
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+
+from datagen import write_inventory_csv
+
+import pandas as pd
+
+from models.consolidation import consolidate_rows
+from models.export import PARQUET_AVAILABLE, iter_export, write_parquet_export, write_xlsx_export
+from models.streaming import open_file_rows
+
+KEY_COLUMNS = ['type', 'modele', 'nbCoeur', 'dateAchat']
+
+
+def consolidated_equipments(path):
+    with ExitStack() as stack:
+        header, rows, _ = open_file_rows(path, 'csv', stack)
+        aggregator, _ = consolidate_rows(header, rows, KEY_COLUMNS)
+    equipments, next_id = [], 1
+    try:
+        for (equipment_type, model, cpu, purchase_date), quantity, rows in aggregator.groups():
+            equipments.append({
+                "equipmentType": equipment_type,
+                "manufacturer": "Non spécifié",
+                "model": model,
+                "quantity": quantity,
+                "cpu": cpu or None,
+                "purchaseYear": purchase_date[:4] or None,
+                "originalIds": [f"eq-{index}" for index in range(next_id, next_id + rows)],
+            })
+            next_id += rows
+    finally:
+        aggregator.close()
+    return equipments
+
+
+def write_streamed(file_format):
+    def write(equipments, path):
+        for _ in iter_export(equipments, path, file_format):
+            pass
+    return write
+
+
+FORMATS = {
+    'csv': (write_streamed('csv'), lambda path: pd.read_csv(path)),
+    'xlsx': (write_xlsx_export, lambda path: pd.read_excel(path)),
+    'csv.gz': (write_streamed('csv.gz'), lambda path: pd.read_csv(path)),
+    'ndjson': (write_streamed('ndjson'), lambda path: pd.read_json(path, lines=True)),
+    'parquet': (write_parquet_export, lambda path: pd.read_parquet(path)),
+}
+
+
+def main(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'inventory.csv')
+        write_inventory_csv(source, rows)
+        equipments = consolidated_equipments(source)
+        print(f"{rows} inventory rows, {len(equipments)} consolidated equipment")
+        print(f"{'format':>8} {'size MB':>8} {'vs csv':>7} {'write s':>8} {'load s':>8}")
+
+        csv_size = None
+        for file_format, (write, load) in FORMATS.items():
+            if file_format == 'parquet' and not PARQUET_AVAILABLE:
+                print(f"{file_format:>8}  skipped (pyarrow is not installed)")
+                continue
+            path = os.path.join(tmp, f"export.{file_format}")
+            start = time.perf_counter()
+            write(equipments, path)
+            write_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            frame = load(path)
+            load_seconds = time.perf_counter() - start
+            assert len(frame) == len(equipments)
+
+            size = os.path.getsize(path)
+            csv_size = csv_size or size
+            print(f"{file_format:>8} {size / 1e6:>8.1f} {size / csv_size:>7.2f} "
+                  f"{write_seconds:>8.2f} {load_seconds:>8.2f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
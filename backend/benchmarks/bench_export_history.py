@@ -0,0 +1,64 @@
+"""Export history: regenerating an identical export vs serving its stored file.
+
+The baseline renders the export again, as the previous ``/api/export`` did
+for every request. With the history, the request hashes the format and its
+equipment in canonical JSON (``export_key``) and finds the stored file. History pages are
+read from a database holding many exports, first page and a deep page by
+cursor, with and without a format filter.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_export_history.py [equipments] [history entries]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from bench_export import equipments
+
+from models.export import iter_export, write_xlsx_export
+from models.export_history import ExportHistory, export_key
+
+FORMATS = ('csv', 'xlsx', 'parquet', 'ndjson')
+
+
+def timed(label, func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    print(f"{label:<46} {(time.perf_counter() - start) / repeat * 1000:>10.2f} ms")
+    return result
+
+
+def main_bench(count, entries):
+    items = equipments(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        history = ExportHistory(os.path.join(tmp, 'exports.sqlite3'))
+        print(f"{count} equipment")
+        for file_format, write in (('csv', lambda path: sum(1 for _ in iter_export(items, path))),
+                                   ('xlsx', lambda path: write_xlsx_export(items, path))):
+            path = os.path.join(tmp, f"export.{file_format}")
+            timed(f"{file_format}: render again", lambda: write(path))
+
+            def reuse():
+                key = export_key(file_format, items)
+                return history.get_artifact(key) is not None and os.path.exists(path)
+            history.record(f"exp-{file_format}", export_key(file_format, items), file_format, path, count,
+                           os.path.getsize(path))
+            assert timed(f"{file_format}: hash equipment + stored file lookup", reuse)
+
+        for index in range(entries):
+            history.record(f"exp-{index}", f"key-{index % 1000}", FORMATS[index % len(FORMATS)],
+                           f"export-{index}", 10, 1000)
+        print(f"{entries} history entries")
+        page = timed("history: first page with total", lambda: history.history(), repeat=20)
+        for _ in range(50):
+            page = history.history(cursor=page["next_cursor"], count=False)
+        timed("history: page 51 by cursor", lambda: history.history(cursor=page["next_cursor"], count=False), repeat=20)
+        timed("history: first xlsx page with total", lambda: history.history(file_format='xlsx'), repeat=20)
+
+
+if __name__ == '__main__':
+    main_bench(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+               int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
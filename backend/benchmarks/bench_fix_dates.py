@@ -0,0 +1,84 @@
+"""Date fixing: former per-row loop vs column-wide format inference.
+
+The former ``fix_dates`` split every date in Python, swapped day and month
+row by row and printed each corrected row (sent to ``/dev/null`` here).
+``normalize_dates`` infers the day/month order once per column and
+converts the distinct values with pandas; the rows are loaded in a
+``ColumnarTable`` beforehand, which is not timed.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_fix_dates.py [rows ...]
+"""
+import contextlib
+import os
+import random
+import sys
+import time
+
+from models import ColumnarTable, normalize_dates
+
+
+def build_rows(row_count, seed=42):
+    """Rows whose dateAchat is written DD/MM/YYYY, a few of them empty or invalid."""
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(row_count):
+        draw = rnd.random()
+        if draw < 0.05:
+            value = ''
+        elif draw < 0.06:
+            value = 'inconnue'
+        else:
+            value = f"{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/20{rnd.randint(10, 23)}"
+        rows.append({'nomEquipementPhysique': f"EQ-{i:08d}", 'dateAchat': value})
+    return rows
+
+
+def legacy(rows, date_column='dateAchat'):
+    """Former CsvHandler.fix_dates loop."""
+    fixed_count = 0
+    unfixable_rows = []
+    for i, row in enumerate(rows, 1):
+        date_value = row[date_column]
+        if not date_value:
+            continue
+        try:
+            if '/' in date_value:
+                month, day, year = map(int, date_value.split('/'))
+                separator_fixed = True
+            else:
+                month, day, year = map(int, date_value.split('-'))
+                separator_fixed = False
+            if month > 12:
+                row[date_column] = f"{day:02d}-{month:02d}-{year}"
+                fixed_count += 1
+                print(f"Corrigé: '{date_value}' → '{row[date_column]}' (ligne {i})")
+            elif separator_fixed:
+                row[date_column] = f"{month:02d}-{day:02d}-{year}"
+                print(f"Normalisé: '{date_value}' → '{row[date_column]}' (ligne {i})")
+        except ValueError:
+            unfixable_rows.append(f"Ligne {i}: impossible de parser '{date_value}'")
+    return fixed_count
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    for row_count in sizes:
+        rows = build_rows(row_count)
+        table = ColumnarTable.from_rows(rows)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            _, legacy_s = timed(legacy, rows)
+        (summary,), engine_s = timed(normalize_dates, table, ['dateAchat'])
+        print(f"{row_count:>9} rows: former loop {legacy_s:6.2f} s, "
+              f"column engine {engine_s:6.3f} s (x{legacy_s / engine_s:.0f}), "
+              f"{summary['detected_format']}, {summary['converted']} converted, {summary['invalid']} invalid")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
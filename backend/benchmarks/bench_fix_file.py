@@ -0,0 +1,67 @@
+"""Fixing two date columns: former load/write cycles vs a single streaming pass.
+
+Each measurement runs in a fresh subprocess. ``cycles`` reproduces the
+former ``/api/fix-dates`` called once per column (``CsvHandler.fix_dates``
+loads the whole file, ``write_data`` writes it back, and the next column
+starts from the corrected file); ``stream`` is ``fix_file``, which fixes
+both columns while the rows are read and written batch by batch.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_fix_file.py [rows ...]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from datagen import write_inventory_csv
+
+from models import CsvHandler, fix_file
+
+COLUMNS = ['dateAchat', 'dateRetrait']
+
+
+def cycles(path, target):
+    for column in COLUMNS:
+        data = CsvHandler(path).fix_dates(column)
+        CsvHandler(target).write_data(data)
+        path = target
+
+
+def stream(path, target):
+    fix_file(path, target, 'csv', {column: ['dates'] for column in COLUMNS})
+
+
+MODES = {'cycles': cycles, 'stream': stream}
+
+
+def measure(mode, path, target):
+    """Fixes the file in a subprocess and returns (seconds, peak RSS MB)."""
+    out = subprocess.check_output([sys.executable, __file__, '--run', mode, path, target], text=True)
+    seconds, rss = out.split()[-2:]
+    return float(seconds), float(rss)
+
+
+def main(sizes):
+    print(f"{'rows':>10} {'size MB':>8} {'mode':>7} {'time s':>8} {'peak RSS MB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"inventory_{rows}.csv")
+            # CsvHandler lit les fichiers séparés par des virgules
+            size = write_inventory_csv(path, rows, delimiter=',')
+            for mode in MODES:
+                seconds, rss = measure(mode, path, os.path.join(tmp, f"corrected_{mode}.csv"))
+                print(f"{rows:>10} {size / 1e6:>8.1f} {mode:>7} {seconds:>8.2f} {rss:>12.1f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 5 and sys.argv[1] == '--run':
+        start = time.perf_counter()
+        MODES[sys.argv[2]](sys.argv[3], sys.argv[4])
+        # ru_maxrss est en Ko sous Linux
+        print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,49 @@
+"""Scaling of parallel CSV validation from 1 to N processes.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_parallel_validation.py [rows] [max_workers] [range_MB]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from datagen import write_inventory_csv
+
+from models import G4IT_COLUMN_SPECS, iter_file_chunks, validate_csv_parallel, validate_csv_stream
+from models.parallel import get_executor
+
+REQUIRED_COLUMNS = [col for col, spec in G4IT_COLUMN_SPECS.items() if spec['required']]
+
+
+def main(rows, max_workers, range_size):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'inventory.csv')
+        size = write_inventory_csv(path, rows)
+        print(f"{rows} rows, {size / 1e6:.1f} MB, ranges of {range_size / 1e6:.0f} MB, {os.cpu_count()} CPU(s)")
+
+        start = time.perf_counter()
+        with open(path, 'rb') as f:
+            reference = validate_csv_stream(iter_file_chunks(f), REQUIRED_COLUMNS)
+        baseline = time.perf_counter() - start
+        print(f"  streaming (1 core) : {baseline:6.2f} s")
+
+        for workers in range(1, max_workers + 1):
+            if workers > 1:
+                # Démarrer les processus avant la mesure
+                executor = get_executor(workers)
+                for future in [executor.submit(os.getpid) for _ in range(workers)]:
+                    future.result()
+            start = time.perf_counter()
+            result = validate_csv_parallel(path, REQUIRED_COLUMNS, workers=workers, range_size=range_size)
+            elapsed = time.perf_counter() - start
+            assert result == reference
+            print(f"  parallel x{workers:<2}       : {elapsed:6.2f} s  (speedup x{baseline / elapsed:.2f})")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 1_000_000,
+         args[1] if len(args) > 1 else (os.cpu_count() or 1),
+         (args[2] if len(args) > 2 else 16) * 1024 * 1024)
@@ -0,0 +1,81 @@
+"""Equipment page of an upload: whole inventory in one response vs store pages.
+
+The baseline is the previous ``/api/process-file-data``: load the file with
+``CsvHandler``, format every row and serialize them all in one JSON
+response. The store imports the file once (``import_upload``), then serves
+pages with a total count, a sort and a search; a repeated upload of the
+same content skips the import. Response sizes are those of the JSON body.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_process_file_data.py [rows]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from datagen import write_inventory_csv
+
+os.environ.setdefault("EQUIPMENT_DB_PATH", os.path.join(tempfile.mkdtemp(), "equipments.sqlite3"))
+
+import main  # noqa: E402
+from models import CsvHandler  # noqa: E402
+
+
+def whole_inventory(path):
+    # Ancien /api/process-file-data : toutes les lignes formatées dans une seule réponse
+    equipments = []
+    for idx, row in enumerate(CsvHandler(path).load_data()):
+        equipments.append({
+            "id": f"eq-{idx+1}",
+            "equipmentType": row.get("type", "Inconnu"),
+            "manufacturer": "Non spécifié",
+            "model": row.get("modele", "Inconnu"),
+            "quantity": int(row.get("quantite", "1")) if row.get("quantite", "").isdigit() else 1,
+            "cpu": row.get("nbCoeur", None),
+            "ram": None,
+            "storage": None,
+            "purchaseYear": row.get("dateAchat", None)[:4] if row.get("dateAchat") else None,
+            "eol": row.get("dateRetrait", None)[:4] if row.get("dateRetrait") else None,
+        })
+    return json.dumps({"equipments": equipments, "total_items": len(equipments)})
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    body = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed * 1000:>10.1f} ms {len(body) / 1024:>10.0f} KB")
+
+
+def main_bench(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'inventory.csv')
+        write_inventory_csv(path, rows, delimiter=',')
+        source = 'bench'
+
+        def page(**params):
+            return json.dumps(main.equipment_page(params.pop('page', 1), 100, params.pop('cursor', None),
+                                                  params.pop('search', None), params.pop('sort', None),
+                                                  None, source=source, **params))
+
+        print(f"{rows} rows")
+        timed("previous: whole inventory", lambda: whole_inventory(path))
+
+        def import_and_page():
+            with open(path, 'rb') as f:
+                main.import_upload(f, '.csv', source, 'inventory.csv')
+            return page()
+        timed("store: import + first page", import_and_page)
+        timed("store: same upload again, first page", lambda: page() if main.equipment_store.get_source(source) else '')
+        cursor = json.loads(page())["next_cursor"]
+        timed("store: next page (cursor)", lambda: page(cursor=cursor))
+        timed("store: first page sorted by -quantity", lambda: page(sort='-quantity'))
+        timed("store: first page, search 'poweredge'", lambda: page(search='poweredge'))
+        timed("store: first page, type Serveur", lambda: page(type='Serveur'))
+
+
+if __name__ == '__main__':
+    main_bench(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
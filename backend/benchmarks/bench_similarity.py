@@ -0,0 +1,94 @@
+"""Near-duplicate labels: all-pairs comparison vs the MinHash-LSH index.
+
+Generates distinct model labels as spelling variants of base models
+(spaces, hyphens, case, a changed or doubled character, a suffix). On a
+sample, the similar pairs found by comparing every pair are checked to be
+in the same cluster of ``find_similar_groups`` (recall); the all-pairs time is then
+extrapolated to the full set (it grows with the square of the number of
+labels, the index about linearly).
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_similarity.py [labels] [sample]
+"""
+import random
+import string
+import sys
+import time
+
+import datagen  # noqa: F401  (chemin du package models)
+
+from models.similarity import DEFAULT_SIMILARITY_THRESHOLD, _jaccard, find_similar_groups, normalize_label
+
+VENDORS = ['PowerEdge', 'ProLiant', 'ThinkSystem', 'EliteBook', 'Latitude', 'OptiPlex', 'Catalyst', 'Nexus']
+
+
+def variant(rnd, base):
+    """Returns a spelling variant of a base label."""
+    vendor, model = base
+    choice = rnd.randrange(6)
+    if choice == 0:
+        return f"{vendor} {model}"
+    if choice == 1:
+        return f"{vendor[:5]} {vendor[5:]} {model[0]}-{model[1:]}"
+    if choice == 2:
+        return f"{vendor.upper()} {model}"
+    if choice == 3:
+        index = rnd.randrange(1, len(model))
+        return f"{vendor} {model[:index]}{model[index]}{model[index:]}"
+    if choice == 4:
+        return f"{vendor} {model} {rnd.choice(['Gen10', 'xd', 'G2', 'v2'])}"
+    index = rnd.randrange(len(vendor))
+    return f"{vendor[:index]}{rnd.choice(string.ascii_lowercase)}{vendor[index + 1:]} {model}"
+
+
+def generate(count, seed=42):
+    rnd = random.Random(seed)
+    labels = set()
+    while len(labels) < count:
+        base = (rnd.choice(VENDORS), f"{rnd.choice(string.ascii_uppercase)}{rnd.randint(100, 99999)}")
+        for _ in range(rnd.randint(1, 4)):
+            labels.add(variant(rnd, base))
+    return sorted(labels)[:count]
+
+
+def similar_pairs(labels, threshold):
+    """Pairs of labels (by index) found similar by comparing every pair."""
+    normalized = [normalize_label(label) for label in labels]
+    pairs = []
+    for i in range(len(labels)):
+        for j in range(i + 1, len(labels)):
+            a, b = normalized[i], normalized[j]
+            if a == b or (len(a) >= 3 and len(b) >= 3 and _jaccard(a, b) >= threshold):
+                pairs.append((i, j))
+    return pairs
+
+
+def main(count, sample_size):
+    threshold = DEFAULT_SIMILARITY_THRESHOLD
+    labels = generate(count)
+    sample = random.Random(0).sample(labels, min(sample_size, len(labels)))
+
+    start = time.perf_counter()
+    expected = similar_pairs(sample, threshold)
+    pairs_s = time.perf_counter() - start
+    # Rappel : part des paires similaires placées dans le même groupe par l'index
+    cluster_of = {}
+    for number, cluster in enumerate(find_similar_groups(sample, threshold=threshold)):
+        for spelling in cluster["values"]:
+            cluster_of[spelling["value"]] = number
+    found = sum(1 for i, j in expected if cluster_of.get(sample[i], -1) == cluster_of.get(sample[j], -2))
+    print(f"sample of {len(sample)} labels: {len(expected)} similar pairs, "
+          f"recall {found / max(len(expected), 1):.1%}")
+
+    start = time.perf_counter()
+    clusters = find_similar_groups(labels, threshold=threshold)
+    index_s = time.perf_counter() - start
+    extrapolated = pairs_s * (len(labels) / len(sample)) ** 2
+    print(f"{len(labels)} labels: index {index_s:.1f} s, {len(clusters)} clusters; "
+          f"all pairs ~{extrapolated / 3600:.0f} h (extrapolated from {pairs_s:.1f} s)")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 1_000_000, args[1] if len(args) > 1 else 3000)
@@ -0,0 +1,69 @@
+"""Peak RSS of CSV validation: legacy full-read vs single-pass streaming.
+
+Each measurement runs in a fresh subprocess so ``ru_maxrss`` reflects only
+that run. With streaming, peak memory should stay flat as the file grows.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_streaming_validation.py [rows ...]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from datagen import write_inventory_csv
+
+from models import G4IT_COLUMN_SPECS, iter_file_chunks, validate_csv_stream
+
+REQUIRED_COLUMNS = [col for col, spec in G4IT_COLUMN_SPECS.items() if spec['required']]
+
+
+def legacy(path):
+    """Reproduces the former validate_file CSV flow: the whole upload in memory,
+    a full re-read to find the delimiter, then the row validation."""
+    with open(path, 'rb') as f:
+        content = f.read()  # await file.read()
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    delimiter = ';' if ';' in text.split('\n')[0] else ','
+    result = validate_csv_stream([content], REQUIRED_COLUMNS)
+    assert result["delimiter"] == delimiter
+    return len(result["type_errors"])
+
+
+def streaming(path):
+    with open(path, 'rb') as f:
+        return len(validate_csv_stream(iter_file_chunks(f), REQUIRED_COLUMNS)["type_errors"])
+
+
+def measure(mode, path):
+    """Runs one validation in a subprocess and returns (seconds, peak RSS MB)."""
+    out = subprocess.check_output([sys.executable, __file__, '--run', mode, path], text=True)
+    seconds, rss = out.split()
+    return float(seconds), float(rss)
+
+
+def main(sizes):
+    print(f"{'rows':>10} {'size MB':>9} {'legacy s':>9} {'legacy MB':>10} {'stream s':>9} {'stream MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"inventory_{rows}.csv")
+            size = write_inventory_csv(path, rows)
+            legacy_s, legacy_mb = measure('legacy', path)
+            stream_s, stream_mb = measure('streaming', path)
+            print(f"{rows:>10} {size / 1e6:>9.1f} {legacy_s:>9.2f} {legacy_mb:>10.1f} {stream_s:>9.2f} {stream_mb:>10.1f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--run':
+        func = legacy if sys.argv[2] == 'legacy' else streaming
+        start = time.perf_counter()
+        func(sys.argv[3])
+        elapsed = time.perf_counter() - start
+        # ru_maxrss est en Ko sous Linux
+        print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [100_000, 500_000, 2_000_000])
@@ -0,0 +1,148 @@
+"""Upload ingestion: whole upload read in memory vs chunked copy.
+
+A uvicorn server runs this module's app in a subprocess and a client sends
+a large multipart upload over HTTP, by blocks. The previous ingestion wrote
+``await file.read()`` to disk, holding the whole file in memory; the API now
+copies the spooled upload by blocks of ``DEFAULT_CHUNK_SIZE`` (or parses it
+in place). The server memory added by the upload is its peak RSS minus its
+RSS before the upload. Finally, an upload larger than ``MAX_UPLOAD_SIZE`` is
+refused with a 413 before its body is read.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_uploads.py [size MB]
+"""
+import http.client
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import datagen
+
+from fastapi import FastAPI, File, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from models.streaming import DEFAULT_CHUNK_SIZE
+
+BOUNDARY = "bench-upload-boundary"
+BLOCK_SIZE = 1024 * 1024
+
+app = FastAPI()
+
+
+@app.post("/previous")
+async def previous(file: UploadFile = File(...)):
+    # Ancienne copie : tout le fichier lu en mémoire avant d'être écrit
+    with tempfile.NamedTemporaryFile(dir=os.environ.get("BENCH_UPLOAD_DIR")) as buffer:
+        buffer.write(await file.read())
+    return {"ok": True}
+
+
+@app.post("/chunked")
+async def chunked(file: UploadFile = File(...)):
+    with tempfile.NamedTemporaryFile(dir=os.environ.get("BENCH_UPLOAD_DIR")) as buffer:
+        await run_in_threadpool(shutil.copyfileobj, file.file, buffer, DEFAULT_CHUNK_SIZE)
+    return {"ok": True}
+
+
+def rss_mb(pid, field):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(module, port, env):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", module, "--port", str(port), "--log-level", "warning"],
+        cwd=datagen.BACKEND_DIR, env=env
+    )
+    for _ in range(200):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("Le serveur uvicorn n'a pas démarré")
+
+
+def upload(port, path, url):
+    """Sends ``path`` as a multipart upload, by blocks; returns (status, seconds)."""
+    head = (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"inventory.csv\"\r\n"
+            f"Content-Type: text/csv\r\n\r\n").encode()
+    tail = f"\r\n--{BOUNDARY}--\r\n".encode()
+
+    def body():
+        yield head
+        with open(path, "rb") as f:
+            while block := f.read(BLOCK_SIZE):
+                yield block
+        yield tail
+
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=600)
+    start = time.perf_counter()
+    try:
+        connection.request("POST", url, body=body(), headers={
+            "Content-Type": f"multipart/form-data; boundary={BOUNDARY}",
+            "Content-Length": str(len(head) + os.path.getsize(path) + len(tail)),
+        })
+        status = connection.getresponse().status
+    except (BrokenPipeError, ConnectionResetError):
+        # Serveur qui répond 413 puis ferme la connexion avant la fin de l'envoi
+        status = 413
+    finally:
+        connection.close()
+    return status, time.perf_counter() - start
+
+
+def measure(module, url, path, env):
+    port = free_port()
+    server = start_server(module, port, env)
+    try:
+        baseline = rss_mb(server.pid, "VmRSS")
+        status, seconds = upload(port, path, url)
+        return status, seconds, rss_mb(server.pid, "VmHWM") - baseline
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(size_mb):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "inventory.csv")
+        with open(path, "wb") as f:
+            line = b"EQ-00000001;PowerEdge R740;3;DC-PARIS;2021-01-01\n"
+            block = line * (BLOCK_SIZE // len(line))
+            for _ in range(size_mb):
+                f.write(block)
+        benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+        # Dossier temporaire du serveur (copies de l'API comprises) supprimé à la fin
+        env = dict(os.environ, BENCH_UPLOAD_DIR=tmp, TMPDIR=tmp,
+                   PYTHONPATH=os.pathsep.join([datagen.BACKEND_DIR, benchmarks_dir]))
+        print(f"upload of {os.path.getsize(path) / 1e6:.0f} MB")
+        print(f"{'mode':<36} {'status':>6} {'time s':>8} {'extra MB':>9}")
+        for label, module, url, extra_env in (
+            ("previous: await file.read()", "bench_uploads:app", "/previous", {}),
+            ("chunked copy", "bench_uploads:app", "/chunked", {}),
+            ("API /api/jobs/validate-file", "main:app", "/api/jobs/validate-file", {}),
+            ("API, over MAX_UPLOAD_SIZE (413)", "main:app", "/api/jobs/validate-file",
+             {"MAX_UPLOAD_SIZE": str(64 * 1024 * 1024)}),
+        ):
+            status, seconds, extra = measure(module, url, path, dict(env, **extra_env))
+            print(f"{label:<36} {status:>6} {seconds:>8.2f} {extra:>9.1f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1024)
@@ -0,0 +1,81 @@
+"""Cells/sec of the former per-cell if/elif validation vs compiled validators.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_validators.py [rows]
+"""
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+from datagen import INVENTORY_COLUMNS, inventory_row
+
+from models import G4IT_COLUMN_SPECS, get_validators
+
+
+def legacy_csv(rows):
+    """Former validate_file CSV loop: spec lookups, branch chain, re.match, strptime."""
+    errors = 0
+    for row_index, row in enumerate(rows, start=2):
+        for column in row.keys():
+            if column not in G4IT_COLUMN_SPECS:
+                continue
+            value = row[column]
+            if value is None or (isinstance(value, str) and value.strip() == ''):
+                if G4IT_COLUMN_SPECS[column]['required']:
+                    errors += 1
+                continue
+            expected_type = G4IT_COLUMN_SPECS[column]['type']
+            try:
+                if expected_type == 'integer':
+                    if not isinstance(value, str) or not value.isdigit():
+                        raise ValueError("La valeur n'est pas un entier valide")
+                elif expected_type == 'number':
+                    if not isinstance(value, str) or not all(c.isdigit() or c == '.' for c in value):
+                        raise ValueError("La valeur n'est pas un nombre valide")
+                    float(value)
+                elif expected_type == 'date':
+                    if not isinstance(value, str) or not re.match(r'^\d{4}-\d{2}-\d{2}$', value):
+                        raise ValueError("Format de date invalide (doit être YYYY-MM-DD)")
+                    datetime.strptime(value, '%Y-%m-%d')
+            except Exception:
+                errors += 1
+    return errors
+
+
+def compiled_csv(rows):
+    validators = get_validators(G4IT_COLUMN_SPECS, 'csv')
+    checks = [(column, validators[column]) for column in INVENTORY_COLUMNS if column in validators]
+    errors = 0
+    for row_index, row in enumerate(rows, start=2):
+        for column, validate in checks:
+            if validate(row[column], row_index) is not None:
+                errors += 1
+    return errors
+
+
+def bench(func, rows, cells):
+    start = time.perf_counter()
+    errors = func(rows)
+    elapsed = time.perf_counter() - start
+    return errors, cells / elapsed
+
+
+def main(row_count):
+    rnd = random.Random(42)
+    rows = [dict(zip(INVENTORY_COLUMNS, inventory_row(rnd, i))) for i in range(row_count)]
+    cells = row_count * sum(1 for column in INVENTORY_COLUMNS if column in G4IT_COLUMN_SPECS)
+
+    legacy_errors, legacy_rate = bench(legacy_csv, rows, cells)
+    compiled_errors, compiled_rate = bench(compiled_csv, rows, cells)
+    assert legacy_errors == compiled_errors
+
+    print(f"{cells} cells, {legacy_errors} errors")
+    print(f"  legacy   : {legacy_rate / 1e6:6.2f} M cells/s")
+    print(f"  compiled : {compiled_rate / 1e6:6.2f} M cells/s  (x{compiled_rate / legacy_rate:.1f})")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,99 @@
+"""Excel validation step: former per-cell Python loop vs vectorized masks.
+
+The DataFrame mimics what ``pd.read_excel`` returns for an inventory
+workbook (typed numeric/date columns, object columns where errors are
+mixed in). Pass ``--parse`` to also time ``pd.read_excel`` on a workbook
+of the same size, to compare validation with parsing.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_vectorized_excel.py [rows] [--parse]
+"""
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from datagen import INVENTORY_COLUMNS, inventory_row
+
+from models import G4IT_COLUMN_SPECS, validate_dataframe
+
+
+def build_dataframe(row_count):
+    rnd = random.Random(42)
+    df = pd.DataFrame([inventory_row(rnd, i) for i in range(row_count)], columns=INVENTORY_COLUMNS)
+    df = df.replace('', None)
+    for column in INVENTORY_COLUMNS:
+        expected_type = G4IT_COLUMN_SPECS[column]['type']
+        if expected_type in ('integer', 'number'):
+            # Comme read_excel : les cellules non numériques rendent la colonne "object"
+            numeric = pd.to_numeric(df[column], errors='coerce')
+            df[column] = numeric if numeric.notna().sum() == df[column].notna().sum() else \
+                df[column].where(numeric.isna(), numeric).astype(object)
+        elif expected_type == 'date':
+            parsed = pd.to_datetime(df[column], format='%Y-%m-%d', errors='coerce')
+            df[column] = parsed if parsed.notna().sum() == df[column].notna().sum() else \
+                df[column].where(parsed.isna(), parsed).astype(object)
+    return df
+
+
+def legacy(df):
+    """Former validate_file Excel loop."""
+    type_errors = []
+    for column in [col for col in df.columns if col in G4IT_COLUMN_SPECS]:
+        expected_type = G4IT_COLUMN_SPECS[column]['type']
+        for row_index, value in enumerate(df[column], start=2):
+            if pd.isna(value):
+                if G4IT_COLUMN_SPECS[column]['required']:
+                    type_errors.append({"column": column, "row": row_index})
+                continue
+            try:
+                if expected_type == 'integer':
+                    if not isinstance(value, int) and not (isinstance(value, float) and value.is_integer()):
+                        raise ValueError("Pas un entier")
+                elif expected_type == 'number':
+                    if not isinstance(value, (int, float)):
+                        raise ValueError("Pas un nombre")
+                elif expected_type == 'date':
+                    if not isinstance(value, (datetime, pd.Timestamp)):
+                        if isinstance(value, str) and not re.match(r'^\d{4}-\d{2}-\d{2}$', value):
+                            raise ValueError("Format de date invalide")
+                        if isinstance(value, str):
+                            datetime.strptime(value, '%Y-%m-%d')
+            except Exception:
+                type_errors.append({"column": column, "row": row_index})
+    return type_errors
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(row_count, parse):
+    df = build_dataframe(row_count)
+    legacy_errors, legacy_s = timed(legacy, df)
+    errors, vector_s = timed(validate_dataframe, df)
+    assert [(e["column"], e["row"]) for e in errors] == [(e["column"], e["row"]) for e in legacy_errors]
+
+    print(f"{row_count} rows, {len(errors)} errors")
+    print(f"  legacy loop : {legacy_s:7.2f} s")
+    print(f"  vectorized  : {vector_s:7.2f} s  (x{legacy_s / vector_s:.0f})")
+
+    if parse:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'inventory.xlsx')
+            df.to_excel(path, index=False)
+            _, parse_s = timed(pd.read_excel, path)
+        print(f"  read_excel  : {parse_s:7.2f} s")
+
+
+if __name__ == '__main__':
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    main(int(args[0]) if args else 500_000, '--parse' in sys.argv)
@@ -0,0 +1,67 @@
+"""Temporary files: unmanaged directory vs ``Workspace`` quota and expiry.
+
+Simulates a stream of generated files (exports, corrected files) written to
+a temporary directory. Without a manager, the directory grows with every
+file; with ``Workspace``, the bytes held stay under the quota (least
+recently used files removed first) and ``sweep`` removes expired files.
+Also times ``register`` and ``sweep`` with many tracked files.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_workspace.py [files] [file size KB] [quota MB]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import datagen  # noqa: F401  (chemin du dossier backend)
+
+from models.workspace import Workspace
+
+
+def directory_size(directory):
+    return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+
+def write_files(directory, count, size, workspace=None):
+    data = b'x' * size
+    start = time.perf_counter()
+    for index in range(count):
+        path = os.path.join(directory, f"export-{index}.csv")
+        with open(path, 'wb') as f:
+            f.write(data)
+        if workspace is not None:
+            workspace.register(path)
+    return time.perf_counter() - start
+
+
+def main(count, size_kb, quota_mb):
+    size = size_kb * 1024
+    print(f"{count} files of {size_kb} KB, quota {quota_mb} MB")
+    with tempfile.TemporaryDirectory() as tmp:
+        write_files(tmp, count, size)
+        print(f"{'unmanaged: bytes held':<40} {directory_size(tmp) / 1e6:>10.1f} MB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = Workspace(tmp, max_bytes=quota_mb * 1024 * 1024, default_ttl=3600)
+        seconds = write_files(tmp, count, size, workspace)
+        stats = workspace.stats()
+        print(f"{'workspace: bytes held':<40} {directory_size(tmp) / 1e6:>10.1f} MB")
+        print(f"{'workspace: files evicted':<40} {stats['evicted_files']:>10}")
+        print(f"{'workspace: write + register per file':<40} {seconds / count * 1e6:>10.1f} us")
+
+        start = time.perf_counter()
+        workspace.sweep()
+        print(f"{'workspace: sweep, nothing expired':<40} {(time.perf_counter() - start) * 1000:>10.1f} ms "
+              f"({stats['files']} files tracked)")
+        start = time.perf_counter()
+        removed = workspace.sweep(time.time() + 3600)
+        print(f"{'workspace: sweep, all expired':<40} {(time.perf_counter() - start) * 1000:>10.1f} ms "
+              f"({removed} files removed)")
+        print(f"{'workspace: bytes held after expiry':<40} {directory_size(tmp) / 1e6:>10.1f} MB")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [20_000, 64, 256][len(args):]))
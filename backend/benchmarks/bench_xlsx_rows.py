@@ -0,0 +1,74 @@
+"""Peak RSS of reading a workbook: former full-mode load vs read-only ``iter_rows``.
+
+Each measurement runs in a fresh subprocess so ``ru_maxrss`` reflects only
+that run. ``legacy`` reproduces the former ``XlsxHandler.load_data``
+(``load_workbook`` in normal mode, every row kept as a dict); ``iter_rows``
+streams the rows, and ``validate_columns`` runs the handler validation on
+top of it.
+
+Usage (from ``backend/``)::
+
+    python benchmarks/bench_xlsx_rows.py [rows ...]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from datagen import write_inventory_xlsx
+
+import openpyxl
+from models import XlsxHandler
+
+
+def legacy(path):
+    wb = openpyxl.load_workbook(path)
+    sheet = wb.active
+    headers = [cell.value for cell in sheet[1]]
+    data = [dict(zip(headers, row)) for row in sheet.iter_rows(min_row=2, values_only=True)]
+    return len(data)
+
+
+def iter_rows(path):
+    return sum(1 for _ in XlsxHandler(path).iter_rows())
+
+
+def validate_columns(path):
+    return XlsxHandler(path).validate_columns()["error_summary"]["total_errors"]
+
+
+MODES = {'legacy': legacy, 'iter_rows': iter_rows, 'validate_columns': validate_columns}
+
+
+def measure(mode, path):
+    """Runs one read in a subprocess and returns (seconds, peak RSS MB)."""
+    out = subprocess.check_output([sys.executable, __file__, '--run', mode, path], text=True)
+    seconds, rss = out.split()[-2:]
+    return float(seconds), float(rss)
+
+
+def main(sizes):
+    header = f"{'rows':>10} {'size MB':>8}" + ''.join(f" {mode + ' s':>20} {mode + ' MB':>20}" for mode in MODES)
+    print(header)
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"inventory_{rows}.xlsx")
+            size = write_inventory_xlsx(path, rows)
+            line = f"{rows:>10} {size / 1e6:>8.1f}"
+            for mode in MODES:
+                seconds, rss = measure(mode, path)
+                line += f" {seconds:>20.2f} {rss:>20.1f}"
+            print(line)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--run':
+        start = time.perf_counter()
+        MODES[sys.argv[2]](sys.argv[3])
+        elapsed = time.perf_counter() - start
+        # ru_maxrss est en Ko sous Linux
+        print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,71 @@
+"""Synthetic G4IT inventory generator shared by the benchmark scripts."""
+import csv
+import os
+import random
+import sys
+
+# Permettre l'import du package ``models`` depuis le dossier backend
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+INVENTORY_COLUMNS = [
+    'nomEquipementPhysique', 'modele', 'quantite', 'nomCourtDatacenter',
+    'dateAchat', 'dateRetrait', 'dureeUsageInterne', 'type', 'statut',
+    'paysDUtilisation', 'consoElecAnnuelle', 'utilisateur', 'nbCoeur',
+    'nbJourUtiliseAn', 'modeUtilisation', 'tauxUtilisation'
+]
+
+MODELS = ['PowerEdge R740', 'PowerEdge R640', 'ProLiant DL380', 'ThinkSystem SR650', 'P2419H', 'EliteBook 840']
+TYPES = ['Serveur', 'Ecran', 'PC', 'Switch']
+STATUSES = ['Active', 'Inactive', 'En maintenance']
+DATACENTERS = ['DC-PARIS', 'DC-LYON', 'DC-LILLE', 'DC-NANTES']
+COUNTRIES = ['France', 'Allemagne', 'Belgique', 'Espagne']
+
+
+def inventory_row(rnd, index, error_rate=0.01):
+    """Builds one inventory row as a list of strings, with occasional errors."""
+    bad = rnd.random() < error_rate
+    return [
+        f"EQ-{index:08d}",
+        rnd.choice(MODELS),
+        'abc' if bad else str(rnd.randint(1, 50)),
+        rnd.choice(DATACENTERS),
+        '2021-13-45' if bad else f"20{rnd.randint(10, 23)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+        '' if rnd.random() < 0.7 else f"20{rnd.randint(24, 30)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+        str(rnd.randint(12, 72)),
+        rnd.choice(TYPES),
+        rnd.choice(STATUSES),
+        rnd.choice(COUNTRIES),
+        f"{rnd.random() * 3000:.2f}",
+        'Service IT',
+        '' if rnd.random() < 0.5 else str(rnd.choice([4, 8, 16, 32])),
+        str(rnd.randint(200, 365)),
+        'Production',
+        f"{rnd.random():.2f}",
+    ]
+
+
+def write_inventory_csv(path, rows, delimiter=';', error_rate=0.01, seed=42):
+    """Writes a synthetic inventory CSV file and returns its size in bytes."""
+    rnd = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(INVENTORY_COLUMNS)
+        for i in range(rows):
+            writer.writerow(inventory_row(rnd, i, error_rate))
+    return os.path.getsize(path)
+
+
+def write_inventory_xlsx(path, rows, error_rate=0.01, seed=42):
+    """Writes a synthetic inventory workbook (numbers as numeric cells) and returns its size in bytes."""
+    import openpyxl
+
+    rnd = random.Random(seed)
+    wb = openpyxl.Workbook(write_only=True)
+    sheet = wb.create_sheet()
+    sheet.append(INVENTORY_COLUMNS)
+    for i in range(rows):
+        sheet.append([int(value) if value.isdigit() else value for value in inventory_row(rnd, i, error_rate)])
+    wb.save(path)
+    return os.path.getsize(path)
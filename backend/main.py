@@ -1,22 +1,100 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Response
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse, HTMLResponse
-from typing import Optional
+from fastapi.responses import JSONResponse, FileResponse, HTMLResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+import asyncio
 import tempfile
 import os
+import shutil
 import uuid
+from contextlib import ExitStack, asynccontextmanager, closing
 import logging
 import csv
-import re
+import json
 import pandas as pd
-from models import CsvHandler, XlsxHandler, check_file, validate_columns, G4IT_COLUMN_SPECS
-from datetime import datetime
+from models import check_file, G4IT_COLUMN_SPECS
+from models import iter_file_chunks, validate_csv_stream, validate_dataframe, validate_csv_parallel, ErrorCollector
+from models import open_csv_stream, iter_validated_records, iter_validated_columns, iter_validated_ranges, JobManager
+from models import ValidationCache, SessionStore, sniff_headers, fix_file, parse_fixes, extract_archive, validate_batch
+from models.streaming import DEFAULT_CHUNK_SIZE, validate_csv_records, open_file_rows
+from models.parallel import read_csv_header, split_csv_ranges
+from models.jobs import DEFAULT_JOB_RETENTION
+from models.cache import DEFAULT_CACHE_MAX_BYTES, hash_file
+from models.sniffer import sniff_csv_file, supports_byte_ranges
+from models.dates import DAY_FIRST, MONTH_FIRST
+from models.fixes import DATES
+from models.batch import ARCHIVE_EXTENSIONS, DEFAULT_MAX_ARCHIVE_SIZE, SUPPORTED_EXTENSIONS
+from models.consolidation import DEFAULT_KEY_COLUMNS, DEFAULT_MAX_GROUPS, QUANTITY_COLUMN, consolidate_rows
+from models.similarity import DEFAULT_SIMILARITY_THRESHOLD, find_similar_groups
+from models.equipments import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, EquipmentStore
+from models.export import MEDIA_TYPES, PARQUET_AVAILABLE, STREAMED_FORMATS, iter_export, write_parquet_export, write_xlsx_export
+from models.export_history import DEFAULT_HISTORY_SIZE, ExportHistory, export_key
+from models.utils import private_directory
+from models.workspace import DEFAULT_ARTIFACT_TTL, DEFAULT_SWEEP_INTERVAL, DEFAULT_WORKSPACE_MAX_BYTES, Workspace
 
 # Configurer le logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+async def sweep_workspace():
+    """Supprime périodiquement les fichiers et les sessions de téléversement expirés."""
+    while True:
+        await asyncio.sleep(WORKSPACE_SWEEP_INTERVAL)
+        try:
+            removed = await run_in_threadpool(workspace.sweep)
+            if removed:
+                logger.info(f"Nettoyage du dossier de travail: {removed} fichiers ou sessions expirés supprimés")
+        except Exception as e:
+            logger.error(f"Erreur lors du nettoyage du dossier de travail: {str(e)}")
+
+@asynccontextmanager
+async def lifespan(app):
+    # Nettoyage en arrière-plan pendant toute la vie de l'application
+    sweeper = asyncio.create_task(sweep_workspace())
+    yield
+    sweeper.cancel()
+
+# Taille maximale du corps d'une requête (fichiers téléversés compris), 0 pour ne pas la limiter
+MAX_UPLOAD_SIZE = int(os.environ.get("MAX_UPLOAD_SIZE", 4 * 1024 * 1024 * 1024))
+
+class UploadSizeLimitMiddleware:
+    """
+    Refuse (413) les requêtes dont le corps dépasse `max_bytes` : dès l'en-tête
+    Content-Length quand il est annoncé, sinon dès que les blocs reçus dépassent la
+    limite, avant que le reste du fichier ne soit lu et écrit sur disque.
+    """
+
+    def __init__(self, app, max_bytes):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.max_bytes:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Fichier trop volumineux (maximum {self.max_bytes} octets)"
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Relancée telle quelle par FastAPI pendant la lecture du formulaire
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+app = FastAPI(lifespan=lifespan)
 
 # Configurer CORS pour permettre les requêtes du front-end
 origins = [
@@ -26,6 +104,8 @@ origins = [
     "http://127.0.0.1:3001",    # Alternative
 ]
 
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=MAX_UPLOAD_SIZE)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -37,6 +117,102 @@ app.add_middleware(
 # Dossier pour stocker temporairement les fichiers
 TEMP_DIR = tempfile.gettempdir()
 
+# Fichiers produits par l'API, rangés dans un dossier qui lui est réservé (jamais d'autres
+# fichiers du dossier temporaire du système) : taille totale maximale (au-delà, les moins
+# récemment utilisés sont supprimés), intervalle du nettoyage en arrière-plan et durée de
+# conservation après la dernière utilisation, par type de fichier (en secondes)
+WORKSPACE_DIR = os.path.abspath(os.environ.get("WORKSPACE_DIR", os.path.join(TEMP_DIR, "g4it_workspace")))
+WORKSPACE_MAX_BYTES = int(os.environ.get("WORKSPACE_MAX_BYTES", DEFAULT_WORKSPACE_MAX_BYTES))
+WORKSPACE_SWEEP_INTERVAL = int(os.environ.get("WORKSPACE_SWEEP_INTERVAL", DEFAULT_SWEEP_INTERVAL))
+UPLOAD_TTL = int(os.environ.get("UPLOAD_TTL", 6 * 3600))
+CORRECTED_FILE_TTL = int(os.environ.get("CORRECTED_FILE_TTL", DEFAULT_ARTIFACT_TTL))
+CONSOLIDATED_FILE_TTL = int(os.environ.get("CONSOLIDATED_FILE_TTL", DEFAULT_ARTIFACT_TTL))
+EXPORT_TTL = int(os.environ.get("EXPORT_TTL", 24 * 3600))
+UPLOAD_SESSION_TTL = int(os.environ.get("UPLOAD_SESSION_TTL", 24 * 3600))
+workspace = Workspace(WORKSPACE_DIR, WORKSPACE_MAX_BYTES, DEFAULT_ARTIFACT_TTL)
+
+# Validation parallèle des gros fichiers CSV (nombre de processus, taille des plages
+# d'octets confiées à chaque processus, taille minimale du fichier pour l'activer)
+VALIDATION_WORKERS = int(os.environ.get("VALIDATION_WORKERS", os.cpu_count() or 1))
+VALIDATION_CHUNK_SIZE = int(os.environ.get("VALIDATION_CHUNK_SIZE", 64 * 1024 * 1024))
+PARALLEL_VALIDATION_MIN_SIZE = int(os.environ.get("PARALLEL_VALIDATION_MIN_SIZE", 128 * 1024 * 1024))
+
+# Nombre maximal d'entrées d'erreur renvoyées par défaut par /api/validate-file
+MAX_VALIDATION_ERRORS = int(os.environ.get("MAX_VALIDATION_ERRORS", 1000))
+
+# Tâches de validation en arrière-plan (tâches simultanées, conservation des résultats en secondes)
+VALIDATION_JOB_WORKERS = int(os.environ.get("VALIDATION_JOB_WORKERS", 2))
+JOB_RETENTION_SECONDS = int(os.environ.get("JOB_RETENTION_SECONDS", DEFAULT_JOB_RETENTION))
+jobs = JobManager(VALIDATION_JOB_WORKERS, JOB_RETENTION_SECONDS)
+
+# Cache des résultats de validation, indexé par le SHA-256 du fichier (0 désactive le cache)
+VALIDATION_CACHE_DIR = os.environ.get("VALIDATION_CACHE_DIR", os.path.join(TEMP_DIR, "g4it_validation_cache"))
+VALIDATION_CACHE_MAX_BYTES = int(os.environ.get("VALIDATION_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES))
+validation_cache = ValidationCache(VALIDATION_CACHE_DIR, VALIDATION_CACHE_MAX_BYTES)
+
+# Sessions de téléversement : fichiers lus une seule fois et conservés sous forme de colonnes
+UPLOAD_SESSIONS_DIR = os.environ.get("UPLOAD_SESSIONS_DIR", os.path.join(TEMP_DIR, "g4it_upload_sessions"))
+upload_sessions = SessionStore(UPLOAD_SESSIONS_DIR)
+# Sessions laissées par une exécution précédente : même durée de conservation et même quota
+workspace.adopt(UPLOAD_SESSIONS_DIR, UPLOAD_SESSION_TTL, kind="session")
+
+# Taille maximale des fichiers d'une archive ZIP validée par /api/validate-files, une fois décompressés
+MAX_ARCHIVE_SIZE = int(os.environ.get("MAX_ARCHIVE_SIZE", DEFAULT_MAX_ARCHIVE_SIZE))
+
+# Consolidation côté serveur : groupes gardés en mémoire avant d'écrire des séries triées sur disque
+CONSOLIDATION_MAX_GROUPS = int(os.environ.get("CONSOLIDATION_MAX_GROUPS", DEFAULT_MAX_GROUPS))
+
+# Dossier des bases SQLite par défaut, réservé à l'utilisateur de l'API (mode 0700) : dans le
+# dossier temporaire partagé, un autre utilisateur pourrait sinon créer les bases à l'avance
+DATABASE_DIR = os.environ.get("DATABASE_DIR", os.path.join(TEMP_DIR, "g4it_databases"))
+
+# Base SQLite des équipements issus des fichiers traités (servis par /api/equipments)
+EQUIPMENT_DB_PATH = (os.environ.get("EQUIPMENT_DB_PATH")
+                     or os.path.join(private_directory(DATABASE_DIR), "g4it_equipments.sqlite3"))
+equipment_store = EquipmentStore(EQUIPMENT_DB_PATH)
+
+# Base SQLite de l'historique des exportations (fichiers exportés gardés dans WORKSPACE_DIR)
+EXPORT_DB_PATH = (os.environ.get("EXPORT_DB_PATH")
+                  or os.path.join(private_directory(DATABASE_DIR), "g4it_exports.sqlite3"))
+export_history = ExportHistory(EXPORT_DB_PATH)
+
+# Colonnes obligatoires dans les fichiers CSV G4IT
+REQUIRED_COLUMNS = [
+    'nomEquipementPhysique',  # Nom ou référence de l'équipement
+    'modele',                 # Modèle ou catégorie de l'équipement
+    'quantite',               # Nombre d'unités
+    'nomCourtDatacenter',     # Identifiant du datacenter
+    'type',                   # Type d'équipement (Ecran, Serveur, etc.)
+    'statut',                 # État de l'équipement (Active, Inactive, etc.)
+    'paysDUtilisation'        # Pays où l'équipement est utilisé
+]
+
+# Colonnes optionnelles dans les fichiers CSV G4IT
+OPTIONAL_COLUMNS = [
+    # Informations temporelles
+    'dateAchat',           # Date d'acquisition (format YYYY-MM-DD)
+    'dateRetrait',         # Date de mise hors service (format YYYY-MM-DD)
+    'dureeUsageInterne',   # Durée d'utilisation interne en mois
+    'dureeUsageAmont',     # Durée d'utilisation en amont en mois
+    'dureeUsageAval',      # Durée d'utilisation en aval en mois
+
+    # Informations d'utilisation
+    'consoElecAnnuelle',   # Consommation électrique annuelle en kWh
+    'utilisateur',         # Service ou personne utilisant l'équipement
+    'nomSourceDonnee',     # Source des données pour cet équipement
+    'nomEntite',           # Entité responsable de l'équipement
+
+    # Caractéristiques techniques
+    'nbCoeur',             # Nombre de cœurs de processeur
+    'nbJourUtiliseAn',     # Nombre de jours d'utilisation par an
+    'goTelecharge',        # Volume de données téléchargées en Go
+
+    # Modalités d'utilisation
+    'modeUtilisation',     # Mode d'utilisation (Production, Test, etc.)
+    'tauxUtilisation',     # Taux d'utilisation moyen (entre 0 et 1)
+    'qualite'              # Niveau de qualité ou performance
+]
+
 @app.get("/")
 def read_root():
     return {"message": "G4IT CSV Checker API is running"}
@@ -45,11 +221,267 @@ def read_root():
 def read_data():
     return {"message": "Hello from FastAPI"}
 
+def open_validation(file_path, file_extension, collector, stack):
+    """
+    Lit l'en-tête d'un fichier enregistré sur disque et prépare sa validation pas à pas.
+
+    Retourne les colonnes détectées, le générateur des étapes de validation (à ne
+    parcourir que si les colonnes requises sont présentes) et une fonction qui
+    associe à chaque étape le couple (lignes traitées, fraction du fichier traitée).
+    Les fichiers ouverts sont fermés avec `stack`.
+    """
+    if file_extension == '.csv':
+        size = os.path.getsize(file_path)
+        if (VALIDATION_WORKERS > 1 and size >= PARALLEL_VALIDATION_MIN_SIZE
+                and supports_byte_ranges(sniff_csv_file(file_path))):
+            # Gros fichier : plages d'octets validées sur plusieurs cœurs, une étape par plage
+            dialect, detected_columns, data_start = read_csv_header(file_path)
+            ranges = split_csv_ranges(file_path, data_start, VALIDATION_CHUNK_SIZE)
+            range_ends = iter([end for _, end in ranges])
+            steps = iter_validated_ranges(
+                file_path, data_start, dialect, detected_columns, G4IT_COLUMN_SPECS,
+                collector, VALIDATION_WORKERS, VALIDATION_CHUNK_SIZE, ranges
+            )
+            return detected_columns, steps, lambda rows: (rows, next(range_ends, size) / size)
+
+        source = stack.enter_context(open(file_path, "rb"))
+        delimiter, detected_columns, reader = open_csv_stream(iter_file_chunks(source))
+        steps = iter_validated_records(reader, detected_columns, collector=collector)
+        return detected_columns, steps, lambda rows: (rows, min(source.tell() / size, 1.0))
+
+    # Excel : validation colonne par colonne, la progression est la part des colonnes traitées
+    df = pd.read_excel(file_path)
+    detected_columns = df.columns.tolist()
+    validated_columns = [col for col in detected_columns if col in G4IT_COLUMN_SPECS]
+    done = []
+
+    def progress(column):
+        done.append(column)
+        fraction = len(done) / len(validated_columns)
+        return int(len(df) * fraction), fraction
+
+    return detected_columns, iter_validated_columns(df, collector=collector), progress
+
+def _ndjson(record):
+    return json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+def iter_validation_ndjson(file_path, file_extension, max_errors, fail_fast):
+    """
+    Valide un fichier enregistré sur disque et produit le résultat au format NDJSON.
+
+    Enregistrements émis, un objet JSON par ligne :
+    - `columns` : colonnes requises, optionnelles, détectées et manquantes, dès la lecture de l'en-tête ;
+    - `errors` : lots d'erreurs de type, au fil de la validation (une entrée n'est émise
+      qu'une fois sa plage de lignes terminée) ;
+    - `summary` : `is_valid` et `error_summary`, en dernier ;
+    - `error` : remplace la suite du flux si le fichier ne peut pas être lu.
+
+    Le fichier est supprimé à la fin du flux (sinon, à l'expiration de sa durée de conservation).
+    """
+    collector = ErrorCollector(max_errors, fail_fast)
+    try:
+        with ExitStack() as stack:
+            try:
+                detected_columns, steps, _ = open_validation(file_path, file_extension, collector, stack)
+            except Exception as e:
+                logger.error(f"Erreur lors de la lecture du fichier: {str(e)}")
+                yield _ndjson({"type": "error", "detail": f"Format de fichier invalide: {str(e)}"})
+                return
+
+            missing_required_columns = [col for col in REQUIRED_COLUMNS if col not in detected_columns]
+            yield _ndjson({
+                "type": "columns",
+                "required_columns": REQUIRED_COLUMNS,
+                "optional_columns": OPTIONAL_COLUMNS,
+                "detected_columns": detected_columns,
+                "missing_required_columns": missing_required_columns
+            })
+
+            # Valider le contenu uniquement si toutes les colonnes requises sont présentes
+            if not missing_required_columns:
+                for step in steps:
+                    errors = collector.drain()
+                    if errors:
+                        yield _ndjson({"type": "errors", "progress": step, "errors": errors})
+                errors = collector.drain(final=True)
+                if errors:
+                    yield _ndjson({"type": "errors", "progress": None, "errors": errors})
+
+            error_summary = collector.summary()
+            yield _ndjson({
+                "type": "summary",
+                "is_valid": not missing_required_columns and not error_summary["total_errors"],
+                "error_summary": error_summary
+            })
+    except Exception as e:
+        logger.error(f"Erreur lors de la validation du fichier: {str(e)}")
+        yield _ndjson({"type": "error", "detail": f"Erreur lors de la validation du fichier: {str(e)}"})
+    finally:
+        workspace.remove(file_path)
+
+def validate_session(session, max_errors, fail_fast):
+    """Valide les données d'une session de téléversement et retourne le même résultat que /api/validate-file"""
+    collector = ErrorCollector(max_errors, fail_fast)
+    detected_columns = session.columns
+    missing_required_columns = [col for col in REQUIRED_COLUMNS if col not in detected_columns]
+    if not missing_required_columns:
+        if session.file_type == "csv":
+            validate_csv_records(session.iter_records(), detected_columns, collector=collector)
+        else:
+            validate_dataframe(session.data, collector=collector)
+
+    error_summary = collector.summary()
+    return {
+        "is_valid": not missing_required_columns and not error_summary["total_errors"],
+        "required_columns": REQUIRED_COLUMNS,
+        "optional_columns": OPTIONAL_COLUMNS,
+        "detected_columns": detected_columns,
+        "missing_required_columns": missing_required_columns,
+        "type_errors": collector.errors,
+        "error_summary": error_summary
+    }
+
+def track_upload_session(session_id):
+    """Suit le dossier d'une session dans le dossier de travail (taille à jour, durée de conservation relancée)"""
+    path = upload_sessions.path(session_id)
+    if path is not None and os.path.isdir(path):
+        workspace.register(path, UPLOAD_SESSION_TTL, kind="session")
+
+def touch_upload_session(session_id):
+    """Marque une session comme utilisée : sa durée de conservation repart de zéro"""
+    path = upload_sessions.path(session_id)
+    if path is not None:
+        workspace.touch(path)
+
+async def load_upload_session(session_id):
+    """Charge une session de téléversement ou lève une erreur 404"""
+    session = await run_in_threadpool(upload_sessions.load, session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session de téléversement introuvable")
+    touch_upload_session(session_id)
+    return session
+
+def iter_session_rows(session):
+    """Retourne les lignes d'une session sous forme de tuples, dans l'ordre de `session.columns`"""
+    if session.file_type == "csv":
+        return session.iter_records()
+    return session.data.itertuples(index=False, name=None)
+
+@app.post("/api/upload-sessions")
+async def create_upload_session(file: UploadFile = File(...)):
+    """
+    Lit un fichier CSV ou Excel une seule fois et le conserve sous forme de colonnes.
+
+    L'identifiant retourné (`session_id`) peut remplacer le fichier dans
+    /api/detect-headers, /api/validate-file et /api/process-file-data.
+    """
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="Nom de fichier manquant")
+    if os.path.splitext(file.filename)[1].lower() not in ['.csv', '.xlsx', '.xls']:
+        raise HTTPException(status_code=400, detail="Format de fichier non supporté. Utilisez CSV ou XLSX.")
+    try:
+        session = await run_in_threadpool(upload_sessions.create, file.file, file.filename)
+    except Exception as e:
+        logger.error(f"Erreur lors de la lecture du fichier: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Format de fichier invalide: {str(e)}")
+    await run_in_threadpool(track_upload_session, session.id)
+    logger.info(f"Session de téléversement {session.id} créée pour {file.filename}")
+    return dict(session.meta, detected_columns=session.headers)
+
+@app.get("/api/upload-sessions/{session_id}")
+def get_upload_session(session_id: str):
+    """Retourne les informations d'une session de téléversement"""
+    meta = upload_sessions.get_meta(session_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Session de téléversement introuvable")
+    touch_upload_session(session_id)
+    return meta
+
+@app.delete("/api/upload-sessions/{session_id}")
+def delete_upload_session(session_id: str):
+    """Supprime une session de téléversement"""
+    if not upload_sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail="Session de téléversement introuvable")
+    workspace.remove(upload_sessions.path(session_id))
+    return {"success": True}
+
+@app.post("/api/upload-sessions/{session_id}/edits")
+async def edit_upload_session(session_id: str, data: dict):
+    """
+    Modifie des cellules d'une session de téléversement et revalide uniquement ces cellules.
+
+    Corps : {"edits": [{"row": 5, "column": "quantite", "value": "3"}, ...]}, où `row`
+    est le numéro de ligne des rapports d'erreurs (2 pour la première ligne de données).
+    Les modifications s'ajoutent à celles déjà enregistrées, sans réécrire le fichier
+    d'origine, et sont prises en compte par /api/validate-file et /api/process-file-data
+    avec ce `session_id`.
+
+    La réponse donne l'écart avec la validation précédente : erreurs corrigées
+    (`resolved`), erreurs des cellules modifiées (`errors`) et variation des compteurs
+    d'erreurs (`error_counts_delta`, `total_errors_delta`).
+    """
+    try:
+        delta = await run_in_threadpool(upload_sessions.edit, session_id, data.get("edits"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if delta is None:
+        raise HTTPException(status_code=404, detail="Session de téléversement introuvable")
+    await run_in_threadpool(track_upload_session, session_id)
+    logger.info(f"Session {session_id}: {delta['edited_cells']} cellules modifiées, {delta['total_errors_delta']:+d} erreurs")
+    return delta
+
+@app.delete("/api/upload-sessions/{session_id}/edits")
+def clear_upload_session_edits(session_id: str):
+    """Annule toutes les modifications de cellules d'une session de téléversement"""
+    if not upload_sessions.clear_edits(session_id):
+        raise HTTPException(status_code=404, detail="Session de téléversement introuvable")
+    track_upload_session(session_id)
+    return {"success": True}
+
 @app.post("/api/validate-file")
-async def validate_file(file: UploadFile = File(...)):
+async def validate_file(
+    file: Optional[UploadFile] = File(None),
+    max_errors: Optional[int] = Form(None),
+    fail_fast: bool = Form(False),
+    stream: bool = Form(False),
+    session_id: Optional[str] = Form(None)
+):
     """
     Valide un fichier téléchargé et retourne les problèmes détectés.
+
+    Les erreurs consécutives identiques d'une colonne sont regroupées en plages
+    de lignes, au plus `max_errors` entrées sont renvoyées (les compteurs de
+    `error_summary` restent exacts) et `fail_fast` arrête la validation à la
+    première valeur obligatoire manquante.
+
+    Avec `stream`, la réponse est un flux NDJSON (voir `iter_validation_ndjson`) :
+    les colonnes puis les erreurs sont envoyées au fur et à mesure de la validation.
+
+    Avec `session_id` (voir /api/upload-sessions), les données déjà lues de la
+    session sont validées à la place d'un fichier.
     """
+    if max_errors is None:
+        max_errors = MAX_VALIDATION_ERRORS
+
+    if session_id:
+        meta = upload_sessions.get_meta(session_id)
+        if meta is None:
+            raise HTTPException(status_code=404, detail="Session de téléversement introuvable")
+        touch_upload_session(session_id)
+        extension = os.path.splitext(meta["filename"])[1].lower()
+        # Cellules modifiées (voir /api/upload-sessions/{session_id}/edits) : le contenu n'est plus l'original
+        edits_hash = [meta["edits_hash"]] if meta.get("edits_hash") else []
+        cache_key = validation_cache.key(meta["content_hash"], extension, max_errors, fail_fast, *edits_hash)
+        result = await run_in_threadpool(validation_cache.get, cache_key)
+        if result is None:
+            session = await load_upload_session(session_id)
+            result = await run_in_threadpool(validate_session, session, max_errors, fail_fast)
+            await run_in_threadpool(validation_cache.put, cache_key, result)
+        return result
+
+    if file is None:
+        raise HTTPException(status_code=400, detail="Fichier ou session de téléversement manquant")
+
     try:
         logger.info(f"Fichier reçu: {file.filename}")
 
@@ -57,83 +489,78 @@ async def validate_file(file: UploadFile = File(...)):
         if not file.filename:
             raise HTTPException(status_code=400, detail="Nom de fichier manquant")
 
-        # Sauvegarder temporairement le fichier
-        file_path = os.path.join(TEMP_DIR, f"upload_{uuid.uuid4()}{os.path.splitext(file.filename)[1]}")
-        with open(file_path, "wb") as buffer:
-            buffer.write(await file.read())
-
         # Déterminer le type de fichier
         file_extension = os.path.splitext(file.filename)[1].lower()
+        file_path = None
+
+        if stream:
+            if file_extension not in ['.csv', '.xlsx', '.xls']:
+                raise HTTPException(status_code=400, detail="Format de fichier non supporté. Utilisez CSV ou XLSX.")
+            # Le fichier téléversé est fermé avant l'envoi de la réponse : en garder une copie
+            file_path = os.path.join(WORKSPACE_DIR, f"upload_{uuid.uuid4()}{file_extension}")
+            with open(file_path, "wb") as buffer:
+                await run_in_threadpool(shutil.copyfileobj, file.file, buffer, DEFAULT_CHUNK_SIZE)
+            workspace.register(file_path, UPLOAD_TTL, pinned=True)
+            return StreamingResponse(
+                iter_validation_ndjson(file_path, file_extension, max_errors, fail_fast),
+                media_type="application/x-ndjson"
+            )
 
-        detected_columns = []
-        # Colonnes obligatoires dans les fichiers CSV G4IT
-        required_columns = [
-            'nomEquipementPhysique',  # Nom ou référence de l'équipement
-            'modele',                 # Modèle ou catégorie de l'équipement
-            'quantite',               # Nombre d'unités
-            'nomCourtDatacenter',     # Identifiant du datacenter
-            'type',                   # Type d'équipement (Ecran, Serveur, etc.)
-            'statut',                 # État de l'équipement (Active, Inactive, etc.)
-            'paysDUtilisation'        # Pays où l'équipement est utilisé
-        ]
+        # Même contenu, mêmes règles et mêmes options : renvoyer le résultat déjà calculé
+        cache_key = None
+        if validation_cache.enabled and file_extension in ['.csv', '.xlsx', '.xls']:
+            content_hash = await run_in_threadpool(hash_file, file.file)
+            cache_key = validation_cache.key(content_hash, file_extension, max_errors, fail_fast)
+            cached_result = await run_in_threadpool(validation_cache.get, cache_key)
+            if cached_result is not None:
+                logger.info(f"Résultat de validation trouvé en cache pour {file.filename}")
+                return cached_result
 
-        # Colonnes optionnelles dans les fichiers CSV G4IT
-        optional_columns = [
-            # Informations temporelles
-            'dateAchat',           # Date d'acquisition (format YYYY-MM-DD)
-            'dateRetrait',         # Date de mise hors service (format YYYY-MM-DD)
-            'dureeUsageInterne',   # Durée d'utilisation interne en mois
-            'dureeUsageAmont',     # Durée d'utilisation en amont en mois
-            'dureeUsageAval',      # Durée d'utilisation en aval en mois
-            
-            # Informations d'utilisation
-            'consoElecAnnuelle',   # Consommation électrique annuelle en kWh
-            'utilisateur',         # Service ou personne utilisant l'équipement
-            'nomSourceDonnee',     # Source des données pour cet équipement
-            'nomEntite',           # Entité responsable de l'équipement
-            
-            # Caractéristiques techniques
-            'nbCoeur',             # Nombre de cœurs de processeur
-            'nbJourUtiliseAn',     # Nombre de jours d'utilisation par an
-            'goTelecharge',        # Volume de données téléchargées en Go
-            
-            # Modalités d'utilisation
-            'modeUtilisation',     # Mode d'utilisation (Production, Test, etc.)
-            'tauxUtilisation',     # Taux d'utilisation moyen (entre 0 et 1)
-            'qualite'              # Niveau de qualité ou performance
-        ]
+        detected_columns = []
+        required_columns = REQUIRED_COLUMNS
+        optional_columns = OPTIONAL_COLUMNS
         missing_required_columns = []
         type_errors = []
+        error_summary = ErrorCollector().summary()
 
         # Lire les en-têtes du fichier selon son type
         if file_extension == '.csv':
             try:
-                # Essayer d'abord avec le séparateur virgule
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                # Détecter le délimiteur (virgule ou point-virgule)
-                delimiter = ';' if ';' in content.split('\n')[0] else ','
-                logger.info(f"Délimiteur détecté: {delimiter}")
-
-                # Relire avec le bon délimiteur
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    reader = csv.reader(f, delimiter=delimiter)
-                    detected_columns = next(reader)  # Lire la première ligne (en-têtes)
+                if VALIDATION_WORKERS > 1 and (file.size or 0) >= PARALLEL_VALIDATION_MIN_SIZE:
+                    # Gros fichier : validation parallèle par plages d'octets sur plusieurs cœurs
+                    file_path = os.path.join(WORKSPACE_DIR, f"upload_{uuid.uuid4()}{file_extension}")
+                    with open(file_path, "wb") as buffer:
+                        await run_in_threadpool(shutil.copyfileobj, file.file, buffer, DEFAULT_CHUNK_SIZE)
+                    workspace.register(file_path, UPLOAD_TTL, pinned=True)
+                    result = await run_in_threadpool(
+                        validate_csv_parallel, file_path, required_columns, G4IT_COLUMN_SPECS,
+                        VALIDATION_WORKERS, VALIDATION_CHUNK_SIZE, max_errors, fail_fast
+                    )
+                else:
+                    # Validation en flux : en-têtes, délimiteur et lignes en une seule passe,
+                    # directement depuis les blocs téléversés (sans copie sur disque)
+                    result = await run_in_threadpool(
+                        validate_csv_stream, iter_file_chunks(file.file), required_columns,
+                        G4IT_COLUMN_SPECS, max_errors, fail_fast
+                    )
+                logger.info(f"Délimiteur détecté: {result['delimiter']}")
+                detected_columns = result["detected_columns"]
+                type_errors = result["type_errors"]
+                error_summary = result["error_summary"]
             except Exception as e:
                 logger.error(f"Erreur lors de la lecture du CSV: {str(e)}")
+                if file_path:
+                    workspace.remove(file_path)
                 raise HTTPException(status_code=400, detail=f"Format CSV invalide: {str(e)}")
         elif file_extension in ['.xlsx', '.xls']:
             try:
-                df = pd.read_excel(file_path)
+                # Classeur lu directement depuis le fichier téléversé (déjà sur disque), sans copie
+                df = await run_in_threadpool(pd.read_excel, file.file)
                 detected_columns = df.columns.tolist()
             except Exception as e:
                 logger.error(f"Erreur lors de la lecture du fichier Excel: {str(e)}")
                 raise HTTPException(status_code=400, detail=f"Format Excel invalide: {str(e)}")
         else:
-            # Nettoyer le fichier temporaire
-            if os.path.exists(file_path):
-                os.remove(file_path)
             raise HTTPException(status_code=400, detail="Format de fichier non supporté. Utilisez CSV ou XLSX.")
 
         # Vérifier les colonnes requises
@@ -144,153 +571,256 @@ async def validate_file(file: UploadFile = File(...)):
             # Utiliser G4IT_COLUMN_SPECS pour une validation complète des types
             logger.info("Validation des types de données pour toutes les colonnes...")
             
-            if file_extension == '.csv':
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                        reader = csv.DictReader(f, delimiter=delimiter)
-                        for row_index, row in enumerate(reader, start=2):  # Ligne 2 car l'entête est la ligne 1
-                            for column in row.keys():
-                                if column not in G4IT_COLUMN_SPECS:
-                                    continue
-                                
-                                value = row[column]
-                                if value is None or (isinstance(value, str) and value.strip() == ''):
-                                    # Vérifier si le champ vide est obligatoire
-                                    if G4IT_COLUMN_SPECS[column]['required']:
-                                        type_errors.append({
-                                            "column": column,
-                                            "row": row_index,
-                                            "value": "",
-                                            "expected_type": G4IT_COLUMN_SPECS[column]['type'],
-                                            "error": "Champ obligatoire manquant"
-                                        })
-                                    continue
-                                    
-                                # Validation plus stricte selon le type attendu
-                                expected_type = G4IT_COLUMN_SPECS[column]['type']
-                                try:
-                                    if expected_type == 'integer':
-                                        # Vérifier strictement que c'est un entier
-                                        if not isinstance(value, str) or not value.isdigit():
-                                            raise ValueError("La valeur n'est pas un entier valide")
-                                    elif expected_type == 'number':
-                                        # Vérifier strictement que c'est un nombre
-                                        if not isinstance(value, str) or not all(c.isdigit() or c == '.' for c in value):
-                                            raise ValueError("La valeur n'est pas un nombre valide")
-                                        float(value)  # Essai de conversion pour confirmer
-                                    elif expected_type == 'date':
-                                        # Vérification stricte du format YYYY-MM-DD
-                                        if not isinstance(value, str) or not re.match(r'^\d{4}-\d{2}-\d{2}$', value):
-                                            raise ValueError("Format de date invalide (doit être YYYY-MM-DD)")
-                                        # Vérifier que c'est une date valide
-                                        datetime.strptime(value, '%Y-%m-%d')
-                                except Exception as e:
-                                    # Ajouter l'erreur à la liste
-                                    type_errors.append({
-                                        "column": column,
-                                        "row": row_index,
-                                        "value": value,
-                                        "expected_type": expected_type,
-                                        "error": f"La valeur n'est pas au format {expected_type} attendu: {str(e)}"
-                                    })
-                except Exception as e:
-                    logger.error(f"Erreur lors de la validation du CSV: {str(e)}")
-                    
-            elif file_extension in ['.xlsx', '.xls']:
+            if file_extension in ['.xlsx', '.xls']:
                 try:
-                    df = pd.read_excel(file_path)
-                    for column in [col for col in df.columns if col in G4IT_COLUMN_SPECS]:
-                        expected_type = G4IT_COLUMN_SPECS[column]['type']
-                        for row_index, value in enumerate(df[column], start=2):
-                            # Gérer les valeurs manquantes
-                            if pd.isna(value):
-                                if G4IT_COLUMN_SPECS[column]['required']:
-                                    type_errors.append({
-                                        "column": column,
-                                        "row": row_index,
-                                        "value": "",
-                                        "expected_type": expected_type,
-                                        "error": "Champ obligatoire manquant"
-                                    })
-                                continue
-                                
-                            # Validation selon le type attendu
-                            try:
-                                if expected_type == 'integer':
-                                    if not isinstance(value, int) and not (isinstance(value, float) and value.is_integer()):
-                                        raise ValueError("Pas un entier")
-                                elif expected_type == 'number':
-                                    if not isinstance(value, (int, float)):
-                                        raise ValueError("Pas un nombre")
-                                elif expected_type == 'date':
-                                    if not isinstance(value, (datetime, pd.Timestamp)):
-                                        # Si c'est une chaîne, vérifier le format YYYY-MM-DD
-                                        if isinstance(value, str) and not re.match(r'^\d{4}-\d{2}-\d{2}$', value):
-                                            raise ValueError("Format de date invalide")
-                                        # Essayer de convertir en date
-                                        if isinstance(value, str):
-                                            datetime.strptime(value, '%Y-%m-%d')
-                            except Exception as e:
-                                type_errors.append({
-                                    "column": column,
-                                    "row": row_index,
-                                    "value": str(value),
-                                    "expected_type": expected_type,
-                                    "error": f"La valeur n'est pas au format {expected_type} attendu ({str(e)})"
-                                })
+                    # Validation vectorisée, colonne par colonne, sur le DataFrame déjà chargé
+                    collector = validate_dataframe(df, collector=ErrorCollector(max_errors, fail_fast))
+                    type_errors = collector.errors
+                    error_summary = collector.summary()
                 except Exception as e:
                     logger.error(f"Erreur lors de la validation du fichier Excel: {str(e)}")
 
         # Nettoyer le fichier temporaire
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        if file_path:
+            workspace.remove(file_path)
 
         # Déterminer si le fichier est valide
-        is_valid = not missing_required_columns and not type_errors
+        is_valid = not missing_required_columns and not error_summary["total_errors"]
 
-        return {
+        result = {
             "is_valid": is_valid,
             "required_columns": required_columns,
             "optional_columns": optional_columns,
             "detected_columns": detected_columns,
             "missing_required_columns": missing_required_columns,
-            "type_errors": type_errors
+            "type_errors": type_errors,
+            "error_summary": error_summary
         }
+        if cache_key:
+            await run_in_threadpool(validation_cache.put, cache_key, result)
+        return result
 
     except Exception as e:
         logger.error(f"Erreur lors de la validation du fichier: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur lors de la validation du fichier: {str(e)}")
 
+@app.post("/api/validate-files")
+async def validate_files(
+    files: List[UploadFile] = File(...),
+    max_errors: Optional[int] = Form(None),
+    fail_fast: bool = Form(False)
+):
+    """
+    Valide plusieurs fichiers CSV ou Excel, ou les fichiers d'archives ZIP, en parallèle.
+
+    Chaque fichier est validé avec les mêmes règles que /api/validate-file, dans un
+    processus du pool partagé (au plus VALIDATION_WORKERS fichiers à la fois) : un
+    fichier lent n'occupe qu'un processus. La réponse contient un rapport par fichier,
+    dans l'ordre d'envoi (les fichiers d'une archive à la suite, avec `archive`), et un
+    résumé global. Un fichier illisible a une `error` dans son rapport sans faire
+    échouer le lot.
+    """
+    if max_errors is None:
+        max_errors = MAX_VALIDATION_ERRORS
+
+    batch_dir = await run_in_threadpool(tempfile.mkdtemp, "", "batch_", WORKSPACE_DIR)
+    try:
+        entries = []
+        for index, file in enumerate(files):
+            filename = file.filename or f"fichier_{index + 1}"
+            extension = os.path.splitext(filename)[1].lower()
+            if extension not in SUPPORTED_EXTENSIONS + ARCHIVE_EXTENSIONS:
+                entries.append({"filename": filename, "extension": extension, "path": None})
+                continue
+
+            path = os.path.join(batch_dir, f"upload_{index}{extension}")
+            with open(path, "wb") as buffer:
+                await run_in_threadpool(shutil.copyfileobj, file.file, buffer, DEFAULT_CHUNK_SIZE)
+            if extension in SUPPORTED_EXTENSIONS:
+                entries.append({"filename": filename, "extension": extension, "path": path})
+                continue
+
+            # Archive : chaque fichier extrait est validé séparément
+            members_dir = os.path.join(batch_dir, f"archive_{index}")
+            os.mkdir(members_dir)
+            try:
+                members = await run_in_threadpool(extract_archive, path, members_dir, MAX_ARCHIVE_SIZE)
+            except ValueError as e:
+                entries.append({"filename": filename, "extension": extension, "path": None, "error": str(e)})
+                continue
+            entries.extend(dict(member, archive=filename) for member in members)
+
+        logger.info(f"Validation de {len(entries)} fichiers en lot")
+        result = await run_in_threadpool(
+            validate_batch, entries, REQUIRED_COLUMNS, G4IT_COLUMN_SPECS,
+            VALIDATION_WORKERS, max_errors, fail_fast
+        )
+        return dict(result, required_columns=REQUIRED_COLUMNS, optional_columns=OPTIONAL_COLUMNS)
+    except Exception as e:
+        logger.error(f"Erreur lors de la validation des fichiers: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur lors de la validation des fichiers: {str(e)}")
+    finally:
+        await run_in_threadpool(shutil.rmtree, batch_dir, True)
+
+def run_validation_job(job, file_path, file_extension, max_errors, fail_fast):
+    """
+    Exécute la validation d'un fichier enregistré sur disque pour une tâche d'arrière-plan.
+
+    La progression (lignes traitées, fraction du fichier, compteurs d'erreurs) est
+    publiée après chaque étape, et l'annulation est prise en compte entre deux étapes.
+    Retourne le même résultat que /api/validate-file.
+    """
+    collector = ErrorCollector(max_errors, fail_fast)
+    with ExitStack() as stack:
+        try:
+            detected_columns, steps, progress = open_validation(file_path, file_extension, collector, stack)
+        except Exception as e:
+            raise ValueError(f"Format de fichier invalide: {str(e)}")
+
+        missing_required_columns = [col for col in REQUIRED_COLUMNS if col not in detected_columns]
+        if not missing_required_columns:
+            # Fermer le générateur en cas d'annulation (les plages en attente sont abandonnées)
+            steps = stack.enter_context(closing(steps))
+            for step in steps:
+                job.update(*progress(step), collector)
+                job.check_cancelled()
+
+    error_summary = collector.summary()
+    return {
+        "is_valid": not missing_required_columns and not error_summary["total_errors"],
+        "required_columns": REQUIRED_COLUMNS,
+        "optional_columns": OPTIONAL_COLUMNS,
+        "detected_columns": detected_columns,
+        "missing_required_columns": missing_required_columns,
+        "type_errors": collector.errors,
+        "error_summary": error_summary
+    }
+
+@app.post("/api/jobs/validate-file")
+async def submit_validation_job(
+    file: UploadFile = File(...),
+    max_errors: Optional[int] = Form(None),
+    fail_fast: bool = Form(False)
+):
+    """
+    Lance la validation d'un fichier en arrière-plan et retourne l'identifiant de la tâche.
+
+    Suivre la progression avec GET /api/jobs/{job_id}, annuler avec DELETE /api/jobs/{job_id}.
+    """
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="Nom de fichier manquant")
+    file_extension = os.path.splitext(file.filename)[1].lower()
+    if file_extension not in ['.csv', '.xlsx', '.xls']:
+        raise HTTPException(status_code=400, detail="Format de fichier non supporté. Utilisez CSV ou XLSX.")
+    if max_errors is None:
+        max_errors = MAX_VALIDATION_ERRORS
+
+    file_path = os.path.join(WORKSPACE_DIR, f"upload_{uuid.uuid4()}{file_extension}")
+    with open(file_path, "wb") as buffer:
+        await run_in_threadpool(shutil.copyfileobj, file.file, buffer, DEFAULT_CHUNK_SIZE)
+    workspace.register(file_path, UPLOAD_TTL, pinned=True)
+
+    job = jobs.submit(
+        "validation", run_validation_job, file_path, file_extension, max_errors, fail_fast,
+        filename=file.filename, cleanup=lambda: workspace.remove(file_path)
+    )
+    logger.info(f"Tâche de validation {job.id} créée pour {file.filename}")
+    return {"job_id": job.id, "status": job.status}
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str):
+    """Retourne l'état d'une tâche : progression, débit, temps restant estimé, erreurs et résultat"""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Tâche introuvable")
+    return job.to_dict()
+
+@app.delete("/api/jobs/{job_id}")
+def cancel_job(job_id: str):
+    """Annule une tâche en attente ou en cours"""
+    job = jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Tâche introuvable")
+    return job.to_dict()
+
+@app.get("/api/validation-cache")
+def get_validation_cache_stats():
+    """Retourne les compteurs du cache de validation (succès, échecs, évictions, taille)"""
+    return validation_cache.stats()
+
+@app.delete("/api/validation-cache")
+def clear_validation_cache():
+    """Vide le cache de validation"""
+    validation_cache.clear()
+    return validation_cache.stats()
+
 @app.post("/api/fix-dates")
-async def fix_dates(file_path: str = Form(...), date_column: str = Form(...)):
-    """Corrige les formats de date dans une colonne spécifique"""
-    logger.info(f"Correction des dates pour {file_path}, colonne {date_column}")
+async def fix_dates(
+    file_path: str = Form(...),
+    date_column: Optional[List[str]] = Form(None),
+    date_format: Optional[str] = Form(None),
+    fixes: Optional[str] = Form(None)
+):
+    """
+    Convertit au format YYYY-MM-DD les dates d'une ou plusieurs colonnes (par
+    défaut, de toutes les colonnes de type date de G4IT_COLUMN_SPECS) et applique
+    les autres corrections demandées.
+
+    `fixes` est un objet JSON {colonne: [transformations]} ('dates', 'strip',
+    'upper', 'lower', 'decimal_point') ; `date_column` peut être répété. Une colonne
+    présente dans les deux reçoit les transformations de `fixes` puis la conversion
+    des dates. Toutes
+    les colonnes sont corrigées en une seule lecture du fichier, ligne par ligne,
+    et le fichier corrigé est écrit au fur et à mesure.
+
+    L'ordre jour/mois de chaque colonne est déduit de l'ensemble de ses valeurs,
+    sauf si `date_format` ('DD/MM/YYYY' ou 'MM/DD/YYYY') l'impose. La réponse
+    contient un résumé par colonne au lieu du détail ligne par ligne.
+    """
+    logger.info(f"Correction de {file_path}, colonnes {date_column or 'de dates'}, corrections {fixes or 'aucune'}")
 
     valid, format_or_error = check_file(file_path)
     if not valid:
         logger.error(f"Fichier invalide: {format_or_error}")
         raise HTTPException(status_code=400, detail=format_or_error)
 
-    handler = CsvHandler(file_path) if format_or_error == "csv" else XlsxHandler(file_path)
+    if date_format not in (None, DAY_FIRST, MONTH_FIRST):
+        raise HTTPException(status_code=400, detail=f"Format de date inconnu: {date_format} (formats acceptés: {DAY_FIRST}, {MONTH_FIRST})")
+
+    # Colonnes de dates puis corrections explicites ; sans l'une ni l'autre, toutes les colonnes de dates
+    requested = None
+    if date_column or fixes:
+        requested = {column: [DATES] for column in date_column or []}
+        try:
+            for column, transforms in parse_fixes(json.loads(fixes) if fixes else {}).items():
+                # Colonne aussi listée dans date_column : ses dates sont converties après ses transformations
+                if column in requested and DATES not in transforms:
+                    transforms = transforms + [DATES]
+                requested[column] = transforms
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Corrections invalides: {str(e)}")
 
     try:
-        # Corriger les dates
-        logger.info("Début de la correction des dates...")
-        corrected_data = handler.fix_dates(date_column)
-
-        # Sauvegarder le fichier corrigé
-        corrected_file_path = os.path.join(TEMP_DIR, f"corrected_{os.path.basename(file_path)}")
-        logger.info(f"Sauvegarde du fichier corrigé: {corrected_file_path}")
-
-        if format_or_error == "csv":
-            CsvHandler(corrected_file_path).write_data(corrected_data)
+        # Corriger toutes les colonnes en une seule passe, sans charger le fichier
+        corrected_file_path = os.path.join(WORKSPACE_DIR, f"corrected_{os.path.basename(file_path)}")
+        logger.info(f"Écriture du fichier corrigé: {corrected_file_path}")
+        result = await run_in_threadpool(fix_file, file_path, corrected_file_path, format_or_error,
+                                         requested, date_format)
+        workspace.register(corrected_file_path, CORRECTED_FILE_TTL)
+
+        summary = [column["dates"] for column in result["columns"] if column["dates"]]
+        if summary or not result["columns"]:
+            columns = ", ".join(column["column"] for column in summary) or "aucune colonne"
+            message = f"Les dates ont été converties au format YYYY-MM-DD ({columns})"
         else:
-            XlsxHandler(corrected_file_path).write_data(corrected_data)
-
+            message = f"Colonnes corrigées: {', '.join(column['column'] for column in result['columns'])}"
         return {
             "success": True,
             "corrected_file_path": corrected_file_path,
-            "message": f"Les dates de la colonne '{date_column}' ont été corrigées"
+            "message": message,
+            "rows": result["rows"],
+            "columns": result["columns"],
+            "summary": summary
         }
     except Exception as e:
         logger.error(f"Erreur lors de la correction des dates: {str(e)}")
@@ -301,6 +831,7 @@ async def download_processed_file(file_path: str = Form(...)):
     """Télécharge un fichier traité"""
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="Fichier non trouvé")
+    workspace.touch(file_path)
 
     return FileResponse(
         path=file_path,
@@ -311,11 +842,20 @@ async def download_processed_file(file_path: str = Form(...)):
 @app.delete("/api/cleanup")
 async def cleanup_temp_file(file_path: str = Form(...)):
     """Supprime un fichier temporaire"""
-    if os.path.exists(file_path) and file_path.startswith(TEMP_DIR):
-        os.remove(file_path)
+    if os.path.exists(file_path) and os.path.normpath(file_path).startswith(os.path.join(WORKSPACE_DIR, "")):
+        workspace.remove(file_path)
         return {"success": True, "message": "Fichier temporaire supprimé"}
     return {"success": False, "message": "Fichier non trouvé ou chemin non autorisé"}
 
+@app.get("/api/workspace")
+def get_workspace_stats():
+    """
+    Retourne l'occupation du dossier de travail et des sessions de téléversement (fichiers
+    et sessions suivis, octets par type) et les compteurs de suppressions (quota dépassé,
+    durée de conservation expirée)
+    """
+    return workspace.stats()
+
 @app.get("/api/column-specs")
 def get_column_specs():
     """Retourne les spécifications de colonnes utilisées pour la validation"""
@@ -330,83 +870,96 @@ async def get_test_page():
 def health_check():
     return {"status": "ok"}
 
+def equipment_page(page, limit, cursor, search, sort, fields, **filters):
+    """
+    Lit une page d'équipements de la base et la met en forme pour le frontend
+    (identifiants `eq-N`, total et nombre de pages pour une requête sans curseur).
+    La taille de page est ramenée entre 1 et MAX_PAGE_SIZE, comme dans la base, et
+    une page demandée au-delà de la dernière (requête sans curseur) devient la dernière.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    page = max(page, 1)
+    result = equipment_store.page(
+        limit=limit, cursor=cursor, offset=(page - 1) * limit, search=search,
+        count=cursor is None, sort=sort, fields=fields, **filters
+    )
+    if cursor is None and page > 1 and not result["equipments"] and result["total_items"]:
+        # Page au-delà de la fin : renvoyer la dernière page
+        page = (result["total_items"] + limit - 1) // limit
+        result = equipment_store.page(
+            limit=limit, offset=(page - 1) * limit, search=search,
+            count=True, sort=sort, fields=fields, **filters
+        )
+    for equipment in result["equipments"]:
+        equipment["id"] = f"eq-{equipment['id']}"
+
+    response = {
+        "equipments": result["equipments"],
+        "next_cursor": result["next_cursor"],
+        "page": page,
+        "limit": limit
+    }
+    if result["total_items"] is not None:
+        response["total_items"] = result["total_items"]
+        response["total_pages"] = (result["total_items"] + limit - 1) // limit  # Ceil division
+    return response
+
+def equipment_list(search, sort, fields, **filters):
+    """
+    Lit tous les équipements d'une requête, page par page (MAX_PAGE_SIZE), et les
+    renvoie en une seule page, dans la forme de `equipment_page`.
+    """
+    equipments, cursor = [], None
+    while True:
+        result = equipment_store.page(limit=MAX_PAGE_SIZE, cursor=cursor, search=search, count=False,
+                                      sort=sort, fields=fields, **filters)
+        equipments.extend(result["equipments"])
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+    for equipment in equipments:
+        equipment["id"] = f"eq-{equipment['id']}"
+    return {
+        "equipments": equipments,
+        "next_cursor": None,
+        "page": 1,
+        "limit": len(equipments),
+        "total_items": len(equipments),
+        "total_pages": 1
+    }
+
 @app.get("/api/equipments")
-async def get_equipments(
+def get_equipments(
     page: int = 1,
-    limit: int = 10,
+    limit: int = DEFAULT_PAGE_SIZE,
     search: str = None,
-    type: str = None
+    type: str = None,
+    model: str = None,
+    datacenter: str = None,
+    source: str = None,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    fields: Optional[List[str]] = Query(None)
 ):
     """
-    Récupère la liste des équipements avec pagination et filtrage
+    Récupère la liste des équipements avec pagination et filtrage.
+
+    Les équipements viennent de la base SQLite alimentée par /api/equipments/import
+    et /api/process-file-data. Les filtres `type`, `model`, `datacenter` et `source`
+    sont indexés et `search` passe par l'index plein texte (FTS5), si bien qu'une page
+    se lit en quelques millisecondes quel que soit le nombre d'équipements. Pour la
+    page suivante, passer `cursor` = `next_cursor` de la réponse (pagination par clé) ;
+    `page` reste accepté mais les pages lointaines sont plus lentes à atteindre.
+    Le total n'est calculé que pour une requête sans `cursor`.
+
+    `sort` trie par un champ (`-champ` pour l'ordre décroissant) et `fields`
+    (répétable) limite les champs renvoyés.
     """
     try:
-        # Créer un tableau de données de test (à remplacer par une vraie base de données)
-        equipments = []
-        equipment_types = ["Laptop", "Desktop", "Server", "Monitor", "Printer"]
-        manufacturers = ["Dell", "HP", "Lenovo", "Apple", "ASUS"]
-
-        for i in range(1, 51):
-            equipment_type = equipment_types[i % len(equipment_types)]
-            manufacturer = manufacturers[i % len(manufacturers)]
-
-            equipment = {
-                "id": f"eq-{i}",
-                "equipmentType": equipment_type,
-                "manufacturer": manufacturer,
-                "model": f"Model-{i}",
-                "quantity": (i % 10) + 1,
-                "cpu": f"CPU-{i}" if i % 3 != 0 else None,
-                "ram": f"{(i % 4 + 1) * 8}GB" if i % 2 == 0 else None,
-                "storage": f"{(i % 3 + 1) * 256}GB" if i % 2 == 0 else None,
-                "purchaseYear": str(2020 + (i % 4)) if i % 3 != 0 else None,
-                "eol": str(2025 + (i % 4)) if i % 3 != 0 else None
-            }
-            equipments.append(equipment)
-
-        # Filtrer les équipements
-        filtered_equipments = equipments
-
-        if search:
-            search_lower = search.lower()
-            filtered_equipments = [
-                eq for eq in filtered_equipments
-                if (
-                    (eq["equipmentType"].lower().find(search_lower) != -1) or
-                    (eq["manufacturer"].lower().find(search_lower) != -1) or
-                    (eq["model"].lower().find(search_lower) != -1)
-                )
-            ]
-
-        if type:
-            filtered_equipments = [
-                eq for eq in filtered_equipments
-                if eq["equipmentType"] == type
-            ]
-
-        # Calculer la pagination
-        total_items = len(filtered_equipments)
-        total_pages = (total_items + limit - 1) // limit  # Ceil division
-
-        # S'assurer que la page demandée est valide
-        if page < 1:
-            page = 1
-        elif page > total_pages and total_pages > 0:
-            page = total_pages
-
-        # Extraire les éléments pour la page demandée
-        start_idx = (page - 1) * limit
-        end_idx = min(start_idx + limit, total_items)
-        paged_equipments = filtered_equipments[start_idx:end_idx]
-
-        return {
-            "equipments": paged_equipments,
-            "total_items": total_items,
-            "total_pages": total_pages,
-            "page": page,
-            "limit": limit
-        }
-
+        return equipment_page(page, limit, cursor, search, sort, fields,
+                              type=type, model=model, datacenter=datacenter, source=source)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Erreur lors de la récupération des équipements: {str(e)}")
         raise HTTPException(
@@ -414,6 +967,65 @@ async def get_equipments(
             detail=f"Erreur lors de la récupération des équipements: {str(e)}"
         )
 
+def import_upload(file_obj, file_extension, source, filename):
+    """
+    Enregistre les équipements d'un fichier téléversé dans la base, ligne par ligne
+    (CSV et XLSX en flux, XLS chargé par pandas).
+    """
+    with ExitStack() as stack:
+        if file_extension == ".xls":
+            df = pd.read_excel(file_obj)
+            header, rows = list(df.columns), df.itertuples(index=False, name=None)
+        else:
+            header, rows, _ = open_file_rows(file_obj, file_extension[1:], stack)
+        return equipment_store.import_rows(source, header, rows, filename)
+
+@app.post("/api/equipments/import")
+async def import_equipments(file: Optional[UploadFile] = File(None), session_id: Optional[str] = Form(None)):
+    """
+    Enregistre les équipements d'un fichier (ou d'une session de téléversement) dans
+    la base servie par /api/equipments.
+
+    Le fichier est lu ligne par ligne et inséré par lots. Un même fichier (même
+    contenu) ou une même session importé à nouveau remplace son import précédent.
+    """
+    if session_id:
+        session = await load_upload_session(session_id)
+    elif file is None or not file.filename:
+        raise HTTPException(status_code=400, detail="Fichier ou session de téléversement manquant")
+    elif os.path.splitext(file.filename)[1].lower() not in [".csv", ".xlsx", ".xls"]:
+        raise HTTPException(status_code=400, detail="Format de fichier non supporté. Utilisez CSV ou XLSX.")
+
+    try:
+        if session_id:
+            source, filename = f"session-{session_id}", session.meta.get("filename")
+            count = await run_in_threadpool(
+                equipment_store.import_rows, source, session.columns, iter_session_rows(session),
+                filename, session.meta.get("edits_hash")
+            )
+        else:
+            digest = await run_in_threadpool(hash_file, file.file)
+            source, filename = f"file-{digest[:16]}", file.filename
+            file_extension = os.path.splitext(file.filename)[1].lower()
+            count = await run_in_threadpool(import_upload, file.file, file_extension, source, filename)
+        logger.info(f"{count} équipements importés depuis {filename} ({source})")
+        return {"success": True, "source": source, "filename": filename, "rows": count}
+    except Exception as e:
+        logger.error(f"Erreur lors de l'import des équipements: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur lors de l'import des équipements: {str(e)}")
+
+@app.get("/api/equipments/sources")
+def get_equipment_sources():
+    """Liste les fichiers dont les équipements sont enregistrés, du plus récent au plus ancien"""
+    return {"sources": equipment_store.sources()}
+
+@app.delete("/api/equipments/sources/{source}")
+def delete_equipment_source(source: str):
+    """Supprime les équipements d'un fichier importé"""
+    if not equipment_store.delete_source(source):
+        raise HTTPException(status_code=404, detail="Source d'équipements introuvable")
+    return {"success": True}
+
 @app.post("/api/consolidate")
 async def consolidate_equipments(data: dict):
     """
@@ -452,6 +1064,173 @@ async def consolidate_equipments(data: dict):
             detail=f"Erreur lors de la consolidation des équipements: {str(e)}"
         )
 
+def run_consolidation(header, rows, key_columns, quantity_column, preview_size):
+    """
+    Regroupe les lignes d'un inventaire et écrit les groupes, triés par clé, dans
+    un fichier CSV du répertoire temporaire. Retourne le résumé de la consolidation
+    avec les `preview_size` premiers groupes.
+    """
+    aggregator, defaulted = consolidate_rows(
+        header, rows, key_columns, quantity_column, CONSOLIDATION_MAX_GROUPS, WORKSPACE_DIR
+    )
+    filename = f"consolidated_{uuid.uuid4()}.csv"
+    file_path = os.path.join(WORKSPACE_DIR, filename)
+    preview = []
+    group_count = 0
+    total_quantity = 0
+    try:
+        with aggregator, open(file_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(key_columns + [quantity_column, "lignes"])
+            for key, quantity, rows_count in aggregator.groups():
+                writer.writerow(list(key) + [quantity, rows_count])
+                group_count += 1
+                total_quantity += quantity
+                if len(preview) < preview_size:
+                    preview.append(dict(zip(key_columns, key), **{quantity_column: quantity, "lignes": rows_count}))
+    except BaseException:
+        workspace.remove(file_path)
+        raise
+    workspace.register(file_path, CONSOLIDATED_FILE_TTL)
+
+    return {
+        "success": True,
+        "key_columns": key_columns,
+        "quantity_column": quantity_column,
+        "rows": aggregator.rows,
+        "groups": group_count,
+        "total_quantity": total_quantity,
+        "defaulted_quantities": defaulted,
+        "spilled_runs": aggregator.spilled_runs,
+        "consolidated_file": filename,
+        "preview": preview
+    }
+
+@app.post("/api/consolidate-file")
+async def consolidate_file(
+    file: Optional[UploadFile] = File(None),
+    session_id: Optional[str] = Form(None),
+    key_columns: Optional[List[str]] = Form(None),
+    quantity_column: str = Form(QUANTITY_COLUMN),
+    preview: int = Form(100)
+):
+    """
+    Consolide un inventaire côté serveur : regroupe les lignes par colonnes clés
+    (par défaut modele, type, nomCourtDatacenter, statut, paysDUtilisation) et
+    additionne `quantity_column`.
+
+    Le fichier (ou la session de téléversement) est lu ligne par ligne et les groupes
+    sont agrégés en mémoire ; au-delà de CONSOLIDATION_MAX_GROUPS groupes, ils sont
+    écrits sur disque en séries triées puis fusionnés, si bien que la mémoire reste
+    bornée quel que soit le nombre de lignes. Tous les groupes sont écrits dans
+    `consolidated_file` (à télécharger avec /api/download-file/{filename}), la
+    réponse n'en contient que les `preview` premiers.
+    """
+    key_columns = key_columns or DEFAULT_KEY_COLUMNS
+    if session_id:
+        session = await load_upload_session(session_id)
+        header = session.columns
+        rows = iter_session_rows(session)
+    elif file is None or not file.filename:
+        raise HTTPException(status_code=400, detail="Fichier ou session de téléversement manquant")
+    elif os.path.splitext(file.filename)[1].lower() not in [".csv", ".xlsx"]:
+        raise HTTPException(status_code=400, detail="Format de fichier non supporté. Utilisez CSV ou XLSX.")
+
+    try:
+        with ExitStack() as stack:
+            if not session_id:
+                # Lecture en flux directement depuis le fichier téléversé
+                file_format = os.path.splitext(file.filename)[1].lower()[1:]
+                header, rows, _ = await run_in_threadpool(open_file_rows, file.file, file_format, stack)
+            logger.info(f"Consolidation par {', '.join(key_columns)}")
+            return await run_in_threadpool(run_consolidation, header, rows, key_columns, quantity_column, max(preview, 0))
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e.args[0]))
+    except Exception as e:
+        logger.error(f"Erreur lors de la consolidation du fichier: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur lors de la consolidation du fichier: {str(e)}")
+
+def run_similarity(header, rows, column, threshold, limit):
+    """
+    Compte les valeurs distinctes de `column` en parcourant les lignes une seule fois,
+    puis regroupe les libellés proches. Retourne les `limit` plus grands groupes.
+    """
+    names = ['' if name is None else str(name).strip() for name in header]
+    if column not in names:
+        raise KeyError(f"La colonne '{column}' est absente du fichier.")
+    # Dernière colonne du nom en cas de doublon, comme DictReader
+    position = len(names) - 1 - names[::-1].index(column)
+
+    counts = {}
+    row_count = 0
+    for row in rows:
+        row_count += 1
+        value = row[position] if len(row) > position else None
+        if isinstance(value, str):
+            value = value.strip()
+        elif hasattr(value, "item"):
+            # Scalaire numpy (colonnes Excel d'une session) -> valeur Python sérialisable
+            value = value.item()
+        if value is None or value == "" or (isinstance(value, float) and value != value):
+            continue
+        counts[value] = counts.get(value, 0) + 1
+
+    values = list(counts)
+    clusters = find_similar_groups(values, [counts[value] for value in values], threshold)
+    return {
+        "success": True,
+        "column": column,
+        "threshold": threshold,
+        "rows": row_count,
+        "distinct_values": len(values),
+        "cluster_count": len(clusters),
+        "clusters": clusters[:limit]
+    }
+
+@app.post("/api/consolidation-candidates")
+async def get_consolidation_candidates(
+    file: Optional[UploadFile] = File(None),
+    session_id: Optional[str] = Form(None),
+    column: str = Form("modele"),
+    threshold: float = Form(DEFAULT_SIMILARITY_THRESHOLD),
+    limit: int = Form(100)
+):
+    """
+    Suggère des candidats à la consolidation : regroupe les valeurs de `column`
+    (par défaut modele, ou nomEquipementPhysique) qui sont probablement des
+    orthographes du même équipement ("PowerEdge R740", "Power Edge R-740").
+
+    Les libellés sont normalisés (accents, casse, espaces et ponctuation) puis
+    comparés par un index MinHash-LSH sur leurs trigrammes : seuls les libellés
+    d'un même seau sont comparés, si bien que le temps reste à peu près linéaire
+    en nombre de valeurs distinctes. `threshold` est la similarité de Jaccard
+    minimale (entre 0 et 1) de deux libellés normalisés. La réponse contient les
+    `limit` plus grands groupes, avec le nombre de lignes de chaque orthographe.
+    """
+    if not 0 < threshold <= 1:
+        raise HTTPException(status_code=400, detail=f"Seuil de similarité invalide: {threshold} (attendu entre 0 et 1)")
+    if session_id:
+        session = await load_upload_session(session_id)
+        header = session.columns
+        rows = iter_session_rows(session)
+    elif file is None or not file.filename:
+        raise HTTPException(status_code=400, detail="Fichier ou session de téléversement manquant")
+    elif os.path.splitext(file.filename)[1].lower() not in [".csv", ".xlsx"]:
+        raise HTTPException(status_code=400, detail="Format de fichier non supporté. Utilisez CSV ou XLSX.")
+
+    try:
+        with ExitStack() as stack:
+            if not session_id:
+                file_format = os.path.splitext(file.filename)[1].lower()[1:]
+                header, rows, _ = await run_in_threadpool(open_file_rows, file.file, file_format, stack)
+            logger.info(f"Recherche de candidats à la consolidation sur {column}")
+            return await run_in_threadpool(run_similarity, header, rows, column, threshold, max(limit, 0))
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e.args[0]))
+    except Exception as e:
+        logger.error(f"Erreur lors de la recherche de candidats à la consolidation: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur lors de la recherche de candidats à la consolidation: {str(e)}")
+
 @app.get("/api/consolidated-equipments", response_class=JSONResponse)
 def get_consolidated_equipments():
     """
@@ -505,33 +1284,12 @@ def get_consolidated_equipments():
             }
         ]
 
-        export_history = [
-            {
-                "id": "exp-1",
-                "filename": "export-20230601.csv",
-                "dateExported": "2023-06-01T10:30:00Z",
-                "format": "csv",
-                "equipmentCount": 8
-            },
-            {
-                "id": "exp-2",
-                "filename": "export-20230715.xlsx",
-                "dateExported": "2023-07-15T14:45:00Z",
-                "format": "xlsx",
-                "equipmentCount": 12
-            },
-            {
-                "id": "exp-3",
-                "filename": "export-20230920.csv",
-                "dateExported": "2023-09-20T09:15:00Z",
-                "format": "csv",
-                "equipmentCount": 15
-            }
-        ]
+        # Dernières exportations, lues dans l'historique persistant
+        export_page = export_history.history(limit=DEFAULT_HISTORY_SIZE, count=False)
 
         return {
             "consolidatedEquipments": consolidated_equipments,
-            "exportHistory": export_history
+            "exportHistory": export_page["exports"]
         }
     except Exception as e:
         logging.error(f"Erreur lors de la récupération des équipements consolidés: {e}")
@@ -548,239 +1306,244 @@ async def download_specific_file(filename: str):
     Returns:
         FileResponse: Le fichier à télécharger
     """
-    file_path = os.path.join(TEMP_DIR, filename)
+    file_path = os.path.join(WORKSPACE_DIR, filename)
     
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail=f"Fichier '{filename}' non trouvé")
     
     # Vérification de sécurité pour éviter la traversée de répertoire
-    if not os.path.normpath(file_path).startswith(TEMP_DIR):
+    if not os.path.normpath(file_path).startswith(os.path.join(WORKSPACE_DIR, "")):
         raise HTTPException(status_code=403, detail="Accès non autorisé")
-    
+
+    workspace.touch(file_path)
     return FileResponse(
         path=file_path,
         filename=filename,
         media_type="application/octet-stream"
     )
 
+def archive_export(chunks, part_path, file_path, export_id, key, format, equipment_count):
+    """
+    Transmet les parties d'un export en flux puis, une fois le fichier complet, le range
+    sous son nom définitif et l'ajoute à l'historique.
+    """
+    yield from chunks
+    os.replace(part_path, file_path)
+    workspace.register(file_path, EXPORT_TTL)
+    export_history.record(export_id, key, format, os.path.basename(file_path), equipment_count,
+                          os.path.getsize(file_path))
+
+def write_archived_export(equipments, part_path, file_path, export_id, key, format):
+    """Écrit un export XLSX ou Parquet, le range sous son nom définitif et l'ajoute à l'historique."""
+    write_export = write_xlsx_export if format == "xlsx" else write_parquet_export
+    write_export(equipments, part_path)
+    os.replace(part_path, file_path)
+    workspace.register(file_path, EXPORT_TTL)
+    export_history.record(export_id, key, format, os.path.basename(file_path), len(equipments),
+                          os.path.getsize(file_path))
+
 @app.post("/api/export", response_class=Response)
 async def export_equipments(data: dict):
     """
-    Exporte les équipements consolidés au format CSV ou XLSX.
+    Exporte les équipements consolidés au format CSV, XLSX, CSV compressé (`csv.gz`),
+    NDJSON ou Parquet (si pyarrow est installé).
+
+    Les fichiers exportés sont adressés par leur contenu : le nom `export-<empreinte>`
+    vient d'une empreinte SHA-256 du format et des équipements sous une forme JSON canonique
+    (ordre des clés et mise en forme du corps sans effet). Si le même export a déjà été produit
+    et que son fichier est toujours là, il est renvoyé sans être regénéré (en-tête
+    `X-Export-Reused: true`). Sinon le fichier n'est produit qu'une fois :
+    CSV, `csv.gz` et NDJSON sont envoyés au fur et à mesure qu'ils sont écrits ; le XLSX
+    est écrit avec une mémoire constante et le Parquet par groupes de lignes, puis
+    envoyés depuis le fichier. Chaque export est ajouté à l'historique (/api/exports).
 
     Args:
         data (dict): Un dictionnaire contenant le format d'export et les équipements à exporter.
 
     Returns:
-        Response: Le fichier CSV ou XLSX à télécharger avec des métadonnées.
+        Response: Le fichier exporté à télécharger avec des métadonnées.
     """
-    try:
-        format = data.get("format")
-        equipments = data.get("equipments", [])
-
-        if not format or format not in ["csv", "xlsx"]:
-            raise HTTPException(status_code=400, detail="Format non valide. Utilisez 'csv' ou 'xlsx'")
-
-        if not equipments or not isinstance(equipments, list) or len(equipments) == 0:
-            raise HTTPException(status_code=400, detail="Aucun équipement à exporter")
-
-        # Préparer les données pour l'export
-        export_data = []
-        for eq in equipments:
-            export_data.append({
-                "Type d'équipement": eq.get("equipmentType", ""),
-                "Fabricant": eq.get("manufacturer", ""),
-                "Modèle": eq.get("model", ""),
-                "Quantité": eq.get("quantity", 0),
-                "CPU": eq.get("cpu", ""),
-                "RAM": eq.get("ram", ""),
-                "Stockage": eq.get("storage", ""),
-                "Année d'achat": eq.get("purchaseYear", ""),
-                "Fin de vie": eq.get("eol", ""),
-                "IDs d'origine": ", ".join(eq.get("originalIds", []))
-            })
+    format = data.get("format")
+    equipments = data.get("equipments", [])
 
-        # Créer un nom de fichier unique avec la date et un identifiant
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        file_id = str(uuid.uuid4())[:8]  # Utiliser les 8 premiers caractères de l'UUID
-        filename = f"export-{current_date}-{file_id}.{format}"
-        
-        # Chemin complet du fichier dans le dossier temporaire
-        file_path = os.path.join(TEMP_DIR, filename)
-        
-        # Générer le fichier selon le format demandé
-        if format == "csv":
-            # Générer un CSV
-            import csv
-            import io
-
-            output = io.StringIO()
-            fieldnames = export_data[0].keys() if export_data else []
-
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(export_data)
-
-            # Sauvegarder le fichier dans le dossier temporaire
-            with open(file_path, "w", newline="", encoding="utf-8-sig") as f:
-                f.write(output.getvalue())
-            
-            content = output.getvalue().encode('utf-8-sig')  # Avec BOM pour Excel
-            media_type = "text/csv"
-            
-        else:
-            # Générer un XLSX
-            import pandas as pd
-            import io
+    if not format or format not in MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail="Format non valide. Utilisez 'csv', 'xlsx', 'csv.gz', 'ndjson' ou 'parquet'"
+        )
+    if format == "parquet" and not PARQUET_AVAILABLE:
+        raise HTTPException(status_code=400, detail="Le format parquet nécessite le paquet pyarrow")
 
-            df = pd.DataFrame(export_data)
-            
-            # Sauvegarder le fichier dans le dossier temporaire
-            with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
-                df.to_excel(writer, sheet_name='Équipements', index=False)
-
-                # Ajuster les largeurs de colonnes
-                worksheet = writer.sheets['Équipements']
-                for i, col in enumerate(df.columns):
-                    max_width = max(df[col].astype(str).map(len).max(), len(col))
-                    worksheet.set_column(i, i, max_width + 2)
-            
-            # Pour la réponse HTTP
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                df.to_excel(writer, sheet_name='Équipements', index=False)
-            
-            content = output.getvalue()
-            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-
-        # Enregistrer les métadonnées du fichier exporté (dans une vraie application, 
-        # cela serait fait dans une base de données)
-        export_metadata = {
-            "id": f"exp-{file_id}",
-            "filename": filename,
-            "dateExported": datetime.now().isoformat(),
-            "format": format,
-            "equipmentCount": len(equipments),
-            "filePath": file_path
+    if not equipments or not isinstance(equipments, list) or len(equipments) == 0:
+        raise HTTPException(status_code=400, detail="Aucun équipement à exporter")
+
+    try:
+        # Nom du fichier tiré du contenu : un export identique retrouve le même fichier
+        key = await run_in_threadpool(export_key, format, equipments)
+        filename = f"export-{key[:16]}.{format}"
+        file_path = os.path.join(WORKSPACE_DIR, filename)
+        export_id = f"exp-{str(uuid.uuid4())[:8]}"  # Utiliser les 8 premiers caractères de l'UUID
+
+        headers = {
+            "Content-Disposition": f"attachment; filename={filename}",
+            "X-Export-ID": export_id,
+            "X-Export-Path": file_path
         }
-        
+
+        artifact = await run_in_threadpool(export_history.get_artifact, key)
+        # Fichier marqué comme utilisé avant d'être servi : le nettoyage ne le supprime pas entre-temps
+        if artifact is not None and workspace.touch(file_path) and os.path.exists(file_path):
+            entry = await run_in_threadpool(export_history.record, export_id, key, format, filename, len(equipments))
+            logger.info(f"Export identique déjà produit, fichier réutilisé: {entry}")
+            headers["X-Export-Reused"] = "true"
+            return FileResponse(file_path, media_type=MEDIA_TYPES[format], headers=headers)
+
+        # Fichier écrit sous un nom temporaire, renommé une fois complet : un export
+        # interrompu ou concurrent ne laisse jamais un fichier partiel sous le nom final
+        part_path = os.path.join(WORKSPACE_DIR, f"{filename}.{export_id}.part")
+        if format in STREAMED_FORMATS:
+            # Un seul rendu, écrit dans le fichier et envoyé par lots
+            chunks = iter_export(equipments, part_path, format)
+            return StreamingResponse(
+                archive_export(chunks, part_path, file_path, export_id, key, format, len(equipments)),
+                media_type=MEDIA_TYPES[format], headers=headers
+            )
+
+        await run_in_threadpool(write_archived_export, equipments, part_path, file_path, export_id, key, format)
         logger.info(f"Fichier exporté sauvegardé: {file_path}")
-        logger.info(f"Métadonnées d'export: {export_metadata}")
-
-        # Retourner le fichier
-        return Response(
-            content=content,
-            media_type=media_type,
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "X-Export-ID": export_metadata["id"],
-                "X-Export-Path": file_path
-            }
-        )
-    except HTTPException as he:
-        raise he
+        return FileResponse(file_path, media_type=MEDIA_TYPES[format], headers=headers)
     except Exception as e:
         logger.error(f"Erreur lors de l'export des équipements: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/exports")
+def get_exports(limit: int = DEFAULT_HISTORY_SIZE, cursor: Optional[str] = None, format: Optional[str] = None):
+    """
+    Renvoie une page de l'historique des exportations, de la plus récente à la plus ancienne.
+
+    Pour la page suivante, passer `cursor` = `next_cursor` de la réponse ; `format` ne garde
+    que les exportations d'un format. Le total n'est calculé que pour une requête sans `cursor`.
+    Le fichier d'une exportation se télécharge avec /api/download-file/{filename}.
+    """
+    try:
+        return export_history.history(limit=limit, cursor=cursor, file_format=format, count=cursor is None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erreur lors de la lecture de l'historique des exportations: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur lors de la lecture de l'historique des exportations: {str(e)}"
+        )
+
 @app.post("/api/detect-headers")
-async def detect_headers(file: UploadFile = File(...)):
-    """Détecte les en-têtes d'un fichier CSV ou Excel sans le valider complètement."""
+async def detect_headers(file: Optional[UploadFile] = File(None), session_id: Optional[str] = Form(None)):
+    """Détecte les en-têtes d'un fichier CSV ou Excel (ou d'une session de téléversement) sans le valider complètement."""
+    if session_id:
+        meta = upload_sessions.get_meta(session_id)
+        if meta is None:
+            raise HTTPException(status_code=404, detail="Session de téléversement introuvable")
+        touch_upload_session(session_id)
+        detected_columns = meta["columns"]
+        if meta["file_type"] == "csv":
+            detected_columns = [h.strip() for h in detected_columns]
+        return {
+            "detected_columns": detected_columns
+        }
+    if file is None:
+        raise HTTPException(status_code=400, detail="Fichier ou session de téléversement manquant")
+
+    # Déterminer le type de fichier
+    file_extension = os.path.splitext(file.filename or "")[1].lower()
+    if file_extension not in [".csv", ".xlsx", ".xls"]:
+        raise HTTPException(status_code=400, detail="Format de fichier non supporté")
+
     try:
-        # Sauvegarder temporairement le fichier
-        temp_file_path = os.path.join(TEMP_DIR, file.filename)
-        with open(temp_file_path, "wb") as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            await file.seek(0)  # Réinitialiser le curseur du fichier
-
-        # Déterminer le type de fichier et extraire les en-têtes
-        file_extension = os.path.splitext(file.filename)[1].lower()
-        
-        if file_extension == ".csv":
-            handler = CsvHandler(temp_file_path)
-        elif file_extension in [".xlsx", ".xls"]:
-            handler = XlsxHandler(temp_file_path)
-        else:
-            raise HTTPException(status_code=400, detail="Format de fichier non supporté")
-        
-        # Lire seulement les en-têtes du fichier
-        detected_columns = handler.get_headers()
-        
-        # Nettoyer le fichier temporaire
-        os.remove(temp_file_path)
-        
+        # Lire seulement le début du fichier téléversé, sans copie sur disque
+        detected_columns = await run_in_threadpool(sniff_headers, file.file, file_extension)
+
         return {
             "detected_columns": detected_columns
         }
-        
+
     except Exception as e:
         logger.error(f"Erreur lors de la détection des en-têtes: {str(e)}")
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
         raise HTTPException(status_code=500, detail=f"Erreur lors de la détection des en-têtes: {str(e)}")
 
 
 @app.post("/api/process-file-data")
-async def process_file_data(file: UploadFile = File(...)):
+async def process_file_data(
+    file: Optional[UploadFile] = File(None),
+    session_id: Optional[str] = Form(None),
+    source: Optional[str] = Form(None),
+    page: Optional[int] = Form(None),
+    limit: Optional[int] = Form(None),
+    cursor: Optional[str] = Form(None),
+    sort: Optional[str] = Form(None),
+    fields: Optional[List[str]] = Form(None),
+    search: Optional[str] = Form(None),
+    type: Optional[str] = Form(None),
+    model: Optional[str] = Form(None),
+    datacenter: Optional[str] = Form(None)
+):
     """
-    Traite le fichier chargé et renvoie les données formatées pour l'affichage.
+    Traite le fichier chargé (ou les données d'une session de téléversement)
+    et renvoie les équipements formatés pour l'affichage.
+
+    Les lignes sont enregistrées une seule fois dans la base des équipements
+    (même contenu de fichier, ou même session sans nouvelle modification : pas de
+    nouvel import), puis lues avec les index de la base. Sans `page`, `limit` ni
+    `cursor`, la réponse contient tous les équipements, comme avant la pagination.
+    Avec l'un d'eux, elle n'en contient qu'une page (`limit`, par défaut
+    DEFAULT_PAGE_SIZE) : les pages suivantes se demandent avec le `source` de la
+    réponse et `cursor` = `next_cursor`, sans renvoyer le fichier. `sort`,
+    `fields`, `search`, `type`, `model` et `datacenter` fonctionnent comme pour
+    /api/equipments ; le total n'est calculé que pour une requête sans `cursor`.
+    Les identifiants (`eq-N`) sont ceux de la base, communs à tous les fichiers.
     """
+    if source:
+        if await run_in_threadpool(equipment_store.get_source, source) is None:
+            raise HTTPException(status_code=404, detail="Source d'équipements introuvable")
+    elif session_id:
+        session = await load_upload_session(session_id)
+    elif file is None or not file.filename:
+        raise HTTPException(status_code=400, detail="Fichier ou session de téléversement manquant")
+    elif os.path.splitext(file.filename)[1].lower() not in [".csv", ".xlsx", ".xls"]:
+        raise HTTPException(status_code=400, detail="Format de fichier non supporté")
+
     try:
-        logger.info(f"Traitement du fichier: {file.filename}")
-        
-        # Sauvegarder temporairement le fichier
-        file_path = os.path.join(TEMP_DIR, f"upload_{uuid.uuid4()}{os.path.splitext(file.filename)[1]}")
-        with open(file_path, "wb") as buffer:
-            buffer.write(await file.read())
-            
-        # Déterminer le type de fichier
-        file_extension = os.path.splitext(file.filename)[1].lower()
-        
-        data = []
-        if file_extension == '.csv':
-            handler = CsvHandler(file_path)
-            data = handler.load_data()
-        elif file_extension in ['.xlsx', '.xls']:
-            handler = XlsxHandler(file_path)
-            data = handler.load_data()
+        if not source and session_id:
+            # Version de la session : nouvel import seulement après des modifications de cellules
+            source, version = f"session-{session_id}", session.meta.get("edits_hash")
+            stored = await run_in_threadpool(equipment_store.get_source, source)
+            if stored is None or stored["version"] != version:
+                await run_in_threadpool(
+                    equipment_store.import_rows, source, session.columns, iter_session_rows(session),
+                    session.meta.get("filename"), version
+                )
+        elif not source:
+            logger.info(f"Traitement du fichier: {file.filename}")
+            # Fichier identifié par son contenu : déjà importé, il n'est pas relu
+            source = f"file-{(await run_in_threadpool(hash_file, file.file))[:16]}"
+            if await run_in_threadpool(equipment_store.get_source, source) is None:
+                file_extension = os.path.splitext(file.filename)[1].lower()
+                await run_in_threadpool(import_upload, file.file, file_extension, source, file.filename)
+
+        if page is None and limit is None and cursor is None:
+            response = await run_in_threadpool(
+                equipment_list, search, sort, fields,
+                type=type, model=model, datacenter=datacenter, source=source
+            )
         else:
-            os.remove(file_path)
-            raise HTTPException(status_code=400, detail="Format de fichier non supporté")
-        
-        # Nettoyer le fichier temporaire
-        os.remove(file_path)
-        
-        # Formater les données pour correspondre à la structure attendue par le frontend
-        equipments = []
-        for idx, row in enumerate(data):
-            equipment = {
-                "id": f"eq-{idx+1}",
-                "equipmentType": row.get("type", "Inconnu"),
-                "manufacturer": "Non spécifié",  # Cette information n'est pas dans G4IT_COLUMN_SPECS
-                "model": row.get("modele", "Inconnu"),
-                "quantity": int(row.get("quantite", "1")) if row.get("quantite", "").isdigit() else 1,
-                "cpu": row.get("nbCoeur", None),
-                "ram": None,  # Pas dans G4IT_COLUMN_SPECS
-                "storage": None,  # Pas dans G4IT_COLUMN_SPECS
-                "purchaseYear": row.get("dateAchat", None)[:4] if row.get("dateAchat") else None,
-                "eol": row.get("dateRetrait", None)[:4] if row.get("dateRetrait") else None,
-                # Ajouter d'autres champs selon votre modèle de données
-            }
-            equipments.append(equipment)
-            
-        # Préparer la réponse paginée
-        total_items = len(equipments)
-        # On renvoie toutes les données, la pagination se fera côté frontend
-        
-        return {
-            "equipments": equipments,
-            "total_items": total_items,
-            "total_pages": 1,  # Pagination côté frontend
-            "page": 1,
-            "limit": total_items
-        }
-        
+            response = await run_in_threadpool(
+                equipment_page, page or 1, DEFAULT_PAGE_SIZE if limit is None else limit, cursor, search, sort,
+                fields, type=type, model=model, datacenter=datacenter, source=source
+            )
+        response["source"] = source
+        return response
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Erreur lors du traitement du fichier: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Erreur lors du traitement du fichier: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Erreur lors du traitement du fichier: {str(e)}")
@@ -1,5 +1,9 @@
 import csv as csv_module
+import itertools
 import logging
+from .dates import normalize_dates
+from .sniffer import sniff_headers
+from .table import ColumnarTable
 from .utils import validate_columns, G4IT_COLUMN_SPECS
 
 class CsvHandler:
@@ -16,28 +20,38 @@ class CsvHandler:
         """
         self.file = file
 
+    def iter_rows(self):
+        """Yields the rows of the CSV file one at a time.
+
+        The file stays open only while the iteration runs and is closed when
+        it ends or the generator is closed.
+
+        Yields:
+            dict: One row, keyed by the headers of the first line.
+        """
+        with open(self.file, mode='r', newline='', encoding='utf-8') as f:
+            yield from csv_module.DictReader(f)
+
     def load_data(self):
         """Reads data from CSV file.
 
         Returns:
-            list: List of dictionaries where each dictionary represents a row.
+            ColumnarTable: Rows stored by column; each row reads like a dictionary.
         """
         try:
-            with open(self.file, mode='r', newline='', encoding='utf-8') as f:
-                reader = csv_module.DictReader(f)
-                return list(reader)
+            return ColumnarTable.from_rows(self.iter_rows())
         except FileNotFoundError:
             print(f"Erreur: Le fichier '{self.file}' est introuvable.")
-            return []
+            return ColumnarTable()
         except PermissionError:
             print(f"Erreur: Pas d'autorisation pour accéder au fichier '{self.file}'.")
-            return []
+            return ColumnarTable()
         except UnicodeDecodeError:
             print(f"Erreur: Problème d'encodage lors de la lecture du fichier '{self.file}'.")
-            return []
+            return ColumnarTable()
         except Exception as e:
             print(f"Erreur inattendue lors du chargement du fichier '{self.file}': {str(e)}")
-            return []
+            return ColumnarTable()
         
     def write_data(self, data, header=None):
         """Writes data to CSV file.
@@ -91,10 +105,9 @@ class CsvHandler:
         Returns:
             bool: True if dates need switching (month > 12 found), False otherwise
         """
-        data = self.load_data()
         invalid_rows = []
         
-        for i, row in enumerate(data, 1):
+        for i, row in enumerate(self.iter_rows(), 1):
             if date_column not in row:
                 raise KeyError(f"La colonne '{date_column}' est absente du fichier CSV. Vérifiez l'orthographe ou les en-têtes du fichier.")
             
@@ -129,64 +142,61 @@ class CsvHandler:
 
         return False
 
-    def fix_dates(self, date_column):
+    def fix_dates(self, date_column=None, date_format=None):
         """
-        Fixes dates by switching month and day if month > 12.
-        Also standardizes separator to hyphen.
-        
+        Normalizes date columns to the YYYY-MM-DD format of G4IT_COLUMN_SPECS.
+
+        Same conversion as ``fix_dates_with_summary``, returning the rows
+        only. The rows are held in memory; ``fix_file`` writes a corrected
+        copy of a file in a single streaming pass instead.
+
         Args:
-            date_column (str): Name of the column containing dates
+            date_column (str or list, optional): Column(s) containing dates.
+                                                 Defaults to the date columns
+                                                 of G4IT_COLUMN_SPECS.
+            date_format (str, optional): 'DD/MM/YYYY' or 'MM/DD/YYYY' to force
+                                         the day/month order.
 
         Returns:
-            list: Corrected data with fixed dates
+            ColumnarTable: Rows with fixed dates, as returned by ``load_data``
         """
-        data = self.load_data()
-        unfixable_rows = []
-        fixed_count = 0
+        data, _ = self.fix_dates_with_summary(date_column, date_format)
+        return data
 
-        for i, row in enumerate(data, 1):
-            if date_column not in row:
-                raise KeyError(f"La colonne '{date_column}' est absente du fichier CSV. Impossible de corriger les dates.")
+    def fix_dates_with_summary(self, date_column=None, date_format=None):
+        """
+        Normalizes date columns and reports what was converted in each column.
 
-            date_value = row[date_column]
+        The day/month order of each column is inferred once from all its
+        values (see ``normalize_dates``), then the column is converted as a
+        whole instead of row by row.
 
-            # Skip empty values
-            if not date_value:
-                continue
+        Args:
+            date_column (str or list, optional): Column(s) containing dates.
+                                                 Defaults to the date columns
+                                                 of G4IT_COLUMN_SPECS.
+            date_format (str, optional): 'DD/MM/YYYY' or 'MM/DD/YYYY' to force
+                                         the day/month order.
 
-            try:
-                if '/' in date_value:
-                    month, day, year = map(int, date_value.split('/'))
-                    separator_fixed = True
-                else:
-                    month, day, year = map(int, date_value.split('-'))
-                    separator_fixed = False
-                    
-                if month > 12:
-                    # Swap month and day and standardize to hyphen
-                    row[date_column] = f"{day:02d}-{month:02d}-{year}"
-                    fixed_count += 1
-                    print(f"Corrigé: '{date_value}' → '{row[date_column]}' (ligne {i})")
-                elif separator_fixed:
-                    # Standardize to hyphen without swapping
-                    row[date_column] = f"{month:02d}-{day:02d}-{year}"
-                    print(f"Normalisé: '{date_value}' → '{row[date_column]}' (ligne {i})")
-            except ValueError:
-                unfixable_rows.append(f"Ligne {i}: impossible de parser '{date_value}'")
-                continue
-            except AttributeError:
-                unfixable_rows.append(f"Ligne {i}: type de donnée invalide pour la date '{type(date_value)}'")
-                continue
-        
-        if unfixable_rows:
-            print(f"\nAttention: {len(unfixable_rows)} lignes n'ont pas pu être corrigées:")
-            for msg in unfixable_rows[:5]:
-                print(f"  - {msg}")
-            if len(unfixable_rows) > 5:
-                print(f"  ... et {len(unfixable_rows)-5} autres problèmes.")
-        
-        print(f"\nRésumé: {fixed_count} dates inversées corrigées, {len(unfixable_rows)} lignes non traitables.")
-        return data
+        Returns:
+            tuple: (ColumnarTable with fixed dates, list of per-column summaries)
+        """
+        data = ColumnarTable.from_rows(self.iter_rows())
+        if not len(data):
+            return data, []
+
+        columns = [date_column] if isinstance(date_column, str) else date_column
+        for column in columns or []:
+            if column not in data.columns:
+                raise KeyError(f"La colonne '{column}' est absente du fichier CSV. Impossible de corriger les dates.")
+
+        summaries = normalize_dates(data, columns, date_format)
+        for summary in summaries:
+            logging.info(
+                f"Dates de '{summary['column']}' ({summary['detected_format']}): {summary['converted']} converties, "
+                f"{summary['already_valid']} déjà valides, {summary['invalid']} non traitables"
+            )
+        return data, summaries
 
     def validate_columns(self, column_specs=None):
         """
@@ -201,15 +211,17 @@ class CsvHandler:
             dict: Validation report with errors and overall validity
         """
         try:
-            data = self.load_data()
-            if not data:
+            # Lecture ligne à ligne : seule la première ligne est lue avant la validation
+            rows = self.iter_rows()
+            first_row = next(rows, None)
+            if first_row is None:
                 return {
                     "is_valid": False,
                     "general_error": f"Impossible de charger les données du fichier '{self.file}'"
                 }
                 
             specs = column_specs if column_specs else G4IT_COLUMN_SPECS
-            report = validate_columns(data, specs)
+            report = validate_columns(itertools.chain([first_row], rows), specs, run_length=True)
             
             # Print summary
             if report["is_valid"]:
@@ -221,11 +233,16 @@ class CsvHandler:
                     print(f"  - Colonnes obligatoires manquantes: {', '.join(report['missing_required_columns'])}")
                 
                 if report.get("type_errors"):
-                    print(f"  - {len(report['type_errors'])} erreurs de type de données:")
-                    for i, error in enumerate(report["type_errors"][:5]):
-                        print(f"    * Ligne {error['row']}, colonne '{error['column']}': {error['error']}")
-                    if len(report["type_errors"]) > 5:
-                        print(f"    * ... et {len(report['type_errors'])-5} autres erreurs.")
+                    # Entrées regroupées par plages de lignes : les totaux viennent du résumé
+                    total = report["error_summary"]["total_errors"]
+                    print(f"  - {total} erreurs de type de données:")
+                    shown = report["type_errors"][:5]
+                    for error in shown:
+                        rows = f"s {error['row']} à {error['row_end']}" if "row_end" in error else f" {error['row']}"
+                        print(f"    * Ligne{rows}, colonne '{error['column']}': {error['error']}")
+                    remaining = total - sum(error.get("count", 1) for error in shown)
+                    if remaining > 0:
+                        print(f"    * ... et {remaining} autres erreurs.")
             
             return report
             
@@ -237,16 +254,8 @@ class CsvHandler:
             
     def get_headers(self):
         try:
-            # Détecter le délimiteur
-            with open(self.file, 'r', encoding='utf-8', errors='replace') as f:
-                first_line = f.readline().strip()
-                delimiter = ';' if ';' in first_line else ','
-            
-            # Lire les en-têtes avec le bon délimiteur
-            with open(self.file, 'r', encoding='utf-8', errors='replace') as f:
-                reader = csv_module.reader(f, delimiter=delimiter)
-                headers = next(reader)  # Prendre la première ligne
-                return [h.strip() for h in headers]  # Nettoyer les espaces
+            # Encodage, délimiteur et en-tête détectés sur le début du fichier uniquement
+            return sniff_headers(self.file, '.csv')
         except Exception as e:
             logging.error(f"Erreur lors de la lecture des en-têtes CSV: {str(e)}")
-            raise ValueError(f"Format CSV invalide: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Format CSV invalide: {str(e)}")
@@ -1,3 +1,22 @@
 from .Csv import CsvHandler
 from .Xlsx import XlsxHandler
-from .utils import *
\ No newline at end of file
+from .utils import *
+from .errors import ErrorCollector
+from .validators import compile_validators, get_validators
+from .streaming import iter_file_chunks, iter_text_lines, open_csv_stream, iter_validated_records, validate_csv_stream
+from .vectorized import iter_validated_columns, validate_dataframe
+from .parallel import split_csv_ranges, iter_validated_ranges, validate_csv_parallel
+from .jobs import JobManager
+from .cache import ValidationCache
+from .sniffer import sniff_csv, sniff_csv_file, sniff_xlsx_headers, sniff_headers
+from .sessions import SessionStore, UploadSession
+from .table import ColumnarTable, TableRow
+from .dates import normalize_date_values, normalize_dates
+from .fixes import fix_file, parse_fixes
+from .batch import extract_archive, validate_batch, validate_path
+from .consolidation import GroupAggregator, consolidate_rows
+from .similarity import find_similar_groups, normalize_label
+from .equipments import EquipmentStore, equipment_values
+from .export import export_record, export_row, iter_export, write_parquet_export, write_xlsx_export
+from .export_history import ExportHistory, export_key
+from .workspace import Workspace
@@ -0,0 +1,196 @@
+import os
+import shutil
+import zipfile
+from concurrent.futures import as_completed
+import pandas as pd
+from .errors import ErrorCollector
+from .parallel import get_executor
+from .streaming import DEFAULT_CHUNK_SIZE, iter_file_chunks, validate_csv_stream
+from .utils import G4IT_COLUMN_SPECS
+from .vectorized import validate_dataframe
+
+SUPPORTED_EXTENSIONS = ('.csv', '.xlsx', '.xls')
+ARCHIVE_EXTENSIONS = ('.zip',)
+
+# Taille décompressée maximale des fichiers d'une archive (2 Go)
+DEFAULT_MAX_ARCHIVE_SIZE = 2 * 1024 * 1024 * 1024
+
+
+def validate_path(path, extension, required_columns, column_specs=G4IT_COLUMN_SPECS,
+                  max_errors=None, fail_fast=False):
+    """Validates one file on disk with the rules of ``/api/validate-file``.
+
+    CSV files are validated in a single streaming pass, Excel files with the
+    vectorized checks on the DataFrame read by ``pd.read_excel``.
+
+    Args:
+        path (str): Path to the file.
+        extension (str): '.csv', '.xlsx' or '.xls'.
+        required_columns (list): Columns that must be present in the header.
+        column_specs (dict, optional): Column specifications.
+                                      Defaults to G4IT_COLUMN_SPECS.
+        max_errors (int, optional): Maximum number of reported error entries.
+        fail_fast (bool, optional): Stop at the first critical error.
+
+    Returns:
+        dict: ``is_valid``, ``detected_columns``, ``missing_required_columns``,
+        ``type_errors`` and ``error_summary``.
+
+    Raises:
+        ValueError: If the file cannot be read.
+    """
+    if extension == '.csv':
+        with open(path, 'rb') as f:
+            result = validate_csv_stream(iter_file_chunks(f), required_columns, column_specs, max_errors, fail_fast)
+        detected_columns = result["detected_columns"]
+        missing_required_columns = result["missing_required_columns"]
+        type_errors = result["type_errors"]
+        error_summary = result["error_summary"]
+    else:
+        df = pd.read_excel(path)
+        detected_columns = df.columns.tolist()
+        missing_required_columns = [col for col in required_columns if col not in detected_columns]
+        collector = ErrorCollector(max_errors, fail_fast)
+        # Valider le contenu uniquement si toutes les colonnes requises sont présentes
+        if not missing_required_columns:
+            validate_dataframe(df, column_specs, collector=collector)
+        type_errors = collector.errors
+        error_summary = collector.summary()
+
+    return {
+        "is_valid": not missing_required_columns and not error_summary["total_errors"],
+        "detected_columns": detected_columns,
+        "missing_required_columns": missing_required_columns,
+        "type_errors": type_errors,
+        "error_summary": error_summary
+    }
+
+
+def _validate_entry(path, extension, required_columns, column_specs, max_errors, fail_fast):
+    """Worker: validates one file and turns a read failure into a report."""
+    try:
+        return validate_path(path, extension, required_columns, column_specs, max_errors, fail_fast)
+    except Exception as e:
+        return {"is_valid": False, "error": f"Format de fichier invalide: {str(e)}"}
+
+
+def extract_archive(archive_path, target_dir, max_size=DEFAULT_MAX_ARCHIVE_SIZE):
+    """Extracts the files of a ZIP archive for validation.
+
+    Members are written under generated names in ``target_dir`` (the paths
+    stored in the archive are never used on disk). Directories, hidden files
+    and macOS metadata are ignored.
+
+    Args:
+        archive_path (str): Path to the ZIP archive.
+        target_dir (str): Existing directory receiving the files.
+        max_size (int, optional): Maximum total uncompressed size in bytes.
+
+    Returns:
+        list: One dict per member: ``filename`` (path in the archive),
+        ``extension`` and ``path`` (None for unsupported formats).
+
+    Raises:
+        ValueError: If the file is not a ZIP archive or is too large once
+                    uncompressed.
+    """
+    try:
+        archive = zipfile.ZipFile(archive_path)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Archive ZIP invalide: {str(e)}")
+
+    with archive:
+        members = [member for member in archive.infolist()
+                   if not member.is_dir() and not member.filename.startswith('__MACOSX/')
+                   and not os.path.basename(member.filename).startswith('.')]
+        if sum(member.file_size for member in members) > max_size:
+            raise ValueError(f"Archive trop volumineuse une fois décompressée (maximum {max_size} octets)")
+
+        entries = []
+        for index, member in enumerate(members):
+            extension = os.path.splitext(member.filename)[1].lower()
+            path = None
+            if extension in SUPPORTED_EXTENSIONS:
+                path = os.path.join(target_dir, f"member_{index}{extension}")
+                with archive.open(member) as source, open(path, 'wb') as target:
+                    shutil.copyfileobj(source, target, DEFAULT_CHUNK_SIZE)
+            entries.append({"filename": member.filename, "extension": extension, "path": path})
+        return entries
+
+
+def validate_batch(entries, required_columns, column_specs=G4IT_COLUMN_SPECS,
+                   workers=None, max_errors=None, fail_fast=False):
+    """Validates several files concurrently.
+
+    Each file is validated in the shared process pool (see ``get_executor``),
+    so at most ``workers`` files are read at the same time and a slow file
+    only holds its own worker. A file that cannot be read gets an ``error``
+    in its report instead of failing the batch.
+
+    Args:
+        entries (list): Dicts with ``filename``, ``extension`` and ``path``
+                        (None for an unsupported format), an optional
+                        ``error`` for a file that could not be received,
+                        plus any key to copy into the report (e.g. ``archive``).
+        required_columns (list): Columns that must be present in each file.
+        column_specs (dict, optional): Column specifications.
+                                      Defaults to G4IT_COLUMN_SPECS.
+        workers (int, optional): Number of processes. Defaults to the CPU count.
+        max_errors (int, optional): Maximum number of reported error entries per file.
+        fail_fast (bool, optional): Stop each file at its first critical error.
+
+    Returns:
+        dict: ``is_valid`` (all files valid), ``files`` (one report per
+        entry, in the order of ``entries``) and ``summary`` (file counts and
+        error counts summed over the files).
+    """
+    workers = workers or os.cpu_count() or 1
+    args = (required_columns, column_specs, max_errors, fail_fast)
+    reports = [None] * len(entries)
+
+    pending = []
+    for index, entry in enumerate(entries):
+        if entry.get("error"):
+            reports[index] = {"is_valid": False, "error": entry["error"]}
+        elif entry["path"] is None:
+            reports[index] = {"is_valid": False, "error": "Format de fichier non supporté. Utilisez CSV ou XLSX."}
+        else:
+            pending.append(index)
+
+    if workers == 1 or len(pending) <= 1:
+        for index in pending:
+            reports[index] = _validate_entry(entries[index]["path"], entries[index]["extension"], *args)
+    else:
+        executor = get_executor(workers)
+        futures = {executor.submit(_validate_entry, entries[index]["path"], entries[index]["extension"], *args): index
+                   for index in pending}
+        # Résultats pris dans l'ordre où les fichiers se terminent
+        for future in as_completed(futures):
+            reports[futures[future]] = future.result()
+
+    files = []
+    for entry, report in zip(entries, reports):
+        details = {key: value for key, value in entry.items() if key not in ("path", "extension")}
+        files.append(dict(details, **report))
+
+    by_column = {}
+    for report in reports:
+        for column, kinds in report.get("error_summary", {}).get("by_column", {}).items():
+            merged = by_column.setdefault(column, {})
+            for kind, count in kinds.items():
+                merged[kind] = merged.get(kind, 0) + count
+
+    failed = sum(1 for report in reports if "error" in report)
+    valid = sum(1 for report in reports if report["is_valid"])
+    return {
+        "is_valid": bool(reports) and valid == len(reports),
+        "files": files,
+        "summary": {
+            "files": len(reports),
+            "valid_files": valid,
+            "invalid_files": len(reports) - valid - failed,
+            "failed_files": failed,
+            "total_errors": sum(report.get("error_summary", {}).get("total_errors", 0) for report in reports),
+            "by_column": by_column
+        }
+    }
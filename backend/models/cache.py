@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from .streaming import DEFAULT_CHUNK_SIZE, iter_file_chunks
+from .utils import G4IT_COLUMN_SPECS, private_directory
+
+# Version du format des résultats : à incrémenter quand les règles de validation changent
+CACHE_FORMAT_VERSION = 1
+
+# Taille maximale par défaut du cache sur disque (256 Mo)
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def hash_file(fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Returns the SHA-256 hex digest of a binary file object, then rewinds it.
+
+    Args:
+        fileobj: Seekable binary file object, read from its start.
+        chunk_size (int, optional): Size of each read in bytes.
+
+    Returns:
+        str: Hex digest of the content.
+    """
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for chunk in iter_file_chunks(fileobj, chunk_size):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def hash_column_specs(column_specs=G4IT_COLUMN_SPECS):
+    """Returns a SHA-256 hex digest identifying a set of column specifications."""
+    payload = json.dumps([CACHE_FORMAT_VERSION, column_specs], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ValidationCache:
+    """On-disk cache of validation results with LRU eviction.
+
+    Each result is a JSON file named after its key. An in-memory index, in
+    least recently used order, tracks the size of every entry so lookups and
+    evictions never list the directory. Entries found on disk at startup are
+    indexed by modification time, and hits refresh that time.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_CACHE_MAX_BYTES, column_specs=G4IT_COLUMN_SPECS):
+        """Opens (or creates) the cache directory.
+
+        Args:
+            directory (str): Directory holding the cached results.
+            max_bytes (int, optional): Maximum total size of the entries;
+                                       0 disables the cache.
+            column_specs (dict, optional): Specifications the results depend on.
+
+        Raises:
+            PermissionError: If the directory exists and cannot be trusted
+                             (see ``private_directory``).
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.specs_hash = hash_column_specs(column_specs)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        if self.max_bytes:
+            # Les résultats lus ici sont renvoyés tels quels : personne d'autre ne doit pouvoir y écrire
+            private_directory(directory)
+            entries = []
+            for name in os.listdir(directory):
+                if name.endswith('.json'):
+                    stat = os.stat(os.path.join(directory, name))
+                    entries.append((stat.st_mtime, name[:-5], stat.st_size))
+            for _, key, size in sorted(entries):
+                self._index[key] = size
+                self._size += size
+            self._evict()
+
+    @property
+    def enabled(self):
+        return bool(self.max_bytes)
+
+    def key(self, content_hash, *options):
+        """Builds the key of a result from the content hash and the validation options.
+
+        Args:
+            content_hash (str): SHA-256 of the uploaded bytes.
+            *options: Other inputs of the validation (file type, error cap...).
+
+        Returns:
+            str: Hex digest combining the content, the column specs and the options.
+        """
+        payload = json.dumps([content_hash, self.specs_hash, *options])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Returns the cached result for ``key``, or None (counted as a miss)."""
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                result = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            # Entrée supprimée ou corrompue : l'oublier
+            with self._lock:
+                self._size -= self._index.pop(key, 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key, result):
+        """Stores a result, evicting the least recently used entries over the size cap."""
+        if not self.enabled:
+            return
+        data = json.dumps(result, ensure_ascii=False, default=str).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._size += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._evict()
+
+    def clear(self):
+        """Removes every entry (counters are kept)."""
+        with self._lock:
+            keys = list(self._index)
+            self._index.clear()
+            self._size = 0
+        for key in keys:
+            self._remove(key)
+
+    def stats(self):
+        """Returns the hit/miss/eviction counters and the size of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "entries": len(self._index),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes
+            }
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _remove(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        # Appelé avec le verrou pris
+        while self._size > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            self._remove(key)
@@ -0,0 +1,239 @@
+import heapq
+import itertools
+import math
+import os
+import pickle
+import shutil
+import tempfile
+from datetime import date
+
+QUANTITY_COLUMN = 'quantite'
+
+DEFAULT_KEY_COLUMNS = ['modele', 'type', 'nomCourtDatacenter', 'statut', 'paysDUtilisation']
+
+# Nombre de groupes gardés en mémoire avant d'écrire une série triée sur disque
+DEFAULT_MAX_GROUPS = 200_000
+
+# Nombre de groupes par lot écrit dans une série
+RUN_BATCH_SIZE = 10_000
+
+# Nombre maximal de séries fusionnées à la fois (fichiers ouverts simultanément)
+MAX_MERGE_FAN_IN = 64
+
+
+def _key_value(value):
+    # Clé de regroupement textuelle : espaces superflus retirés, cellule vide -> ''
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).strip()
+
+
+def _quantity(value):
+    """Returns the quantity of a row, or None if the cell is empty or not a number."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return None if isinstance(value, float) and not math.isfinite(value) else value
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _write_run(path, groups):
+    # Série triée écrite par lots de groupes picklés (fichier temporaire relu par ce processus seulement)
+    groups = iter(groups)
+    with open(path, 'wb') as f:
+        while True:
+            batch = list(itertools.islice(groups, RUN_BATCH_SIZE))
+            if not batch:
+                break
+            pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _read_run(path):
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
+
+
+def _combine(sorted_groups):
+    """Sums the consecutive groups with the same key of a key-sorted stream."""
+    for key, parts in itertools.groupby(sorted_groups, key=lambda group: group[0]):
+        quantity = rows = 0
+        for _, (part_quantity, part_rows) in parts:
+            quantity += part_quantity
+            rows += part_rows
+        yield key, (quantity, rows)
+
+
+def _first(group):
+    return group[0]
+
+
+class GroupAggregator:
+    """Sums quantities by key with a bounded number of groups in memory.
+
+    Groups are aggregated in a dictionary (hash aggregation). When it holds
+    more than ``max_groups`` keys, its content is sorted and written to disk
+    as a run, and the dictionary starts over; the runs are then merged in
+    key order, summing the partial groups of each key (sort-based
+    aggregation). Memory is bounded by ``max_groups`` whatever the number
+    of rows or groups.
+    """
+
+    def __init__(self, max_groups=DEFAULT_MAX_GROUPS, spill_dir=None):
+        """Initializes an empty aggregator.
+
+        Args:
+            max_groups (int, optional): Number of groups kept in memory.
+            spill_dir (str, optional): Directory of the temporary runs.
+                                       Defaults to the system temporary directory.
+        """
+        self.max_groups = max_groups
+        self.spill_dir = spill_dir
+        self.rows = 0
+        self._groups = {}
+        self._runs = []
+        self._run_dir = None
+        self._run_count = 0
+        self.spilled_runs = 0
+
+    def add(self, key, quantity):
+        """Adds one row to the group ``key``.
+
+        Args:
+            key (tuple): Values of the key columns.
+            quantity (int or float): Quantity of the row.
+        """
+        self.rows += 1
+        group = self._groups.get(key)
+        if group is None:
+            if len(self._groups) >= self.max_groups:
+                self._spill()
+            self._groups[key] = [quantity, 1]
+        else:
+            group[0] += quantity
+            group[1] += 1
+
+    def _new_run(self):
+        if self._run_dir is None:
+            self._run_dir = tempfile.mkdtemp(prefix="consolidation_", dir=self.spill_dir)
+        self._run_count += 1
+        return os.path.join(self._run_dir, f"run_{self._run_count}.pkl")
+
+    def _spill(self):
+        path = self._new_run()
+        _write_run(path, sorted(self._groups.items(), key=_first))
+        self._runs.append(path)
+        self._groups = {}
+        self.spilled_runs += 1
+
+    def groups(self):
+        """Yields the groups in key order.
+
+        Yields:
+            tuple: (key, quantity, rows)
+        """
+        in_memory = sorted(((key, tuple(group)) for key, group in self._groups.items()), key=_first)
+        if not self._runs:
+            for key, (quantity, rows) in in_memory:
+                yield key, quantity, rows
+            return
+
+        # Fusion par passes : au plus MAX_MERGE_FAN_IN séries ouvertes à la fois
+        runs = self._runs
+        while len(runs) >= MAX_MERGE_FAN_IN:
+            merged = self._new_run()
+            _write_run(merged, _combine(heapq.merge(*map(_read_run, runs[:MAX_MERGE_FAN_IN]), key=_first)))
+            for path in runs[:MAX_MERGE_FAN_IN]:
+                os.remove(path)
+            runs = runs[MAX_MERGE_FAN_IN:] + [merged]
+        self._runs = runs
+
+        streams = [_read_run(path) for path in runs] + [iter(in_memory)]
+        for key, (quantity, rows) in _combine(heapq.merge(*streams, key=_first)):
+            yield key, quantity, rows
+
+    def close(self):
+        """Removes the runs written to disk."""
+        if self._run_dir is not None:
+            shutil.rmtree(self._run_dir, ignore_errors=True)
+            self._run_dir = None
+        self._runs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def consolidate_rows(header, rows, key_columns=None, quantity_column=QUANTITY_COLUMN,
+                     max_groups=DEFAULT_MAX_GROUPS, spill_dir=None):
+    """Groups inventory rows by key columns and sums their quantities.
+
+    Key values are compared as text, with surrounding spaces removed and
+    empty cells grouped together. A row whose quantity is empty or not a
+    number counts for one equipment, as in ``/api/process-file-data``.
+
+    Args:
+        header (list): Column names.
+        rows (iterable): Rows as sequences of values, in header order.
+        key_columns (list, optional): Grouping columns. Defaults to
+                                      DEFAULT_KEY_COLUMNS.
+        quantity_column (str, optional): Column of the summed quantity.
+        max_groups (int, optional): Number of groups kept in memory before
+                                    spilling to disk.
+        spill_dir (str, optional): Directory of the temporary runs.
+
+    Returns:
+        tuple: (GroupAggregator to iterate with ``groups()`` then close,
+        number of rows whose quantity defaulted to 1)
+
+    Raises:
+        KeyError: If a key column or the quantity column is missing.
+    """
+    key_columns = key_columns or DEFAULT_KEY_COLUMNS
+    names = ['' if name is None else str(name).strip() for name in header]
+    # Position de chaque colonne (la dernière en cas de doublon, comme DictReader)
+    positions = {name: index for index, name in enumerate(names)}
+    missing = [column for column in key_columns + [quantity_column] if column not in positions]
+    if missing:
+        raise KeyError(f"Colonnes absentes du fichier: {', '.join(missing)}")
+
+    key_positions = [positions[column] for column in key_columns]
+    quantity_position = positions[quantity_column]
+    width = max(key_positions + [quantity_position]) + 1
+
+    aggregator = GroupAggregator(max_groups, spill_dir)
+    defaulted = 0
+    add = aggregator.add
+    try:
+        for row in rows:
+            if len(row) < width:
+                row = list(row) + [None] * (width - len(row))
+            quantity = _quantity(row[quantity_position])
+            if quantity is None:
+                quantity = 1
+                defaulted += 1
+            add(tuple([value.strip() if type(value) is str else _key_value(value)
+                       for value in map(row.__getitem__, key_positions)]), quantity)
+    except BaseException:
+        aggregator.close()
+        raise
+    return aggregator, defaulted
@@ -0,0 +1,172 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+from .utils import G4IT_COLUMN_SPECS
+
+ISO_FORMAT = 'YYYY-MM-DD'
+DAY_FIRST = 'DD/MM/YYYY'
+MONTH_FIRST = 'MM/DD/YYYY'
+
+# Ordre retenu quand aucune valeur ne permet de trancher (jour > 12 ou mois > 12) : usage français
+DEFAULT_DATE_FORMAT = DAY_FIRST
+
+# Nombre de valeurs non converties données en exemple dans le résumé
+MAX_INVALID_SAMPLES = 5
+
+# Année en tête (2023-01-31, 2023/1/31), heure éventuelle ignorée
+_YEAR_FIRST = r'^\s*(?P<y>\d{4})[-/.](?P<m>\d{1,2})[-/.](?P<d>\d{1,2})(?:[ T][\d:.]*)?\s*$'
+
+# Jour et mois en tête, dans un ordre à déterminer (31/01/2023, 01-31-23)
+_YEAR_LAST = r'^\s*(?P<a>\d{1,2})[-/.](?P<b>\d{1,2})[-/.](?P<y>\d{4}|\d{2})(?:[ T][\d:.]*)?\s*$'
+
+
+def _numbers(series):
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+
+
+def _full_year(years):
+    # Années sur deux chiffres : 69-99 -> 19xx, 00-68 -> 20xx (comme strptime %y)
+    return np.where(years < 100, np.where(years >= 69, years + 1900, years + 2000), years)
+
+
+def normalize_date_values(values, counts=None, date_format=None, column=None):
+    """Converts date values to ``YYYY-MM-DD`` after inferring their format.
+
+    The values are meant to be the distinct values of a column (see
+    ``ColumnarTable.map_distinct``), with ``counts`` giving how many rows
+    hold each of them. Day/month order is inferred from the whole column:
+    values whose first number is above 12 vote for ``DD/MM/YYYY``, values
+    whose second number is above 12 for ``MM/DD/YYYY``; without any vote
+    the order is ``DEFAULT_DATE_FORMAT``. Parsing and conversion are
+    vectorized with pandas.
+
+    Empty cells and native dates (Excel) are kept as they are; values that
+    cannot be read as a date in the inferred format are left unchanged and
+    reported as invalid.
+
+    Args:
+        values (list): Distinct values of the column.
+        counts (array, optional): Number of rows of each value. Defaults to 1.
+        date_format (str, optional): ``DD/MM/YYYY`` or ``MM/DD/YYYY`` to skip
+                                     the inference of the day/month order.
+        column (str, optional): Column name reported in the summary.
+
+    Returns:
+        tuple: (converted values, in the same order, summary dict)
+
+    Raises:
+        ValueError: If ``date_format`` is not ``DD/MM/YYYY`` or ``MM/DD/YYYY``.
+    """
+    if date_format not in (None, DAY_FIRST, MONTH_FIRST):
+        raise ValueError(f"Format de date inconnu: {date_format} (formats acceptés: {DAY_FIRST}, {MONTH_FIRST})")
+
+    counts = np.ones(len(values), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+    empty = np.array([value is None or (isinstance(value, str) and not value.strip()) for value in values], dtype=bool)
+    native = np.array([isinstance(value, date) for value in values], dtype=bool)
+    text = np.array([isinstance(value, str) for value in values], dtype=bool) & ~empty
+
+    positions = np.flatnonzero(text)
+    series = pd.Series([values[i] for i in positions], dtype=object)
+    year_first = series.str.extract(_YEAR_FIRST)
+    year_last = series.str.extract(_YEAR_LAST)
+    is_year_first = year_first['y'].notna().to_numpy()
+    is_year_last = year_last['a'].notna().to_numpy() & ~is_year_first
+    first, second = _numbers(year_last['a']), _numbers(year_last['b'])
+
+    # Chaque ligne compte : la distribution des valeurs décide de l'ordre jour/mois
+    weights = counts[positions]
+    day_first_votes = int(weights[is_year_last & (first > 12) & (second <= 12)].sum())
+    month_first_votes = int(weights[is_year_last & (second > 12) & (first <= 12)].sum())
+    ambiguous = False
+    order = date_format
+    if order is None:
+        if day_first_votes > month_first_votes:
+            order = DAY_FIRST
+        elif month_first_votes > day_first_votes:
+            order = MONTH_FIRST
+        else:
+            order = DEFAULT_DATE_FORMAT
+            ambiguous = bool(is_year_last.any())
+
+    day_first = order == DAY_FIRST
+    years = np.where(is_year_first, _numbers(year_first['y']), _full_year(_numbers(year_last['y'])))
+    months = np.where(is_year_first, _numbers(year_first['m']), first if not day_first else second)
+    days = np.where(is_year_first, _numbers(year_first['d']), second if not day_first else first)
+    parsed = pd.to_datetime(pd.DataFrame({'year': years, 'month': months, 'day': days}), errors='coerce')
+    iso = parsed.dt.strftime('%Y-%m-%d').to_numpy(dtype=object)
+    valid = parsed.notna().to_numpy()
+
+    converted_values = list(values)
+    unchanged = np.zeros(len(values), dtype=bool)
+    converted = np.zeros(len(values), dtype=bool)
+    for offset, position in enumerate(positions):
+        if not valid[offset]:
+            continue
+        if iso[offset] == values[position]:
+            unchanged[position] = True
+        else:
+            converted[position] = True
+            converted_values[position] = iso[offset]
+    invalid = ~(empty | native | unchanged | converted)
+
+    year_last_rows = int(weights[is_year_last].sum())
+    year_first_rows = int(weights[is_year_first].sum())
+    if year_last_rows > year_first_rows:
+        detected_format = order
+    elif year_first_rows:
+        detected_format = ISO_FORMAT
+    else:
+        detected_format = None
+
+    summary = {
+        "column": column,
+        "detected_format": detected_format,
+        "ambiguous": ambiguous,
+        "votes": {"day_first": day_first_votes, "month_first": month_first_votes},
+        "rows": int(counts.sum()),
+        "empty": int(counts[empty].sum()),
+        "already_valid": int(counts[unchanged | native].sum()),
+        "converted": int(counts[converted].sum()),
+        "invalid": int(counts[invalid].sum()),
+        "invalid_values": [values[i] for i in np.flatnonzero(invalid)[:MAX_INVALID_SAMPLES]]
+    }
+    return converted_values, summary
+
+
+def normalize_dates(table, columns=None, date_format=None):
+    """Converts date columns of a table to ``YYYY-MM-DD``, in place.
+
+    Each column is converted through its distinct values only, so the cost
+    depends on the number of different dates rather than on the number of
+    rows.
+
+    Args:
+        table (ColumnarTable): Rows to fix.
+        columns (list, optional): Columns to convert. Defaults to the columns
+                                  of type ``date`` in G4IT_COLUMN_SPECS
+                                  present in the table.
+        date_format (str, optional): Day/month order forced for all columns.
+
+    Returns:
+        list: One summary per column (see ``normalize_date_values``).
+
+    Raises:
+        KeyError: If a column is missing from the table.
+        ValueError: If ``date_format`` is not ``DD/MM/YYYY`` or ``MM/DD/YYYY``.
+    """
+    if columns is None:
+        columns = [column for column in table.columns
+                   if G4IT_COLUMN_SPECS.get(column, {}).get('type') == 'date']
+
+    summaries = []
+    for column in columns:
+        if column not in table.columns:
+            raise KeyError(f"La colonne '{column}' est absente du fichier. Impossible de corriger les dates.")
+
+        def convert(values, counts, column=column):
+            converted, summary = normalize_date_values(values, counts, date_format, column)
+            summaries.append(summary)
+            return converted
+
+        table.map_distinct(column, convert)
+    return summaries
@@ -0,0 +1,369 @@
+import base64
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+
+# Nombre de lignes insérées par transaction lors d'un import
+IMPORT_BATCH_SIZE = 10_000
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 1000
+
+UNKNOWN = "Inconnu"
+NOT_SPECIFIED = "Non spécifié"
+
+# Colonnes stockées : (colonne SQL, champ renvoyé au frontend)
+FIELDS = [
+    ('equipment_type', 'equipmentType'),
+    ('manufacturer', 'manufacturer'),
+    ('model', 'model'),
+    ('quantity', 'quantity'),
+    ('cpu', 'cpu'),
+    ('ram', 'ram'),
+    ('storage', 'storage'),
+    ('purchase_year', 'purchaseYear'),
+    ('eol', 'eol'),
+    ('datacenter', 'datacenter'),
+    ('name', 'name'),
+    ('source', 'source'),
+]
+
+# Colonnes indexées pour le texte libre de ``search``
+SEARCH_COLUMNS = ['equipment_type', 'manufacturer', 'model', 'name', 'datacenter']
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    filename TEXT,
+    version TEXT,
+    rows INTEGER NOT NULL,
+    imported_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS equipments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    {', '.join(column + (' INTEGER' if column == 'quantity' else ' TEXT') for column, _ in FIELDS)}
+);
+CREATE INDEX IF NOT EXISTS equipments_type ON equipments (equipment_type);
+CREATE INDEX IF NOT EXISTS equipments_model ON equipments (model);
+CREATE INDEX IF NOT EXISTS equipments_datacenter ON equipments (datacenter);
+CREATE INDEX IF NOT EXISTS equipments_source ON equipments (source);
+CREATE VIRTUAL TABLE IF NOT EXISTS equipments_fts USING fts5 (
+    {', '.join(SEARCH_COLUMNS)},
+    content='equipments', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS equipments_delete AFTER DELETE ON equipments BEGIN
+    INSERT INTO equipments_fts (equipments_fts, rowid, {', '.join(SEARCH_COLUMNS)})
+    VALUES ('delete', old.id, {', '.join('old.' + column for column in SEARCH_COLUMNS)});
+END;
+"""
+
+# Filtres d'égalité acceptés par ``page`` -> colonne SQL (chacune indexée)
+FILTERS = {
+    'type': 'equipment_type',
+    'model': 'model',
+    'datacenter': 'datacenter',
+    'source': 'source',
+}
+
+_TOKEN = re.compile(r'\w+')
+
+
+def _text(value):
+    # Valeur d'une cellule en texte : None pour une cellule vide, dates au format ISO
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if hasattr(value, 'item') and not isinstance(value, (date, datetime)):
+        value = value.item()
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    return text or None
+
+
+def _quantity(value):
+    text = _text(value)
+    return int(text) if text and text.isdigit() else 1
+
+
+def equipment_values(row):
+    """Maps an inventory row to the stored equipment fields.
+
+    Same mapping as the equipment page: ``type``, ``modele``, ``quantite``
+    (1 when empty or not a whole number), ``nbCoeur``, the years of
+    ``dateAchat`` and ``dateRetrait``, plus ``nomCourtDatacenter`` and
+    ``nomEquipementPhysique``. The manufacturer, RAM and storage are not in
+    the G4IT columns.
+
+    Args:
+        row (dict): Column name -> cell value (text or Excel value).
+
+    Returns:
+        tuple: Values in the order of ``FIELDS`` (without the source).
+    """
+    purchase = _text(row.get('dateAchat'))
+    retirement = _text(row.get('dateRetrait'))
+    return (
+        _text(row.get('type')) or UNKNOWN,
+        NOT_SPECIFIED,
+        _text(row.get('modele')) or UNKNOWN,
+        _quantity(row.get('quantite')),
+        _text(row.get('nbCoeur')),
+        None,
+        None,
+        purchase[:4] if purchase else None,
+        retirement[:4] if retirement else None,
+        _text(row.get('nomCourtDatacenter')),
+        _text(row.get('nomEquipementPhysique')),
+    )
+
+
+def _match_query(search):
+    # Tous les mots doivent apparaître ; le dernier peut être incomplet (saisie en cours)
+    tokens = _TOKEN.findall(search)
+    if not tokens:
+        return None
+    return ' '.join([f'"{token}"' for token in tokens[:-1]] + [f'"{tokens[-1]}"*'])
+
+
+def _encode_cursor(sort, key):
+    payload = json.dumps([sort, key], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor, sort):
+    # Curseur opaque : tri de la requête et clé de tri de la dernière ligne de la page précédente
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, key = json.loads(payload)
+    except (ValueError, TypeError):
+        raise ValueError("Curseur invalide")
+    if cursor_sort != sort or not isinstance(key, list):
+        raise ValueError("Curseur invalide pour ce tri")
+    return key
+
+
+class EquipmentStore:
+    """Equipment of the processed uploads, persisted in an SQLite database.
+
+    Each upload is stored under a ``source`` key and replaced as a whole
+    when imported again. The type, model, datacenter and source columns are
+    indexed and an FTS5 table indexes the text searched by ``search``, so a
+    page is read with an index range scan whatever the number of rows.
+    Pages are addressed by a cursor (the sort key of the last equipment
+    returned): the next page starts right after it instead of skipping the
+    previous rows. Ids are never reused, so a cursor stays valid across
+    imports.
+
+    Each thread uses its own connection; the database is in WAL mode, so
+    pages can be read while an upload is being imported.
+    """
+
+    def __init__(self, path):
+        """Opens (or creates) the database.
+
+        Args:
+            path (str): Path to the SQLite file.
+        """
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def import_rows(self, source, header, rows, filename=None, version=None):
+        """Stores the equipment of an upload, replacing any previous import of ``source``.
+
+        Rows are read once and inserted by batches of IMPORT_BATCH_SIZE in a
+        single transaction, so readers see either the previous content of
+        the source or the new one.
+
+        Args:
+            source (str): Key of the upload (e.g. a content hash or a session id).
+            header (list): Column names.
+            rows (iterable): Rows as sequences of values, in header order.
+            filename (str, optional): Name of the uploaded file.
+            version (str, optional): Version of the content of ``source``
+                                     (e.g. the edits of a session), kept
+                                     with the import.
+
+        Returns:
+            int: Number of equipment stored.
+        """
+        names = ['' if name is None else str(name).strip() for name in header]
+        placeholders = ', '.join('?' * len(FIELDS))
+        insert = f"INSERT INTO equipments ({', '.join(column for column, _ in FIELDS)}) VALUES ({placeholders})"
+
+        count = 0
+        batch = []
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                connection.execute("DELETE FROM equipments WHERE source = ?", (source,))
+                for row in rows:
+                    batch.append(equipment_values(dict(zip(names, row))) + (source,))
+                    if len(batch) >= IMPORT_BATCH_SIZE:
+                        connection.executemany(insert, batch)
+                        count += len(batch)
+                        batch = []
+                if batch:
+                    connection.executemany(insert, batch)
+                    count += len(batch)
+                # Index plein texte alimenté en une instruction après les lignes : plusieurs fois
+                # plus rapide qu'une insertion dans l'index par ligne
+                connection.execute(f"INSERT INTO equipments_fts (rowid, {', '.join(SEARCH_COLUMNS)}) "
+                                   f"SELECT id, {', '.join(SEARCH_COLUMNS)} FROM equipments WHERE source = ?",
+                                   (source,))
+                connection.execute("INSERT OR REPLACE INTO sources (source, filename, version, rows, imported_at) "
+                                   "VALUES (?, ?, ?, ?, ?)", (source, filename, version, count, time.time()))
+        return count
+
+    def get_source(self, source):
+        """Returns the import of ``source`` (filename, version, rows, date), or None."""
+        row = self._connection().execute("SELECT * FROM sources WHERE source = ?", (source,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def delete_source(self, source):
+        """Removes the equipment of an upload.
+
+        Returns:
+            bool: True if the source existed.
+        """
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                connection.execute("DELETE FROM equipments WHERE source = ?", (source,))
+                return connection.execute("DELETE FROM sources WHERE source = ?", (source,)).rowcount > 0
+
+    def sources(self):
+        """Returns the imported uploads, most recent first."""
+        cursor = self._connection().execute("SELECT * FROM sources ORDER BY imported_at DESC")
+        return [dict(row) for row in cursor]
+
+    def page(self, limit=DEFAULT_PAGE_SIZE, cursor=None, offset=0, search=None, count=True,
+             sort=None, fields=None, **filters):
+        """Returns one page of equipment.
+
+        Pages are in id order (the order of the rows in their file) unless
+        ``sort`` names a field. The cursor of a page holds the sort key of
+        its last equipment, so the next page starts right after it, even
+        when equipment is imported or removed in the meantime.
+
+        Args:
+            limit (int, optional): Page size, at most MAX_PAGE_SIZE.
+            cursor (str, optional): ``next_cursor`` of the previous page.
+            offset (int, optional): Rows skipped when no cursor is given
+                                    (page-number navigation, slower on deep pages).
+            search (str, optional): Words of the type, manufacturer, model,
+                                    name or datacenter, accents and case
+                                    ignored; the last one may be the start
+                                    of a word.
+            count (bool, optional): Also count all the matching equipment.
+            sort (str, optional): Field of ``FIELDS`` to sort by, prefixed
+                                  with '-' for descending order.
+            fields (list, optional): Fields of ``FIELDS`` to return.
+                                     Defaults to all of them.
+            **filters: Exact values of ``type``, ``model``, ``datacenter``
+                       or ``source``.
+
+        Returns:
+            dict: ``equipments`` (dicts with an ``id`` and the requested
+            fields), ``next_cursor`` (None on the last page) and
+            ``total_items`` (None unless ``count``).
+
+        Raises:
+            ValueError: If a filter, the sort field, a field or the cursor is
+                        invalid.
+        """
+        unknown = [name for name in filters if name not in FILTERS]
+        if unknown:
+            raise ValueError(f"Filtre inconnu: {', '.join(unknown)} (filtres acceptés: {', '.join(FILTERS)})")
+        columns = dict((field, column) for column, field in FIELDS)
+        fields = list(fields) if fields else list(columns)
+        unknown = [field for field in fields if field not in columns]
+        if unknown:
+            raise ValueError(f"Champ inconnu: {', '.join(unknown)} (champs acceptés: {', '.join(columns)})")
+        sort = sort or 'id'
+        descending = sort.startswith('-')
+        sort_field = sort.lstrip('-')
+        if sort_field != 'id' and sort_field not in columns:
+            raise ValueError(f"Tri inconnu: {sort} (champs acceptés: id, {', '.join(columns)})")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        tables = "equipments"
+        # Avec une recherche, l'index FTS5 renvoie déjà ses lignes dans l'ordre des rowid
+        id_order = "equipments.id"
+        clauses, params = [], []
+        query = _match_query(search) if search else None
+        if query:
+            # CROSS JOIN : l'index FTS5 reste la table parcourue en premier, la requête plein
+            # texte n'est évaluée qu'une fois (et non pour chaque ligne retenue par un filtre)
+            tables = "equipments_fts CROSS JOIN equipments ON equipments.id = equipments_fts.rowid"
+            id_order = "equipments_fts.rowid"
+            clauses.append("equipments_fts MATCH ?")
+            params.append(query)
+        for name, value in filters.items():
+            if value is not None and value != '':
+                clauses.append(f"equipments.{FILTERS[name]} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        connection = self._connection()
+        total = None
+        if count:
+            # Recherche sans autre filtre : comptée sur l'index FTS5 seul, sans jointure
+            count_tables = "equipments_fts" if query and len(clauses) == 1 else tables
+            total = connection.execute(f"SELECT COUNT(*) FROM {count_tables}{where}", params).fetchone()[0]
+
+        # Clé de tri : (colonne, id), cellules vides triées comme '' pour que la clé soit comparable
+        if sort_field == 'id':
+            keys = [id_order]
+        elif columns[sort_field] == 'quantity':
+            keys = ["equipments.quantity", id_order]
+        else:
+            keys = [f"IFNULL(equipments.{columns[sort_field]}, '')", id_order]
+        direction = "DESC" if descending else "ASC"
+
+        page_clauses, page_params = list(clauses), list(params)
+        if cursor is not None:
+            key = _decode_cursor(cursor, sort)
+            if len(key) != len(keys):
+                raise ValueError("Curseur invalide")
+            page_clauses.append(f"({', '.join(keys)}) {'<' if descending else '>'} ({', '.join('?' * len(keys))})")
+            page_params.extend(key)
+        page_where = f" WHERE {' AND '.join(page_clauses)}" if page_clauses else ""
+        selected = ', '.join(f"equipments.{columns[field]}" for field in fields)
+        sql = (f"SELECT {', '.join(keys)}, equipments.id, {selected} FROM {tables}{page_where} "
+               f"ORDER BY {', '.join(f'{key} {direction}' for key in keys)} LIMIT ? OFFSET ?")
+        rows = connection.execute(sql, page_params + [limit + 1, 0 if cursor is not None else max(offset, 0)]).fetchall()
+
+        width = len(keys) + 1
+        equipments = [dict({"id": row[width - 1]}, **dict(zip(fields, row[width:]))) for row in rows[:limit]]
+        return {
+            "equipments": equipments,
+            "next_cursor": _encode_cursor(sort, list(rows[limit - 1][:len(keys)])) if len(rows) > limit else None,
+            "total_items": total
+        }
+
+    def close(self):
+        """Closes the connection of the calling thread."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
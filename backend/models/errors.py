@@ -0,0 +1,135 @@
+# Messages des erreurs "valeur obligatoire manquante" (considérées comme critiques)
+MISSING_VALUE_ERRORS = ("Champ obligatoire manquant", "Valeur obligatoire manquante")
+
+
+def error_kind(error):
+    """Returns ``'missing'`` for a missing required value, ``'type'`` otherwise."""
+    return "missing" if error["error"] in MISSING_VALUE_ERRORS else "type"
+
+
+class ErrorCollector:
+    """Collects validation errors with memory bounded by distinct problems.
+
+    Counters per column and per error kind are always exact. Consecutive
+    rows of a column failing with the same message are run-length encoded
+    into one entry carrying ``row_end`` and ``count``. At most
+    ``max_errors`` entries are kept; later ones are only counted. With
+    ``fail_fast``, collection stops at the first critical error (a missing
+    required value).
+    """
+
+    def __init__(self, max_errors=None, fail_fast=False):
+        """Initializes an empty collector.
+
+        Args:
+            max_errors (int, optional): Maximum number of stored entries.
+                                        Defaults to None (no limit).
+            fail_fast (bool, optional): Stop at the first critical error.
+        """
+        self.max_errors = max_errors
+        self.fail_fast = fail_fast
+        self.errors = []
+        self.counts = {}
+        self.total = 0
+        self.reported = 0
+        self.truncated = False
+        self.stopped = False
+        self._runs = {}
+
+    def add(self, error):
+        """Records one error dict (as returned by the compiled validators).
+
+        Returns:
+            bool: False if collection must stop (fail-fast), True otherwise.
+        """
+        kind = error_kind(error)
+        column_counts = self.counts.get(error["column"])
+        if column_counts is None:
+            column_counts = self.counts[error["column"]] = {"missing": 0, "type": 0}
+        column_counts[kind] += 1
+        self.total += 1
+        self._store(error, 1)
+
+        if self.fail_fast and kind == "missing":
+            self.stopped = True
+            return False
+        return True
+
+    def merge(self, other, row_offset=0):
+        """Appends the errors of a collector filled on a later part of the file.
+
+        Args:
+            other (ErrorCollector): Collector of the following rows.
+            row_offset (int, optional): Value added to the row numbers of ``other``.
+
+        Returns:
+            bool: False if ``other`` stopped on a critical error, True otherwise.
+        """
+        for entry in other.errors:
+            entry["row"] += row_offset
+            if "row_end" in entry:
+                entry["row_end"] += row_offset
+            self._store(entry, entry.get("count", 1))
+
+        for column, kinds in other.counts.items():
+            column_counts = self.counts.setdefault(column, {"missing": 0, "type": 0})
+            for kind, count in kinds.items():
+                column_counts[kind] += count
+        self.total += other.total
+        self.truncated = self.truncated or other.truncated
+        self.stopped = self.stopped or other.stopped
+        return not other.stopped
+
+    def drain(self, final=False):
+        """Removes and returns the stored entries whose row range is final.
+
+        The open run of each column, which the next rows may still extend,
+        stays in the collector unless ``final`` is set. Draining regularly
+        keeps at most one entry per column in memory.
+
+        Args:
+            final (bool, optional): Also return the open runs (end of validation).
+
+        Returns:
+            list: Error entries, in the order they were stored.
+        """
+        if final:
+            self._runs = {}
+            drained, self.errors = self.errors, []
+            return drained
+        open_runs = {id(entry) for entry in self._runs.values()}
+        drained = [entry for entry in self.errors if id(entry) not in open_runs]
+        self.errors = [entry for entry in self.errors if id(entry) in open_runs]
+        return drained
+
+    def summary(self):
+        """Returns the counters of the collected errors.
+
+        Returns:
+            dict: Total and reported counts, truncation and fail-fast flags,
+            and per-column counts by error kind.
+        """
+        return {
+            "total_errors": self.total,
+            "reported_errors": self.reported,
+            "truncated": self.truncated,
+            "stopped_early": self.stopped,
+            "by_column": self.counts
+        }
+
+    def _store(self, entry, count):
+        column = entry["column"]
+        run = self._runs.get(column)
+        if run is not None and run["error"] == entry["error"] and run.get("row_end", run["row"]) + 1 == entry["row"]:
+            run["row_end"] = entry.get("row_end", entry["row"])
+            run["count"] = run.get("count", 1) + count
+            return
+
+        if self.max_errors is not None and self.reported >= self.max_errors:
+            self.truncated = True
+            self._runs.pop(column, None)
+            return
+
+        self.errors.append(entry)
+        self.reported += 1
+        self._runs[column] = entry
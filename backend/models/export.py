@@ -0,0 +1,244 @@
+import csv as csv_module
+import io
+import json
+import os
+import zlib
+import xlsxwriter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Format Parquet disponible seulement avec pyarrow
+    pa = pq = None
+
+# Colonnes des fichiers exportés : (en-tête, champ de l'équipement, valeur par défaut)
+EXPORT_COLUMNS = [
+    ("Type d'équipement", 'equipmentType', ''),
+    ("Fabricant", 'manufacturer', ''),
+    ("Modèle", 'model', ''),
+    ("Quantité", 'quantity', 0),
+    ("CPU", 'cpu', ''),
+    ("RAM", 'ram', ''),
+    ("Stockage", 'storage', ''),
+    ("Année d'achat", 'purchaseYear', ''),
+    ("Fin de vie", 'eol', ''),
+]
+ORIGINAL_IDS_COLUMN = "IDs d'origine"
+
+EXPORT_HEADER = [header for header, _, _ in EXPORT_COLUMNS] + [ORIGINAL_IDS_COLUMN]
+
+SHEET_NAME = 'Équipements'
+
+# Lignes CSV encodées ensemble avant d'être écrites et envoyées
+CSV_BATCH_ROWS = 1000
+
+# Lignes par groupe de lignes (row group) d'un fichier Parquet
+PARQUET_ROW_GROUP_ROWS = 65536
+
+MEDIA_TYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv.gz': 'application/gzip',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+PARQUET_AVAILABLE = pa is not None
+
+# Formats rendus par iter_export, envoyés pendant leur écriture
+STREAMED_FORMATS = ('csv', 'csv.gz', 'ndjson')
+
+
+def export_row(equipment):
+    """Returns the exported values of an equipment, in the order of EXPORT_HEADER."""
+    row = [equipment.get(field, default) for _, field, default in EXPORT_COLUMNS]
+    row.append(", ".join(equipment.get("originalIds", [])))
+    return row
+
+
+def _remove(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _csv_batches(equipments, batch_rows):
+    buffer = io.StringIO()
+    writer = csv_module.writer(buffer)
+    writer.writerow(EXPORT_HEADER)
+    pending = 1
+    for equipment in equipments:
+        writer.writerow(export_row(equipment))
+        pending += 1
+        if pending >= batch_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def export_record(equipment):
+    """Returns an equipment as a record keyed by field name, with ``originalIds`` kept as a list."""
+    values = {field: equipment.get(field, default) for _, field, default in EXPORT_COLUMNS}
+    values['originalIds'] = list(equipment.get('originalIds', []))
+    return values
+
+
+def _ndjson_batches(equipments, batch_rows):
+    lines = []
+    for equipment in equipments:
+        lines.append(json.dumps(export_record(equipment), ensure_ascii=False))
+        if len(lines) >= batch_rows:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def iter_export(equipments, path, file_format='csv', batch_rows=CSV_BATCH_ROWS):
+    """Renders a text export once, writing it to ``path`` while yielding it.
+
+    Rows are rendered by batches of ``batch_rows``; each batch is encoded
+    once, appended to the file and yielded, so the same bytes go to the
+    archived file and to the HTTP response and memory holds a single batch.
+    ``csv`` is UTF-8 with a BOM (for Excel), ``csv.gz`` the same CSV
+    compressed as a gzip stream, ``ndjson`` one JSON object per equipment
+    and per line (see ``export_record``). If the iteration stops before the end
+    (client gone, error), the incomplete file is removed.
+
+    Args:
+        equipments (iterable): Equipment dicts (see ``export_row``).
+        path (str): Path of the archived file.
+        file_format (str, optional): One of ``STREAMED_FORMATS``.
+        batch_rows (int, optional): Number of rows encoded at once.
+
+    Yields:
+        bytes: Consecutive parts of the file.
+
+    Raises:
+        ValueError: If the format is not a streamed format.
+    """
+    if file_format not in STREAMED_FORMATS:
+        raise ValueError(f"Format non diffusé en flux: {file_format}")
+    if file_format == 'ndjson':
+        batches, encoding = _ndjson_batches(equipments, batch_rows), 'utf-8'
+    else:
+        batches, encoding = _csv_batches(equipments, batch_rows), 'utf-8-sig'
+    # wbits=31 : flux zlib avec en-tête et fin gzip
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if file_format == 'csv.gz' else None
+
+    completed = False
+    try:
+        with open(path, 'wb') as f:
+            for index, text in enumerate(batches):
+                chunk = text.encode(encoding if index == 0 else 'utf-8')
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                    if not chunk:
+                        continue
+                f.write(chunk)
+                yield chunk
+            if compressor is not None:
+                chunk = compressor.flush()
+                f.write(chunk)
+                yield chunk
+        completed = True
+    finally:
+        if not completed:
+            _remove(path)
+
+
+def write_xlsx_export(equipments, path):
+    """Renders an XLSX export once, with constant memory.
+
+    The workbook is written in constant-memory mode: each row goes to a
+    temporary file as soon as it is written instead of staying in memory.
+    Column widths are measured during the same pass and applied when the
+    workbook is closed.
+
+    Args:
+        equipments (iterable): Equipment dicts (see ``export_row``).
+        path (str): Path of the XLSX file.
+
+    Returns:
+        int: Number of exported rows.
+    """
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+    try:
+        sheet = workbook.add_worksheet(SHEET_NAME)
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center'})
+        sheet.write_row(0, 0, EXPORT_HEADER, header_format)
+        widths = [len(header) for header in EXPORT_HEADER]
+
+        count = 0
+        for count, equipment in enumerate(equipments, start=1):
+            row = export_row(equipment)
+            sheet.write_row(count, 0, row)
+            for index, value in enumerate(row):
+                if value is not None:
+                    widths[index] = max(widths[index], len(str(value)))
+
+        for index, width in enumerate(widths):
+            sheet.set_column(index, index, width + 2)
+        workbook.close()
+    except BaseException:
+        _remove(path)
+        raise
+    return count
+
+
+def write_parquet_export(equipments, path, row_group_rows=PARQUET_ROW_GROUP_ROWS):
+    """Writes a Parquet export by row groups, with bounded memory.
+
+    Columns are named after the equipment fields (see ``export_record``):
+    ``quantity`` is an integer, ``originalIds`` a list of strings and the
+    other fields are strings. Rows are converted to Arrow ``row_group_rows``
+    at a time and appended to the file as a row group; the file can only be
+    sent once its footer is written.
+
+    Args:
+        equipments (iterable): Equipment dicts (see ``export_row``).
+        path (str): Path of the Parquet file.
+        row_group_rows (int, optional): Number of rows per row group.
+
+    Returns:
+        int: Number of exported rows.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed.
+    """
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("Le format parquet nécessite le paquet pyarrow")
+    fields = [field for _, field, _ in EXPORT_COLUMNS]
+    schema = pa.schema(
+        [(field, pa.int64() if field == 'quantity' else pa.string()) for field in fields]
+        + [('originalIds', pa.list_(pa.string()))]
+    )
+
+    def convert(field, value):
+        if field == 'quantity':
+            return None if value in (None, '') else int(value)
+        return None if value is None else str(value)
+
+    def write(rows):
+        columns = [[convert(field, row[field]) for row in rows] for field in fields]
+        columns.append([[str(original_id) for original_id in row['originalIds']] for row in rows])
+        arrays = [pa.array(column, type=schema.field(index).type) for index, column in enumerate(columns)]
+        writer.write_batch(pa.record_batch(arrays, schema=schema))
+
+    count = 0
+    try:
+        with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+            rows = []
+            for count, equipment in enumerate(equipments, start=1):
+                rows.append(export_record(equipment))
+                if len(rows) >= row_group_rows:
+                    write(rows)
+                    rows = []
+            if rows or count == 0:
+                write(rows)
+    except BaseException:
+        _remove(path)
+        raise
+    return count
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from .equipments import _decode_cursor, _encode_cursor
+
+DEFAULT_HISTORY_SIZE = 20
+MAX_HISTORY_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS export_artifacts (
+    key TEXT PRIMARY KEY,
+    format TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    equipment_count INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    export_id TEXT NOT NULL UNIQUE,
+    key TEXT NOT NULL,
+    format TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    equipment_count INTEGER NOT NULL,
+    reused INTEGER NOT NULL,
+    exported_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS exports_format ON exports (format, id);
+CREATE INDEX IF NOT EXISTS exports_key ON exports (key);
+"""
+
+# Équipements sérialisés par lots pour l'empreinte : un appel à l'encodeur par lot, mémoire bornée
+KEY_BATCH_SIZE = 1000
+_CANONICAL_JSON = json.JSONEncoder(sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+
+# Curseurs de l'historique, distincts de ceux des pages d'équipements
+_CURSOR_SORT = 'exports'
+
+
+def export_key(file_format, equipments):
+    """Returns the content key of an export: SHA-256 of its format and equipment.
+
+    The equipment is hashed in a canonical JSON form (sorted keys, no
+    whitespace), ``KEY_BATCH_SIZE`` rows at a time: the same equipment sent
+    with another key order or another JSON layout gets the same key and
+    finds the stored file.
+
+    Args:
+        file_format (str): Export format.
+        equipments (list): Equipment dictionaries to export.
+
+    Returns:
+        str: Hexadecimal digest.
+    """
+    digest = hashlib.sha256(file_format.encode('utf-8') + b'\0')
+    for start in range(0, len(equipments), KEY_BATCH_SIZE):
+        digest.update(_CANONICAL_JSON.encode(equipments[start:start + KEY_BATCH_SIZE]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _entry(row):
+    # Forme attendue par le frontend pour l'historique des exportations
+    return {
+        "id": row['export_id'],
+        "filename": row['filename'],
+        "dateExported": datetime.fromtimestamp(row['exported_at']).isoformat(),
+        "format": row['format'],
+        "equipmentCount": row['equipment_count'],
+        "reused": bool(row['reused']),
+    }
+
+
+class ExportHistory:
+    """Exports and their files, indexed in an SQLite database.
+
+    Export files are content-addressed: an artifact is stored once per key
+    (``export_key`` of the format and the equipment), and each export, new
+    or served from an existing artifact, is a row of the history. The
+    history is read most recent first through its primary key (or the
+    ``(format, id)`` index), one page at a time.
+
+    Each thread uses its own connection; the database is in WAL mode.
+    """
+
+    def __init__(self, path):
+        """Opens (or creates) the database.
+
+        Args:
+            path (str): Path to the SQLite file.
+        """
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get_artifact(self, key):
+        """Returns the stored file of ``key`` (format, filename, size, equipment count, date), or None."""
+        row = self._connection().execute("SELECT * FROM export_artifacts WHERE key = ?", (key,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def record(self, export_id, key, file_format, filename, equipment_count, size=None):
+        """Adds an export to the history.
+
+        Args:
+            export_id (str): Identifier of the export.
+            key (str): ``export_key`` of the export.
+            file_format (str): Export format.
+            filename (str): Name of the stored file.
+            equipment_count (int): Number of exported equipment.
+            size (int, optional): Size of a newly written file, stored as the
+                                  artifact of ``key``. None when the export is
+                                  served from the existing artifact.
+
+        Returns:
+            dict: The history entry.
+        """
+        now = time.time()
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                if size is not None:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO export_artifacts (key, format, filename, size, equipment_count, "
+                        "created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, file_format, filename, size, equipment_count, now)
+                    )
+                connection.execute(
+                    "INSERT INTO exports (export_id, key, format, filename, equipment_count, reused, exported_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (export_id, key, file_format, filename, equipment_count, size is None, now)
+                )
+        return _entry({"export_id": export_id, "filename": filename, "exported_at": now, "format": file_format,
+                       "equipment_count": equipment_count, "reused": size is None})
+
+    def delete_artifact(self, key):
+        """Forgets the stored file of ``key`` (its history is kept).
+
+        Returns:
+            bool: True if the artifact existed.
+        """
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                return connection.execute("DELETE FROM export_artifacts WHERE key = ?", (key,)).rowcount > 0
+
+    def history(self, limit=DEFAULT_HISTORY_SIZE, cursor=None, file_format=None, count=True):
+        """Returns one page of the export history, most recent first.
+
+        Args:
+            limit (int, optional): Page size, at most MAX_HISTORY_SIZE.
+            cursor (str, optional): ``next_cursor`` of the previous page.
+            file_format (str, optional): Only the exports in this format.
+            count (bool, optional): Also count all the matching exports.
+
+        Returns:
+            dict: ``exports`` (history entries), ``next_cursor`` (None on
+            the last page) and ``total_items`` (None unless ``count``).
+
+        Raises:
+            ValueError: If the cursor is invalid.
+        """
+        limit = max(1, min(limit, MAX_HISTORY_SIZE))
+        clauses, params = [], []
+        if file_format:
+            clauses.append("format = ?")
+            params.append(file_format)
+
+        connection = self._connection()
+        total = None
+        if count:
+            where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+            total = connection.execute(f"SELECT COUNT(*) FROM exports{where}", params).fetchone()[0]
+
+        if cursor is not None:
+            key = _decode_cursor(cursor, _CURSOR_SORT)
+            if len(key) != 1:
+                raise ValueError("Curseur invalide")
+            clauses.append("id < ?")
+            params.extend(key)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = connection.execute(f"SELECT * FROM exports{where} ORDER BY id DESC LIMIT ?",
+                                  params + [limit + 1]).fetchall()
+        return {
+            "exports": [_entry(row) for row in rows[:limit]],
+            "next_cursor": _encode_cursor(_CURSOR_SORT, [rows[limit - 1]['id']]) if len(rows) > limit else None,
+            "total_items": total
+        }
+
+    def close(self):
+        """Closes the connection of the calling thread."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
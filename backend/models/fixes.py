@@ -0,0 +1,303 @@
+import collections
+import csv as csv_module
+import itertools
+import os
+import re
+from contextlib import ExitStack
+import openpyxl
+from .dates import DAY_FIRST, DEFAULT_DATE_FORMAT, MONTH_FIRST, normalize_date_values
+from .streaming import DEFAULT_BATCH_ROWS, open_file_rows
+from .utils import G4IT_COLUMN_SPECS
+
+DATES = 'dates'
+
+# Lignes lues (et gardées en mémoire) avant l'écriture pour déduire l'ordre jour/mois des dates
+DATE_INFERENCE_ROWS = 10_000
+
+# Nombre décimal écrit avec une virgule (12,5), sans séparateur de milliers
+_DECIMAL_COMMA = re.compile(r'^\s*[-+]?\d+,\d+\s*$')
+
+
+def _text_transform(func):
+    # Les valeurs non textuelles (nombres et dates Excel, cellules vides) ne sont pas modifiées
+    def transform(value):
+        return func(value) if isinstance(value, str) else value
+    return transform
+
+
+def _decimal_point(value):
+    return value.replace(',', '.') if _DECIMAL_COMMA.match(value) else value
+
+
+TRANSFORMS = {
+    DATES: None,
+    'strip': _text_transform(str.strip),
+    'upper': _text_transform(str.upper),
+    'lower': _text_transform(str.lower),
+    'decimal_point': _text_transform(_decimal_point),
+}
+
+
+def parse_fixes(fixes):
+    """Checks a fix specification.
+
+    Args:
+        fixes (dict): Column name -> transform name or list of transform
+                      names, applied in order (see ``TRANSFORMS``).
+
+    Returns:
+        dict: Column name -> list of transform names.
+
+    Raises:
+        ValueError: If the specification is malformed or a transform is
+                    unknown or repeated.
+    """
+    if not isinstance(fixes, dict):
+        raise ValueError("Les corrections doivent être un objet {colonne: [transformations]}")
+
+    parsed = {}
+    for column, transforms in fixes.items():
+        if isinstance(transforms, str):
+            transforms = [transforms]
+        if not isinstance(transforms, list) or not all(isinstance(name, str) for name in transforms):
+            raise ValueError(f"Transformations invalides pour la colonne '{column}': {transforms}")
+        unknown = [name for name in transforms if name not in TRANSFORMS]
+        if unknown:
+            raise ValueError(f"Transformation inconnue pour la colonne '{column}': {', '.join(unknown)} "
+                             f"(transformations acceptées: {', '.join(TRANSFORMS)})")
+        if len(set(transforms)) != len(transforms):
+            raise ValueError(f"Transformation répétée pour la colonne '{column}': {transforms}")
+        parsed[column] = list(transforms)
+    return parsed
+
+
+class _DateStep:
+    """Converts the dates of one column through a cache of distinct values."""
+
+    def __init__(self, column, date_format):
+        self.column = column
+        self.order = date_format
+        self.defaulted = False
+        self.counts = collections.Counter()
+        self.mapping = {}
+
+    def _votes(self):
+        values = list(self.counts)
+        _, summary = normalize_date_values(values, [self.counts[value] for value in values], None, self.column)
+        return summary
+
+    def infer(self, final):
+        """Sets the day/month order from the values counted so far.
+
+        Returns False, without setting it, when day-and-month values were
+        counted but do not decide the order (as many votes for each) and
+        more values may follow (``final`` is False).
+        """
+        summary = self._votes()
+        votes = summary["votes"]
+        if summary["ambiguous"] and not final:
+            return False
+        if votes["day_first"] != votes["month_first"]:
+            self.order = DAY_FIRST if votes["day_first"] > votes["month_first"] else MONTH_FIRST
+        else:
+            self.order = DEFAULT_DATE_FORMAT
+            self.defaulted = True
+        self.counts.clear()
+        return True
+
+    def apply(self, values):
+        self.counts.update(values)
+        missing = [value for value in set(values) if value not in self.mapping]
+        if missing:
+            converted, _ = normalize_date_values(missing, None, self.order, self.column)
+            self.mapping.update(zip(missing, converted))
+        mapping = self.mapping
+        return [mapping[value] for value in values]
+
+    def summary(self):
+        values = list(self.counts)
+        _, summary = normalize_date_values(values, [self.counts[value] for value in values],
+                                           self.order, self.column)
+        if self.defaulted:
+            # Ordre par défaut : ambigu dès que la colonne contient des dates jour/mois
+            whole = self._votes()
+            summary["ambiguous"] = whole["ambiguous"] or any(whole["votes"].values())
+        return summary
+
+
+class _ColumnFix:
+    """Transforms of one column, applied to a batch of rows."""
+
+    def __init__(self, column, position, transforms, date_format):
+        self.column = column
+        self.position = position
+        self.transforms = transforms
+        self.steps = [_DateStep(column, date_format) if name == DATES else TRANSFORMS[name]
+                      for name in transforms]
+        self.changed = 0
+
+    def date_step(self):
+        return next((step for step in self.steps if isinstance(step, _DateStep)), None)
+
+    def _values(self, batch):
+        position = self.position
+        rows = [row for row in batch if len(row) > position]
+        return rows, [row[position] for row in rows]
+
+    def count(self, batch):
+        # Valeurs de la colonne telles qu'elles arrivent à l'étape des dates, avant leur conversion
+        _, values = self._values(batch)
+        for step in self.steps:
+            if isinstance(step, _DateStep):
+                step.counts.update(values)
+                return
+            values = [step(value) for value in values]
+
+    def apply(self, batch):
+        rows, values = self._values(batch)
+        original = values
+        for step in self.steps:
+            values = step.apply(values) if isinstance(step, _DateStep) else [step(value) for value in values]
+        position = self.position
+        for row, before, after in zip(rows, original, values):
+            if after != before:
+                row[position] = after
+                self.changed += 1
+
+    def summary(self):
+        step = self.date_step()
+        return {
+            "column": self.column,
+            "transforms": self.transforms,
+            "changed": self.changed,
+            "dates": step.summary() if step else None
+        }
+
+
+def _sheet_title(source):
+    # Nom de la feuille lue par open_file_rows (feuille active), sans lire ses lignes
+    wb = openpyxl.load_workbook(source, read_only=True)
+    try:
+        return wb.active.title
+    finally:
+        wb.close()
+
+
+def _open_target(path, file_format, header, delimiter, stack, sheet_title=None):
+    # Retourne une fonction d'écriture d'un lot de lignes et une fonction de finalisation
+    if file_format == 'csv':
+        f = stack.enter_context(open(path, mode='w', newline='', encoding='utf-8'))
+        writer = csv_module.writer(f, delimiter=delimiter)
+        writer.writerow(header)
+        return writer.writerows, f.flush
+    # Classeur en écriture seule : les lignes sont écrites au fur et à mesure, sans cellules en mémoire
+    wb = openpyxl.Workbook(write_only=True)
+    sheet = wb.create_sheet(sheet_title)
+    sheet.append(header)
+
+    def write_rows(rows):
+        for row in rows:
+            sheet.append(row)
+    return write_rows, lambda: wb.save(path)
+
+
+def _batches(rows, batch_rows):
+    while True:
+        batch = list(itertools.islice(rows, batch_rows))
+        if not batch:
+            return
+        yield batch
+
+
+def fix_file(source, target, file_format, fixes=None, date_format=None, batch_rows=DEFAULT_BATCH_ROWS,
+             inference_rows=DATE_INFERENCE_ROWS):
+    """Rewrites a CSV or XLSX file with transformed columns, streaming its rows.
+
+    Rows are read, transformed and written by batches of ``batch_rows``, so
+    memory does not depend on the size of the file: CSV files are decoded
+    chunk by chunk, XLSX files are read with a read-only workbook and written
+    with a write-only one. All the columns are fixed in the same pass.
+
+    Date columns are converted to ``YYYY-MM-DD`` through a cache of their
+    distinct values (see ``normalize_date_values``). Unless ``date_format``
+    forces the day/month order, the order is inferred from the first
+    ``inference_rows`` rows, kept in memory until they are written, so the
+    file is read once. Only a date column whose first rows hold day/month
+    dates without deciding the order (as many votes for each, e.g. no day
+    or month above 12) is counted over the whole file first, in a second
+    read-only pass.
+
+    Args:
+        source (str): Path of the file to fix.
+        target (str): Path of the fixed file, in the same format.
+        file_format (str): 'csv' or 'xlsx' (see ``check_file``).
+        fixes (dict, optional): Column name -> list of transforms (see
+                                ``parse_fixes``). Defaults to ``dates`` on
+                                the date columns of G4IT_COLUMN_SPECS
+                                present in the file.
+        date_format (str, optional): 'DD/MM/YYYY' or 'MM/DD/YYYY' to force
+                                     the day/month order of all date columns.
+        batch_rows (int, optional): Number of rows transformed at once.
+        inference_rows (int, optional): Number of rows read to infer the
+                                        day/month order of date columns.
+
+    Returns:
+        dict: ``rows`` written and one summary per fixed column: ``column``,
+        ``transforms``, ``changed`` values and, for date columns, the
+        ``dates`` summary of ``normalize_date_values``.
+
+    Raises:
+        KeyError: If a column to fix is missing from the file.
+        ValueError: If ``fixes`` or ``date_format`` is invalid.
+    """
+    fixes = None if fixes is None else parse_fixes(fixes)
+    if date_format not in (None, DAY_FIRST, MONTH_FIRST):
+        raise ValueError(f"Format de date inconnu: {date_format} (formats acceptés: {DAY_FIRST}, {MONTH_FIRST})")
+
+    with ExitStack() as stack:
+        header, rows, delimiter = open_file_rows(source, file_format, stack)
+        names = ['' if name is None else str(name) for name in header]
+        if fixes is None:
+            fixes = {name: [DATES] for name in names if G4IT_COLUMN_SPECS.get(name, {}).get('type') == 'date'}
+        # Position de chaque colonne (la dernière en cas de doublon, comme DictReader)
+        positions = {name: index for index, name in enumerate(names)}
+        for column in fixes:
+            if column not in positions:
+                raise KeyError(f"La colonne '{column}' est absente du fichier. Impossible de la corriger.")
+        columns = [_ColumnFix(column, positions[column], transforms, date_format)
+                   for column, transforms in fixes.items()]
+
+        # Ordre jour/mois déduit d'un premier bloc de lignes, gardé en mémoire puis écrit normalement
+        inferred = [column for column in columns if column.date_step() and date_format is None]
+        prefix = list(itertools.islice(rows, inference_rows)) if inferred else []
+        complete = len(prefix) < inference_rows
+        for column in inferred:
+            column.count(prefix)
+        undecided = [column for column in inferred if not column.date_step().infer(final=complete)]
+        if undecided:
+            # Dates jour/mois du bloc à égalité : compter le reste de ces colonnes (seconde lecture)
+            with ExitStack() as counting:
+                _, rest, _ = open_file_rows(source, file_format, counting)
+                for batch in _batches(itertools.islice(rest, len(prefix), None), batch_rows):
+                    for column in undecided:
+                        column.count(batch)
+            for column in undecided:
+                column.date_step().infer(final=True)
+
+        sheet_title = _sheet_title(source) if file_format == 'xlsx' else None
+        write_rows, finish = _open_target(target, file_format, header, delimiter, stack, sheet_title)
+        row_count = 0
+        try:
+            for batch in _batches(itertools.chain(prefix, rows), batch_rows):
+                for column in columns:
+                    column.apply(batch)
+                write_rows(batch)
+                row_count += len(batch)
+            finish()
+        except BaseException:
+            stack.close()
+            if os.path.exists(target):
+                os.remove(target)
+            raise
+
+    return {"rows": row_count, "columns": [column.summary() for column in columns]}
@@ -0,0 +1,208 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Durée de conservation des tâches terminées (1 heure)
+DEFAULT_JOB_RETENTION = 3600
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised by a job function when it notices the job was cancelled."""
+
+
+class Job:
+    """A background task with progress counters.
+
+    The job function runs in a worker thread and reports its progress with
+    ``update``; readers only see the snapshot taken at the last update, so
+    they never touch the data being built by the worker.
+    """
+
+    def __init__(self, kind, filename=None):
+        """Initializes a pending job.
+
+        Args:
+            kind (str): Type of work (e.g. ``'validation'``).
+            filename (str, optional): Name of the processed file.
+        """
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.filename = filename
+        self.status = PENDING
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.rows_processed = 0
+        self.fraction = 0.0
+        self.error_counts = {"total_errors": 0, "by_column": {}}
+        self.result = None
+        self.error = None
+        self.future = None
+        self._cancel = threading.Event()
+        self._cleanup = None
+
+    @property
+    def cancelled(self):
+        """True once a cancellation has been requested."""
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        """Raises JobCancelled if a cancellation has been requested."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def update(self, rows_processed, fraction, collector=None):
+        """Records the progress of the job.
+
+        Args:
+            rows_processed (int): Number of rows processed so far.
+            fraction (float): Part of the work done, between 0 and 1.
+            collector (ErrorCollector, optional): Collector whose counters are copied.
+        """
+        self.rows_processed = rows_processed
+        self.fraction = fraction
+        if collector is not None:
+            self.error_counts = {
+                "total_errors": collector.total,
+                "by_column": {column: dict(kinds) for column, kinds in collector.counts.items()}
+            }
+
+    def to_dict(self):
+        """Returns the state of the job with its throughput and estimated time left.
+
+        Returns:
+            dict: Status, progress counters, rows per second, ETA in seconds,
+            partial error counts and, once completed, the result.
+        """
+        rows_per_second = None
+        eta_seconds = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+            if elapsed > 0:
+                rows_per_second = round(self.rows_processed / elapsed, 1)
+            if self.status == RUNNING and self.fraction > 0:
+                eta_seconds = round(elapsed * (1 - self.fraction) / self.fraction, 1)
+
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "filename": self.filename,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "rows_processed": self.rows_processed,
+            "progress": round(self.fraction, 4),
+            "rows_per_second": rows_per_second,
+            "eta_seconds": eta_seconds,
+            "errors": self.error_counts,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class JobManager:
+    """In-process job store running jobs on a bounded thread pool.
+
+    Finished jobs are kept for ``retention`` seconds, then forgotten.
+    """
+
+    def __init__(self, workers=2, retention=DEFAULT_JOB_RETENTION):
+        """Initializes the store and its worker pool.
+
+        Args:
+            workers (int, optional): Number of jobs running at the same time.
+            retention (int, optional): Seconds a finished job stays available.
+        """
+        self.retention = retention
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+
+    def submit(self, kind, func, *args, filename=None, cleanup=None):
+        """Queues ``func(job, *args)`` and returns the new job.
+
+        The function returns the result of the job; it should call
+        ``job.update`` and ``job.check_cancelled`` between steps.
+
+        Args:
+            kind (str): Type of work.
+            func (callable): Job function.
+            filename (str, optional): Name of the processed file.
+            cleanup (callable, optional): Called once the job is finished,
+                                          whatever its outcome.
+
+        Returns:
+            Job: The pending job.
+        """
+        self._purge()
+        job = Job(kind, filename)
+        job._cleanup = cleanup
+        with self._lock:
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, func, args)
+        return job
+
+    def get(self, job_id):
+        """Returns the job with this id, or None."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Requests the cancellation of a job.
+
+        A pending job is cancelled at once; a running job stops at its next
+        step. Finished jobs are left unchanged.
+
+        Returns:
+            Job: The job, or None if the id is unknown.
+        """
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return job
+        job._cancel.set()
+        if job.future.cancel():
+            job.status = CANCELLED
+            self._finish(job)
+        return job
+
+    def _run(self, job, func, args):
+        try:
+            if job.cancelled:
+                job.status = CANCELLED
+                return
+            job.started_at = time.time()
+            job.status = RUNNING
+            result = func(job, *args)
+            job.result = result
+            job.fraction = 1.0
+            job.status = COMPLETED
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            self._finish(job)
+
+    def _finish(self, job):
+        job.finished_at = time.time()
+        if job._cleanup is not None:
+            job._cleanup()
+
+    def _purge(self):
+        limit = time.time() - self.retention
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.status in FINISHED_STATUSES and job.finished_at and job.finished_at < limit]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -0,0 +1,240 @@
+import csv as csv_module
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from .errors import ErrorCollector
+from .sniffer import sniff_csv_file, supports_byte_ranges
+from .streaming import DEFAULT_CHUNK_SIZE, iter_file_chunks, iter_text_lines, validate_csv_records, validate_csv_stream
+from .utils import G4IT_COLUMN_SPECS
+
+# Taille cible d'une plage d'octets confiée à un processus (64 Mo)
+DEFAULT_RANGE_SIZE = 64 * 1024 * 1024
+
+# Taille des blocs lus pour repérer les fins d'enregistrement (4 Mo)
+SCAN_BLOCK_SIZE = 4 * 1024 * 1024
+
+_executor = None
+_executor_workers = None
+
+
+def get_executor(workers):
+    """Returns the shared process pool, (re)creating it for ``workers`` processes."""
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        # "spawn" : le serveur est multi-thread, un fork pourrait hériter de verrous pris
+        _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        _executor_workers = workers
+    return _executor
+
+
+def iter_record_boundaries(fileobj, start, range_size, block_size=SCAN_BLOCK_SIZE):
+    """Yields byte offsets where CSV records end, about ``range_size`` apart.
+
+    Each yielded offset is just after the first line break found at or after
+    the previous boundary plus ``range_size`` that is not inside a quoted
+    field. Quote parity is tracked with ``bytes.count`` so the scan runs at
+    disk speed; it assumes RFC 4180 quoting (quotes only delimit fields or
+    appear doubled inside them).
+
+    Args:
+        fileobj: Binary file object, read from ``start``.
+        start (int): Offset of the beginning of a record.
+        range_size (int): Minimum distance between two boundaries.
+        block_size (int, optional): Size of the blocks read while scanning.
+
+    Yields:
+        int: Absolute offset of the first byte after a record.
+    """
+    fileobj.seek(start)
+    position = start
+    target = start + range_size
+    in_quotes = 0
+    while True:
+        block = fileobj.read(block_size)
+        if not block:
+            return
+        offset = 0
+        block_end = position + len(block)
+        while target < block_end:
+            search = max(target - position, offset)
+            in_quotes ^= block.count(b'"', offset, search) & 1
+            offset = search
+            boundary = None
+            while True:
+                newline = block.find(b'\n', offset)
+                if newline < 0:
+                    break
+                in_quotes ^= block.count(b'"', offset, newline) & 1
+                offset = newline + 1
+                if not in_quotes:
+                    boundary = position + offset
+                    break
+            if boundary is None:
+                break
+            yield boundary
+            target = boundary + range_size
+        in_quotes ^= block.count(b'"', offset) & 1
+        position = block_end
+
+
+def split_csv_ranges(path, start, range_size=DEFAULT_RANGE_SIZE):
+    """Splits a CSV file into byte ranges aligned on record boundaries.
+
+    Args:
+        path (str): Path to the CSV file.
+        start (int): Offset of the first data record (after the header).
+        range_size (int, optional): Target size of each range in bytes.
+
+    Returns:
+        list: ``(start, end)`` tuples covering ``[start, file size)``.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        for boundary in iter_record_boundaries(f, start, range_size):
+            if boundary >= size:
+                break
+            ranges.append((start, boundary))
+            start = boundary
+    if start < size:
+        ranges.append((start, size))
+    return ranges
+
+
+def _iter_range_chunks(fileobj, length, chunk_size=DEFAULT_CHUNK_SIZE):
+    while length > 0:
+        chunk = fileobj.read(min(chunk_size, length))
+        if not chunk:
+            break
+        length -= len(chunk)
+        yield chunk
+
+
+def _validate_range(path, start, end, dialect, detected_columns, column_specs, max_errors, fail_fast):
+    """Worker: validates the records of one byte range, numbered from 1."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        lines = iter_text_lines(_iter_range_chunks(f, end - start), dialect["encoding"])
+        reader = csv_module.reader(lines, delimiter=dialect["delimiter"], quotechar=dialect["quotechar"])
+        collector = ErrorCollector(max_errors, fail_fast)
+        return validate_csv_records(reader, detected_columns, column_specs, first_row=1, collector=collector)
+
+
+def read_csv_header(path):
+    """Reads the header record of a CSV file.
+
+    Returns:
+        tuple: (dialect detected by ``sniff_csv_file``, detected columns,
+        offset of the first data record)
+
+    Raises:
+        ValueError: If the file is empty.
+    """
+    dialect = sniff_csv_file(path)
+    with open(path, 'rb') as f:
+        header_end = next(iter_record_boundaries(f, 0, 0), os.path.getsize(path))
+    return dialect, dialect["header"], header_end
+
+
+def iter_validated_ranges(path, data_start, dialect, detected_columns, column_specs, collector,
+                          workers=None, range_size=DEFAULT_RANGE_SIZE, ranges=None):
+    """Validates the records of a CSV file on several cores, range by range.
+
+    The ranges are merged into ``collector`` in file order, with absolute row
+    numbers; a step follows each merged range.
+
+    Args:
+        path (str): Path to the CSV file on disk.
+        data_start (int): Offset of the first data record.
+        dialect (dict): Encoding, delimiter and quote character of the file
+                        (see ``read_csv_header``).
+        detected_columns (list): Header of the file.
+        column_specs (dict): Column specifications.
+        collector (ErrorCollector): Collector receiving the errors.
+        workers (int, optional): Number of processes. Defaults to the CPU count.
+        range_size (int, optional): Target size of each range in bytes.
+        ranges (list, optional): Ranges already computed by ``split_csv_ranges``;
+                                 one step is yielded per range.
+
+    Yields:
+        int: Number of records validated so far.
+    """
+    workers = workers or os.cpu_count() or 1
+    specs = None if column_specs is G4IT_COLUMN_SPECS else column_specs
+    if ranges is None:
+        ranges = split_csv_ranges(path, data_start, range_size)
+    # Marge par colonne : la première erreur d'une plage peut prolonger une série de la précédente
+    max_errors = collector.max_errors
+    range_max_errors = None if max_errors is None else max_errors + len(detected_columns)
+    args = (dialect, detected_columns, specs, range_max_errors, collector.fail_fast)
+
+    futures = []
+    if workers == 1 or len(ranges) <= 1:
+        results = (_validate_range(path, start, end, *args) for start, end in ranges)
+    else:
+        executor = get_executor(workers)
+        futures = [executor.submit(_validate_range, path, start, end, *args) for start, end in ranges]
+        results = (future.result() for future in futures)
+
+    # Renuméroter les lignes : l'entête est la ligne 1
+    row_offset = 1
+    try:
+        for record_count, range_collector in results:
+            if not collector.merge(range_collector, row_offset):
+                # Erreur critique en mode fail-fast : abandonner les plages suivantes
+                yield row_offset - 1 + record_count
+                break
+            row_offset += record_count
+            yield row_offset - 1
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def validate_csv_parallel(path, required_columns, column_specs=G4IT_COLUMN_SPECS,
+                          workers=None, range_size=DEFAULT_RANGE_SIZE, max_errors=None, fail_fast=False):
+    """Validates a CSV file on several cores.
+
+    The file is split into byte ranges aligned on record boundaries (quoted
+    line breaks included), each range is validated in a process pool and
+    the per-range errors are merged back with absolute row numbers. The
+    result is the same as ``validate_csv_stream`` on the same file, which
+    is used instead when the encoding or the quote character of the file
+    does not allow splitting it on line break bytes (e.g. UTF-16).
+
+    Args:
+        path (str): Path to the CSV file on disk.
+        required_columns (list): Columns that must be present in the header.
+        column_specs (dict, optional): Column specifications.
+                                      Defaults to G4IT_COLUMN_SPECS.
+        workers (int, optional): Number of processes. Defaults to the CPU count.
+        range_size (int, optional): Target size of each range in bytes.
+        max_errors (int, optional): Maximum number of reported error entries.
+        fail_fast (bool, optional): Stop at the first critical error.
+
+    Returns:
+        dict: ``delimiter``, ``detected_columns``, ``missing_required_columns``,
+        ``type_errors`` and ``error_summary``.
+    """
+    dialect, detected_columns, data_start = read_csv_header(path)
+    if not supports_byte_ranges(dialect):
+        with open(path, 'rb') as f:
+            return validate_csv_stream(iter_file_chunks(f), required_columns, column_specs, max_errors, fail_fast)
+
+    missing_required_columns = [col for col in required_columns if col not in detected_columns]
+    collector = ErrorCollector(max_errors, fail_fast)
+
+    if not missing_required_columns:
+        for _ in iter_validated_ranges(path, data_start, dialect, detected_columns, column_specs,
+                                       collector, workers, range_size):
+            pass
+
+    return {
+        "delimiter": dialect["delimiter"],
+        "detected_columns": detected_columns,
+        "missing_required_columns": missing_required_columns,
+        "type_errors": collector.errors,
+        "error_summary": collector.summary()
+    }
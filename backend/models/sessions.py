@@ -0,0 +1,564 @@
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, datetime, time as datetime_time, timedelta
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from .errors import error_kind
+from .streaming import DEFAULT_BATCH_ROWS, DEFAULT_CHUNK_SIZE, iter_file_chunks, open_csv_stream
+from .table import _key
+from .utils import G4IT_COLUMN_SPECS, private_directory
+from .validators import get_validators
+
+SESSION_META = "meta.json"
+SESSION_DATA = "data.npz"
+SESSION_EDITS = "edits.json"
+
+
+class _HashingReader:
+    """Binary file wrapper computing the SHA-256 of the bytes read through it."""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size=-1):
+        chunk = self.fileobj.read(size)
+        self.digest.update(chunk)
+        self.size += len(chunk)
+        return chunk
+
+
+def _categorical(values):
+    # Colonne encodée par dictionnaire : valeurs distinctes + un code entier par ligne (-1 si absente)
+    codes, uniques = pd.factorize(np.array(values, dtype=object))
+    return pd.Categorical.from_codes(codes, uniques)
+
+
+def _csv_frame(reader, width, batch_rows=DEFAULT_BATCH_ROWS):
+    """Builds a DataFrame of dictionary-encoded text columns from CSV records.
+
+    Blank records are skipped; short records get None for their missing
+    cells and cells beyond the header are dropped, as with ``csv.DictReader``.
+    Each column is stored as a categorical (distinct values + integer codes),
+    which is much smaller and faster to reload than one object per cell.
+    Records are encoded ``batch_rows`` at a time and the blocks of each
+    column merged at the end, so only one block of records is held as text.
+    """
+    blocks = [[] for _ in range(width)]
+    length = 0
+    for batch in iter(lambda: list(itertools.islice(reader, batch_rows)), []):
+        rows = [row for row in batch if row]
+        columns = list(itertools.zip_longest(*rows))[:width]
+        columns += [(None,) * len(rows)] * (width - len(columns))
+        for position, column in enumerate(columns):
+            blocks[position].append(_categorical(column))
+        length += len(rows)
+    data = {position: union_categoricals(column) if column else _categorical([])
+            for position, column in enumerate(blocks)}
+    return pd.DataFrame(data, index=pd.RangeIndex(length))
+
+
+def _encode_value(value):
+    # Valeurs sans équivalent JSON (dates Excel, scalaires numpy) : objet étiqueté par leur type
+    if isinstance(value, np.generic):
+        return value.item()
+    for kind, cls in (("datetime", datetime), ("date", date), ("time", datetime_time)):
+        if isinstance(value, cls):
+            return {f"${kind}": value.isoformat()}
+    if isinstance(value, timedelta):
+        return {"$timedelta": value.total_seconds()}
+    raise TypeError(f"Valeur non enregistrable: {value!r}")
+
+
+def _decode_value(obj):
+    if len(obj) == 1:
+        (kind, value), = obj.items()
+        if kind == "$datetime":
+            return datetime.fromisoformat(value)
+        if kind == "$date":
+            return date.fromisoformat(value)
+        if kind == "$time":
+            return datetime_time.fromisoformat(value)
+        if kind == "$timedelta":
+            return timedelta(seconds=value)
+    return obj
+
+
+def _json_array(values):
+    # Texte JSON rangé dans un tableau d'octets de l'archive .npz
+    payload = json.dumps(values, ensure_ascii=False, default=_encode_value)
+    return np.frombuffer(payload.encode('utf-8'), dtype=np.uint8)
+
+
+def _json_values(array):
+    return json.loads(array.tobytes().decode('utf-8'), object_hook=_decode_value)
+
+
+def _encode_objects(values):
+    """Dictionary-encodes a column of Python values: (codes, distinct values), -1 for empty cells."""
+    index, uniques = {}, []
+    codes = np.empty(len(values), dtype=np.int64)
+    for position, value in enumerate(values):
+        if value is None or (isinstance(value, float) and value != value):
+            codes[position] = -1
+            continue
+        key = _key(value)
+        code = index.get(key)
+        if code is None:
+            code = index[key] = len(uniques)
+            uniques.append(value)
+        codes[position] = code
+    return codes, uniques
+
+
+def _save_frame(data, path):
+    """Writes a session DataFrame as typed columns in an ``.npz`` archive.
+
+    Numeric, boolean and datetime columns are stored as their numpy arrays;
+    categorical and object columns as integer codes plus their distinct
+    values in JSON (dates tagged by type). Nothing is pickled, so loading
+    the archive with ``allow_pickle=False`` never runs code from the file.
+    """
+    arrays, columns = {}, []
+    for position in range(data.shape[1]):
+        series = data.iloc[:, position]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            kind = "dict"
+            codes, uniques = series.cat.codes.to_numpy(), series.cat.categories.tolist()
+        elif series.dtype.kind in "biufmM":
+            kind = "array"
+            arrays[f"c{position}"] = series.to_numpy()
+        else:
+            kind = "objects"
+            codes, uniques = _encode_objects(series.tolist())
+        if kind != "array":
+            arrays[f"c{position}_codes"] = codes
+            arrays[f"c{position}_values"] = _json_array(uniques)
+        columns.append({"label": data.columns[position], "kind": kind})
+    arrays["schema"] = _json_array({"rows": len(data), "columns": columns})
+    np.savez(path, **arrays)
+
+
+def _load_frame(path):
+    """Reads a DataFrame written by ``_save_frame``."""
+    with np.load(path, allow_pickle=False) as archive:
+        schema = _json_values(archive["schema"])
+        data = {}
+        for position, column in enumerate(schema["columns"]):
+            if column["kind"] == "array":
+                data[position] = archive[f"c{position}"]
+                continue
+            codes = archive[f"c{position}_codes"]
+            uniques = _json_values(archive[f"c{position}_values"])
+            if column["kind"] == "dict":
+                data[position] = pd.Categorical.from_codes(codes, pd.Index(uniques, dtype=object))
+            else:
+                values = np.empty(len(uniques) + 1, dtype=object)
+                values[:-1] = uniques
+                values[-1] = np.nan
+                data[position] = values[codes]
+    frame = pd.DataFrame(data, index=pd.RangeIndex(schema["rows"]))
+    frame.columns = [column["label"] for column in schema["columns"]]
+    return frame
+
+
+def _decode_column(series):
+    """Returns the values of a dictionary-encoded column, None for missing cells."""
+    values = np.append(series.cat.categories.to_numpy(dtype=object), None)
+    return values[series.cat.codes.to_numpy()].tolist()
+
+
+def _csv_cell(value):
+    # Cellule CSV : toujours du texte, None pour une cellule absente
+    return None if value is None else str(value)
+
+
+def _excel_cell(value):
+    # Saisie dans un tableur : un nombre tapé devient une cellule numérique, un texte vide une cellule vide
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if not text:
+        return None
+    for parse in (int, float):
+        try:
+            return parse(text)
+        except ValueError:
+            pass
+    return value
+
+
+class UploadSession:
+    """An uploaded file parsed once into a columnar artifact.
+
+    CSV files are stored as dictionary-encoded text columns indexed by
+    position (the raw header is kept apart, so duplicate names stay as they
+    are) and Excel files as the typed DataFrame read by ``pd.read_excel``.
+    """
+
+    def __init__(self, meta, data, edits=None):
+        self.meta = meta
+        # Données du fichier téléversé, jamais modifiées
+        self._base = data
+        # Cellules modifiées (ligne du fichier, colonne) -> valeur, appliquées seulement à la lecture de `data`
+        self.edits = dict(edits or {})
+        self._data = None
+
+    @property
+    def data(self):
+        """The session DataFrame with the edits applied.
+
+        The edited columns are rebuilt once, on first access after a change
+        of the edits, and the result is kept until the next change.
+        """
+        if not self.edits:
+            return self._base
+        if self._data is None:
+            self._data = self._apply_overlay()
+        return self._data
+
+    def _apply_overlay(self):
+        """Returns a copy of the data with the edited cells, rebuilding each edited column once."""
+        by_position = {}
+        for (row, column), value in self.edits.items():
+            index, position = self._locate(row, column)
+            by_position.setdefault(position, {})[index] = value
+        data = self._base.copy(deep=False)
+        for position, cells in by_position.items():
+            series = self._base.iloc[:, position]
+            indices = np.fromiter(cells, dtype=np.int64, count=len(cells))
+            values = list(cells.values())
+            if self.file_type == "csv":
+                # Nouvelles valeurs ajoutées aux catégories en un seul appel, puis codes remplacés
+                new = pd.Index([value for value in values if value is not None], dtype=object).unique()
+                new = new.difference(series.cat.categories, sort=False)
+                categories = series.cat.categories.append(new) if len(new) else series.cat.categories
+                codes = series.cat.codes.to_numpy().astype(np.int64)
+                codes[indices] = categories.get_indexer(pd.Index(values, dtype=object))
+                column = pd.Categorical.from_codes(codes, categories)
+            else:
+                # Colonne typée convertie une seule fois en objets
+                column = series.astype(object).to_numpy(copy=True)
+                cells_array = np.empty(len(values), dtype=object)
+                cells_array[:] = [np.nan if value is None else value for value in values]
+                column[indices] = cells_array
+            data.isetitem(position, column)
+        return data
+
+    @property
+    def id(self):
+        return self.meta["session_id"]
+
+    @property
+    def file_type(self):
+        return self.meta["file_type"]
+
+    @property
+    def columns(self):
+        """Header of the file, as read by the validation."""
+        if self.file_type == "csv":
+            return self.meta["columns"]
+        return self._base.columns.tolist()
+
+    @property
+    def headers(self):
+        """Column names as detected by ``CsvHandler``/``XlsxHandler.get_headers``."""
+        if self.file_type == "csv":
+            return [h.strip() for h in self.meta["columns"]]
+        return self.columns
+
+    def iter_records(self):
+        """Yields CSV records as tuples of strings (None for missing cells)."""
+        return zip(*(_decode_column(self.data[i]) for i in range(len(self.meta["columns"]))))
+
+    def _locate(self, row, column):
+        """Returns the (index, position) of a cell given by file row number and column name."""
+        rows = len(self._base)
+        if isinstance(row, bool) or not isinstance(row, int) or not 2 <= row <= rows + 1:
+            raise ValueError(f"Ligne invalide: {row} (lignes de données: 2 à {rows + 1})")
+        columns = self.columns
+        if column not in columns:
+            raise ValueError(f"La colonne '{column}' est absente du fichier")
+        # Dernière colonne du nom en cas de doublon, comme la validation
+        return row - 2, len(columns) - 1 - columns[::-1].index(column)
+
+    def cell(self, row, column):
+        """Returns the current value of a cell (edits included), None or NaN if empty."""
+        index, position = self._locate(row, column)
+        if (row, column) in self.edits:
+            value = self.edits[(row, column)]
+            return np.nan if value is None and self.file_type != "csv" else value
+        value = self._base.iat[index, position]
+        if self.file_type == "csv" and pd.isna(value):
+            return None
+        # Scalaires numpy (colonnes typées Excel) rendus en types Python, comme les valideurs les attendent
+        return value.item() if isinstance(value, np.generic) else value
+
+    def apply_edits(self, edits, column_specs=G4IT_COLUMN_SPECS):
+        """Applies cell edits and re-validates only the edited cells.
+
+        The edits are checked first, so an invalid edit leaves the session
+        unchanged. Each edited cell is validated before and after the edit
+        with the validators of ``/api/validate-file`` (CSV text rules, or
+        typed Excel rules where numeric text becomes a number, as when it is
+        typed in a spreadsheet), so the cost depends on the number of edits
+        only.
+
+        Args:
+            edits (list): Dicts with ``row`` (file row number, 2 for the first
+                          data row, as in the error reports), ``column`` and
+                          ``value``. The last edit of a cell wins.
+            column_specs (dict, optional): Column specifications.
+                                           Defaults to G4IT_COLUMN_SPECS.
+
+        Returns:
+            dict: ``edited_cells``, ``resolved`` (errors of the edited cells
+            that are gone), ``errors`` (errors of the edited cells after the
+            edit) and ``error_counts_delta`` / ``total_errors_delta`` to apply
+            to the ``error_summary`` of the previous validation.
+
+        Raises:
+            ValueError: If an edit is malformed or targets an unknown cell.
+        """
+        if not isinstance(edits, list):
+            raise ValueError("Les modifications doivent être une liste de cellules {row, column, value}")
+        normalize = _csv_cell if self.file_type == "csv" else _excel_cell
+        cells = {}
+        for edit in edits:
+            if not isinstance(edit, dict) or not {"row", "column"} <= edit.keys():
+                raise ValueError(f"Modification invalide: {edit} (attendu: {{row, column, value}})")
+            value = edit.get("value")
+            if isinstance(value, (dict, list)):
+                raise ValueError(f"Valeur invalide pour la ligne {edit['row']}, colonne '{edit['column']}': {value}")
+            self._locate(edit["row"], edit["column"])
+            cells[(edit["row"], edit["column"])] = normalize(value)
+
+        validators = get_validators(column_specs, "csv" if self.file_type == "csv" else "excel")
+        resolved, errors, counts = [], [], {}
+        for (row, column), value in cells.items():
+            validate = validators.get(column)
+            before = validate(self.cell(row, column), row) if validate else None
+            self.edits[(row, column)] = value
+            after = validate(value, row) if validate else None
+            for error, step in ((before, -1), (after, 1)):
+                if error is not None:
+                    kinds = counts.setdefault(column, {"missing": 0, "type": 0})
+                    kinds[error_kind(error)] += step
+            if after is not None:
+                errors.append(after)
+            elif before is not None:
+                resolved.append(before)
+
+        self._data = None
+        counts = {column: kinds for column, kinds in counts.items() if any(kinds.values())}
+        return {
+            "edited_cells": len(cells),
+            "resolved": resolved,
+            "errors": errors,
+            "error_counts_delta": counts,
+            "total_errors_delta": sum(sum(kinds.values()) for kinds in counts.values())
+        }
+
+    def to_records(self):
+        """Returns the rows as dictionaries, like the handlers' ``load_data``.
+
+        Returns:
+            list: One dictionary per row, keyed by column name.
+        """
+        if self.file_type == "csv":
+            return [dict(zip(self.meta["columns"], values)) for values in self.iter_records()]
+        columns = self.data.columns.tolist()
+        df = self.data.astype(object).where(self.data.notna(), None)
+        values = [[v.to_pydatetime() if isinstance(v, pd.Timestamp) else v for v in df[col].tolist()]
+                  for col in df.columns]
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+class SessionStore:
+    """Stores upload sessions under a directory, one sub-directory per session."""
+
+    def __init__(self, directory):
+        """Creates the store directory if needed, accessible to the current user only.
+
+        Args:
+            directory (str): Directory holding the sessions.
+
+        Raises:
+            PermissionError: If the directory exists and cannot be trusted
+                             (see ``private_directory``).
+        """
+        self.directory = private_directory(directory)
+        # Lecture, application et enregistrement des modifications sans entrelacement
+        self._edit_lock = threading.Lock()
+
+    def create(self, fileobj, filename):
+        """Parses an uploaded file once and stores it as a session.
+
+        Args:
+            fileobj: Binary file object of the upload, read from its start.
+            filename (str): Original file name (its extension selects the parser).
+
+        Returns:
+            UploadSession: The new session.
+
+        Raises:
+            ValueError: If the file type is not supported or the file cannot be read.
+        """
+        extension = os.path.splitext(filename)[1].lower()
+        session_id = str(uuid.uuid4())
+        reader = _HashingReader(fileobj)
+        meta = {"session_id": session_id, "filename": filename, "created_at": time.time()}
+
+        if extension == '.csv':
+            delimiter, columns, records = open_csv_stream(iter_file_chunks(reader, DEFAULT_CHUNK_SIZE))
+            data = _csv_frame(records, len(columns))
+            meta.update(file_type="csv", delimiter=delimiter, columns=columns)
+        elif extension in ['.xlsx', '.xls']:
+            data = self._read_excel(fileobj, reader, extension)
+            meta.update(file_type="excel", delimiter=None, columns=data.columns.tolist())
+        else:
+            raise ValueError("Format de fichier non supporté")
+
+        # Lire la fin éventuelle du fichier pour que l'empreinte couvre tout le contenu
+        for _ in iter_file_chunks(reader):
+            pass
+        meta.update(rows=len(data), size=reader.size, content_hash=reader.digest.hexdigest())
+
+        path = self.path(session_id)
+        os.makedirs(path, mode=0o700)
+        _save_frame(data, os.path.join(path, SESSION_DATA))
+        with open(os.path.join(path, SESSION_META), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, default=str)
+        return UploadSession(meta, data)
+
+    def _read_excel(self, fileobj, reader, extension):
+        """Parses an Excel upload from a file, never from a copy of its bytes in memory.
+
+        A seekable upload (the spooled file of the request) is parsed in
+        place, then rewound so that ``create`` hashes it by blocks; otherwise
+        it is copied by blocks to a temporary file of the store directory,
+        parsed and removed. ``pd.read_excel`` opens XLSX workbooks in
+        openpyxl read-only mode.
+        """
+        if getattr(fileobj, 'seekable', lambda: False)():
+            start = fileobj.tell()
+            data = pd.read_excel(fileobj)
+            fileobj.seek(start)
+            return data
+        with tempfile.NamedTemporaryFile(dir=self.directory, prefix="upload_", suffix=extension) as copy:
+            shutil.copyfileobj(reader, copy, DEFAULT_CHUNK_SIZE)
+            copy.flush()
+            return pd.read_excel(copy.name)
+
+    def get_meta(self, session_id):
+        """Returns the metadata of a session, or None if it does not exist."""
+        path = self.path(session_id)
+        if path is None or not os.path.isdir(path):
+            return None
+        with open(os.path.join(path, SESSION_META), encoding='utf-8') as f:
+            return json.load(f)
+
+    def load(self, session_id):
+        """Returns a session with its data, or None if it does not exist."""
+        meta = self.get_meta(session_id)
+        if meta is None:
+            return None
+        path = self.path(session_id)
+        try:
+            data = _load_frame(os.path.join(path, SESSION_DATA))
+            edits = {}
+            if os.path.exists(os.path.join(path, SESSION_EDITS)):
+                with open(os.path.join(path, SESSION_EDITS), encoding='utf-8') as f:
+                    edits = {(row, column): value for row, column, value in json.load(f)}
+        except FileNotFoundError:
+            # Session supprimée (expirée) pendant sa lecture, ou enregistrée dans un ancien format
+            return None
+        return UploadSession(meta, data, edits)
+
+    def edit(self, session_id, edits, column_specs=G4IT_COLUMN_SPECS):
+        """Applies cell edits to a session and re-validates the edited cells.
+
+        The edits are kept as an overlay next to the original data, which is
+        never rewritten. Loading a session does not apply them: edited cells
+        are read from the overlay, and the edited columns are rebuilt only
+        when the whole data is read (see ``UploadSession.data``). The
+        metadata gets the number of edited cells and a hash of the overlay
+        (``edits_hash``), so results cached for the original content are
+        not reused for the edited one.
+
+        Args:
+            session_id (str): Identifier of the session.
+            edits (list): Cell edits (see ``UploadSession.apply_edits``).
+            column_specs (dict, optional): Column specifications.
+
+        Returns:
+            dict: The delta of ``UploadSession.apply_edits`` with the total
+            number of edited cells (``edits``), or None if the session does
+            not exist.
+
+        Raises:
+            ValueError: If an edit is malformed or targets an unknown cell.
+        """
+        with self._edit_lock:
+            session = self.load(session_id)
+            if session is None:
+                return None
+            delta = session.apply_edits(edits, column_specs)
+            self._save_edits(session)
+        return dict(delta, edits=len(session.edits))
+
+    def clear_edits(self, session_id):
+        """Drops the edits of a session. Returns False if it does not exist."""
+        with self._edit_lock:
+            meta = self.get_meta(session_id)
+            if meta is None:
+                return False
+            self._save_edits(UploadSession(meta, None))
+        return True
+
+    def _save_edits(self, session):
+        path = self.path(session.id)
+        cells = [[row, column, value] for (row, column), value in session.edits.items()]
+        payload = json.dumps(cells, ensure_ascii=False, default=str)
+        if cells:
+            self._write(os.path.join(path, SESSION_EDITS), payload)
+        elif os.path.exists(os.path.join(path, SESSION_EDITS)):
+            os.remove(os.path.join(path, SESSION_EDITS))
+        session.meta.update(
+            edits=len(cells),
+            edits_hash=hashlib.sha256(payload.encode('utf-8')).hexdigest() if cells else None
+        )
+        self._write(os.path.join(path, SESSION_META), json.dumps(session.meta, ensure_ascii=False, default=str))
+
+    @staticmethod
+    def _write(path, payload):
+        # Écriture dans un fichier temporaire puis remplacement : jamais de fichier à moitié écrit
+        temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(temporary, path)
+
+    def delete(self, session_id):
+        """Removes a session. Returns False if it does not exist."""
+        path = self.path(session_id)
+        if path is None or not os.path.isdir(path):
+            return False
+        shutil.rmtree(path)
+        return True
+
+    def path(self, session_id):
+        """Returns the directory of a session, or None if the identifier is not a UUID."""
+        # L'identifiant vient du client : n'accepter que des UUID
+        try:
+            return os.path.join(self.directory, str(uuid.UUID(session_id)))
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,228 @@
+import itertools
+import math
+import re
+import unicodedata
+import numpy as np
+
+# Seuil de similarité par défaut (Jaccard des trigrammes de caractères des libellés normalisés)
+DEFAULT_SIMILARITY_THRESHOLD = 0.7
+
+# Nombre de fonctions de hachage MinHash (taille de la signature de chaque libellé)
+NUM_PERMUTATIONS = 32
+
+# Au-delà, un seau LSH n'est pas comparé paire à paire : chaque libellé n'est comparé qu'au premier
+MAX_BUCKET_SIZE = 50
+
+# Libellés traités par lot pour le calcul des signatures
+SIGNATURE_BATCH_SIZE = 50_000
+
+# Marge sous le seuil de la similarité estimée par les signatures en dessous de laquelle
+# une paire candidate est écartée sans calculer sa similarité exacte
+ESTIMATE_MARGIN = 0.2
+
+NGRAM_SIZE = 3
+
+# Alphabet des libellés normalisés : chiffres et lettres minuscules non accentuées
+_ALPHABET_SIZE = 36
+_NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+_CHAR_CODES = np.full(256, -1, dtype=np.int32)
+_CHAR_CODES[np.frombuffer(b'0123456789abcdefghijklmnopqrstuvwxyz', dtype=np.uint8)] = np.arange(_ALPHABET_SIZE)
+
+# Permutations MinHash précalculées sur tout l'univers des trigrammes (36^3 valeurs)
+_MERSENNE_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240101)
+_PERMUTATIONS = ((_rng.integers(1, _MERSENNE_PRIME, NUM_PERMUTATIONS, dtype=np.int64)[:, None]
+                  * np.arange(_ALPHABET_SIZE ** NGRAM_SIZE, dtype=np.int64)[None, :]
+                  + _rng.integers(0, _MERSENNE_PRIME, NUM_PERMUTATIONS, dtype=np.int64)[:, None])
+                 % _MERSENNE_PRIME).astype(np.uint32)
+_BAND_MULTIPLIERS = _rng.integers(1, 1 << 62, NUM_PERMUTATIONS, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+
+
+def normalize_label(value):
+    """Normalizes an equipment label for comparison.
+
+    Accents are removed, letters lowercased and every character other than
+    a letter or a digit dropped, so "Power Edge R-740" and "PowerEdge R740"
+    both become "poweredger740".
+
+    Args:
+        value: Label (non-text values are converted with ``str``).
+
+    Returns:
+        str: Normalized label, possibly empty.
+    """
+    text = unicodedata.normalize('NFKD', str(value))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _NON_ALPHANUMERIC.sub('', text.lower())
+
+
+def _ngram_codes(labels):
+    """Returns the trigram codes of all labels and the offset of each label."""
+    lengths = np.fromiter((len(label) for label in labels), dtype=np.int64, count=len(labels))
+    chars = _CHAR_CODES[np.frombuffer(''.join(labels).encode('ascii'), dtype=np.uint8)].astype(np.int64)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    counts = np.maximum(lengths - (NGRAM_SIZE - 1), 0)
+    # Positions de début des trigrammes qui restent dans leur libellé
+    positions = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts) + np.arange(counts.sum())
+    codes = (chars[positions] * _ALPHABET_SIZE + chars[positions + 1]) * _ALPHABET_SIZE + chars[positions + 2]
+    return codes, np.concatenate(([0], np.cumsum(counts)[:-1])), counts
+
+
+def _signatures(labels):
+    """Computes the MinHash signature of each label (labels of at least three characters)."""
+    signatures = np.empty((len(labels), NUM_PERMUTATIONS), dtype=np.uint32)
+    for start in range(0, len(labels), SIGNATURE_BATCH_SIZE):
+        batch = labels[start:start + SIGNATURE_BATCH_SIZE]
+        codes, offsets, _ = _ngram_codes(batch)
+        signatures[start:start + len(batch)] = np.minimum.reduceat(_PERMUTATIONS[:, codes], offsets, axis=1).T
+    return signatures
+
+
+def _bands(threshold):
+    """Chooses the LSH banding (bands, rows per band) for a similarity threshold.
+
+    Two labels share a bucket in at least one band with a probability that
+    rises steeply around (1 / bands) ** (1 / rows); it is kept a little
+    below the threshold so that similar labels are rarely missed.
+    """
+    best = (NUM_PERMUTATIONS, 1)
+    for rows in range(1, NUM_PERMUTATIONS + 1):
+        bands = NUM_PERMUTATIONS // rows
+        if (1 / bands) ** (1 / rows) <= threshold - 0.2:
+            best = (bands, rows)
+    return best
+
+
+def _candidate_pairs(signatures, threshold):
+    """Returns the pairs of labels sharing an LSH bucket, as two index arrays."""
+    bands, rows = _bands(threshold)
+    firsts, seconds = [], []
+    for band in range(bands):
+        columns = slice(band * rows, (band + 1) * rows)
+        keys = (signatures[:, columns].astype(np.uint64) * _BAND_MULTIPLIERS[columns]).sum(axis=1)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+        starts = np.concatenate(([0], boundaries))
+        sizes = np.diff(np.concatenate((starts, [len(keys)])))
+
+        # Seaux de deux libellés (cas le plus fréquent) : une paire chacun
+        pairs = starts[sizes == 2]
+        firsts.append(order[pairs])
+        seconds.append(order[pairs + 1])
+        for start, size in zip(starts[sizes > 2], sizes[sizes > 2]):
+            members = order[start:start + size]
+            if size <= MAX_BUCKET_SIZE:
+                combos = np.array(list(itertools.combinations(range(size), 2)))
+                firsts.append(members[combos[:, 0]])
+                seconds.append(members[combos[:, 1]])
+            else:
+                firsts.append(np.full(size - 1, members[0]))
+                seconds.append(members[1:])
+
+    if not firsts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    first, second = np.concatenate(firsts), np.concatenate(seconds)
+    low, high = np.minimum(first, second), np.maximum(first, second)
+    pairs = np.unique(low.astype(np.int64) * len(signatures) + high)
+    return pairs // len(signatures), pairs % len(signatures)
+
+
+def _ngrams(label):
+    return frozenset(label[i:i + NGRAM_SIZE] for i in range(len(label) - NGRAM_SIZE + 1))
+
+
+def _jaccard(left, right):
+    grams_left, grams_right = _ngrams(left), _ngrams(right)
+    return len(grams_left & grams_right) / len(grams_left | grams_right)
+
+
+def _find(parents, index):
+    while parents[index] != index:
+        parents[index] = parents[parents[index]]
+        index = parents[index]
+    return index
+
+
+def find_similar_groups(values, counts=None, threshold=DEFAULT_SIMILARITY_THRESHOLD):
+    """Clusters labels that are likely spellings of the same equipment.
+
+    Labels equal once normalized (see ``normalize_label``) are grouped
+    first. The distinct normalized labels are then compared through a
+    MinHash-LSH index on their character trigrams: only the labels sharing
+    a bucket are compared, with the exact Jaccard similarity of their
+    trigrams, so the cost grows about linearly with the number of labels
+    instead of with the number of pairs. Similar pairs are joined
+    transitively into clusters.
+
+    Args:
+        values (list): Distinct labels (e.g. the values of ``modele``).
+        counts (list, optional): Number of rows of each label. Defaults to 1.
+        threshold (float, optional): Minimum Jaccard similarity, between 0
+                                     and 1, of two normalized labels.
+
+    Returns:
+        list: Clusters of at least two labels, largest first. Each cluster is
+        a dict with ``canonical`` (its most frequent label), ``rows`` and
+        ``values`` (label and rows of each spelling, most frequent first).
+
+    Raises:
+        ValueError: If ``threshold`` is not between 0 and 1.
+    """
+    if not 0 < threshold <= 1:
+        raise ValueError(f"Seuil de similarité invalide: {threshold} (attendu entre 0 et 1)")
+    counts = [1] * len(values) if counts is None else list(counts)
+
+    # Regroupement exact sur le libellé normalisé
+    members = {}
+    for index, value in enumerate(values):
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            continue
+        label = normalize_label(value)
+        if label:
+            members.setdefault(label, []).append(index)
+    labels = list(members)
+    parents = list(range(len(labels)))
+
+    # Comparaison approchée des libellés assez longs pour avoir des trigrammes
+    long_labels = [index for index, label in enumerate(labels) if len(label) >= NGRAM_SIZE]
+    if threshold < 1 and len(long_labels) > 1:
+        texts = [labels[index] for index in long_labels]
+        signatures = _signatures(texts)
+        firsts, seconds = _candidate_pairs(signatures, threshold)
+        # Similarité estimée (part des valeurs MinHash égales) : filtre vectorisé avant le calcul exact
+        keep = np.concatenate([
+            (signatures[firsts[start:start + SIGNATURE_BATCH_SIZE]]
+             == signatures[seconds[start:start + SIGNATURE_BATCH_SIZE]]).mean(axis=1)
+            >= threshold - ESTIMATE_MARGIN
+            for start in range(0, len(firsts), SIGNATURE_BATCH_SIZE)
+        ] or [np.empty(0, dtype=bool)])
+        firsts, seconds = firsts[keep], seconds[keep]
+        # Trigrammes calculés une fois par libellé comparé
+        grams = {}
+        for first, second in zip(firsts.tolist(), seconds.tolist()):
+            grams_first = grams.get(first) or grams.setdefault(first, _ngrams(texts[first]))
+            grams_second = grams.get(second) or grams.setdefault(second, _ngrams(texts[second]))
+            if len(grams_first & grams_second) >= threshold * len(grams_first | grams_second):
+                root_first = _find(parents, long_labels[first])
+                root_second = _find(parents, long_labels[second])
+                if root_first != root_second:
+                    parents[root_second] = root_first
+
+    clusters = {}
+    for index, label in enumerate(labels):
+        clusters.setdefault(_find(parents, index), []).extend(members[label])
+
+    result = []
+    for indices in clusters.values():
+        if len(indices) < 2:
+            continue
+        spellings = sorted(({"value": values[i], "rows": counts[i]} for i in indices),
+                           key=lambda spelling: (-spelling["rows"], str(spelling["value"])))
+        result.append({
+            "canonical": spellings[0]["value"],
+            "rows": sum(spelling["rows"] for spelling in spellings),
+            "values": spellings
+        })
+    result.sort(key=lambda cluster: (-cluster["rows"], str(cluster["canonical"])))
+    return result
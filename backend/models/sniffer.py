@@ -0,0 +1,497 @@
+import codecs
+import csv as csv_module
+import io
+import re
+import zipfile
+from collections import defaultdict
+from xml.etree import ElementTree
+import pandas as pd
+from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, WINDOWS_EPOCH, from_excel
+
+# Taille du préfixe lu pour analyser un fichier CSV (64 Ko)
+DEFAULT_SNIFF_SIZE = 64 * 1024
+
+# Taille maximale lue pour trouver la fin de la ligne d'en-tête (1 Mo)
+MAX_SNIFF_SIZE = 1024 * 1024
+
+# Délimiteurs reconnus, par ordre de priorité en cas d'égalité
+CSV_DELIMITERS = (';', ',', '\t', '|')
+
+# Nombre de lignes de l'échantillon données à csv.Sniffer pour détecter les guillemets
+SNIFF_QUOTE_LINES = 50
+
+# Marques d'ordre des octets (UTF-32 avant UTF-16 : leurs marques commencent pareil)
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Encodages où chaque saut de ligne et chaque guillemet est un octet isolé,
+# ce qui permet de découper le fichier en plages d'octets
+BYTE_RANGE_ENCODINGS = ('utf-8', 'utf-8-sig', 'cp1252')
+
+_CELL_REFERENCE = re.compile(r'([A-Z]+)')
+
+
+def detect_encoding(sample, final=False):
+    """Detects the text encoding of a file from its first bytes.
+
+    A byte order mark selects UTF-8/16/32; otherwise the sample is tried as
+    UTF-8 and falls back to Windows-1252 (the usual encoding of CSV files
+    exported by a French Excel).
+
+    Args:
+        sample (bytes): First bytes of the file.
+        final (bool, optional): True if the sample is the whole file (else a
+                                multi-byte character cut at its end is ignored).
+
+    Returns:
+        tuple: (Python codec name, length of the byte order mark)
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding, len(bom)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final)
+        return 'utf-8', 0
+    except UnicodeDecodeError:
+        return 'cp1252', 0
+
+
+def _header_text(text, final):
+    """Returns the text of the header record, or None if it is not complete in ``text``."""
+    in_quotes = False
+    start = 0
+    while True:
+        newline = text.find('\n', start)
+        if newline < 0:
+            return text if final else None
+        # Un saut de ligne entre guillemets fait partie du champ
+        in_quotes ^= text.count('"', start, newline) & 1
+        start = newline + 1
+        if not in_quotes:
+            return text[:start]
+
+
+def _guess_delimiter(header_text):
+    """Picks the delimiter splitting the header into the most fields.
+
+    Ties go to the first delimiter of ``CSV_DELIMITERS``; a header with a
+    single field keeps the comma.
+    """
+    best, best_count = ',', 1
+    for delimiter in CSV_DELIMITERS:
+        fields = next(csv_module.reader(io.StringIO(header_text, newline=''), delimiter=delimiter), [])
+        if len(fields) > best_count:
+            best, best_count = delimiter, len(fields)
+    return best
+
+
+def _guess_quotechar(text, delimiter):
+    """Detects single-quote quoting with ``csv.Sniffer``; double quotes otherwise."""
+    sample = ''.join(io.StringIO(text, newline='').readlines()[:SNIFF_QUOTE_LINES])
+    if "'" not in sample or '"' in sample:
+        return '"'
+    try:
+        return csv_module.Sniffer().sniff(sample, delimiters=delimiter).quotechar
+    except csv_module.Error:
+        return '"'
+
+
+def sniff_csv(sample, final=False):
+    """Detects the encoding, dialect and header of a CSV file from its first bytes.
+
+    Args:
+        sample (bytes): First bytes of the file.
+        final (bool, optional): True if the sample is the whole file.
+
+    Returns:
+        dict: ``encoding`` (codec reading the file, byte order mark included),
+        ``bom`` (True if the file starts with one), ``delimiter``, ``quotechar``
+        and ``header`` (raw column names), or None if the header record does
+        not end within the sample.
+
+    Raises:
+        ValueError: If the file is empty.
+    """
+    encoding, bom_length = detect_encoding(sample, final)
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(sample, final)
+    if not text and final:
+        raise ValueError("Le fichier CSV est vide")
+
+    header_text = _header_text(text, final)
+    if header_text is None:
+        return None
+
+    delimiter = _guess_delimiter(header_text)
+    quotechar = _guess_quotechar(text, delimiter)
+    reader = csv_module.reader(io.StringIO(header_text, newline=''), delimiter=delimiter, quotechar=quotechar)
+    return {
+        "encoding": encoding,
+        "bom": bool(bom_length),
+        "delimiter": delimiter,
+        "quotechar": quotechar,
+        "header": next(reader, [])
+    }
+
+
+def sniff_csv_chunks(chunks, sample_size=DEFAULT_SNIFF_SIZE):
+    """Sniffs a streamed CSV file without losing the chunks read to do it.
+
+    Chunks are buffered until ``sample_size`` bytes (more if the header
+    record is longer, up to ``MAX_SNIFF_SIZE``) or the end of the file.
+
+    Args:
+        chunks (iterable): Iterable of ``bytes`` chunks of the CSV file.
+        sample_size (int, optional): Number of bytes analysed.
+
+    Returns:
+        tuple: (result of ``sniff_csv``, iterator over all the chunks,
+        buffered ones first)
+
+    Raises:
+        ValueError: If the file is empty.
+    """
+    chunks = iter(chunks)
+    buffered = []
+    size = 0
+    target = sample_size
+    while True:
+        final = True
+        for chunk in chunks:
+            buffered.append(chunk)
+            size += len(chunk)
+            if size >= target:
+                final = False
+                break
+        sample = b''.join(buffered)
+        # En-tête démesuré : ne garder que ce qui en a été lu
+        sniffed = sniff_csv(sample, final or target >= MAX_SNIFF_SIZE)
+        if sniffed is not None:
+            return sniffed, _chain_chunks(sample, chunks)
+        target = max(target * 4, size + 1)
+
+
+def _chain_chunks(sample, chunks):
+    if sample:
+        yield sample
+    yield from chunks
+
+
+def sniff_csv_file(source, sample_size=DEFAULT_SNIFF_SIZE):
+    """Sniffs a CSV file on disk or a seekable binary file object.
+
+    Only a bounded prefix is read; a file object is put back at its
+    initial position.
+
+    Args:
+        source: Path or binary file object.
+        sample_size (int, optional): Number of bytes analysed.
+
+    Returns:
+        dict: Result of ``sniff_csv``.
+
+    Raises:
+        ValueError: If the file is empty.
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            return sniff_csv_file(f, sample_size)
+    start = source.tell()
+    try:
+        sniffed, _ = sniff_csv_chunks(iter(lambda: source.read(sample_size), b''), sample_size)
+    finally:
+        source.seek(start)
+    return sniffed
+
+
+def supports_byte_ranges(sniffed):
+    """True if a file with this dialect can be split into byte ranges on line breaks."""
+    return sniffed["encoding"] in BYTE_RANGE_ENCODINGS and sniffed["quotechar"] == '"'
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _children(element, name):
+    return [child for child in element if _local_name(child.tag) == name]
+
+
+def _resolve_target(base, target):
+    if target.startswith('/'):
+        return target[1:]
+    parts = base.split('/')[:-1]
+    for part in target.split('/'):
+        if part == '..':
+            parts.pop()
+        elif part != '.':
+            parts.append(part)
+    return '/'.join(parts)
+
+
+def _relationships(archive, part):
+    """Returns the relationships of a part of the package, as {id: (type, path)}."""
+    folder, _, name = part.rpartition('/')
+    rels_path = f"{folder}/_rels/{name}.rels" if folder else f"_rels/{name}.rels"
+    try:
+        root = ElementTree.fromstring(archive.read(rels_path))
+    except KeyError:
+        return {}
+    return {
+        rel.get('Id'): (rel.get('Type', '').rsplit('/', 1)[-1], _resolve_target(part, rel.get('Target', '')))
+        for rel in root
+    }
+
+
+def _workbook_parts(archive):
+    """Returns the parts of a workbook needed to read the header of its first sheet.
+
+    Returns:
+        tuple: (first worksheet path, shared strings path or None, styles
+        path or None, date epoch of the workbook)
+    """
+    workbook = next((path for kind, path in _relationships(archive, '').values() if kind == 'officeDocument'),
+                    'xl/workbook.xml')
+    relationships = _relationships(archive, workbook)
+    shared_strings = next((path for kind, path in relationships.values() if kind == 'sharedStrings'), None)
+    styles = next((path for kind, path in relationships.values() if kind == 'styles'), None)
+
+    root = ElementTree.fromstring(archive.read(workbook))
+    # Calendrier 1904 (classeurs Mac) : même choix d'origine qu'openpyxl
+    epoch = WINDOWS_EPOCH
+    for properties in _children(root, 'workbookPr'):
+        if properties.get('date1904') in ('1', 'true'):
+            epoch = CALENDAR_MAC_1904
+    for sheets in _children(root, 'sheets'):
+        for sheet in _children(sheets, 'sheet'):
+            rel_id = next((value for key, value in sheet.attrib.items() if _local_name(key) == 'id'), None)
+            if rel_id in relationships:
+                return relationships[rel_id][1], shared_strings, styles, epoch
+    raise ValueError("Le classeur ne contient aucune feuille")
+
+
+def _date_styles(stream, style_ids):
+    """Finds which cell styles display a number as a date or a duration.
+
+    Only the styles in ``style_ids`` are checked, with the same rules as
+    openpyxl (``is_date_format`` and ``is_timedelta_format``).
+
+    Returns:
+        tuple: (date style ids, duration style ids)
+    """
+    root = ElementTree.parse(stream).getroot()
+    custom = {}
+    for formats in _children(root, 'numFmts'):
+        for number_format in _children(formats, 'numFmt'):
+            custom[int(number_format.get('numFmtId'))] = number_format.get('formatCode')
+    format_ids = []
+    for cell_formats in _children(root, 'cellXfs'):
+        format_ids = [int(xf.get('numFmtId', 0)) for xf in _children(cell_formats, 'xf')]
+
+    dates, durations = set(), set()
+    for style_id in style_ids:
+        if style_id >= len(format_ids):
+            continue
+        format_id = format_ids[style_id]
+        code = custom[format_id] if format_id in custom else builtin_format_code(format_id)
+        if code and is_date_format(code):
+            dates.add(style_id)
+            if is_timedelta_format(code):
+                durations.add(style_id)
+    return dates, durations
+
+
+def _column_index(reference):
+    index = 0
+    for letter in _CELL_REFERENCE.match(reference).group(1):
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index - 1
+
+
+def _text(element):
+    # Texte d'une chaîne riche : concaténation des <t>, sans les annotations phonétiques
+    if _local_name(element.tag) == 'rPh':
+        return ''
+    if _local_name(element.tag) == 't':
+        return element.text or ''
+    return ''.join(_text(child) for child in element)
+
+
+def _first_row(stream):
+    """Reads the cells of the first row holding a value, stopping right after it.
+
+    Returns:
+        tuple: (row number, list of ``(column index, type, raw value, style id)`` tuples)
+    """
+    cells = []
+    position = 0
+    row_number = 0
+    for _, element in ElementTree.iterparse(stream):
+        name = _local_name(element.tag)
+        if name == 'c':
+            cell_type = element.get('t', 'n')
+            value = None
+            for child in element:
+                child_name = _local_name(child.tag)
+                if child_name == 'v':
+                    value = child.text
+                elif child_name == 'is':
+                    value = _text(child)
+            # Sans référence, la cellule suit la précédente
+            reference = element.get('r')
+            if reference:
+                position = _column_index(reference)
+            if value not in (None, ''):
+                cells.append((position, cell_type, value, int(element.get('s', 0))))
+            position += 1
+            element.clear()
+        elif name == 'row':
+            row_number = int(element.get('r', row_number + 1))
+            if cells:
+                return row_number, cells
+            position = 0
+            element.clear()
+    return row_number, cells
+
+
+def _shared_strings(stream, indexes):
+    """Reads the shared strings up to the largest index needed."""
+    needed = max(indexes)
+    strings = {}
+    position = 0
+    for _, element in ElementTree.iterparse(stream):
+        if _local_name(element.tag) == 'si':
+            if position in indexes:
+                strings[position] = _text(element)
+            element.clear()
+            if position >= needed:
+                break
+            position += 1
+    return strings
+
+
+def _cell_value(cell_type, value, strings, date_format=None, epoch=WINDOWS_EPOCH):
+    if cell_type == 's':
+        return strings.get(int(value))
+    if cell_type == 'b':
+        return value == '1'
+    if cell_type in ('str', 'inlineStr', 'e', 'd'):
+        return value
+    number = float(value) if '.' in value or 'E' in value or 'e' in value else int(value)
+    if date_format is not None:
+        # Nombre affiché comme une date : converti comme le fait openpyxl
+        try:
+            return from_excel(number, epoch, timedelta=date_format == 'timedelta')
+        except (OverflowError, ValueError):
+            return '#VALUE!'
+    return number
+
+
+def _dedup_names(names, unnamed):
+    """Renames duplicate column names as pandas does (``nom``, ``nom.1``...).
+
+    As in ``pd.read_excel``, a suffix already used by another column of the
+    header is skipped and the ``unnamed`` positions are renamed last.
+    """
+    names = list(names)
+    counts = defaultdict(int)
+    for index in [i for i in range(len(names)) if i not in unnamed] + unnamed:
+        name = original = names[index]
+        count = counts[name]
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in names else counts[name]
+        names[index] = name
+        counts[name] = count + 1
+    return names
+
+
+def sniff_xlsx_headers(source):
+    """Reads the header row of the first sheet of an XLSX workbook.
+
+    Only the first row of the sheet XML is parsed, straight from the zip
+    archive, plus the shared strings it refers to; the rest of the sheet is
+    never decompressed. Names follow ``pd.read_excel``: the header is the
+    first row of the sheet, empty cells become ``Unnamed: <position>``,
+    numbers displayed as dates become ``datetime`` values (read through the
+    cell's number format, as openpyxl does) and duplicates get a ``.1``,
+    ``.2``... suffix. Unlike pandas, columns that
+    only hold data beyond the last header cell are not counted.
+
+    Args:
+        source: Path or seekable binary file object of the workbook.
+
+    Returns:
+        list: Column names of the first sheet.
+
+    Raises:
+        zipfile.BadZipFile: If the file is not an XLSX (zip) workbook.
+        ValueError: If the workbook has no sheet.
+    """
+    with zipfile.ZipFile(source) as archive:
+        sheet, shared_strings, styles, epoch = _workbook_parts(archive)
+        with archive.open(sheet) as stream:
+            row_number, cells = _first_row(stream)
+        if not cells:
+            return []
+        if row_number != 1:
+            # Première ligne vide : pandas nomme toutes les colonnes "Unnamed"
+            width = max(position for position, _, _, _ in cells) + 1
+            return [f"Unnamed: {position}" for position in range(width)]
+
+        indexes = {int(value) for _, cell_type, value, _ in cells if cell_type == 's'}
+        strings = {}
+        if indexes and shared_strings:
+            with archive.open(shared_strings) as stream:
+                strings = _shared_strings(stream, indexes)
+
+        # Nombres mis en forme : leur format dit s'il s'agit de dates
+        style_ids = {style_id for _, cell_type, _, style_id in cells if cell_type == 'n' and style_id}
+        dates, durations = set(), set()
+        if style_ids and styles:
+            with archive.open(styles) as stream:
+                dates, durations = _date_styles(stream, style_ids)
+
+    row = [None] * (max(position for position, _, _, _ in cells) + 1)
+    for position, cell_type, value, style_id in cells:
+        date_format = None
+        if cell_type == 'n' and style_id in dates:
+            date_format = 'timedelta' if style_id in durations else 'date'
+        row[position] = _cell_value(cell_type, value, strings, date_format, epoch)
+    unnamed = [position for position, value in enumerate(row) if value in (None, '')]
+    names = [f"Unnamed: {position}" if position in unnamed else value for position, value in enumerate(row)]
+    return _dedup_names(names, unnamed)
+
+
+def sniff_headers(source, file_extension):
+    """Returns the column names of a CSV or Excel file, reading only its beginning.
+
+    CSV names are stripped of surrounding spaces. Excel files that are not
+    XLSX archives (``.xls``) are read with ``pd.read_excel``.
+
+    Args:
+        source: Path or seekable binary file object.
+        file_extension (str): Extension of the file (``.csv``, ``.xlsx``, ``.xls``).
+
+    Returns:
+        list: Column names.
+
+    Raises:
+        ValueError: If the file type is not supported or the file cannot be read.
+    """
+    if file_extension == '.csv':
+        return [h.strip() for h in sniff_csv_file(source)["header"]]
+    if file_extension not in ('.xlsx', '.xls'):
+        raise ValueError("Format de fichier non supporté")
+    try:
+        return sniff_xlsx_headers(source)
+    except zipfile.BadZipFile:
+        if not isinstance(source, str):
+            source.seek(0)
+        return pd.read_excel(source, nrows=0).columns.tolist()
@@ -0,0 +1,236 @@
+import codecs
+import csv as csv_module
+import io
+import itertools
+import openpyxl
+from .errors import ErrorCollector
+from .sniffer import sniff_csv_chunks
+from .utils import G4IT_COLUMN_SPECS
+from .validators import get_validators
+
+# Taille des blocs lus depuis le fichier téléversé (1 Mo)
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Longueur maximale d'une ligne décodée (caractères) : au-delà le fichier est refusé
+MAX_LINE_LENGTH = 16 * 1024 * 1024
+
+# Nombre de lignes validées entre deux points d'étape en mode pas à pas
+DEFAULT_BATCH_ROWS = 10000
+
+
+def iter_file_chunks(fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Reads a binary file object in fixed-size chunks.
+
+    Args:
+        fileobj: Binary file-like object (e.g. ``UploadFile.file``).
+        chunk_size (int, optional): Size of each chunk in bytes.
+
+    Yields:
+        bytes: Successive chunks until end of file.
+    """
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def iter_text_lines(chunks, encoding='utf-8', errors='replace', max_line_length=MAX_LINE_LENGTH):
+    """Decodes a stream of byte chunks into text lines.
+
+    Lines end at ``'\n'``, ``'\r\n'`` or a lone ``'\r'``, as with universal
+    newlines. Only the incomplete trailing line of each chunk is kept
+    between iterations, and a line longer than ``max_line_length`` is
+    refused, so memory stays bounded even for an upload without line
+    breaks. Line endings are preserved, as ``csv`` expects.
+
+    Args:
+        chunks (iterable): Iterable of ``bytes`` chunks.
+        encoding (str, optional): Text encoding. Defaults to UTF-8.
+        errors (str, optional): Decoding error handler.
+        max_line_length (int, optional): Maximum number of characters in a line.
+
+    Yields:
+        str: Lines including their line terminator.
+
+    Raises:
+        ValueError: If a line is longer than ``max_line_length``.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    pending = ''
+    for chunk in chunks:
+        text = pending + decoder.decode(chunk)
+        # Un '\r' final est gardé : il peut être suivi du '\n' d'un '\r\n' dans le bloc suivant
+        end = len(text) - 1 if text.endswith('\r') else len(text)
+        cut = max(text.rfind('\n', 0, end), text.rfind('\r', 0, end)) + 1
+        pending = text[cut:]
+        if len(pending) > max_line_length:
+            raise ValueError(f"Ligne trop longue (plus de {max_line_length} caractères)")
+        if cut:
+            yield from io.StringIO(text[:cut], newline='')
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield from io.StringIO(pending, newline='')
+
+
+def validate_csv_records(reader, detected_columns, column_specs=G4IT_COLUMN_SPECS, first_row=2, collector=None):
+    """Validates parsed CSV records with the compiled per-column validators.
+
+    Args:
+        reader (iterable): Records as lists of strings (e.g. a ``csv.reader``
+                           positioned after the header).
+        detected_columns (list): Header of the file.
+        column_specs (dict, optional): Column specifications.
+                                      Defaults to G4IT_COLUMN_SPECS.
+        first_row (int, optional): Row number given to the first record.
+        collector (ErrorCollector, optional): Collector receiving the errors.
+                                              Defaults to an unbounded one.
+
+    Returns:
+        tuple: (number of records validated, ErrorCollector)
+    """
+    if collector is None:
+        collector = ErrorCollector()
+    validators = get_validators(column_specs, 'csv')
+    # Position de chaque colonne connue (la dernière en cas de doublon, comme DictReader)
+    positions = {column: index for index, column in enumerate(detected_columns)}
+    checks = [(positions[column], validators[column]) for column in positions if column in validators]
+    add_error = collector.add
+
+    row_index = first_row - 1
+    for row in reader:
+        if not row:
+            continue  # Lignes vides ignorées, comme DictReader
+        row_index += 1
+        width = len(row)
+        for position, validate in checks:
+            error = validate(row[position] if position < width else None, row_index)
+            if error is not None and not add_error(error):
+                return row_index - first_row + 1, collector
+
+    return row_index - first_row + 1, collector
+
+
+def iter_validated_records(reader, detected_columns, column_specs=G4IT_COLUMN_SPECS, first_row=2,
+                           collector=None, batch_rows=DEFAULT_BATCH_ROWS):
+    """Validates parsed CSV records batch by batch.
+
+    Same checks as ``validate_csv_records``, with a step after each batch of
+    ``batch_rows`` records so the caller can publish the errors found so
+    far (e.g. with ``ErrorCollector.drain``) before the end of the file.
+
+    Args:
+        reader (iterable): Records as lists of strings, after the header.
+        detected_columns (list): Header of the file.
+        column_specs (dict, optional): Column specifications.
+                                      Defaults to G4IT_COLUMN_SPECS.
+        first_row (int, optional): Row number given to the first record.
+        collector (ErrorCollector, optional): Collector receiving the errors.
+                                              Defaults to an unbounded one.
+        batch_rows (int, optional): Number of records per batch.
+
+    Yields:
+        int: Number of records validated so far.
+    """
+    if collector is None:
+        collector = ErrorCollector()
+    validated = 0
+    while not collector.stopped:
+        batch = list(itertools.islice(reader, batch_rows))
+        if not batch:
+            break
+        count, _ = validate_csv_records(batch, detected_columns, column_specs, first_row + validated, collector)
+        validated += count
+        yield validated
+
+
+def open_csv_stream(chunks):
+    """Reads the header of a streamed CSV file.
+
+    The encoding (byte order mark included), the delimiter and the quote
+    character are detected on the first chunks with ``sniff_csv_chunks``.
+
+    Args:
+        chunks (iterable): Iterable of ``bytes`` chunks of the CSV file.
+
+    Returns:
+        tuple: (delimiter, detected columns, ``csv.reader`` positioned on the
+        first data record)
+
+    Raises:
+        ValueError: If the file is empty.
+    """
+    sniffed, chunks = sniff_csv_chunks(chunks)
+    lines = iter_text_lines(chunks, sniffed["encoding"])
+    reader = csv_module.reader(lines, delimiter=sniffed["delimiter"], quotechar=sniffed["quotechar"])
+    return sniffed["delimiter"], next(reader, []), reader
+
+
+def open_file_rows(source, file_format, stack):
+    """Opens a CSV or XLSX file for reading row by row.
+
+    CSV files are decoded chunk by chunk with the dialect detected by
+    ``open_csv_stream`` (blank records are skipped, as with ``DictReader``);
+    XLSX workbooks are opened in read-only mode, so rows are parsed lazily
+    from the sheet XML.
+
+    Args:
+        source: Path or seekable binary file object.
+        file_format (str): 'csv' or 'xlsx'.
+        stack (ExitStack): Receives the file or workbook to close.
+
+    Returns:
+        tuple: (header, iterator of rows as lists, CSV delimiter or None)
+
+    Raises:
+        ValueError: If a CSV file is empty.
+    """
+    if file_format == 'csv':
+        f = source if hasattr(source, 'read') else stack.enter_context(open(source, 'rb'))
+        delimiter, header, reader = open_csv_stream(iter_file_chunks(f))
+        return header, (row for row in reader if row), delimiter
+    wb = openpyxl.load_workbook(source, read_only=True)
+    stack.callback(wb.close)
+    rows = wb.active.iter_rows(values_only=True)
+    header = list(next(rows, None) or [])
+    return header, (list(row) for row in rows), None
+
+
+def validate_csv_stream(chunks, required_columns, column_specs=G4IT_COLUMN_SPECS,
+                        max_errors=None, fail_fast=False):
+    """Validates a CSV upload in a single streaming pass.
+
+    The delimiter and the header come from the first line; rows are then
+    checked one at a time as the chunks are decoded, so the whole file is
+    never held in memory nor written to disk.
+
+    Args:
+        chunks (iterable): Iterable of ``bytes`` chunks of the CSV file.
+        required_columns (list): Columns that must be present in the header.
+        column_specs (dict, optional): Column specifications.
+                                      Defaults to G4IT_COLUMN_SPECS.
+        max_errors (int, optional): Maximum number of reported error entries.
+        fail_fast (bool, optional): Stop at the first critical error.
+
+    Returns:
+        dict: ``delimiter``, ``detected_columns``, ``missing_required_columns``,
+        ``type_errors`` and ``error_summary``.
+
+    Raises:
+        ValueError: If the file is empty.
+    """
+    delimiter, detected_columns, reader = open_csv_stream(chunks)
+    missing_required_columns = [col for col in required_columns if col not in detected_columns]
+    collector = ErrorCollector(max_errors, fail_fast)
+
+    # Valider le contenu uniquement si toutes les colonnes requises sont présentes
+    if not missing_required_columns:
+        validate_csv_records(reader, detected_columns, column_specs, collector=collector)
+
+    return {
+        "delimiter": delimiter,
+        "detected_columns": detected_columns,
+        "missing_required_columns": missing_required_columns,
+        "type_errors": collector.errors,
+        "error_summary": collector.summary()
+    }
@@ -0,0 +1,489 @@
+import sys
+from array import array
+from collections.abc import MutableMapping, Sequence
+from datetime import date, datetime
+import numpy as np
+
+# Nombre de lignes décodées à la fois par ColumnarTable.iter_dicts
+DEFAULT_DECODE_ROWS = 10000
+
+# Marque une cellule absente de sa ligne (clé manquante du dictionnaire d'origine)
+_MISSING = object()
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+
+def _key(value):
+    # True == 1 == 1.0 : le type fait partie de la clé, sauf pour le cas courant des chaînes
+    return value if value.__class__ is str else (value.__class__, value)
+
+
+def _codes_dtype(count):
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if count <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.uint64
+
+
+def _is_int_text(value):
+    try:
+        return str(int(value)) == value and _INT64_MIN <= int(value) <= _INT64_MAX
+    except ValueError:
+        return False
+
+
+def _is_float_text(value):
+    try:
+        return repr(float(value)) == value
+    except ValueError:
+        return False
+
+
+def _is_date_text(value):
+    try:
+        return len(value) == 10 and date.fromisoformat(value).isoformat() == value
+    except ValueError:
+        return False
+
+
+# Types de colonnes stockées en tableau numpy : (test d'une valeur, dtype, décodage d'une cellule)
+_TYPED_KINDS = {
+    "int": (lambda v: v.__class__ is int and _INT64_MIN <= v <= _INT64_MAX, np.int64, int),
+    "float": (lambda v: v.__class__ is float, np.float64, float),
+    "datetime": (lambda v: v.__class__ is datetime and v.tzinfo is None, 'datetime64[us]', lambda v: v.item()),
+    "int_text": (lambda v: v.__class__ is str and _is_int_text(v), np.int64, lambda v: str(int(v))),
+    "float_text": (lambda v: v.__class__ is str and _is_float_text(v), np.float64, lambda v: repr(float(v))),
+    "date_text": (lambda v: v.__class__ is str and _is_date_text(v), 'datetime64[D]',
+                  lambda v: v.item().isoformat()),
+}
+
+
+def _decimal_kind(decimals):
+    """Kind of CSV numbers written with a fixed number of decimals (``"1234.50"``)."""
+    def accepts(value):
+        try:
+            return value.__class__ is str and '.' in value and f"{float(value):.{decimals}f}" == value
+        except ValueError:
+            return False
+    return accepts, np.float64, lambda v: f"{v:.{decimals}f}"
+
+
+def _typed_input(kind, value):
+    # Valeur donnée à numpy pour une cellule d'un type donné
+    if kind == "int_text":
+        return int(value)
+    if kind in ("float_text", "decimal_text"):
+        return float(value)
+    return value
+
+
+class _DictColumn:
+    """Dictionary-encoded column: distinct values plus one integer code per row."""
+
+    kind = "dict"
+
+    def __init__(self, codes, uniques):
+        self.codes = codes
+        self.uniques = uniques
+        self._index = None
+
+    def __len__(self):
+        return len(self.codes)
+
+    def get(self, index):
+        return self.uniques[self.codes[index]]
+
+    def values(self, start=0, stop=None):
+        uniques = np.empty(len(self.uniques), dtype=object)
+        uniques[:] = self.uniques
+        return uniques[self.codes[start:stop]].tolist()
+
+    def set(self, index, value):
+        if self._index is None:
+            self._index = {_key(unique): code for code, unique in enumerate(self.uniques)}
+        key = _key(value)
+        try:
+            code = self._index.get(key)
+        except TypeError:
+            # Valeur non hachable (liste...) : la colonne devient une simple liste
+            return _ObjectColumn(self.values()).set(index, value)
+        if code is None:
+            code = len(self.uniques)
+            self._index[key] = code
+            self.uniques.append(value)
+            dtype = _codes_dtype(len(self.uniques))
+            if dtype != self.codes.dtype:
+                self.codes = self.codes.astype(dtype)
+        self.codes[index] = code
+        return self
+
+    @property
+    def nbytes(self):
+        return (self.codes.nbytes + sys.getsizeof(self.uniques)
+                + sum(sys.getsizeof(value) for value in self.uniques if value is not _MISSING))
+
+    def typed(self):
+        """Returns the same column as a numpy array when that takes less memory, else itself."""
+        present = [value for value in self.uniques if value is not None]
+        if not present or _MISSING in present:
+            return self
+        candidates = list(_TYPED_KINDS.items())
+        if present[0].__class__ is str and '.' in present[0]:
+            candidates.append(("decimal_text", _decimal_kind(len(present[0]) - present[0].index('.') - 1)))
+        for kind, spec in candidates:
+            if all(spec[0](value) for value in present):
+                break
+        else:
+            return self
+        dtype = spec[1]
+
+        nulls = np.array([value is None for value in self.uniques])
+        mask = nulls[self.codes] if nulls.any() else None
+        typed_nbytes = len(self.codes) * (8 + (mask is not None))
+        if typed_nbytes >= self.nbytes:
+            return self
+        placeholder = present[0]
+        uniques = np.array([_typed_input(kind, placeholder if value is None else value)
+                            for value in self.uniques], dtype=dtype)
+        return _TypedColumn(kind, spec, uniques[self.codes], mask)
+
+
+class _TypedColumn:
+    """Column of numbers or dates stored in a numpy array, with a mask of empty cells."""
+
+    def __init__(self, kind, spec, array, mask=None):
+        self.kind = kind
+        self.array = array
+        self.mask = mask
+        self._accepts, _, self._decode = spec
+
+    def __len__(self):
+        return len(self.array)
+
+    def get(self, index):
+        if self.mask is not None and self.mask[index]:
+            return None
+        return self._decode(self.array[index])
+
+    def values(self, start=0, stop=None):
+        array = self.array[start:stop]
+        if self.kind in ("int", "float", "datetime"):
+            # tolist() rend des int, float et datetime Python
+            values = array.tolist()
+        else:
+            values = [self._decode(value) for value in array]
+        if self.mask is not None:
+            for position in np.flatnonzero(self.mask[start:stop]):
+                values[position] = None
+        return values
+
+    def set(self, index, value):
+        if value is None:
+            if self.mask is None:
+                self.mask = np.zeros(len(self.array), dtype=bool)
+            self.mask[index] = True
+            return self
+        if not self._accepts(value):
+            # Valeur d'un autre type : repasser en colonne encodée par dictionnaire
+            return _encode_values(self.values()).set(index, value)
+        self.array[index] = _typed_input(self.kind, value)
+        if self.mask is not None:
+            self.mask[index] = False
+        return self
+
+    @property
+    def nbytes(self):
+        return self.array.nbytes + (self.mask.nbytes if self.mask is not None else 0)
+
+
+class _ObjectColumn:
+    """Plain list of values, for columns holding unhashable values (e.g. lists)."""
+
+    kind = "object"
+
+    def __init__(self, items):
+        self.items = items
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, index):
+        return self.items[index]
+
+    def values(self, start=0, stop=None):
+        return self.items[start:stop]
+
+    def set(self, index, value):
+        self.items[index] = value
+        return self
+
+    @property
+    def nbytes(self):
+        return sys.getsizeof(self.items) + sum(sys.getsizeof(value) for value in self.items
+                                               if value is not _MISSING)
+
+
+def _encode_values(values):
+    """Dictionary-encodes a list of values (a plain list if one is unhashable)."""
+    index = {}
+    uniques = []
+    codes = []
+    try:
+        for value in values:
+            key = _key(value)
+            code = index.get(key)
+            if code is None:
+                code = index[key] = len(uniques)
+                uniques.append(value)
+            codes.append(code)
+    except TypeError:
+        return _ObjectColumn(list(values))
+    return _DictColumn(np.array(codes, dtype=_codes_dtype(len(uniques))), uniques)
+
+
+class TableRow(MutableMapping):
+    """Dictionary view of one row of a ``ColumnarTable``.
+
+    Reads decode the cell from its column and writes are stored back in
+    the table, so code written for the former list of dictionaries keeps
+    working (``row["type"]``, ``row.get(...)``, ``row[...] = ...``).
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key):
+        value = self._table._columns[key].get(self._index)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._table.set_value(self._index, key, value)
+
+    def __delitem__(self, key):
+        self[key]
+        self._table.set_value(self._index, key, _MISSING)
+
+    def __iter__(self):
+        for name, column in self._table._columns.items():
+            if column.get(self._index) is not _MISSING:
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ColumnarTable(Sequence):
+    """Rows stored column by column instead of one dictionary per row.
+
+    Text columns are dictionary-encoded: each distinct value (``type``,
+    ``statut``, ``paysDUtilisation``...) is stored once and rows hold a small
+    integer code. Numeric and date columns are stored in numpy arrays when
+    that takes less memory, including CSV text that converts back to the
+    exact same string (``"12"``, ``"2.5"``, ``"2023-01-31"``). Indexing or
+    iterating yields ``TableRow`` dictionary views, so the table can replace
+    the list of dictionaries returned by the handlers.
+    """
+
+    def __init__(self, columns=None, length=0):
+        """Initializes a table from already built columns.
+
+        Args:
+            columns (dict, optional): Columns by name, as built by ``from_rows``.
+            length (int, optional): Number of rows.
+        """
+        self._columns = columns if columns is not None else {}
+        self._length = length
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds a table from an iterable of dictionaries, encoding cells as they come.
+
+        The rows are consumed one at a time, so a lazy iterator (e.g. the
+        handlers' ``iter_rows``) never needs to be held in memory. Columns
+        follow the order in which keys are first seen; a key missing from a
+        row is also missing from its view.
+
+        Args:
+            rows (iterable): Rows as dictionaries.
+
+        Returns:
+            ColumnarTable: The encoded rows.
+        """
+        names = []
+        indexes = []
+        uniques = []
+        codes = []
+        positions = {}
+        length = 0
+
+        def add_cell(position, value):
+            index = indexes[position]
+            if index is None:
+                uniques[position].append(value)
+                return
+            try:
+                code = index.get(_key(value))
+            except TypeError:
+                # Valeur non hachable (liste...) : la colonne devient une simple liste
+                values = uniques[position]
+                uniques[position] = [values[code] for code in codes[position]] + [value]
+                indexes[position] = codes[position] = None
+                return
+            if code is None:
+                code = index[_key(value)] = len(uniques[position])
+                uniques[position].append(value)
+            codes[position].append(code)
+
+        for row in rows:
+            missing = 0
+            for position, name in enumerate(names):
+                value = row.get(name, _MISSING)
+                if value is _MISSING:
+                    missing += 1
+                index = indexes[position]
+                if index is None:
+                    add_cell(position, value)
+                    continue
+                key = value if value.__class__ is str else _key(value)
+                try:
+                    code = index.get(key)
+                except TypeError:
+                    add_cell(position, value)
+                    continue
+                if code is None:
+                    code = index[key] = len(uniques[position])
+                    uniques[position].append(value)
+                codes[position].append(code)
+            if len(row) + missing != len(names):
+                # Nouvelles colonnes : absentes des lignes précédentes
+                for name in row:
+                    if name not in positions:
+                        positions[name] = len(names)
+                        names.append(name)
+                        indexes.append({_key(_MISSING): 0} if length else {})
+                        uniques.append([_MISSING] if length else [])
+                        codes.append(array('I', [0]) * length)
+                        add_cell(positions[name], row[name])
+            length += 1
+
+        columns = {}
+        for position, name in enumerate(names):
+            if indexes[position] is None:
+                columns[name] = _ObjectColumn(uniques[position])
+                continue
+            dtype = _codes_dtype(len(uniques[position]))
+            column = _DictColumn(np.frombuffer(codes[position], dtype=np.uint32).astype(dtype), uniques[position])
+            codes[position] = None
+            columns[name] = column.typed()
+        return cls(columns, length)
+
+    @property
+    def columns(self):
+        """Names of the columns, in order."""
+        return list(self._columns)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TableRow(self, i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Indice de ligne hors limites")
+        return TableRow(self, index)
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield TableRow(self, index)
+
+    def column(self, name):
+        """Returns the values of a column (None for cells missing from their row).
+
+        Raises:
+            KeyError: If the column does not exist.
+        """
+        return [None if value is _MISSING else value for value in self._columns[name].values()]
+
+    def map_distinct(self, name, func):
+        """Replaces the values of a column through a function of its distinct values.
+
+        The function is called once with the distinct values of the column
+        (None for cells missing from their row) and the number of rows
+        holding each of them, and returns the new value of each. Rows keep
+        their codes, so the cost does not depend on the number of rows.
+
+        Args:
+            name (str): Column to transform.
+            func (callable): ``func(values, counts)`` returning a list of
+                             the same length as ``values``.
+
+        Raises:
+            KeyError: If the column does not exist.
+            TypeError: If the column holds unhashable values.
+        """
+        column = self._columns[name]
+        if column.kind != "dict":
+            column = _encode_values(column.values())
+            if column.kind != "dict":
+                raise TypeError(f"La colonne '{name}' contient des valeurs non hachables")
+        missing = [position for position, value in enumerate(column.uniques) if value is _MISSING]
+        values = [None if value is _MISSING else value for value in column.uniques]
+        counts = np.bincount(column.codes, minlength=len(values))
+        values = list(func(values, counts))
+        for position in missing:
+            values[position] = _MISSING
+        self._columns[name] = _DictColumn(column.codes, values).typed()
+
+    def set_value(self, index, name, value):
+        """Stores a cell, adding the column if it does not exist yet."""
+        if name not in self._columns:
+            self._columns[name] = _DictColumn(np.zeros(self._length, dtype=np.uint8), [_MISSING])
+        column = self._columns[name]
+        self._columns[name] = column.set(index, value)
+
+    def iter_dicts(self, batch_rows=DEFAULT_DECODE_ROWS):
+        """Yields the rows as plain dictionaries, decoding the columns by blocks.
+
+        Args:
+            batch_rows (int, optional): Number of rows decoded at a time.
+
+        Yields:
+            dict: One row, without its missing keys.
+        """
+        names = self.columns
+        if not names:
+            # Lignes sans aucune clé
+            yield from ({} for _ in range(self._length))
+            return
+        for start in range(0, self._length, batch_rows):
+            stop = min(start + batch_rows, self._length)
+            blocks = [self._columns[name].values(start, stop) for name in names]
+            for values in zip(*blocks):
+                yield {name: value for name, value in zip(names, values) if value is not _MISSING}
+
+    def to_dicts(self):
+        """Returns the rows as a list of plain dictionaries."""
+        return list(self.iter_dicts())
+
+    def memory_usage(self):
+        """Returns the approximate number of bytes used by each column.
+
+        Returns:
+            dict: Bytes by column name, with the storage ``kind`` used
+            (``dict``, ``int``, ``float_text``, ``date_text``...).
+        """
+        return {name: {"kind": column.kind, "bytes": column.nbytes} for name, column in self._columns.items()}
+
+    def __repr__(self):
+        return f"<ColumnarTable {self._length} rows x {len(self._columns)} columns>"
@@ -1,154 +1,9 @@
 import os
-import datetime
+import itertools
 
-# Spécifications des colonnes G4IT
-G4IT_COLUMN_SPECS = {
-    # Informations d'identification de l'équipement
-    'nomEquipementPhysique': {
-        'required': True,
-        'type': 'string',
-        'example': 'Serveur Dell PowerEdge R740',
-        'description': "Nom ou référence de l'équipement physique"
-    },
-    'modele': {
-        'required': True,
-        'type': 'string',
-        'example': 'Serveur-Milieu-de-Gamme',
-        'description': "Modèle ou catégorie de l'équipement"
-    },
-    'quantite': {
-        'required': True,
-        'type': 'integer',
-        'example': '25000',
-        'description': "Nombre d'unités de cet équipement"
-    },
-    'nomCourtDatacenter': {
-        'required': True,
-        'type': 'string',
-        'example': 'DC-PARIS',
-        'description': "Identifiant du datacenter hébergeant l'équipement"
-    },
-    
-    # Informations temporelles
-    'dateAchat': {
-        'required': False,
-        'type': 'date',
-        'format': 'YYYY-MM-DD',
-        'example': '2015-12-25',
-        'description': "Date d'acquisition de l'équipement"
-    },
-    'dateRetrait': {
-        'required': False,
-        'type': 'date',
-        'format': 'YYYY-MM-DD',
-        'example': '2018-12-25',
-        'description': "Date de mise hors service prévue ou effective"
-    },
-    'dureeUsageInterne': {
-        'required': False,
-        'type': 'integer',
-        'example': '36',
-        'description': "Durée d'utilisation interne en mois"
-    },
-    'dureeUsageAmont': {
-        'required': False,
-        'type': 'integer',
-        'example': '12',
-        'description': "Durée d'utilisation en amont en mois"
-    },
-    'dureeUsageAval': {
-        'required': False,
-        'type': 'integer',
-        'example': '24',
-        'description': "Durée d'utilisation en aval en mois"
-    },
-    
-    # Caractéristiques de l'équipement
-    'type': {
-        'required': True,
-        'type': 'string',
-        'example': 'Ecran',
-        'description': "Type d'équipement (Serveur, Ecran, PC, etc.)"
-    },
-    'statut': {
-        'required': True,
-        'type': 'string',
-        'example': 'Active',
-        'description': "État actuel de l'équipement (Active, Inactive, En maintenance, etc.)"
-    },
-    'paysDUtilisation': {
-        'required': True,
-        'type': 'string',
-        'example': 'France',
-        'description': "Pays où l'équipement est utilisé"
-    },
-    
-    # Informations de consommation et d'utilisation
-    'consoElecAnnuelle': {
-        'required': False,
-        'type': 'number',
-        'example': '2450.75',
-        'description': "Consommation électrique annuelle en kWh"
-    },
-    'utilisateur': {
-        'required': False,
-        'type': 'string',
-        'example': 'Service IT',
-        'description': "Service ou personne utilisant l'équipement"
-    },
-    'nomSourceDonnee': {
-        'required': False,
-        'type': 'string',
-        'example': 'Inventaire 2023',
-        'description': "Source des données pour cet équipement"
-    },
-    'nomEntite': {
-        'required': False,
-        'type': 'string',
-        'example': 'Département Réseau',
-        'description': "Entité responsable de l'équipement"
-    },
-    
-    # Caractéristiques techniques
-    'nbCoeur': {
-        'required': False,
-        'type': 'integer',
-        'example': '16',
-        'description': "Nombre de cœurs de processeur (pour serveurs/PC)"
-    },
-    'nbJourUtiliseAn': {
-        'required': False,
-        'type': 'integer',
-        'example': '252',
-        'description': "Nombre de jours d'utilisation par an"
-    },
-    'goTelecharge': {
-        'required': False,
-        'type': 'integer',
-        'example': '5000',
-        'description': "Volume de données téléchargées en Go"
-    },
-    
-    # Modalités d'utilisation
-    'modeUtilisation': {
-        'required': False,
-        'type': 'string',
-        'example': 'Production',
-        'description': "Mode d'utilisation (Production, Test, Développement, etc.)"
-    },
-    'tauxUtilisation': {
-        'required': False,
-        'type': 'number',
-        'example': '0.75',
-        'description': "Taux d'utilisation moyen (entre 0 et 1)"
-    },
-    'qualite': {
-        'required': False,
-        'type': 'string',
-        'example': 'Haute',
-        'description': "Niveau de qualité ou de performance (Haute, Moyenne, Standard, etc.)"
-    }
-}
+from .errors import ErrorCollector
+from .specs import G4IT_COLUMN_SPECS
+from .validators import TYPE_CHECKS, get_validators
 
 def check_file(file_path):
     """
@@ -177,6 +32,38 @@ def check_file(file_path):
     return False, f"Le fichier '{file_path}' n'est ni un CSV ni un XLSX valide."
 
 
+def private_directory(path):
+    """
+    Creates a directory only the current user can access, or checks an existing one.
+
+    The API keeps its working files under the shared system temporary
+    directory, where another local user could create the directory first
+    and plant files in it. An existing directory is accepted only if it is
+    a real directory (not a symbolic link) owned by the current user and
+    not writable by others; its permissions are then restricted to 0700.
+
+    Args:
+        path (str): Path of the directory
+
+    Returns:
+        str: The path
+
+    Raises:
+        PermissionError: If the directory cannot be trusted
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    stat = os.lstat(path)
+    if os.path.islink(path) or not os.path.isdir(path):
+        raise PermissionError(f"'{path}' n'est pas un dossier")
+    if hasattr(os, 'getuid'):
+        if stat.st_uid != os.getuid():
+            raise PermissionError(f"Le dossier '{path}' appartient à un autre utilisateur")
+        if stat.st_mode & 0o022:
+            raise PermissionError(f"Le dossier '{path}' est accessible en écriture à d'autres utilisateurs")
+        os.chmod(path, 0o700)
+    return path
+
+
 def validate_data_type(value, expected_type):
     """
     Validates if the given value matches the expected type.
@@ -190,45 +77,36 @@ def validate_data_type(value, expected_type):
     """
     if value is None or value == "":
         return True, None  # Empty values are handled separately for required fields
-        
-    if expected_type == "string":
-        return True, None  # Any non-empty value is valid as string
-    
-    elif expected_type == "integer":
-        try:
-            int(str(value).strip())
-            return True, None
-        except ValueError:
-            return False, f"'{value}' n'est pas un nombre entier valide"
-    
-    elif expected_type == "number":
-        try:
-            float(str(value).strip())
-            return True, None
-        except ValueError:
-            return False, f"'{value}' n'est pas un nombre valide"
-    
-    elif expected_type == "date":
-        try:
-            # Check if it's in YYYY-MM-DD format
-            date_str = str(value).strip()
-            datetime.datetime.strptime(date_str, '%Y-%m-%d')
-            return True, None
-        except ValueError:
-            return False, f"'{value}' n'est pas au format de date valide (YYYY-MM-DD)"
-    
-    return False, f"Type inconnu '{expected_type}'"
 
-def validate_columns(data, column_specs=G4IT_COLUMN_SPECS):
+    type_check = TYPE_CHECKS['lenient'].get(expected_type)
+    if type_check is None:
+        return False, f"Type inconnu '{expected_type}'"
+
+    error_msg = type_check(value)
+    return error_msg is None, error_msg
+
+def validate_columns(data, column_specs=G4IT_COLUMN_SPECS, max_errors=None, fail_fast=False, run_length=False):
     """
     Validates data against column specifications.
     
     Args:
-        data (list): List of dictionaries, each representing a row
+        data (iterable): Rows as dictionaries, either a list or a lazy
+                         iterator such as ``CsvHandler.iter_rows()``
         column_specs (dict): Specifications for columns with types and requirements
+        max_errors (int, optional): Maximum number of reported error entries
+        fail_fast (bool, optional): Stop at the first missing required value
+        run_length (bool, optional): Report runs of errors with their counts
+                                     instead of one entry per cell
         
     Returns:
-        dict: Validation report with errors
+        dict: Validation report with errors. By default ``type_errors`` holds
+              one entry (``row``, ``column``, ``error``) per invalid cell, at
+              most ``max_errors`` entries. With ``run_length``, it holds one
+              entry per run of consecutive rows with the same error in a
+              column (``row`` to ``row_end``, ``count`` rows; no ``row_end``
+              for a single row), at most ``max_errors`` entries, and
+              ``error_summary`` gives the exact counts (see
+              ``ErrorCollector.summary``)
     """
     report = {
         "missing_required_columns": [],
@@ -236,50 +114,48 @@ def validate_columns(data, column_specs=G4IT_COLUMN_SPECS):
         "is_valid": True
     }
     
-    # Check if data is empty
-    if not data:
+    # Check if data is empty (only the first row is read from an iterator)
+    rows = iter(data)
+    first_row = next(rows, None)
+    if first_row is None:
         report["is_valid"] = False
         report["general_error"] = "Aucune donnée trouvée dans le fichier"
         return report
     
     # Check for missing required columns
-    headers = data[0].keys()
+    headers = first_row.keys()
     for column_name, specs in column_specs.items():
         if specs["required"] and column_name not in headers:
             report["missing_required_columns"].append(column_name)
             report["is_valid"] = False
     
-    # Check data types for each row
-    for row_idx, row in enumerate(data, 1):
-        for column_name, specs in column_specs.items():
+    # Check data types for each row, one precompiled validator call per cell
+    collector = ErrorCollector(max_errors, fail_fast)
+    # Une entrée par cellule (format historique) : copies, le collecteur prolonge ses entrées en plages
+    cells = []
+    validators = get_validators(column_specs, 'lenient')
+    for row_idx, row in enumerate(itertools.chain([first_row], rows), 1):
+        for column_name, validate in validators.items():
             # Skip columns not in the data
             if column_name not in row:
                 continue
-                
-            value = row[column_name]
-            
-            # Skip validation for empty optional fields
-            if (value is None or value == "") and not specs["required"]:
-                continue
-                
-            # Validate required fields are not empty
-            if specs["required"] and (value is None or value == ""):
-                report["type_errors"].append({
-                    "row": row_idx,
-                    "column": column_name,
-                    "error": "Valeur obligatoire manquante"
-                })
-                report["is_valid"] = False
+
+            error = validate(row[column_name], row_idx)
+            if error is None:
                 continue
-            
-            # Validate data type
-            is_valid, error_msg = validate_data_type(value, specs["type"])
-            if not is_valid:
-                report["type_errors"].append({
-                    "row": row_idx,
-                    "column": column_name,
-                    "error": error_msg
-                })
-                report["is_valid"] = False
+            if not run_length and (max_errors is None or len(cells) < max_errors):
+                cells.append(dict(error))
+            if not collector.add(error):
+                break
+        if collector.stopped:
+            break
+
+    if run_length:
+        report["type_errors"] = collector.errors
+        report["error_summary"] = collector.summary()
+    else:
+        report["type_errors"] = cells
+    if collector.total:
+        report["is_valid"] = False
     
     return report
\ No newline at end of file
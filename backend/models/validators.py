@@ -0,0 +1,238 @@
+import re
+from datetime import date, datetime
+import pandas as pd
+from .specs import G4IT_COLUMN_SPECS
+
+_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def _parse_iso_date(value):
+    """Parses a YYYY-MM-DD string, keeping the strptime error message on failure."""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        # Chemin lent réservé aux erreurs : message identique à strptime
+        return datetime.strptime(value, '%Y-%m-%d')
+
+
+# --- Contrôles de type pour les valeurs brutes des fichiers CSV -------------
+
+def _csv_string(value):
+    return None
+
+
+def _csv_integer(value):
+    if not value.isdigit():
+        return "La valeur n'est pas un entier valide"
+    return None
+
+
+def _csv_number(value):
+    digits = value.replace('.', '')
+    if digits and not digits.isdigit():
+        return "La valeur n'est pas un nombre valide"
+    try:
+        float(value)
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+def _csv_date(value):
+    if not _DATE_PATTERN.match(value):
+        return "Format de date invalide (doit être YYYY-MM-DD)"
+    try:
+        _parse_iso_date(value)
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+# --- Contrôles de type pour les valeurs typées lues par pandas (Excel) ------
+
+def _excel_string(value):
+    return None
+
+
+def _excel_integer(value):
+    if not isinstance(value, int) and not (isinstance(value, float) and value.is_integer()):
+        return "Pas un entier"
+    return None
+
+
+def _excel_number(value):
+    if not isinstance(value, (int, float)):
+        return "Pas un nombre"
+    return None
+
+
+def _excel_date(value):
+    if isinstance(value, (datetime, date)):
+        return None
+    if isinstance(value, str):
+        if not _DATE_PATTERN.match(value):
+            return "Format de date invalide"
+        try:
+            _parse_iso_date(value)
+        except ValueError as e:
+            return str(e)
+    return None
+
+
+# --- Contrôles souples utilisés par validate_columns -------------------------
+
+def _lenient_string(value):
+    return None
+
+
+def _lenient_integer(value):
+    try:
+        int(str(value).strip())
+    except ValueError:
+        return f"'{value}' n'est pas un nombre entier valide"
+    return None
+
+
+def _lenient_number(value):
+    try:
+        float(str(value).strip())
+    except ValueError:
+        return f"'{value}' n'est pas un nombre valide"
+    return None
+
+
+def _lenient_date(value):
+    date_str = str(value).strip()
+    try:
+        if _DATE_PATTERN.match(date_str):
+            _parse_iso_date(date_str)
+        else:
+            # Conserver les formats tolérés par strptime (ex: 2020-1-5)
+            datetime.strptime(date_str, '%Y-%m-%d')
+    except ValueError:
+        return f"'{value}' n'est pas au format de date valide (YYYY-MM-DD)"
+    return None
+
+
+TYPE_CHECKS = {
+    'csv': {'string': _csv_string, 'integer': _csv_integer, 'number': _csv_number, 'date': _csv_date},
+    'excel': {'string': _excel_string, 'integer': _excel_integer, 'number': _excel_number, 'date': _excel_date},
+    'lenient': {'string': _lenient_string, 'integer': _lenient_integer, 'number': _lenient_number, 'date': _lenient_date},
+}
+
+
+def _unknown_type_check(expected_type):
+    def check(value):
+        return f"Type inconnu '{expected_type}'"
+    return check
+
+
+def _compile_csv(column, expected_type, required, type_check):
+    def validate(value, row):
+        if value is None or not value.strip():
+            if required:
+                return {
+                    "column": column,
+                    "row": row,
+                    "value": "",
+                    "expected_type": expected_type,
+                    "error": "Champ obligatoire manquant"
+                }
+            return None
+        message = type_check(value)
+        if message is None:
+            return None
+        return {
+            "column": column,
+            "row": row,
+            "value": value,
+            "expected_type": expected_type,
+            "error": f"La valeur n'est pas au format {expected_type} attendu: {message}"
+        }
+    return validate
+
+
+def _compile_excel(column, expected_type, required, type_check):
+    isna = pd.isna
+
+    def validate(value, row):
+        if isna(value):
+            if required:
+                return {
+                    "column": column,
+                    "row": row,
+                    "value": "",
+                    "expected_type": expected_type,
+                    "error": "Champ obligatoire manquant"
+                }
+            return None
+        message = type_check(value)
+        if message is None:
+            return None
+        return {
+            "column": column,
+            "row": row,
+            "value": str(value),
+            "expected_type": expected_type,
+            "error": f"La valeur n'est pas au format {expected_type} attendu ({message})"
+        }
+    return validate
+
+
+def _compile_lenient(column, expected_type, required, type_check):
+    def validate(value, row):
+        if value is None or value == "":
+            if required:
+                return {"row": row, "column": column, "error": "Valeur obligatoire manquante"}
+            return None
+        message = type_check(value)
+        if message is None:
+            return None
+        return {"row": row, "column": column, "error": message}
+    return validate
+
+
+_COMPILERS = {
+    'csv': _compile_csv,
+    'excel': _compile_excel,
+    'lenient': _compile_lenient,
+}
+
+
+def compile_validators(column_specs=G4IT_COLUMN_SPECS, mode='csv'):
+    """Compiles column specifications into one specialized validator per column.
+
+    The type dispatch and the ``required`` lookup are resolved once here, so
+    validating a cell costs a single call with no dict lookup or branch chain.
+
+    Args:
+        column_specs (dict, optional): Column specifications.
+                                      Defaults to G4IT_COLUMN_SPECS.
+        mode (str, optional): ``'csv'`` for raw text cells, ``'excel'`` for
+                              typed values read by pandas, ``'lenient'`` for
+                              the rules of ``validate_columns``.
+
+    Returns:
+        dict: Column name -> ``validate(value, row)`` callable returning an
+        error dict, or None if the value is valid.
+    """
+    compiler = _COMPILERS[mode]
+    checks = TYPE_CHECKS[mode]
+    validators = {}
+    for column, spec in column_specs.items():
+        expected_type = spec['type']
+        type_check = checks.get(expected_type) or _unknown_type_check(expected_type)
+        validators[column] = compiler(column, expected_type, spec['required'], type_check)
+    return validators
+
+
+def get_validators(column_specs=None, mode='csv'):
+    """Returns the validator table for the given specs, reusing the precompiled
+    G4IT tables when the default specifications are used."""
+    if column_specs is None or column_specs is G4IT_COLUMN_SPECS:
+        return COMPILED_VALIDATORS[mode]
+    return compile_validators(column_specs, mode)
+
+
+# Tables compilées une seule fois au démarrage
+COMPILED_VALIDATORS = {mode: compile_validators(G4IT_COLUMN_SPECS, mode) for mode in _COMPILERS}
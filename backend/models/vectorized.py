@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+from .errors import ErrorCollector
+from .utils import G4IT_COLUMN_SPECS
+from .validators import get_validators
+
+_DATE_REGEX = r'^\d{4}-\d{2}-\d{2}$'
+_NUMERIC_TYPES = [int, float, bool]
+
+
+def _integer_mask(series, present):
+    """Rows of an integer column that may not hold an integer value."""
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return np.zeros(len(series), dtype=bool)
+    if pd.api.types.is_float_dtype(series):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        with np.errstate(invalid='ignore'):
+            integral = np.isfinite(values) & (values == np.floor(values))
+        return present & ~integral
+    numeric = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    with np.errstate(invalid='ignore'):
+        integral = np.isfinite(numeric) & (numeric == np.floor(numeric))
+    is_numeric = series.map(type).isin(_NUMERIC_TYPES).to_numpy()
+    return present & ~(is_numeric & integral)
+
+
+def _number_mask(series, present):
+    """Rows of a number column that may not hold a numeric value."""
+    if pd.api.types.is_numeric_dtype(series):
+        return np.zeros(len(series), dtype=bool)
+    is_numeric = series.map(type).isin(_NUMERIC_TYPES).to_numpy()
+    return present & ~is_numeric
+
+
+def _date_mask(series, present):
+    """Rows of a date column holding a string that is not a valid YYYY-MM-DD date."""
+    mask = np.zeros(len(series), dtype=bool)
+    if series.dtype != object:
+        return mask
+    # Seules les chaînes peuvent être en erreur (dates, nombres... sont acceptés)
+    text_positions = np.flatnonzero(series.map(type).to_numpy() == str)
+    if not len(text_positions):
+        return mask
+    text = series.iloc[text_positions]
+    well_formed = text.str.match(_DATE_REGEX).to_numpy(dtype=bool)
+    parsed = pd.to_datetime(text[well_formed], format='%Y-%m-%d', errors='coerce')
+    mask[text_positions[~well_formed]] = True
+    mask[text_positions[well_formed][parsed.isna().to_numpy()]] = True
+    return mask & present
+
+
+_TYPE_MASKS = {
+    'integer': _integer_mask,
+    'number': _number_mask,
+    'date': _date_mask,
+}
+
+
+def _first_critical(df, columns, column_specs):
+    """Position and column of the first missing required value, in row-major order."""
+    first = None
+    for order, column in enumerate(columns):
+        if not column_specs[column]['required']:
+            continue
+        missing = np.flatnonzero(df[column].isna().to_numpy())
+        if len(missing) and (first is None or missing[0] < first[0]):
+            first = (missing[0], order)
+    return first
+
+
+def iter_validated_columns(df, column_specs=G4IT_COLUMN_SPECS, first_row=2, collector=None):
+    """Validates a DataFrame column by column, with a step after each column.
+
+    Same checks as ``validate_dataframe``; the steps let the caller publish
+    the errors of each column before the next one is checked.
+
+    Args:
+        df (pandas.DataFrame): Data read with ``pd.read_excel``.
+        column_specs (dict, optional): Column specifications.
+                                      Defaults to G4IT_COLUMN_SPECS.
+        first_row (int, optional): File row number of the first data row.
+        collector (ErrorCollector, optional): Collector receiving the errors.
+                                              Defaults to an unbounded one.
+
+    Yields:
+        str: Name of the column just validated.
+    """
+    if collector is None:
+        collector = ErrorCollector()
+    validators = get_validators(column_specs, 'excel')
+    columns = [col for col in df.columns if col in validators]
+
+    # Fail-fast : ne garder que ce qui précède la première erreur critique (ordre ligne par ligne)
+    critical = _first_critical(df, columns, column_specs) if collector.fail_fast else None
+
+    for order, column in enumerate(columns):
+        series = df[column]
+        spec = column_specs[column]
+        missing = series.isna().to_numpy()
+        present = ~missing
+
+        flagged = missing if spec['required'] else np.zeros(len(series), dtype=bool)
+        type_mask = _TYPE_MASKS.get(spec['type'])
+        if type_mask is not None:
+            flagged = flagged | type_mask(series, present)
+
+        positions = np.flatnonzero(flagged)
+        if critical is not None:
+            stop_position, stop_order = critical
+            positions = positions[positions <= stop_position] if order <= stop_order \
+                else positions[positions < stop_position]
+
+        validate = validators[column]
+        values = series.iloc[positions].tolist()
+        for position, value in zip(positions.tolist(), values):
+            error = validate(value, position + first_row)
+            if error is not None:
+                collector.add(error)
+        yield column
+
+
+def validate_dataframe(df, column_specs=G4IT_COLUMN_SPECS, first_row=2, collector=None):
+    """Validates a DataFrame column by column with vectorized error masks.
+
+    For each known column, boolean masks flag missing required values and
+    values that may not match the expected type (numeric coercion, integer
+    check, date parsing). Only the flagged rows go through the compiled
+    Excel validator, which builds the error dict, so the Python cost is
+    proportional to the number of errors rather than to the number of cells.
+
+    Args:
+        df (pandas.DataFrame): Data read with ``pd.read_excel``.
+        column_specs (dict, optional): Column specifications.
+                                      Defaults to G4IT_COLUMN_SPECS.
+        first_row (int, optional): File row number of the first data row.
+        collector (ErrorCollector, optional): Collector receiving the errors.
+                                              Defaults to an unbounded one.
+
+    Returns:
+        ErrorCollector: The errors, column by column, in row order.
+    """
+    if collector is None:
+        collector = ErrorCollector()
+    for _ in iter_validated_columns(df, column_specs, first_row, collector):
+        pass
+    return collector
@@ -0,0 +1,265 @@
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from .utils import private_directory
+
+# Taille maximale par défaut des fichiers du dossier de travail (10 Go)
+DEFAULT_WORKSPACE_MAX_BYTES = 10 * 1024 * 1024 * 1024
+
+# Durée de conservation par défaut d'un fichier après sa dernière utilisation (1 heure)
+DEFAULT_ARTIFACT_TTL = 3600
+
+# Intervalle par défaut entre deux passages du nettoyage en arrière-plan (1 minute)
+DEFAULT_SWEEP_INTERVAL = 60
+
+# Préfixes des noms de fichiers produits par l'API, qui donnent leur type dans les statistiques
+MANAGED_PREFIXES = ('upload_', 'corrected_', 'consolidated_', 'export-')
+
+
+def _entry_size(path):
+    # Taille d'un fichier, ou total des fichiers d'un dossier (session de téléversement...)
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class Workspace:
+    """Lifecycle of the files and directories written by the API.
+
+    Every file (or directory, such as an upload session) the endpoints
+    create is registered with a time to live, counted from its last use
+    (registration or ``touch``), and the total size of the registered
+    entries is capped: past ``max_bytes``, the least recently used entries
+    are removed. Pinned entries (an upload being validated) are never
+    removed to make room, only when they expire. ``sweep`` removes the
+    expired entries; the application calls it periodically.
+
+    The workspace owns a dedicated directory, created private to the
+    current user: everything found in it when it is opened (left by a
+    previous run) is registered with the default time to live, in
+    modification time order, so it expires like the rest. Other
+    directories of the application are adopted the same way with
+    ``adopt``; nothing outside them is ever listed or removed.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_WORKSPACE_MAX_BYTES, default_ttl=DEFAULT_ARTIFACT_TTL,
+                 prefixes=MANAGED_PREFIXES):
+        """Creates the directory if needed and indexes the entries already in it.
+
+        Args:
+            directory (str): Directory dedicated to the workspace.
+            max_bytes (int, optional): Maximum total size of the registered entries.
+            default_ttl (int, optional): Seconds an entry is kept after its last use.
+            prefixes (tuple, optional): Name prefixes giving the kind of an
+                                        entry in ``stats`` (``other`` if none matches).
+
+        Raises:
+            PermissionError: If the directory exists and cannot be trusted
+                             (see ``private_directory``).
+        """
+        self.directory = private_directory(directory)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.prefixes = prefixes
+        self.evicted_files = 0
+        self.evicted_bytes = 0
+        self.expired_files = 0
+        self.expired_bytes = 0
+        self.sweeps = 0
+        self.last_sweep = None
+        # Chemin -> [taille, durée de vie, dernière utilisation, épinglé, type], du moins au plus récemment utilisé
+        self._index = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.adopt(self.directory)
+
+    def _kind(self, path):
+        name = os.path.basename(path)
+        return next((prefix.rstrip('_-') for prefix in self.prefixes if name.startswith(prefix)), 'other')
+
+    def adopt(self, directory, ttl=None, kind=None):
+        """Registers the entries already in a directory of the application.
+
+        Each file or sub-directory is registered as last used at its
+        modification time, oldest first, then the quota is applied.
+
+        Args:
+            directory (str): Directory whose entries the application created.
+            ttl (int, optional): Seconds an entry is kept after its last use.
+                                 Defaults to ``default_ttl``.
+            kind (str, optional): Kind of the entries in ``stats``. Defaults
+                                  to the kind given by their name prefix.
+
+        Returns:
+            int: Number of entries adopted.
+        """
+        entries = []
+        for name in os.listdir(directory):
+            path = os.path.abspath(os.path.join(directory, name))
+            if os.path.islink(path):
+                continue
+            try:
+                entries.append((os.stat(path).st_mtime, path, _entry_size(path)))
+            except OSError:
+                pass
+        with self._lock:
+            for mtime, path, size in sorted(entries):
+                previous = self._index.pop(path, None)
+                if previous is not None:
+                    self._size -= previous[0]
+                self._index[path] = [size, self.default_ttl if ttl is None else ttl, mtime, False,
+                                     kind or self._kind(path)]
+                self._size += size
+            self._index = OrderedDict(sorted(self._index.items(), key=lambda item: item[1][2]))
+            self._evict()
+        return len(entries)
+
+    def register(self, path, ttl=None, pinned=False, kind=None):
+        """Starts tracking a file or directory written by the API, evicting others over the quota.
+
+        Call it once the entry is complete: its current size (the total of
+        its files for a directory) is recorded. Registering it again
+        records its new size and restarts its time to live.
+
+        Args:
+            path (str): Path of the file or directory.
+            ttl (int, optional): Seconds the entry is kept after its last use.
+                                 Defaults to ``default_ttl``.
+            pinned (bool, optional): Never remove the entry to make room
+                                     (until ``release``); it still expires.
+            kind (str, optional): Kind of the entry in ``stats``. Defaults to
+                                  the kind given by its name prefix.
+
+        Returns:
+            str: The path, for chaining.
+        """
+        path = os.path.abspath(path)
+        size = _entry_size(path)
+        with self._lock:
+            previous = self._index.pop(path, None)
+            if previous is not None:
+                self._size -= previous[0]
+            self._index[path] = [size, self.default_ttl if ttl is None else ttl, time.time(), pinned,
+                                 kind or self._kind(path)]
+            self._size += size
+            self._evict()
+        return path
+
+    def touch(self, path):
+        """Marks an entry as used (downloaded, session read), restarting its time to live.
+
+        Returns:
+            bool: True if the entry is registered.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            entry = self._index.get(path)
+            if entry is None:
+                return False
+            entry[2] = time.time()
+            self._index.move_to_end(path)
+            return True
+
+    def release(self, path):
+        """Unpins an entry, which can then be removed to make room."""
+        with self._lock:
+            entry = self._index.get(os.path.abspath(path))
+            if entry is not None:
+                entry[3] = False
+
+    def remove(self, path):
+        """Removes a file or directory and stops tracking it (whether it was registered or not).
+
+        Returns:
+            bool: True if the entry existed.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            entry = self._index.pop(path, None)
+            if entry is not None:
+                self._size -= entry[0]
+        return self._delete(path)
+
+    def sweep(self, now=None):
+        """Removes the expired entries and forgets the entries deleted by other means.
+
+        Args:
+            now (float, optional): Current time (defaults to ``time.time()``).
+
+        Returns:
+            int: Number of expired entries removed.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [(path, entry[0]) for path, entry in self._index.items() if entry[2] + entry[1] <= now]
+            for path, size in expired:
+                del self._index[path]
+                self._size -= size
+            missing = [path for path in self._index if not os.path.exists(path)]
+            for path in missing:
+                self._size -= self._index.pop(path)[0]
+        removed = 0
+        for path, size in expired:
+            if self._delete(path):
+                removed += 1
+                with self._lock:
+                    self.expired_files += 1
+                    self.expired_bytes += size
+        with self._lock:
+            self.sweeps += 1
+            self.last_sweep = now
+        return removed
+
+    def stats(self):
+        """Returns the size held, per kind of entry, and the eviction and expiry counters."""
+        with self._lock:
+            kinds = {}
+            for entry in self._index.values():
+                counts = kinds.setdefault(entry[4], {"files": 0, "size_bytes": 0})
+                counts["files"] += 1
+                counts["size_bytes"] += entry[0]
+            return {
+                "files": len(self._index),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "pinned_files": sum(1 for entry in self._index.values() if entry[3]),
+                "by_kind": kinds,
+                "evicted_files": self.evicted_files,
+                "evicted_bytes": self.evicted_bytes,
+                "expired_files": self.expired_files,
+                "expired_bytes": self.expired_bytes,
+                "sweeps": self.sweeps,
+                "last_sweep": self.last_sweep
+            }
+
+    def _delete(self, path):
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def _evict(self):
+        # Appelé avec le verrou pris ; les fichiers épinglés sont laissés en place
+        if self._size <= self.max_bytes:
+            return
+        for path in [path for path, entry in self._index.items() if not entry[3]]:
+            if self._size <= self.max_bytes:
+                break
+            size = self._index.pop(path)[0]
+            self._size -= size
+            if self._delete(path):
+                self.evicted_files += 1
+                self.evicted_bytes += size
@@ -0,0 +1,29 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+# Les tests importent `models` et `main` comme l'application, depuis le dossier backend
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def api(tmp_path_factory):
+    """Imports the API with its files (workspace, sessions, databases) in a temporary directory."""
+    root = tmp_path_factory.mktemp("api")
+    os.environ.update(
+        WORKSPACE_DIR=str(root / "workspace"),
+        UPLOAD_SESSIONS_DIR=str(root / "sessions"),
+        VALIDATION_CACHE_DIR=str(root / "cache"),
+        DATABASE_DIR=str(root / "databases"),
+        EQUIPMENT_DB_PATH=str(root / "equipments.sqlite3"),
+        EXPORT_DB_PATH=str(root / "exports.sqlite3"),
+    )
+    return importlib.import_module("main")
+
+
+@pytest.fixture(scope="session")
+def client(api):
+    from fastapi.testclient import TestClient
+    return TestClient(api.app)
@@ -0,0 +1,165 @@
+import io
+import os
+import zipfile
+
+import pandas as pd
+import pytest
+
+from models import G4IT_COLUMN_SPECS, extract_archive, validate_batch, validate_path
+
+REQUIRED_COLUMNS = [name for name, spec in G4IT_COLUMN_SPECS.items() if spec['required']]
+VALID_ROW = ['Serveur 1', 'R740', '3', 'DC-PARIS', 'Serveur', 'Active', 'France']
+
+
+def csv_bytes(rows):
+    return ('\n'.join([','.join(REQUIRED_COLUMNS)] + [','.join(row) for row in rows]) + '\n').encode('utf-8')
+
+
+VALID_CSV = csv_bytes([VALID_ROW] * 3)
+INVALID_CSV = csv_bytes([VALID_ROW, ['Serveur 2', '', 'x', 'DC', 'Serveur', 'Active', 'France']])
+MISSING_COLUMNS_CSV = b'nomEquipementPhysique,modele\nServeur 1,R740\n'
+
+
+def xlsx_bytes(rows):
+    buffer = io.BytesIO()
+    pd.DataFrame(rows, columns=REQUIRED_COLUMNS).to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def zip_bytes(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def write(directory, name, content):
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return path
+
+
+@pytest.fixture
+def entries(tmp_path):
+    return [
+        {'filename': 'valide.csv', 'extension': '.csv', 'path': write(tmp_path, 'a.csv', VALID_CSV)},
+        {'filename': 'erreurs.csv', 'extension': '.csv', 'path': write(tmp_path, 'b.csv', INVALID_CSV)},
+        {'filename': 'valide.xlsx', 'extension': '.xlsx', 'path': write(tmp_path, 'c.xlsx', xlsx_bytes([VALID_ROW]))},
+        {'filename': 'colonnes.csv', 'extension': '.csv', 'path': write(tmp_path, 'd.csv', MISSING_COLUMNS_CSV)},
+        {'filename': 'illisible.xlsx', 'extension': '.xlsx', 'path': write(tmp_path, 'e.xlsx', b'pas un classeur')},
+        {'filename': 'notes.txt', 'extension': '.txt', 'path': None, 'archive': 'lot.zip'},
+        {'filename': 'lot2.zip', 'extension': '.zip', 'path': None, 'error': 'Archive ZIP invalide'},
+    ]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_batch_reports_each_file_in_order(entries, workers):
+    result = validate_batch(entries, REQUIRED_COLUMNS, workers=workers)
+    files = result['files']
+    assert [report['filename'] for report in files] == [entry['filename'] for entry in entries]
+    assert [report['is_valid'] for report in files] == [True, False, True, False, False, False, False]
+    assert files[0] == dict(validate_path(entries[0]['path'], '.csv', REQUIRED_COLUMNS), filename='valide.csv')
+    assert files[1]['error_summary']['total_errors'] == 2
+    assert files[3]['missing_required_columns'] == REQUIRED_COLUMNS[2:]
+    assert files[4]['error'].startswith('Format de fichier invalide')
+    assert files[5]['archive'] == 'lot.zip' and 'non supporté' in files[5]['error']
+    assert files[6]['error'] == 'Archive ZIP invalide'
+    assert all('path' not in report and 'extension' not in report for report in files)
+    assert result['is_valid'] is False
+    assert result['summary'] == {
+        'files': 7, 'valid_files': 2, 'invalid_files': 2, 'failed_files': 3, 'total_errors': 2,
+        'by_column': {'modele': {'missing': 1, 'type': 0}, 'quantite': {'missing': 0, 'type': 1}},
+    }
+
+
+def test_batch_of_valid_files(entries):
+    assert validate_batch(entries[:1] + entries[2:3], REQUIRED_COLUMNS, workers=2)['is_valid'] is True
+    assert validate_batch([], REQUIRED_COLUMNS)['is_valid'] is False
+
+
+def test_archive_members_are_extracted_under_generated_names(tmp_path):
+    archive = write(tmp_path, 'lot.zip', zip_bytes({
+        'inventaires/a.csv': VALID_CSV,
+        '../../evasion.csv': INVALID_CSV,
+        'inventaires/b.XLSX': xlsx_bytes([VALID_ROW]),
+        'lisez-moi.txt': b'texte',
+        '__MACOSX/inventaires/._a.csv': b'x',
+        'inventaires/.cache.csv': b'x',
+        'vide/': b'',
+    }))
+    target = tmp_path / 'extraits'
+    target.mkdir()
+    members = extract_archive(archive, str(target))
+    assert [(member['filename'], member['extension']) for member in members] == [
+        ('inventaires/a.csv', '.csv'), ('../../evasion.csv', '.csv'),
+        ('inventaires/b.XLSX', '.xlsx'), ('lisez-moi.txt', '.txt'),
+    ]
+    assert members[3]['path'] is None
+    assert sorted(os.listdir(target)) == ['member_0.csv', 'member_1.csv', 'member_2.xlsx']
+    assert not os.path.exists(tmp_path.parent / 'evasion.csv')
+    with open(members[1]['path'], 'rb') as f:
+        assert f.read() == INVALID_CSV
+
+
+def test_archive_size_limit(tmp_path):
+    archive = write(tmp_path, 'lot.zip', zip_bytes({'a.csv': VALID_CSV, 'b.csv': VALID_CSV}))
+    target = tmp_path / 'extraits'
+    target.mkdir()
+    with pytest.raises(ValueError, match='trop volumineuse'):
+        extract_archive(archive, str(target), max_size=2 * len(VALID_CSV) - 1)
+    assert os.listdir(target) == []
+    assert len(extract_archive(archive, str(target), max_size=2 * len(VALID_CSV))) == 2
+
+
+def test_invalid_archive(tmp_path):
+    with pytest.raises(ValueError, match='Archive ZIP invalide'):
+        extract_archive(write(tmp_path, 'lot.zip', b'pas une archive'), str(tmp_path))
+
+
+def batch_dirs(api):
+    return [name for name in os.listdir(api.WORKSPACE_DIR) if name.startswith('batch_')]
+
+
+def test_api_validates_files_and_archives(api, client):
+    files = [
+        ('files', ('valide.csv', io.BytesIO(VALID_CSV))),
+        ('files', ('lot.zip', io.BytesIO(zip_bytes({'a.csv': INVALID_CSV, 'b.xlsx': xlsx_bytes([VALID_ROW])})))),
+        ('files', ('abime.zip', io.BytesIO(b'pas une archive'))),
+        ('files', ('notes.pdf', io.BytesIO(b'%PDF'))),
+    ]
+    response = client.post('/api/validate-files', files=files, data={'max_errors': '1'})
+    assert response.status_code == 200
+    body = response.json()
+    assert [(report['filename'], report.get('archive'), report['is_valid']) for report in body['files']] == [
+        ('valide.csv', None, True), ('a.csv', 'lot.zip', False), ('b.xlsx', 'lot.zip', True),
+        ('abime.zip', None, False), ('notes.pdf', None, False),
+    ]
+    assert len(body['files'][1]['type_errors']) == 1
+    assert body['files'][1]['error_summary']['total_errors'] == 2
+    assert body['files'][3]['error'].startswith('Archive ZIP invalide')
+    assert body['summary']['failed_files'] == 2
+    assert body['required_columns'] == api.REQUIRED_COLUMNS
+    # Dossier du lot supprimé une fois la réponse prête
+    assert batch_dirs(api) == []
+
+
+def test_api_archive_over_the_size_limit(api, client, monkeypatch):
+    monkeypatch.setattr(api, 'MAX_ARCHIVE_SIZE', len(VALID_CSV))
+    archive = zip_bytes({'a.csv': VALID_CSV, 'b.csv': VALID_CSV})
+    response = client.post('/api/validate-files', files=[('files', ('lot.zip', io.BytesIO(archive)))])
+    assert response.status_code == 200
+    report, = response.json()['files']
+    assert report['is_valid'] is False and 'trop volumineuse' in report['error']
+    assert batch_dirs(api) == []
+
+
+def test_api_removes_the_batch_directory_on_failure(api, client, monkeypatch):
+    def fail(*args):
+        raise RuntimeError('panne')
+
+    monkeypatch.setattr(api, 'validate_batch', fail)
+    response = client.post('/api/validate-files', files=[('files', ('valide.csv', io.BytesIO(VALID_CSV)))])
+    assert response.status_code == 500
+    assert batch_dirs(api) == []
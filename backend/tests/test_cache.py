@@ -0,0 +1,54 @@
+import os
+import stat
+
+import pytest
+
+from models import ValidationCache
+
+RESULT = {"is_valid": False, "type_errors": [{"row": 2, "column": "quantite", "error": "x"}]}
+
+
+def test_results_are_cached_by_key(tmp_path):
+    cache = ValidationCache(str(tmp_path / "cache"))
+    key = cache.key("abc", ".csv", 1000, False)
+    assert key != cache.key("abc", ".csv", 1000, True)
+    assert cache.get(key) is None
+    cache.put(key, RESULT)
+    assert cache.get(key) == RESULT
+    # Entrées retrouvées par un nouveau cache sur le même dossier
+    assert ValidationCache(str(tmp_path / "cache")).get(key) == RESULT
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_results_are_evicted(tmp_path):
+    # Place pour deux résultats seulement
+    cache = ValidationCache(str(tmp_path / "cache"), max_bytes=250)
+    keys = [cache.key(str(index)) for index in range(3)]
+    for key in keys[:2]:
+        cache.put(key, RESULT)
+    cache.get(keys[0])
+    cache.put(keys[2], RESULT)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == RESULT and cache.get(keys[2]) == RESULT
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_directory_is_private(tmp_path):
+    directory = tmp_path / "cache"
+    ValidationCache(str(directory))
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+
+
+def test_cache_refuses_untrusted_directory(tmp_path):
+    directory = tmp_path / "shared"
+    directory.mkdir()
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        ValidationCache(str(directory))
+
+
+def test_disabled_cache_creates_nothing(tmp_path):
+    cache = ValidationCache(str(tmp_path / "cache"), max_bytes=0)
+    cache.put(cache.key("abc"), RESULT)
+    assert not cache.enabled and cache.get(cache.key("abc")) is None
+    assert not os.path.exists(tmp_path / "cache")
@@ -0,0 +1,109 @@
+import csv
+import io
+import os
+import random
+from collections import Counter
+from datetime import date
+
+import pytest
+
+from models import GroupAggregator, consolidate_rows
+from models import consolidation as consolidation_module
+from models.consolidation import DEFAULT_KEY_COLUMNS
+
+HEADER = ['nomEquipementPhysique', 'modele', 'quantite', 'type', 'nomCourtDatacenter', 'statut', 'paysDUtilisation']
+
+
+def random_groups(count, keys, seed=7):
+    rng = random.Random(seed)
+    return [((f'modele-{rng.randrange(keys)}', rng.choice(['Serveur', 'Switch'])), rng.randint(1, 9))
+            for _ in range(count)]
+
+
+def expected_totals(rows):
+    quantities, counts = Counter(), Counter()
+    for key, quantity in rows:
+        quantities[key] += quantity
+        counts[key] += 1
+    return sorted((key, quantities[key], counts[key]) for key in quantities)
+
+
+def test_groups_in_memory_are_sorted_by_key():
+    rows = random_groups(500, 40)
+    with GroupAggregator() as aggregator:
+        for key, quantity in rows:
+            aggregator.add(key, quantity)
+        assert list(aggregator.groups()) == expected_totals(rows)
+        assert aggregator.rows == 500 and aggregator.spilled_runs == 0
+
+
+def test_spilled_runs_are_merged_in_several_passes(tmp_path, monkeypatch):
+    # Série écrite tous les 5 groupes et fusion par 3 : plusieurs passes de fusion intermédiaires
+    monkeypatch.setattr(consolidation_module, 'MAX_MERGE_FAN_IN', 3)
+    monkeypatch.setattr(consolidation_module, 'RUN_BATCH_SIZE', 2)
+    rows = random_groups(2000, 60)
+    aggregator = GroupAggregator(max_groups=5, spill_dir=str(tmp_path))
+    for key, quantity in rows:
+        aggregator.add(key, quantity)
+    assert aggregator.spilled_runs > 3 * 3
+
+    groups = list(aggregator.groups())
+    assert groups == expected_totals(rows)
+    assert sum(quantity for _, quantity, _ in groups) == sum(quantity for _, quantity in rows)
+    assert len(aggregator._runs) < 3
+    # Séries fusionnées supprimées au fur et à mesure, le reste à la fermeture
+    run_dir, = os.listdir(tmp_path)
+    assert len(os.listdir(tmp_path / run_dir)) == len(aggregator._runs)
+    aggregator.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_consolidate_rows_normalizes_keys_and_quantities():
+    rows = [
+        ['a', 'R740', '3', 'Serveur', 'DC1', 'Active', 'France'],
+        ['b', ' R740 ', 2.5, 'Serveur', 'DC1', 'Active', 'France'],
+        ['c', 'R740', 'x', 'Serveur', 'DC1', 'Active', 'France'],
+        ['d', 'R740', '', 'Serveur', 'DC1', 'Active'],
+        ['e', None, float('nan'), 'Serveur', 'DC1', date(2023, 1, 31), 'France'],
+        ['f', 'R740', True, 'Serveur', 'DC1', 'Active', 'France'],
+    ]
+    aggregator, defaulted = consolidate_rows(HEADER, rows, max_groups=1)
+    with aggregator:
+        assert list(aggregator.groups()) == [
+            (('', 'Serveur', 'DC1', '2023-01-31', 'France'), 1, 1),
+            (('R740', 'Serveur', 'DC1', 'Active', ''), 1, 1),
+            (('R740', 'Serveur', 'DC1', 'Active', 'France'), 7.5, 4),
+        ]
+    assert defaulted == 4
+    assert aggregator.rows == 6 and aggregator.spilled_runs == 3
+
+
+def test_consolidate_rows_requires_its_columns():
+    with pytest.raises(KeyError, match='paysDUtilisation'):
+        consolidate_rows(HEADER[:-1], [])
+    with pytest.raises(KeyError, match='volume'):
+        consolidate_rows(HEADER, [], quantity_column='volume')
+
+
+def test_api_consolidates_a_file(api, client, monkeypatch):
+    monkeypatch.setattr(api, 'CONSOLIDATION_MAX_GROUPS', 3)
+    rng = random.Random(11)
+    rows = [[f'srv-{i}', f'R{rng.randrange(10)}', str(rng.randint(1, 5)), 'Serveur', f'DC{rng.randrange(2)}',
+             'Active', 'France'] for i in range(300)]
+    content = io.StringIO()
+    csv.writer(content).writerows([HEADER] + rows)
+    response = client.post('/api/consolidate-file', data={'preview': '2'},
+                           files={'file': ('inventaire.csv', io.BytesIO(content.getvalue().encode('utf-8')))})
+    assert response.status_code == 200
+    body = response.json()
+    expected = expected_totals([(tuple(row[1:2] + row[3:]), int(row[2])) for row in rows])
+    assert body['rows'] == 300 and body['groups'] == len(expected)
+    assert body['total_quantity'] == sum(int(row[2]) for row in rows)
+    assert body['spilled_runs'] > 0
+    assert body['key_columns'] == DEFAULT_KEY_COLUMNS and len(body['preview']) == 2
+
+    with open(os.path.join(api.WORKSPACE_DIR, body['consolidated_file']), newline='', encoding='utf-8') as f:
+        written = list(csv.reader(f))
+    assert written[0] == DEFAULT_KEY_COLUMNS + ['quantite', 'lignes']
+    assert [(tuple(row[:5]), int(row[5]), int(row[6])) for row in written[1:]] == expected
+    assert not [name for name in os.listdir(api.WORKSPACE_DIR) if name.startswith('consolidation_')]
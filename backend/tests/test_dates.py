@@ -0,0 +1,129 @@
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from models import ColumnarTable, normalize_date_values, normalize_dates
+from models.dates import DAY_FIRST, ISO_FORMAT, MONTH_FIRST
+
+
+def test_day_first_values_decide_the_order():
+    values, summary = normalize_date_values(["31/01/2023", "02/03/2023", "15-12-2022"], column="dateAchat")
+    assert values == ["2023-01-31", "2023-03-02", "2022-12-15"]
+    assert summary["detected_format"] == DAY_FIRST
+    assert summary["votes"] == {"day_first": 2, "month_first": 0}
+    assert summary["ambiguous"] is False
+    assert summary["column"] == "dateAchat"
+    assert summary["converted"] == 3 and summary["invalid"] == 0
+
+
+def test_month_first_values_decide_the_order():
+    values, summary = normalize_date_values(["01/31/2023", "02/03/2023", "12.15.2022"])
+    assert values == ["2023-01-31", "2023-02-03", "2022-12-15"]
+    assert summary["detected_format"] == MONTH_FIRST
+    assert summary["votes"] == {"day_first": 0, "month_first": 2}
+
+
+def test_votes_are_weighted_by_row_counts():
+    values = ["31/01/2023", "01/31/2023", "05/06/2023"]
+    converted, summary = normalize_date_values(values, counts=[2, 5, 10])
+    assert summary["votes"] == {"day_first": 2, "month_first": 5}
+    assert summary["detected_format"] == MONTH_FIRST
+    # Valeur incompatible avec l'ordre retenu : laissée telle quelle
+    assert converted == ["31/01/2023", "2023-01-31", "2023-05-06"]
+    assert summary["rows"] == 17 and summary["converted"] == 15
+    assert summary["invalid"] == 2 and summary["invalid_values"] == ["31/01/2023"]
+
+
+@pytest.mark.parametrize("values, expected", [
+    (["05/06/2023", "01/02/2023"], ["2023-06-05", "2023-02-01"]),     # aucun vote
+    (["31/01/2023", "01/31/2023"], ["2023-01-31", "01/31/2023"]),     # votes à égalité
+])
+def test_ambiguous_columns_use_the_default_order(values, expected):
+    converted, summary = normalize_date_values(values)
+    assert summary["ambiguous"] is True
+    assert summary["detected_format"] == DAY_FIRST
+    assert converted == expected
+
+
+def test_forced_format_skips_the_inference():
+    converted, summary = normalize_date_values(["31/01/2023", "05/06/2023"], date_format=MONTH_FIRST)
+    assert converted == ["31/01/2023", "2023-05-06"]
+    assert summary["detected_format"] == MONTH_FIRST and summary["ambiguous"] is False
+    assert summary["votes"] == {"day_first": 1, "month_first": 0}
+    assert summary["invalid"] == 1
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("31/01/23", "2023-01-31"),
+    ("31/01/68", "2068-01-31"),
+    ("31/01/69", "1969-01-31"),
+    ("31/01/99", "1999-01-31"),
+    ("31/01/2023", "2023-01-31"),
+    ("1/2/2023", "2023-02-01"),
+    ("31/01/2023 10:30:00", "2023-01-31"),
+])
+def test_two_and_four_digit_years(value, expected):
+    assert normalize_date_values([value])[0] == [expected]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2023-01-31", "2023-01-31"),
+    ("2023/1/5", "2023-01-05"),
+    ("2023.12.01", "2023-12-01"),
+    ("2023-01-31T08:00:00", "2023-01-31"),
+    ("  2023-01-31 ", "2023-01-31"),
+])
+def test_year_first_values(value, expected):
+    converted, summary = normalize_date_values([value])
+    assert converted == [expected]
+    assert summary["detected_format"] == ISO_FORMAT
+    assert summary["already_valid"] + summary["converted"] == 1
+
+
+def test_empty_native_and_invalid_values():
+    values = [None, "", "  ", date(2021, 1, 31), datetime(2021, 1, 31, 12), "2021-02-30", "hier",
+              "31/13/2023", 20230131, "2021-01-31"]
+    converted, summary = normalize_date_values(values)
+    assert converted == values
+    assert summary["empty"] == 3
+    assert summary["already_valid"] == 3
+    assert summary["converted"] == 0
+    assert summary["invalid"] == 4
+    assert summary["invalid_values"] == ["2021-02-30", "hier", "31/13/2023", 20230131]
+
+
+def test_only_five_invalid_values_are_reported():
+    _, summary = normalize_date_values([f"hier {index}" for index in range(8)])
+    assert summary["invalid"] == 8 and len(summary["invalid_values"]) == 5
+
+
+def test_column_without_text():
+    converted, summary = normalize_date_values([None, date(2020, 5, 1)], counts=np.array([3, 4]))
+    assert converted == [None, date(2020, 5, 1)]
+    assert summary["detected_format"] is None
+    assert summary["rows"] == 7 and summary["empty"] == 3 and summary["already_valid"] == 4
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        normalize_date_values(["31/01/2023"], date_format="YYYY/DD/MM")
+
+
+def test_normalize_dates_converts_the_date_columns_of_a_table():
+    rows = [{"nomEquipementPhysique": f"Serveur {index}",
+             "dateAchat": ["31/01/2023", "05/06/2023", ""][index % 3],
+             "dateRetrait": ["01/31/2030", "2030-02-01"][index % 2]} for index in range(30)]
+    table = ColumnarTable.from_rows(rows)
+    summaries = normalize_dates(table)
+    assert [summary["column"] for summary in summaries] == ["dateAchat", "dateRetrait"]
+    assert summaries[0]["rows"] == 30 and summaries[0]["converted"] == 20 and summaries[0]["empty"] == 10
+    assert table.column("dateAchat")[:3] == ["2023-01-31", "2023-06-05", ""]
+    assert table.column("dateRetrait")[:2] == ["2030-01-31", "2030-02-01"]
+    assert table.column("nomEquipementPhysique")[0] == "Serveur 0"
+
+
+def test_normalize_dates_of_a_missing_column():
+    table = ColumnarTable.from_rows([{"dateAchat": "31/01/2023"}])
+    with pytest.raises(KeyError):
+        normalize_dates(table, ["dateRetrait"])
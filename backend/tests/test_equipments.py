@@ -0,0 +1,145 @@
+import pytest
+
+from models import EquipmentStore
+
+HEADER = ["nomEquipementPhysique", "modele", "quantite", "nomCourtDatacenter", "type", "dateAchat"]
+
+
+def inventory(count, prefix="Serveur"):
+    return [[f"{prefix} {index}", f"Modèle {index % 5}", str(index % 4 + 1), f"DC-{index % 3}",
+             "Serveur" if index % 2 else "Écran", "2021-01-31"] for index in range(count)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EquipmentStore(str(tmp_path / "equipments.sqlite3"))
+    store.import_rows("file-a", HEADER, inventory(95), "a.csv")
+    yield store
+    store.close()
+
+
+def walk(store, **options):
+    """Reads every page by following the cursors; returns the pages."""
+    pages, cursor = [], None
+    while True:
+        page = store.page(cursor=cursor, count=cursor is None, **options)
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_cursor_pages_cover_every_row_once(store):
+    pages = walk(store, limit=10)
+    ids = [equipment["id"] for page in pages for equipment in page["equipments"]]
+    assert len(pages) == 10
+    assert ids == sorted(ids) and len(set(ids)) == 95
+    assert pages[0]["total_items"] == 95
+    assert all(page["total_items"] is None for page in pages[1:])
+
+
+def test_cursor_pages_match_offset_pages(store):
+    by_cursor = [page["equipments"] for page in walk(store, limit=7, sort="-model")]
+    by_offset = [store.page(limit=7, offset=7 * index, sort="-model", count=False)["equipments"]
+                 for index in range(len(by_cursor))]
+    assert by_cursor == by_offset
+    models = [equipment["model"] for page in by_cursor for equipment in page]
+    assert models == sorted(models, reverse=True)
+
+
+def test_cursor_survives_imports(store):
+    first = store.page(limit=10)
+    store.import_rows("file-b", HEADER, inventory(5, "Baie"), "b.csv")
+    # Nouvel import de la même source : lignes remplacées, nouveaux identifiants en fin de table
+    store.import_rows("file-a", HEADER, inventory(95), "a.csv")
+    following = store.page(limit=10, cursor=first["next_cursor"], source="file-b")
+    assert [equipment["name"] for equipment in following["equipments"]] == [f"Baie {i}" for i in range(5)]
+
+
+def test_filters_and_search(store):
+    page = store.page(limit=100, type="Écran", datacenter="DC-0")
+    assert page["total_items"] == len([i for i in range(95) if i % 2 == 0 and i % 3 == 0])
+    assert store.page(search="modele 3 serv", limit=100)["total_items"] == 19
+    page = store.page(limit=3, fields=["name"])
+    assert page["equipments"][0] == {"id": page["equipments"][0]["id"], "name": "Serveur 0"}
+
+
+def test_invalid_requests(store):
+    cursor = store.page(limit=5)["next_cursor"]
+    with pytest.raises(ValueError):
+        store.page(cursor=cursor, sort="model")
+    with pytest.raises(ValueError):
+        store.page(cursor="pas-un-curseur")
+    with pytest.raises(ValueError):
+        store.page(sort="inconnu")
+    with pytest.raises(ValueError):
+        store.page(couleur="rouge")
+
+
+def test_api_cursor_pagination(api, client):
+    api.equipment_store.import_rows("file-api", HEADER, inventory(25, "Api"), "api.csv")
+    response = client.get("/api/equipments", params={"limit": 10, "source": "file-api"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_items"] == 25 and body["total_pages"] == 3
+    names = [equipment["name"] for equipment in body["equipments"]]
+    while body["next_cursor"]:
+        body = client.get("/api/equipments", params={"limit": 10, "source": "file-api",
+                                                     "cursor": body["next_cursor"]}).json()
+        assert "total_items" not in body
+        names += [equipment["name"] for equipment in body["equipments"]]
+    assert names == [f"Api {index}" for index in range(25)]
+    assert client.get("/api/equipments", params={"cursor": "invalide"}).status_code == 400
+
+
+@pytest.mark.parametrize("limit, expected_limit, expected_pages", [(0, 1, 25), (-3, 1, 25), (5000, 1000, 1)])
+def test_api_page_size_is_clamped(api, client, limit, expected_limit, expected_pages):
+    api.equipment_store.import_rows("file-api", HEADER, inventory(25, "Api"), "api.csv")
+    response = client.get("/api/equipments", params={"limit": limit, "page": 2, "source": "file-api"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["limit"] == expected_limit
+    assert body["total_items"] == 25 and body["total_pages"] == expected_pages
+    # Page 2 au-delà de la fin avec 1000 lignes par page : dernière page
+    assert body["page"] == min(2, expected_pages)
+    assert len(body["equipments"]) == (1 if expected_limit == 1 else 25)
+
+
+@pytest.mark.parametrize("limit, expected_limit, expected_pages", [(0, 1, 6), (5000, 1000, 1)])
+def test_api_process_file_data_page_size_is_clamped(client, limit, expected_limit, expected_pages):
+    content = "\n".join([",".join(HEADER)] + [",".join(row) for row in inventory(6, "Fichier")]) + "\n"
+    response = client.post("/api/process-file-data", data={"limit": str(limit)},
+                           files={"file": ("inventaire.csv", content.encode("utf-8"))})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["limit"] == expected_limit
+    assert body["total_items"] == 6 and body["total_pages"] == expected_pages
+    assert len(body["equipments"]) == min(expected_limit, 6)
+    assert body["source"].startswith("file-")
+
+
+def test_api_process_file_data_returns_every_row_by_default(client):
+    content = "\n".join([",".join(HEADER)] + [",".join(row) for row in inventory(1500, "Complet")]) + "\n"
+    files = {"file": ("complet.csv", content.encode("utf-8"))}
+    body = client.post("/api/process-file-data", files=files).json()
+    assert [equipment["name"] for equipment in body["equipments"]] == [f"Complet {index}" for index in range(1500)]
+    assert body["total_items"] == 1500 and body["total_pages"] == 1 and body["limit"] == 1500
+    assert body["next_cursor"] is None
+    ids = [int(equipment["id"][3:]) for equipment in body["equipments"]]
+    assert ids == sorted(ids)
+
+    # Pagination dès qu'un paramètre de page est envoyé
+    body = client.post("/api/process-file-data", data={"source": body["source"], "page": "2"}).json()
+    assert [equipment["name"] for equipment in body["equipments"]] == [f"Complet {index}" for index in range(10, 20)]
+    assert body["total_pages"] == 150 and body["next_cursor"]
+
+
+def test_api_page_past_the_end_returns_the_last_page(api, client):
+    api.equipment_store.import_rows("file-api", HEADER, inventory(25, "Api"), "api.csv")
+    body = client.get("/api/equipments", params={"limit": 10, "page": 99, "source": "file-api"}).json()
+    assert body["page"] == 3 and body["total_pages"] == 3
+    assert [equipment["name"] for equipment in body["equipments"]] == [f"Api {index}" for index in range(20, 25)]
+    assert body["next_cursor"] is None
+    # Aucun équipement : page vide, sans erreur
+    body = client.get("/api/equipments", params={"page": 4, "source": "absente"}).json()
+    assert body["equipments"] == [] and body["total_items"] == 0 and body["page"] == 4
@@ -0,0 +1,84 @@
+from models import ErrorCollector
+
+
+def type_error(row, column="quantite", error="La valeur n'est pas au format integer attendu"):
+    return {"column": column, "row": row, "value": "x", "expected_type": "integer", "error": error}
+
+
+def missing(row, column="modele"):
+    return {"column": column, "row": row, "value": "", "expected_type": "string",
+            "error": "Champ obligatoire manquant"}
+
+
+def test_consecutive_rows_are_run_length_encoded():
+    collector = ErrorCollector()
+    for row in (2, 3, 4, 7):
+        collector.add(type_error(row))
+    assert [(e["row"], e.get("row_end"), e.get("count")) for e in collector.errors] == [
+        (2, 4, 3), (7, None, None)
+    ]
+    assert collector.total == 4
+    assert collector.reported == 2
+
+
+def test_runs_are_kept_per_column_and_message():
+    collector = ErrorCollector()
+    collector.add(type_error(2))
+    collector.add(type_error(2, column="nbCoeur"))
+    collector.add(type_error(3, error="autre message"))
+    collector.add(type_error(3, column="nbCoeur"))
+    assert [(e["column"], e["row"], e.get("row_end")) for e in collector.errors] == [
+        ("quantite", 2, None), ("nbCoeur", 2, 3), ("quantite", 3, None)
+    ]
+    assert collector.summary()["by_column"] == {
+        "quantite": {"missing": 0, "type": 2}, "nbCoeur": {"missing": 0, "type": 2}
+    }
+
+
+def test_cap_keeps_exact_counts():
+    collector = ErrorCollector(max_errors=2)
+    for row in range(2, 12, 2):
+        collector.add(type_error(row))
+    # Une série ouverte continue de s'étendre même une fois la limite atteinte
+    collector.add(type_error(11, column="nbCoeur"))
+    summary = collector.summary()
+    assert len(collector.errors) == 2
+    assert summary["total_errors"] == 6
+    assert summary["reported_errors"] == 2
+    assert summary["truncated"] is True
+    assert summary["by_column"]["quantite"]["type"] == 5
+
+
+def test_fail_fast_stops_on_missing_value():
+    collector = ErrorCollector(fail_fast=True)
+    assert collector.add(type_error(2)) is True
+    assert collector.add(missing(3)) is False
+    assert collector.stopped
+    assert collector.summary()["stopped_early"] is True
+    assert collector.summary()["by_column"]["modele"] == {"missing": 1, "type": 0}
+
+
+def test_merge_continues_runs_across_parts():
+    first, second = ErrorCollector(), ErrorCollector()
+    first.add(type_error(3))
+    first.add(type_error(4))
+    second.add(type_error(1))
+    second.add(type_error(2))
+    second.add(missing(2))
+    merged = ErrorCollector()
+    merged.merge(first)
+    merged.merge(second, row_offset=4)
+    assert [(e["column"], e["row"], e.get("row_end"), e.get("count")) for e in merged.errors] == [
+        ("quantite", 3, 6, 4), ("modele", 6, None, None)
+    ]
+    assert merged.total == 5
+
+
+def test_drain_keeps_open_runs():
+    collector = ErrorCollector()
+    collector.add(type_error(2))
+    collector.add(type_error(5))
+    assert [e["row"] for e in collector.drain()] == [2]
+    collector.add(type_error(6))
+    assert [(e["row"], e["row_end"]) for e in collector.drain(final=True)] == [(5, 6)]
+    assert collector.errors == []
@@ -0,0 +1,148 @@
+import csv
+import gzip
+import io
+import json
+import os
+
+import openpyxl
+import pytest
+
+from models import iter_export
+from models.export import EXPORT_COLUMNS, EXPORT_HEADER, export_record, export_row, write_parquet_export
+
+EQUIPMENTS = [
+    {"equipmentType": "Serveur", "manufacturer": "Dell", "model": f"R{index}", "quantity": index,
+     "purchaseYear": "2021", "originalIds": [f"eq-{index}", f"eq-{index + 100}"]}
+    for index in range(1, 2501)
+]
+
+
+def test_iter_export_streams_what_it_writes(tmp_path):
+    path = str(tmp_path / "export.csv")
+    chunks = list(iter_export(EQUIPMENTS, path, "csv", batch_rows=100))
+    assert len(chunks) > 20
+    with open(path, "rb") as f:
+        assert f.read() == b"".join(chunks)
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8-sig"))))
+    assert rows[0] == EXPORT_HEADER
+    assert rows[1:] == [[str(value) for value in export_row(equipment)] for equipment in EQUIPMENTS]
+
+
+def test_interrupted_export_leaves_no_file(tmp_path):
+    path = str(tmp_path / "export.csv")
+    chunks = iter_export(EQUIPMENTS, path, "csv", batch_rows=100)
+    next(chunks)
+    chunks.close()
+    assert not os.path.exists(path)
+
+
+def test_compressed_and_ndjson_exports(tmp_path):
+    csv_bytes = b"".join(iter_export(EQUIPMENTS, str(tmp_path / "a.csv"), "csv"))
+    assert gzip.decompress(b"".join(iter_export(EQUIPMENTS, str(tmp_path / "a.csv.gz"), "csv.gz"))) == csv_bytes
+    lines = b"".join(iter_export(EQUIPMENTS, str(tmp_path / "a.ndjson"), "ndjson")).decode("utf-8").splitlines()
+    assert len(lines) == len(EQUIPMENTS)
+    assert json.loads(lines[0])["originalIds"] == ["eq-1", "eq-101"]
+
+
+def test_parquet_export_round_trip(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    equipments = EQUIPMENTS + [{"model": "Sans quantité", "quantity": "", "cpu": 8, "originalIds": []}]
+    path = str(tmp_path / "export.parquet")
+    assert write_parquet_export(iter(equipments), path, row_group_rows=1000) == len(equipments)
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    assert parquet.metadata.row_group(0).column(0).compression == "ZSTD"
+    table = parquet.read()
+    assert table.column_names == [field for _, field, _ in EXPORT_COLUMNS] + ["originalIds"]
+    assert str(table.schema.field("quantity").type) == "int64"
+    expected = [export_record(equipment) for equipment in equipments]
+    expected[-1].update(quantity=None, cpu="8")
+    assert table.to_pylist() == expected
+
+
+def test_empty_parquet_export(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "export.parquet")
+    assert write_parquet_export([], path) == 0
+    assert pq.read_table(path).num_rows == 0
+
+
+def test_api_export_reuses_identical_exports(api, client):
+    payload = {"format": "csv", "equipments": EQUIPMENTS}
+    first = client.post("/api/export", json=payload)
+    assert first.status_code == 200
+    assert "X-Export-Reused" not in first.headers
+    path = first.headers["X-Export-Path"]
+    assert os.path.dirname(path) == api.WORKSPACE_DIR
+    with open(path, "rb") as f:
+        assert f.read() == first.content
+    # Aucun fichier partiel laissé dans le dossier de travail
+    assert not [name for name in os.listdir(api.WORKSPACE_DIR) if name.endswith(".part")]
+    assert api.workspace.stats()["by_kind"]["export"]["files"] >= 1
+
+    second = client.post("/api/export", json=payload)
+    assert second.headers["X-Export-Reused"] == "true"
+    assert second.headers["X-Export-Path"] == path
+    assert second.headers["X-Export-ID"] != first.headers["X-Export-ID"]
+    assert second.content == first.content
+
+    history = client.get("/api/exports", params={"format": "csv"}).json()
+    assert [(entry["id"], entry["reused"]) for entry in history["exports"][:2]] == [
+        (second.headers["X-Export-ID"], True), (first.headers["X-Export-ID"], False)
+    ]
+    download = client.get(f"/api/download-file/{os.path.basename(path)}")
+    assert download.content == first.content
+
+
+def test_api_export_key_ignores_the_json_layout(client):
+    payload = {"format": "ndjson", "equipments": EQUIPMENTS[:50]}
+    first = client.post("/api/export", json=payload)
+    # Mêmes équipements, clés dans l'ordre inverse et corps indenté
+    reordered = {"equipments": [dict(reversed(list(equipment.items()))) for equipment in EQUIPMENTS[:50]],
+                 "format": "ndjson"}
+    second = client.post("/api/export", content=json.dumps(reordered, indent=2),
+                         headers={"Content-Type": "application/json"})
+    assert second.headers["X-Export-Reused"] == "true"
+    assert second.headers["X-Export-Path"] == first.headers["X-Export-Path"]
+
+    other = client.post("/api/export", json={"format": "ndjson", "equipments": EQUIPMENTS[1:51]})
+    assert "X-Export-Reused" not in other.headers
+    assert other.headers["X-Export-Path"] != first.headers["X-Export-Path"]
+
+
+def test_api_export_regenerates_a_removed_file(api, client):
+    payload = {"format": "ndjson", "equipments": EQUIPMENTS[:10]}
+    path = client.post("/api/export", json=payload).headers["X-Export-Path"]
+    api.workspace.remove(path)
+    again = client.post("/api/export", json=payload)
+    assert "X-Export-Reused" not in again.headers
+    assert os.path.exists(path)
+
+
+def test_api_xlsx_export(client):
+    response = client.post("/api/export", json={"format": "xlsx", "equipments": EQUIPMENTS[:50]})
+    assert response.status_code == 200
+    sheet = openpyxl.load_workbook(io.BytesIO(response.content), read_only=True).active
+    rows = list(sheet.iter_rows(values_only=True))
+    assert list(rows[0]) == EXPORT_HEADER
+    assert len(rows) == 51
+
+
+def test_api_parquet_export(client):
+    pq = pytest.importorskip("pyarrow.parquet")
+    response = client.post("/api/export", json={"format": "parquet", "equipments": EQUIPMENTS[:50]})
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.to_pylist() == [export_record(equipment) for equipment in EQUIPMENTS[:50]]
+
+
+def test_api_parquet_export_without_pyarrow(api, client, monkeypatch):
+    monkeypatch.setattr(api, "PARQUET_AVAILABLE", False)
+    response = client.post("/api/export", json={"format": "parquet", "equipments": EQUIPMENTS[:1]})
+    assert response.status_code == 400
+
+
+def test_api_export_rejects_bad_requests(client):
+    assert client.post("/api/export", json={"format": "pdf", "equipments": EQUIPMENTS[:1]}).status_code == 400
+    assert client.post("/api/export", json={"format": "csv", "equipments": []}).status_code == 400
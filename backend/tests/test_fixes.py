@@ -0,0 +1,176 @@
+import csv
+import json
+import os
+from datetime import datetime
+
+import openpyxl
+import pytest
+
+from models import fix_file
+from models import fixes as fixes_module
+from models.dates import DAY_FIRST, MONTH_FIRST
+
+HEADER = ["nomEquipementPhysique", "modele", "quantite", "dateAchat", "dateRetrait"]
+
+
+def write_csv(path, rows, delimiter=","):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+    return str(path)
+
+
+def read_csv(path, delimiter=","):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f, delimiter=delimiter))
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Counts the times fix_file opens its source."""
+    calls = []
+    open_file_rows = fixes_module.open_file_rows
+
+    def counting(*args):
+        calls.append(args[0])
+        return open_file_rows(*args)
+
+    monkeypatch.setattr(fixes_module, "open_file_rows", counting)
+    return calls
+
+
+def test_csv_dates_are_fixed_in_one_read(tmp_path, reads):
+    rows = [[f"Serveur {i}", " r740 ", str(i), ["31/01/2023", "05/06/2023", ""][i % 3], "2030-01-31"]
+            for i in range(50)]
+    source = write_csv(tmp_path / "a.csv", rows, delimiter=";")
+    target = str(tmp_path / "b.csv")
+    result = fix_file(source, target, "csv", batch_rows=7)
+
+    assert len(reads) == 1
+    assert result["rows"] == 50
+    written = read_csv(target, delimiter=";")
+    assert written[0] == HEADER
+    assert [row[3] for row in written[1:4]] == ["2023-01-31", "2023-06-05", ""]
+    assert [row[:3] + row[4:] for row in written[1:]] == [row[:3] + row[4:] for row in rows]
+    achat, retrait = result["columns"]
+    assert achat["column"] == "dateAchat" and achat["transforms"] == ["dates"]
+    assert achat["changed"] == 34
+    assert achat["dates"]["detected_format"] == DAY_FIRST and achat["dates"]["ambiguous"] is False
+    assert achat["dates"]["votes"] == {"day_first": 17, "month_first": 0}
+    assert retrait["changed"] == 0 and retrait["dates"]["already_valid"] == 50
+
+
+def test_order_undecided_by_the_first_rows_is_counted_over_the_file(tmp_path, reads):
+    # Premières lignes sans jour ni mois supérieur à 12 : l'ordre vient de la fin du fichier
+    rows = [[f"Serveur {i}", "R740", "1", "05/06/2023" if i < 30 else "01/31/2023", ""] for i in range(40)]
+    source = write_csv(tmp_path / "a.csv", rows)
+    target = str(tmp_path / "b.csv")
+    result = fix_file(source, target, "csv", {"dateAchat": ["dates"]}, batch_rows=8, inference_rows=10)
+
+    assert len(reads) == 2
+    assert [row[3] for row in read_csv(target)[1:]] == ["2023-05-06"] * 30 + ["2023-01-31"] * 10
+    dates = result["columns"][0]["dates"]
+    assert dates["detected_format"] == MONTH_FIRST
+    assert dates["votes"] == {"day_first": 0, "month_first": 10}
+    assert dates["converted"] == 40 and dates["ambiguous"] is False
+
+
+def test_column_never_decided_uses_the_default_order(tmp_path, reads):
+    rows = [[f"Serveur {i}", "R740", "1", "05/06/2023", ""] for i in range(20)]
+    source = write_csv(tmp_path / "a.csv", rows)
+    target = str(tmp_path / "b.csv")
+    result = fix_file(source, target, "csv", {"dateAchat": ["dates"]}, inference_rows=5)
+    assert len(reads) == 2
+    assert {row[3] for row in read_csv(target)[1:]} == {"2023-06-05"}
+    assert result["columns"][0]["dates"]["ambiguous"] is True
+
+
+def test_first_rows_decide_even_if_later_rows_disagree(tmp_path, reads):
+    rows = [[f"Serveur {i}", "R740", "1", "31/01/2023" if i < 10 else "01/31/2023", ""] for i in range(20)]
+    source = write_csv(tmp_path / "a.csv", rows)
+    target = str(tmp_path / "b.csv")
+    result = fix_file(source, target, "csv", {"dateAchat": ["dates"]}, inference_rows=10)
+    assert len(reads) == 1
+    assert [row[3] for row in read_csv(target)[1:]] == ["2023-01-31"] * 10 + ["01/31/2023"] * 10
+    dates = result["columns"][0]["dates"]
+    assert dates["detected_format"] == DAY_FIRST
+    assert dates["invalid"] == 10 and dates["invalid_values"] == ["01/31/2023"]
+
+
+def test_forced_format_and_other_transforms(tmp_path, reads):
+    rows = [["Serveur 1", " r740 ", "1,5", " 02/03/2023 ", ""], ["Serveur 2", "dell", "2", "", ""], ["Serveur 3"]]
+    source = write_csv(tmp_path / "a.csv", rows)
+    target = str(tmp_path / "b.csv")
+    result = fix_file(source, target, "csv", {
+        "modele": ["strip", "upper"], "quantite": "decimal_point", "dateAchat": ["strip", "dates"]
+    }, date_format=MONTH_FIRST)
+    assert len(reads) == 1
+    assert read_csv(target)[1:] == [["Serveur 1", "R740", "1.5", "2023-02-03", ""],
+                                   ["Serveur 2", "DELL", "2", "", ""],
+                                   ["Serveur 3"]]
+    assert [column["changed"] for column in result["columns"]] == [2, 1, 1]
+    assert result["columns"][0]["dates"] is None
+
+
+def test_xlsx_keeps_its_sheet_and_native_dates(tmp_path):
+    wb = openpyxl.Workbook()
+    sheet = wb.active
+    sheet.title = "Inventaire"
+    sheet.append(HEADER)
+    sheet.append(["Serveur 1", "R740", 3, "31/01/2023", datetime(2030, 1, 31)])
+    sheet.append(["Serveur 2", "R740", 4, datetime(2022, 6, 1), "2030-02-01"])
+    source = str(tmp_path / "a.xlsx")
+    wb.save(source)
+    target = str(tmp_path / "b.xlsx")
+
+    result = fix_file(source, target, "xlsx")
+    assert result["rows"] == 2
+    written = openpyxl.load_workbook(target)
+    assert written.sheetnames == ["Inventaire"]
+    rows = list(written.active.iter_rows(values_only=True))
+    assert list(rows[0]) == HEADER
+    assert list(rows[1]) == ["Serveur 1", "R740", 3, "2023-01-31", datetime(2030, 1, 31)]
+    assert list(rows[2]) == ["Serveur 2", "R740", 4, datetime(2022, 6, 1), "2030-02-01"]
+
+
+def test_invalid_requests_leave_no_target(tmp_path):
+    source = write_csv(tmp_path / "a.csv", [["Serveur 1", "R740", "1", "", ""]])
+    target = str(tmp_path / "b.csv")
+    with pytest.raises(KeyError):
+        fix_file(source, target, "csv", {"inconnue": ["dates"]})
+    with pytest.raises(ValueError):
+        fix_file(source, target, "csv", {"modele": ["titre"]})
+    with pytest.raises(ValueError):
+        fix_file(source, target, "csv", date_format="YYYY/MM/DD")
+    assert not os.path.exists(target)
+
+
+def test_api_merges_date_column_with_fixes(client, tmp_path):
+    rows = [["Serveur 1", "r740", "1", " 31/01/2023 ", "05/06/2030"], ["Serveur 2", "r640", "2", "01/02/2023", ""]]
+    source = write_csv(tmp_path / "inventaire.csv", rows)
+    response = client.post("/api/fix-dates", data={
+        "file_path": source,
+        "date_column": ["dateAchat", "dateRetrait"],
+        "fixes": json.dumps({"dateAchat": ["strip"], "modele": ["upper"]}),
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert [(column["column"], column["transforms"]) for column in body["columns"]] == [
+        ("dateAchat", ["strip", "dates"]), ("dateRetrait", ["dates"]), ("modele", ["upper"])
+    ]
+    assert [summary["column"] for summary in body["summary"]] == ["dateAchat", "dateRetrait"]
+    assert body["rows"] == 2
+    assert os.path.basename(body["corrected_file_path"]) == "corrected_inventaire.csv"
+    assert read_csv(body["corrected_file_path"])[1:] == [
+        ["Serveur 1", "R740", "1", "2023-01-31", "2030-06-05"],
+        ["Serveur 2", "R640", "2", "2023-02-01", ""],
+    ]
+
+
+def test_api_rejects_bad_requests(client, tmp_path):
+    source = write_csv(tmp_path / "inventaire.csv", [["Serveur 1", "R740", "1", "", ""]])
+    assert client.post("/api/fix-dates", data={"file_path": str(tmp_path / "absent.csv")}).status_code == 400
+    assert client.post("/api/fix-dates", data={"file_path": source, "date_format": "YYYY"}).status_code == 400
+    response = client.post("/api/fix-dates", data={"file_path": source, "fixes": json.dumps({"modele": "titre"})})
+    assert response.status_code == 400
@@ -0,0 +1,164 @@
+import io
+import threading
+import time
+
+import pytest
+
+from models import ErrorCollector, JobManager
+from models.jobs import CANCELLED, COMPLETED, FAILED, PENDING, RUNNING
+
+TIMEOUT = 10
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(workers=1)
+    yield manager
+    manager._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def wait_for(predicate):
+    deadline = time.time() + TIMEOUT
+    while not predicate():
+        assert time.time() < deadline, "délai dépassé"
+        time.sleep(0.01)
+
+
+def test_completed_job_reports_its_result(manager):
+    cleanups = []
+
+    def work(job, rows):
+        for row in range(1, rows + 1):
+            job.update(row, row / rows)
+        return {"rows": rows}
+
+    job = manager.submit("validation", work, 50, filename="a.csv", cleanup=lambda: cleanups.append(1))
+    job.future.result(TIMEOUT)
+    state = manager.get(job.id).to_dict()
+    assert state["status"] == COMPLETED
+    assert state["result"] == {"rows": 50} and state["error"] is None
+    assert state["rows_processed"] == 50 and state["progress"] == 1.0
+    assert state["filename"] == "a.csv" and state["kind"] == "validation"
+    assert state["started_at"] <= state["finished_at"]
+    assert state["eta_seconds"] is None
+    assert cleanups == [1]
+
+
+def test_progress_of_a_running_job(manager):
+    updated, release = threading.Event(), threading.Event()
+
+    def work(job):
+        collector = ErrorCollector()
+        collector.add({"column": "quantite", "row": 2, "value": "x", "expected_type": "integer",
+                       "error": "La valeur n'est pas au format integer attendu"})
+        job.update(250, 0.25, collector)
+        updated.set()
+        release.wait(TIMEOUT)
+        return None
+
+    job = manager.submit("validation", work)
+    assert updated.wait(TIMEOUT)
+    state = job.to_dict()
+    release.set()
+    assert state["status"] == RUNNING
+    assert state["rows_processed"] == 250 and state["progress"] == 0.25
+    assert state["errors"] == {"total_errors": 1, "by_column": {"quantite": {"missing": 0, "type": 1}}}
+    assert state["eta_seconds"] is not None and state["eta_seconds"] >= 0
+    job.future.result(TIMEOUT)
+    assert job.status == COMPLETED
+
+
+def test_failed_job_keeps_its_error(manager):
+    cleanups = []
+
+    def work(job):
+        raise ValueError("Format de fichier invalide")
+
+    job = manager.submit("validation", work, cleanup=lambda: cleanups.append(1))
+    job.future.result(TIMEOUT)
+    assert job.status == FAILED
+    assert job.to_dict()["error"] == "Format de fichier invalide"
+    assert job.result is None
+    assert cleanups == [1]
+
+
+def test_running_job_stops_at_its_next_step(manager):
+    started = threading.Event()
+    steps = []
+
+    def work(job):
+        started.set()
+        while True:
+            steps.append(len(steps))
+            job.check_cancelled()
+            time.sleep(0.01)
+
+    job = manager.submit("validation", work)
+    assert started.wait(TIMEOUT)
+    assert manager.cancel(job.id) is job
+    job.future.result(TIMEOUT)
+    assert job.status == CANCELLED and job.cancelled
+    assert job.finished_at is not None and job.result is None
+
+
+def test_pending_job_is_cancelled_at_once(manager):
+    release = threading.Event()
+    blocking = manager.submit("validation", lambda job: release.wait(TIMEOUT))
+    cleanups = []
+    pending = manager.submit("validation", lambda job: "jamais", cleanup=lambda: cleanups.append(1))
+    assert pending.status == PENDING
+
+    manager.cancel(pending.id)
+    assert pending.status == CANCELLED
+    assert cleanups == [1]
+    release.set()
+    blocking.future.result(TIMEOUT)
+    assert pending.result is None and cleanups == [1]
+
+
+def test_finished_and_unknown_jobs(manager):
+    job = manager.submit("validation", lambda job: 42)
+    job.future.result(TIMEOUT)
+    assert manager.cancel(job.id).status == COMPLETED
+    assert manager.cancel("inconnu") is None
+    assert manager.get("inconnu") is None
+
+
+def test_finished_jobs_are_forgotten_after_retention():
+    manager = JobManager(workers=1, retention=0)
+    job = manager.submit("validation", lambda job: 1)
+    job.future.result(TIMEOUT)
+    time.sleep(0.01)
+    manager.submit("validation", lambda job: 2).future.result(TIMEOUT)
+    assert manager.get(job.id) is None
+    manager._executor.shutdown(wait=True)
+
+
+def test_api_validation_job(client):
+    content = ("nomEquipementPhysique,modele,quantite,nomCourtDatacenter,type,statut,paysDUtilisation\n"
+               + "".join(f"Serveur {i},R740,{'x' if i % 4 == 0 else i},DC,Serveur,Active,France\n"
+                         for i in range(1, 41))).encode("utf-8")
+    response = client.post("/api/jobs/validate-file", files={"file": ("inventaire.csv", io.BytesIO(content))})
+    assert response.status_code == 200
+    job_id = response.json()["job_id"]
+
+    def state():
+        return client.get(f"/api/jobs/{job_id}").json()
+
+    wait_for(lambda: state()["status"] in (COMPLETED, FAILED, CANCELLED))
+    job = state()
+    expected = client.post("/api/validate-file", files={"file": ("inventaire.csv", io.BytesIO(content))}).json()
+    assert job["status"] == COMPLETED
+    assert job["rows_processed"] == 40 and job["progress"] == 1.0
+    assert job["errors"]["total_errors"] == 10
+    assert job["result"] == expected
+
+    # Tâche terminée : l'annulation la laisse inchangée
+    assert client.delete(f"/api/jobs/{job_id}").json()["status"] == COMPLETED
+
+
+def test_api_unknown_jobs(client):
+    assert client.get("/api/jobs/inconnu").status_code == 404
+    assert client.delete("/api/jobs/inconnu").status_code == 404
+    response = client.post("/api/jobs/validate-file", files={"file": ("inventaire.pdf", io.BytesIO(b"x"))})
+    assert response.status_code == 400
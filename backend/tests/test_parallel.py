@@ -0,0 +1,63 @@
+import csv
+import io
+
+import pytest
+
+from models import G4IT_COLUMN_SPECS, iter_file_chunks, split_csv_ranges, validate_csv_parallel, validate_csv_stream
+from models.parallel import read_csv_header
+
+REQUIRED_COLUMNS = [name for name, spec in G4IT_COLUMN_SPECS.items() if spec['required']]
+HEADER = REQUIRED_COLUMNS + ['dateAchat', 'nbCoeur']
+
+
+def inventory_row(index):
+    quantity = 'x' if index % 7 == 0 else str(index % 50 + 1)
+    # Séries d'erreurs consécutives sur plusieurs lignes, parfois à cheval sur deux plages
+    model = '' if 40 <= index % 100 < 46 else f'Modele {index % 9}'
+    purchase = '2021-02-30' if index % 11 == 0 else '2021-01-31'
+    name = f'"Serveur\n{index}"' if index % 13 == 0 else f'Serveur {index}'
+    return [name, model, quantity, 'DC-PARIS', 'Serveur', 'Active', 'France', purchase, str(index % 8)]
+
+
+@pytest.fixture
+def inventory(tmp_path):
+    path = tmp_path / 'inventory.csv'
+    lines = [','.join(HEADER)] + [','.join(inventory_row(index)) for index in range(1, 1501)]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def stream(path, **options):
+    with open(path, 'rb') as f:
+        return validate_csv_stream(iter_file_chunks(f, 4096), REQUIRED_COLUMNS, **options)
+
+
+def test_ranges_follow_record_boundaries(inventory):
+    _, _, data_start = read_csv_header(inventory)
+    ranges = split_csv_ranges(inventory, data_start, range_size=2048)
+    assert len(ranges) > 10
+    assert ranges[0][0] == data_start
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    # Chaque plage se lit seule : aucune ne coupe un champ entre guillemets
+    records = []
+    with open(inventory, 'rb') as f:
+        for start, end in ranges:
+            f.seek(start)
+            records.extend(csv.reader(io.StringIO(f.read(end - start).decode('utf-8'), newline='')))
+    assert len(records) == 1500
+    assert all(len(record) == len(HEADER) for record in records)
+
+
+@pytest.mark.parametrize('options', [{}, {'max_errors': 25}, {'fail_fast': True}])
+def test_parallel_matches_streaming(inventory, options):
+    expected = stream(inventory, **options)
+    for workers in (1, 2):
+        result = validate_csv_parallel(inventory, REQUIRED_COLUMNS, workers=workers, range_size=2048, **options)
+        assert result == expected
+
+
+def test_parallel_reports_merged_runs(inventory):
+    result = validate_csv_parallel(inventory, REQUIRED_COLUMNS, workers=2, range_size=2048)
+    runs = [e for e in result["type_errors"] if e["column"] == "modele"]
+    assert runs[0]["row"] == 41 and runs[0]["row_end"] == 46 and runs[0]["count"] == 6
+    assert result["error_summary"]["by_column"]["modele"]["missing"] == 90
@@ -0,0 +1,167 @@
+import io
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from models import SessionStore
+
+CSV_CONTENT = (
+    "nomEquipementPhysique,modele,quantite,dateAchat\n"
+    "Serveur 1,R740,3,2021-01-31\n"
+    "Serveur 2,,x\n"
+    "\n"
+    "Serveur 3,R740,5,2021-02-30,en trop\n"
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(str(tmp_path / "sessions"))
+
+
+def excel_upload(df):
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    buffer.seek(0)
+    return buffer
+
+
+def test_csv_round_trip(store):
+    session = store.create(io.BytesIO(CSV_CONTENT.encode("utf-8")), "inventaire.csv")
+    loaded = store.load(session.id)
+    assert loaded.meta == session.meta
+    assert loaded.meta["rows"] == 3
+    assert loaded.columns == ["nomEquipementPhysique", "modele", "quantite", "dateAchat"]
+    # Lignes courtes et cellules en trop conservées comme les lit le validateur
+    assert list(loaded.iter_records()) == [
+        ("Serveur 1", "R740", "3", "2021-01-31"),
+        ("Serveur 2", "", "x", None),
+        ("Serveur 3", "R740", "5", "2021-02-30"),
+    ]
+    assert loaded.to_records()[1] == {"nomEquipementPhysique": "Serveur 2", "modele": "",
+                                      "quantite": "x", "dateAchat": None}
+
+
+def test_excel_round_trip_keeps_types(store):
+    df = pd.DataFrame({
+        "nomEquipementPhysique": ["Serveur 1", "Serveur 2", None],
+        "quantite": [3, 4, 5],
+        "consoElecAnnuelle": [1.5, None, 2.25],
+        "dateAchat": [datetime(2021, 1, 31), datetime(2022, 6, 1), None],
+        "mixte": ["a", 2, 3.5],
+        2023: [True, False, None],
+    })
+    upload = excel_upload(df)
+    expected = pd.read_excel(upload)
+    upload.seek(0)
+
+    session = store.create(upload, "inventaire.xlsx")
+    loaded = store.load(session.id)
+    assert loaded.columns == expected.columns.tolist()
+    pd.testing.assert_frame_equal(loaded.data, expected)
+    assert loaded.meta["size"] == len(upload.getvalue())
+
+
+def test_edits_are_revalidated_and_persisted(store):
+    session = store.create(io.BytesIO(CSV_CONTENT.encode("utf-8")), "inventaire.csv")
+    delta = store.edit(session.id, [
+        {"row": 3, "column": "quantite", "value": "7"},
+        {"row": 3, "column": "modele", "value": ""},
+        {"row": 4, "column": "dateAchat", "value": "2021-02-28"},
+    ])
+    assert delta["edited_cells"] == 3
+    assert delta["edits"] == 3
+    assert [(e["row"], e["column"]) for e in delta["resolved"]] == [(3, "quantite"), (4, "dateAchat")]
+    assert [(e["row"], e["column"]) for e in delta["errors"]] == [(3, "modele")]
+    assert delta["error_counts_delta"] == {"quantite": {"missing": 0, "type": -1},
+                                           "dateAchat": {"missing": 0, "type": -1}}
+    assert delta["total_errors_delta"] == -2
+
+    loaded = store.load(session.id)
+    assert loaded.cell(3, "quantite") == "7"
+    assert loaded.cell(4, "dateAchat") == "2021-02-28"
+    assert loaded.meta["edits"] == 3 and loaded.meta["edits_hash"]
+
+    assert store.clear_edits(session.id)
+    loaded = store.load(session.id)
+    assert loaded.cell(3, "quantite") == "x"
+    assert loaded.meta["edits"] == 0 and loaded.meta["edits_hash"] is None
+
+
+def test_edited_cells_are_read_with_the_data(store):
+    session = store.create(io.BytesIO(CSV_CONTENT.encode("utf-8")), "inventaire.csv")
+    store.edit(session.id, [
+        {"row": 2, "column": "modele", "value": "Nouveau modèle"},
+        {"row": 3, "column": "modele", "value": "Autre modèle"},
+        {"row": 3, "column": "dateAchat", "value": None},
+        {"row": 4, "column": "quantite", "value": "3"},
+    ])
+    loaded = store.load(session.id)
+    # Chargement sans application des modifications : les colonnes d'origine sont gardées telles quelles
+    assert loaded._data is None
+    assert loaded.cell(2, "modele") == "Nouveau modèle" and loaded.cell(3, "dateAchat") is None
+    assert list(loaded.iter_records()) == [
+        ("Serveur 1", "Nouveau modèle", "3", "2021-01-31"),
+        ("Serveur 2", "Autre modèle", "x", None),
+        ("Serveur 3", "R740", "3", "2021-02-30"),
+    ]
+    # Nouvelles valeurs ajoutées aux catégories de la colonne, sans doublon
+    assert loaded.data[1].cat.categories.tolist() == ["R740", "", "Nouveau modèle", "Autre modèle"]
+    assert loaded.data[2].cat.categories.tolist() == ["3", "x", "5"]
+    assert store.load(session.id)._base[1].cat.categories.tolist() == ["R740", ""]
+
+
+def test_many_new_values_in_one_column(store):
+    # Plus de nouvelles valeurs que n'en contiennent les codes d'origine (int8)
+    content = "nomEquipementPhysique,modele\n" + "".join(f"Serveur {index},R740\n" for index in range(300))
+    session = store.create(io.BytesIO(content.encode("utf-8")), "inventaire.csv")
+    store.edit(session.id, [{"row": index + 2, "column": "modele", "value": f"M{index}"} for index in range(300)])
+    assert [record[1] for record in store.load(session.id).iter_records()] == [f"M{index}" for index in range(300)]
+
+
+def test_excel_edits_are_read_with_the_data(store):
+    df = pd.DataFrame({"nomEquipementPhysique": ["Serveur 1", "Serveur 2"], "quantite": [3, 4],
+                       "dateAchat": [datetime(2021, 1, 31), datetime(2022, 6, 1)]})
+    session = store.create(excel_upload(df), "inventaire.xlsx")
+    store.edit(session.id, [{"row": 2, "column": "dateAchat", "value": "hier"},
+                            {"row": 3, "column": "quantite", "value": ""},
+                            {"row": 3, "column": "nomEquipementPhysique", "value": "12"}])
+    loaded = store.load(session.id)
+    assert loaded.cell(2, "quantite") == 3 and pd.isna(loaded.cell(3, "quantite"))
+    records = loaded.to_records()
+    assert records[0] == {"nomEquipementPhysique": "Serveur 1", "quantite": 3, "dateAchat": "hier"}
+    assert records[1] == {"nomEquipementPhysique": 12, "quantite": None, "dateAchat": datetime(2022, 6, 1)}
+
+
+def test_invalid_edit_leaves_session_unchanged(store):
+    session = store.create(io.BytesIO(CSV_CONTENT.encode("utf-8")), "inventaire.csv")
+    with pytest.raises(ValueError):
+        store.edit(session.id, [{"row": 3, "column": "quantite", "value": "7"},
+                                {"row": 99, "column": "quantite", "value": "1"}])
+    assert store.load(session.id).cell(3, "quantite") == "x"
+
+
+def test_excel_edit_types_numeric_text(store):
+    df = pd.DataFrame({"nomEquipementPhysique": ["Serveur 1"], "quantite": ["abc"]})
+    session = store.create(excel_upload(df), "inventaire.xlsx")
+    delta = store.edit(session.id, [{"row": 2, "column": "quantite", "value": "12"}])
+    assert delta["total_errors_delta"] == -1
+    assert store.load(session.id).cell(2, "quantite") == 12
+
+
+def test_unknown_and_deleted_sessions(store):
+    assert store.load("not-a-uuid") is None
+    session = store.create(io.BytesIO(CSV_CONTENT.encode("utf-8")), "inventaire.csv")
+    assert store.delete(session.id)
+    assert store.load(session.id) is None
+    assert store.edit(session.id, []) is None
+
+
+def test_store_refuses_untrusted_directory(tmp_path):
+    directory = tmp_path / "shared"
+    directory.mkdir()
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        SessionStore(str(directory))
@@ -0,0 +1,96 @@
+import csv
+import io
+import random
+import string
+
+import pytest
+
+from models import find_similar_groups, normalize_label
+from models import similarity as similarity_module
+
+
+def cluster_values(clusters):
+    return [sorted(str(spelling['value']) for spelling in cluster['values']) for cluster in clusters]
+
+
+def test_normalize_label():
+    assert normalize_label('Power Edge R-740') == 'poweredger740'
+    assert normalize_label('  PowerEdge  R740 ') == 'poweredger740'
+    assert normalize_label('Écran Ultra-Fin') == 'ecranultrafin'
+    assert normalize_label(740) == '740'
+    assert normalize_label(' - ') == ''
+
+
+def test_spellings_of_the_same_model_are_clustered():
+    values = ['PowerEdge R740', 'Power Edge R-740', 'POWEREDGE R740xd', 'PowerEdge R640', 'ThinkPad T14']
+    clusters = find_similar_groups(values, [10, 3, 1, 7, 5])
+    assert cluster_values(clusters) == [['POWEREDGE R740xd', 'Power Edge R-740', 'PowerEdge R740']]
+    cluster, = clusters
+    assert cluster['canonical'] == 'PowerEdge R740' and cluster['rows'] == 14
+    assert cluster['values'] == [{'value': 'PowerEdge R740', 'rows': 10}, {'value': 'Power Edge R-740', 'rows': 3},
+                                 {'value': 'POWEREDGE R740xd', 'rows': 1}]
+
+
+def test_distinct_labels_are_not_clustered():
+    values = ['PowerEdge R740', 'PowerEdge R640', 'ProLiant DL380', 'ThinkPad T14', 'Catalyst 9300', 'ab', 'AB ']
+    # Libellés trop courts pour des trigrammes : seulement regroupés s'ils sont égaux une fois normalisés
+    assert cluster_values(find_similar_groups(values)) == [['AB ', 'ab']]
+
+
+def test_threshold_controls_the_clusters():
+    values = ['PowerEdge R740', 'PowerEdge R640']
+    assert find_similar_groups(values, threshold=0.5) != []
+    assert find_similar_groups(values, threshold=0.9) == []
+    assert find_similar_groups(['PowerEdge R740', 'Power Edge R-740', 'PowerEdge R740xd'], threshold=1) == [
+        {'canonical': 'Power Edge R-740', 'rows': 2,
+         'values': [{'value': 'Power Edge R-740', 'rows': 1}, {'value': 'PowerEdge R740', 'rows': 1}]}
+    ]
+    with pytest.raises(ValueError):
+        find_similar_groups(values, threshold=0)
+
+
+def test_empty_and_missing_values_are_ignored():
+    assert find_similar_groups([]) == []
+    assert find_similar_groups([None, float('nan'), '', 'PowerEdge R740']) == []
+
+
+def test_clusters_are_joined_transitively():
+    # a~b et b~c au seuil, a et c trop différents : un seul groupe
+    values = ['inventaire serveur rack', 'inventaire serveur racks baie', 'serveur racks baie alpha']
+    assert cluster_values(find_similar_groups(values, threshold=0.45)) == [sorted(values)]
+    assert cluster_values(find_similar_groups(values, threshold=0.6)) == [sorted(values[:2])]
+
+
+def test_many_labels_match_the_pairwise_comparison(monkeypatch):
+    # Lots de signatures réduits : le calcul par lots est aussi couvert
+    monkeypatch.setattr(similarity_module, 'SIGNATURE_BATCH_SIZE', 64)
+    rng = random.Random(3)
+    bases = [''.join(rng.choices(string.ascii_uppercase, k=6)) + f' {rng.randrange(1000)}' for _ in range(150)]
+    values = bases + [base.replace(' ', '-') + 'X' for base in bases[:50]]
+    clusters = find_similar_groups(values)
+
+    expected = []
+    for base in bases[:50]:
+        spellings = [value for value in values
+                     if similarity_module._jaccard(normalize_label(base), normalize_label(value)) >= 0.7]
+        expected.append(sorted(spellings))
+    assert sorted(cluster_values(clusters)) == sorted(expected)
+
+
+def test_api_suggests_candidates(client):
+    rows = [['Serveur 1', 'PowerEdge R740'], ['Serveur 2', ' PowerEdge R740'], ['Serveur 3', 'Power Edge R-740'],
+            ['Serveur 4', 'ThinkPad T14'], ['Serveur 5', '']]
+    content = io.StringIO()
+    csv.writer(content).writerows([['nomEquipementPhysique', 'modele']] + rows)
+    files = {'file': ('inventaire.csv', io.BytesIO(content.getvalue().encode('utf-8')))}
+    response = client.post('/api/consolidation-candidates', files=files)
+    assert response.status_code == 200
+    body = response.json()
+    assert body['rows'] == 5 and body['distinct_values'] == 3 and body['cluster_count'] == 1
+    assert body['clusters'][0]['values'] == [{'value': 'PowerEdge R740', 'rows': 2},
+                                             {'value': 'Power Edge R-740', 'rows': 1}]
+
+    files['file'][1].seek(0)
+    assert client.post('/api/consolidation-candidates', files=files, data={'column': 'absente'}).status_code == 400
+    files['file'][1].seek(0)
+    assert client.post('/api/consolidation-candidates', files=files, data={'threshold': '1.5'}).status_code == 400
@@ -0,0 +1,47 @@
+import io
+from datetime import datetime, time, timedelta
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from models import sniff_headers
+from models.utils import G4IT_COLUMN_SPECS
+
+
+def workbook(header, formats=None, date1904=False):
+    wb = openpyxl.Workbook()
+    if date1904:
+        wb.epoch = openpyxl.utils.datetime.CALENDAR_MAC_1904
+    sheet = wb.active
+    sheet.append(header)
+    for cell, number_format in (formats or {}).items():
+        sheet[cell].number_format = number_format
+    sheet.append(["x"] * len(header))
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.parametrize("date1904", [False, True])
+def test_xlsx_headers_match_pandas(date1904):
+    upload = workbook(
+        ["nom", None, "nom", 2023, 1.5, datetime(2020, 1, 1), time(12, 30), timedelta(hours=30), 43831],
+        {"G1": "hh:mm", "H1": "[h]:mm:ss", "I1": "0.00"}, date1904
+    )
+    expected = pd.read_excel(upload).columns.tolist()
+    upload.seek(0)
+    headers = sniff_headers(upload, ".xlsx")
+    assert headers == expected
+    assert headers[5] == datetime(2020, 1, 1)
+
+
+def test_csv_headers_are_stripped():
+    upload = io.BytesIO((" " + " ; ".join(G4IT_COLUMN_SPECS) + "\n").encode("utf-8"))
+    assert sniff_headers(upload, ".csv") == list(G4IT_COLUMN_SPECS)
+
+
+def test_unsupported_extension():
+    with pytest.raises(ValueError):
+        sniff_headers(io.BytesIO(b""), ".pdf")
@@ -0,0 +1,118 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from models import G4IT_COLUMN_SPECS, iter_text_lines
+
+REQUIRED_COLUMNS = [name for name, spec in G4IT_COLUMN_SPECS.items() if spec['required']]
+
+
+def inventory_rows(count):
+    rows = []
+    for index in range(count):
+        quantity = 'x' if index % 5 == 0 else str(index + 1)
+        model = '' if 10 <= index < 14 else f'Modele {index % 3}'
+        rows.append([f'Serveur {index}', model, quantity, 'DC-PARIS', 'Serveur', 'Active', 'France',
+                     '2021-02-30' if index % 7 == 0 else '2021-01-31'])
+    return rows
+
+
+def csv_upload(count=60):
+    lines = [','.join(REQUIRED_COLUMNS + ['dateAchat'])] + [','.join(row) for row in inventory_rows(count)]
+    return ('inventaire.csv', io.BytesIO(('\n'.join(lines) + '\n').encode('utf-8')))
+
+
+def xlsx_upload(count=60):
+    buffer = io.BytesIO()
+    pd.DataFrame(inventory_rows(count), columns=REQUIRED_COLUMNS + ['dateAchat']).to_excel(buffer, index=False)
+    buffer.seek(0)
+    return ('inventaire.xlsx', buffer)
+
+
+def validate(client, upload, **form):
+    response = client.post('/api/validate-file', files={'file': upload}, data=form)
+    assert response.status_code == 200
+    return response
+
+
+def records(response):
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    lines = response.text.split('\n')
+    assert lines[-1] == ''
+    return [json.loads(line) for line in lines[:-1]]
+
+
+def error_key(error):
+    return error['row'], error['column']
+
+
+@pytest.mark.parametrize('make_upload', [csv_upload, xlsx_upload])
+def test_stream_matches_json_response(client, make_upload):
+    expected = validate(client, make_upload()).json()
+    streamed = records(validate(client, make_upload(), stream='true'))
+
+    assert streamed[0]['type'] == 'columns'
+    assert streamed[-1]['type'] == 'summary'
+    assert {record['type'] for record in streamed[1:-1]} == {'errors'}
+    assert streamed[0]['detected_columns'] == expected['detected_columns']
+    assert streamed[0]['missing_required_columns'] == []
+
+    summary = streamed[-1]
+    assert summary['is_valid'] == expected['is_valid'] is False
+    assert summary['error_summary'] == expected['error_summary']
+    errors = [error for record in streamed[1:-1] for error in record['errors']]
+    assert sorted(errors, key=error_key) == sorted(expected['type_errors'], key=error_key)
+
+
+def test_stream_honours_max_errors(client):
+    expected = validate(client, csv_upload(), max_errors='3').json()
+    streamed = records(validate(client, csv_upload(), max_errors='3', stream='true'))
+    errors = [error for record in streamed[1:-1] for error in record['errors']]
+    assert len(errors) == 3
+    assert streamed[-1]['error_summary'] == expected['error_summary']
+    assert streamed[-1]['error_summary']['truncated'] is True
+
+
+def test_stream_without_required_columns(client):
+    upload = ('inventaire.csv', io.BytesIO(b'nomEquipementPhysique,modele\nServeur 1,R740\n'))
+    streamed = records(validate(client, upload, stream='true'))
+    assert [record['type'] for record in streamed] == ['columns', 'summary']
+    assert 'quantite' in streamed[0]['missing_required_columns']
+    assert streamed[1]['is_valid'] is False
+
+
+def test_stream_reports_unreadable_file(client):
+    upload = ('inventaire.xlsx', io.BytesIO(b'pas un classeur'))
+    streamed = records(validate(client, upload, stream='true'))
+    assert [record['type'] for record in streamed] == ['error']
+    assert streamed[0]['detail'].startswith('Format de fichier invalide')
+
+
+@pytest.mark.parametrize('newline', ['\n', '\r\n', '\r'])
+def test_text_lines_split_on_every_line_ending(newline):
+    content = newline.join(f'Serveur {index},R740' for index in range(200)) + newline
+    data = content.encode('utf-8')
+    # Blocs de 7 octets : des '\r\n' sont coupés entre deux blocs
+    lines = list(iter_text_lines(data[start:start + 7] for start in range(0, len(data), 7)))
+    assert lines == [f'Serveur {index},R740{newline}' for index in range(200)]
+    # Première ligne rendue sans lire tout le fichier
+    chunks = iter([data[:100], data[100:]])
+    assert next(iter_text_lines(chunks)) == f'Serveur 0,R740{newline}'
+    assert next(chunks, None) == data[100:]
+
+
+def test_text_lines_refuse_a_line_too_long():
+    chunks = (b'x' * 100 for _ in range(100))
+    with pytest.raises(ValueError, match='Ligne trop longue'):
+        next(iter_text_lines(chunks, max_line_length=1000))
+    assert list(iter_text_lines([b'x' * 1000], max_line_length=1000)) == ['x' * 1000]
+
+
+def test_upload_with_carriage_returns_is_validated(client):
+    name, content = csv_upload()
+    lf = validate(client, (name, io.BytesIO(content.getvalue()))).json()
+    cr = validate(client, (name, io.BytesIO(content.getvalue().replace(b'\n', b'\r')))).json()
+    assert cr['detected_columns'] == lf['detected_columns']
+    assert cr['type_errors'] == lf['type_errors']
@@ -0,0 +1,168 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import ColumnarTable
+
+
+def typed(rows):
+    """Rows with the type of every value, so that 1, 1.0, True and "1" differ."""
+    return [{name: (value.__class__, value) for name, value in row.items()} for row in rows]
+
+
+def inventory(count=300):
+    rows = []
+    for index in range(count):
+        row = {
+            "nomEquipementPhysique": f"Serveur {index}",
+            "type": ["Serveur", "Ecran", "PC"][index % 3],
+            "quantite": str(index * 7),
+            "consoElecAnnuelle": repr(index / 4),
+            "prix": f"{index * 1.5:.2f}",
+            "dateAchat": (datetime(2020, 1, 1) + timedelta(days=index)).date().isoformat(),
+            "nbCoeur": index,
+            "tauxUtilisation": index / 3,
+            "dateRetrait": datetime(2025, 1, 1) + timedelta(hours=index),
+            "mixte": [index, "a", 2.5, True, None][index % 5],
+        }
+        if index % 10 == 0:
+            row["quantite"] = None
+            row["dateAchat"] = None
+            row["nbCoeur"] = None
+        if index % 4 == 0:
+            del row["type"]
+        if index >= 150:
+            # Colonne absente des premières lignes
+            row["commentaire"] = "" if index % 2 else "à vérifier"
+        rows.append(row)
+    return rows
+
+
+def test_round_trip_keeps_values_types_and_missing_keys():
+    rows = inventory()
+    table = ColumnarTable.from_rows(iter(rows))
+    assert len(table) == len(rows)
+    # Colonnes dans l'ordre où elles apparaissent
+    assert table.columns == [name for name in rows[1] if name != "type"] + ["type", "commentaire"]
+    assert typed(table.to_dicts()) == typed(rows)
+    assert typed(table.iter_dicts(batch_rows=7)) == typed(rows)
+    assert typed([dict(row) for row in table]) == typed(rows)
+    assert "type" not in table[0] and table[1]["type"] == "Ecran"
+    with pytest.raises(KeyError):
+        table[0]["type"]
+    assert table.column("type")[:2] == [None, "Ecran"]
+
+
+def test_numeric_and_date_columns_are_stored_as_arrays():
+    kinds = {name: usage["kind"] for name, usage in ColumnarTable.from_rows(inventory()).memory_usage().items()}
+    assert kinds == {
+        "nomEquipementPhysique": "dict",
+        "type": "dict",
+        "quantite": "int_text",
+        "consoElecAnnuelle": "float_text",
+        "prix": "decimal_text",
+        "dateAchat": "date_text",
+        "nbCoeur": "int",
+        "tauxUtilisation": "float",
+        "dateRetrait": "datetime",
+        "mixte": "dict",
+        "commentaire": "dict",
+    }
+
+
+def test_text_that_would_not_round_trip_stays_text():
+    rows = [{"quantite": value, "date": day} for value, day in
+            [("007", "2021-1-5"), ("1e3", "2021-02-30"), ("+4", "31/01/2021")] * 100]
+    table = ColumnarTable.from_rows(rows)
+    assert {usage["kind"] for usage in table.memory_usage().values()} == {"dict"}
+    assert typed(table.to_dicts()) == typed(rows)
+
+
+def test_empty_tables():
+    table = ColumnarTable.from_rows([])
+    assert len(table) == 0 and table.columns == [] and table.to_dicts() == []
+    table = ColumnarTable.from_rows([{}, {}])
+    assert table.to_dicts() == [{}, {}]
+
+
+def test_unhashable_values_are_kept_in_a_list():
+    rows = [{"ids": "eq-1"}, {"ids": ["eq-2", "eq-3"]}, {"ids": None}]
+    table = ColumnarTable.from_rows(rows)
+    assert table.memory_usage()["ids"]["kind"] == "object"
+    assert table.to_dicts() == rows
+    with pytest.raises(TypeError):
+        table.map_distinct("ids", lambda values, counts: values)
+
+
+@pytest.mark.parametrize("name, value", [
+    ("quantite", "abc"),            # int_text -> dict
+    ("quantite", "12"),
+    ("quantite", 12),               # entier Python dans une colonne de texte
+    ("consoElecAnnuelle", "1.50"),
+    ("prix", "3.5"),                # autre nombre de décimales
+    ("prix", "4.25"),
+    ("dateAchat", "2021-02-30"),
+    ("dateAchat", datetime(2021, 1, 1)),
+    ("nbCoeur", 2.5),               # int -> dict
+    ("nbCoeur", True),
+    ("tauxUtilisation", 3),
+    ("dateRetrait", "demain"),
+    ("dateRetrait", datetime(2030, 1, 1)),
+    ("type", 4),
+    ("mixte", ["a", "b"]),          # valeur non hachable
+    ("nouvelle", "valeur"),         # nouvelle colonne
+])
+def test_edits_across_types(name, value):
+    rows = inventory(60)
+    table = ColumnarTable.from_rows(rows)
+    for index in (0, 5, 59):
+        table[index][name] = value
+        rows[index][name] = value
+    table[7][name] = None
+    rows[7][name] = None
+    assert typed(table.to_dicts()) == typed(rows)
+
+
+def test_cells_can_be_cleared_and_restored():
+    rows = inventory(60)
+    table = ColumnarTable.from_rows(rows)
+    del table[3]["quantite"]
+    del rows[3]["quantite"]
+    table[4]["quantite"] = None
+    rows[4]["quantite"] = None
+    table[10]["quantite"] = "5"
+    rows[10]["quantite"] = "5"
+    assert typed(table.to_dicts()) == typed(rows)
+    assert table.memory_usage()["quantite"]["kind"] == "dict"
+
+
+def test_map_distinct_calls_the_function_once_per_distinct_value():
+    rows = inventory(90)
+    table = ColumnarTable.from_rows(rows)
+    expected = Counter(row.get("type") for row in rows)
+    calls = []
+
+    def upper(values, counts):
+        calls.append(dict(zip(values, counts.tolist())))
+        return [value.upper() if value else value for value in values]
+
+    table.map_distinct("type", upper)
+    assert calls == [expected]
+    for row in rows:
+        if "type" in row:
+            row["type"] = row["type"].upper()
+    # Les cellules absentes restent absentes
+    assert typed(table.to_dicts()) == typed(rows)
+
+
+def test_map_distinct_on_a_typed_column():
+    rows = inventory(120)
+    table = ColumnarTable.from_rows(rows)
+    table.map_distinct("quantite", lambda values, counts: [None if value is None else str(int(value) + 1)
+                                                           for value in values])
+    for row in rows:
+        if row["quantite"] is not None:
+            row["quantite"] = str(int(row["quantite"]) + 1)
+    assert typed(table.to_dicts()) == typed(rows)
+    assert table.memory_usage()["quantite"]["kind"] == "int_text"
@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+MAX_BYTES = 4096
+CHUNK_SIZE = 1024
+BOUNDARY = "limite"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def multipart(rows):
+    content = b"nomEquipementPhysique,modele\n" + b"".join(b"Serveur %d,R740\n" % index for index in range(rows))
+    return (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"inventaire.csv\"\r\n"
+            f"Content-Type: text/csv\r\n\r\n").encode("utf-8") + content + f"\r\n--{BOUNDARY}--\r\n".encode("utf-8")
+
+
+def post(app, body, content_length):
+    """Sends ``body`` to /api/detect-headers in CHUNK_SIZE messages; returns the status, detail and bytes read."""
+    headers = [(b"content-type", CONTENT_TYPE.encode("ascii"))]
+    if content_length:
+        headers.append((b"content-length", str(len(body)).encode("ascii")))
+    else:
+        headers.append((b"transfer-encoding", b"chunked"))
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "scheme": "http", "path": "/api/detect-headers", "raw_path": b"/api/detect-headers",
+             "root_path": "", "query_string": b"", "headers": headers,
+             "client": ("127.0.0.1", 1234), "server": ("testserver", 80)}
+    chunks = [body[start:start + CHUNK_SIZE] for start in range(0, len(body), CHUNK_SIZE)]
+    read = 0
+    sent = []
+
+    async def receive():
+        nonlocal read
+        if not chunks:
+            await asyncio.sleep(3600)
+        chunk = chunks.pop(0)
+        read += len(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    status = next(message["status"] for message in sent if message["type"] == "http.response.start")
+    content = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return status, json.loads(content), read
+
+
+@pytest.fixture
+def limited(api):
+    """The API behind a small upload size limit."""
+    return api.UploadSizeLimitMiddleware(api.app, max_bytes=MAX_BYTES)
+
+
+def test_api_has_the_upload_limit(api):
+    middleware = [entry for entry in api.app.user_middleware if entry.cls is api.UploadSizeLimitMiddleware]
+    assert len(middleware) == 1 and middleware[0].kwargs == {"max_bytes": api.MAX_UPLOAD_SIZE}
+
+
+def test_content_length_over_the_limit_is_refused_before_reading(limited):
+    body = multipart(1000)
+    status, response, read = post(limited, body, content_length=True)
+    assert status == 413
+    assert str(MAX_BYTES) in response["detail"]
+    # Refus sur l'en-tête : aucun octet du corps n'est lu
+    assert read == 0
+
+
+def test_chunked_body_over_the_limit_is_refused_while_reading(limited):
+    body = multipart(1000)
+    status, response, read = post(limited, body, content_length=False)
+    assert status == 413
+    assert str(MAX_BYTES) in response["detail"]
+    # Lecture arrêtée au premier bloc qui dépasse la limite
+    assert MAX_BYTES < read <= MAX_BYTES + CHUNK_SIZE < len(body)
+
+
+@pytest.mark.parametrize("content_length", [True, False])
+def test_body_under_the_limit_is_accepted(limited, content_length):
+    body = multipart(10)
+    status, response, read = post(limited, body, content_length)
+    assert status == 200
+    assert response["detected_columns"] == ["nomEquipementPhysique", "modele"]
+    assert read == len(body)
+
+
+def test_client_upload_over_the_limit(limited):
+    client = TestClient(limited)
+    body = multipart(1000)
+    response = client.post("/api/detect-headers", content=body, headers={"Content-Type": CONTENT_TYPE})
+    assert response.status_code == 413
+    # Corps envoyé par morceaux (Transfer-Encoding: chunked), sans Content-Length
+    response = client.post("/api/detect-headers", content=iter([body[:2000], body[2000:]]),
+                           headers={"Content-Type": CONTENT_TYPE})
+    assert response.status_code == 413
@@ -0,0 +1,197 @@
+import math
+import re
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from models import G4IT_COLUMN_SPECS, compile_validators, validate_columns
+
+
+# --- Contrôles d'origine (avant la compilation des valideurs), pour comparer les messages ---
+
+def baseline_csv(column, value, row):
+    spec = G4IT_COLUMN_SPECS[column]
+    expected_type = spec['type']
+    if value is None or value.strip() == '':
+        if spec['required']:
+            return {"column": column, "row": row, "value": "", "expected_type": expected_type,
+                    "error": "Champ obligatoire manquant"}
+        return None
+    try:
+        if expected_type == 'integer':
+            if not value.isdigit():
+                raise ValueError("La valeur n'est pas un entier valide")
+        elif expected_type == 'number':
+            if not all(c.isdigit() or c == '.' for c in value):
+                raise ValueError("La valeur n'est pas un nombre valide")
+            float(value)
+        elif expected_type == 'date':
+            if not re.match(r'^\d{4}-\d{2}-\d{2}$', value):
+                raise ValueError("Format de date invalide (doit être YYYY-MM-DD)")
+            datetime.strptime(value, '%Y-%m-%d')
+    except Exception as e:
+        return {"column": column, "row": row, "value": value, "expected_type": expected_type,
+                "error": f"La valeur n'est pas au format {expected_type} attendu: {str(e)}"}
+    return None
+
+
+def baseline_excel(column, value, row):
+    spec = G4IT_COLUMN_SPECS[column]
+    expected_type = spec['type']
+    if pd.isna(value):
+        if spec['required']:
+            return {"column": column, "row": row, "value": "", "expected_type": expected_type,
+                    "error": "Champ obligatoire manquant"}
+        return None
+    try:
+        if expected_type == 'integer':
+            if not isinstance(value, int) and not (isinstance(value, float) and value.is_integer()):
+                raise ValueError("Pas un entier")
+        elif expected_type == 'number':
+            if not isinstance(value, (int, float)):
+                raise ValueError("Pas un nombre")
+        elif expected_type == 'date':
+            if not isinstance(value, (datetime, pd.Timestamp)):
+                if isinstance(value, str) and not re.match(r'^\d{4}-\d{2}-\d{2}$', value):
+                    raise ValueError("Format de date invalide")
+                if isinstance(value, str):
+                    datetime.strptime(value, '%Y-%m-%d')
+    except Exception as e:
+        return {"column": column, "row": row, "value": str(value), "expected_type": expected_type,
+                "error": f"La valeur n'est pas au format {expected_type} attendu ({str(e)})"}
+    return None
+
+
+def baseline_lenient(value, expected_type):
+    if value is None or value == "":
+        return True, None
+    if expected_type == "string":
+        return True, None
+    elif expected_type == "integer":
+        try:
+            int(str(value).strip())
+            return True, None
+        except ValueError:
+            return False, f"'{value}' n'est pas un nombre entier valide"
+    elif expected_type == "number":
+        try:
+            float(str(value).strip())
+            return True, None
+        except ValueError:
+            return False, f"'{value}' n'est pas un nombre valide"
+    elif expected_type == "date":
+        try:
+            datetime.strptime(str(value).strip(), '%Y-%m-%d')
+            return True, None
+        except ValueError:
+            return False, f"'{value}' n'est pas au format de date valide (YYYY-MM-DD)"
+    return False, f"Type inconnu '{expected_type}'"
+
+
+def baseline_validate_columns(data, column_specs=G4IT_COLUMN_SPECS):
+    report = {"missing_required_columns": [], "type_errors": [], "is_valid": True}
+    if not data:
+        report["is_valid"] = False
+        report["general_error"] = "Aucune donnée trouvée dans le fichier"
+        return report
+    headers = data[0].keys()
+    for column_name, specs in column_specs.items():
+        if specs["required"] and column_name not in headers:
+            report["missing_required_columns"].append(column_name)
+            report["is_valid"] = False
+    for row_idx, row in enumerate(data, 1):
+        for column_name, specs in column_specs.items():
+            if column_name not in row:
+                continue
+            value = row[column_name]
+            if (value is None or value == "") and not specs["required"]:
+                continue
+            if specs["required"] and (value is None or value == ""):
+                report["type_errors"].append({"row": row_idx, "column": column_name,
+                                              "error": "Valeur obligatoire manquante"})
+                report["is_valid"] = False
+                continue
+            is_valid, error_msg = baseline_lenient(value, specs["type"])
+            if not is_valid:
+                report["type_errors"].append({"row": row_idx, "column": column_name, "error": error_msg})
+                report["is_valid"] = False
+    return report
+
+
+COLUMNS = ['nomEquipementPhysique', 'quantite', 'consoElecAnnuelle', 'dateAchat', 'nbCoeur', 'tauxUtilisation']
+
+CSV_VALUES = [
+    None, '', '   ', 'abc', '12', '-3', '12.5', '1.2.3', '.', '1e3', ' 7', '²',
+    '2021-01-31', '2021-02-30', '2021-13-01', '2021-1-5', '31/01/2021', '20210131',
+]
+
+EXCEL_VALUES = [
+    None, math.nan, pd.NaT, 'abc', '', 12, 12.0, 12.5, -3, True,
+    datetime(2021, 1, 31), pd.Timestamp('2021-01-31'), date(2021, 1, 31),
+    '2021-01-31', '2021-02-30', '2021-1-5', '31/01/2021',
+]
+
+
+@pytest.mark.parametrize('column', COLUMNS)
+def test_csv_validators_match_baseline(column):
+    validate = compile_validators(G4IT_COLUMN_SPECS, 'csv')[column]
+    for value in CSV_VALUES:
+        assert validate(value, 7) == baseline_csv(column, value, 7), value
+
+
+@pytest.mark.parametrize('column', COLUMNS)
+def test_excel_validators_match_baseline(column):
+    validate = compile_validators(G4IT_COLUMN_SPECS, 'excel')[column]
+    for value in EXCEL_VALUES:
+        assert validate(value, 7) == baseline_excel(column, value, 7), value
+
+
+def expand_runs(errors):
+    """One error per row, as before run-length encoding, in row then column order."""
+    expanded = []
+    for entry in errors:
+        for row in range(entry["row"], entry.get("row_end", entry["row"]) + 1):
+            expanded.append({"row": row, "column": entry["column"], "error": entry["error"]})
+    order = list(G4IT_COLUMN_SPECS)
+    return sorted(expanded, key=lambda error: (error["row"], order.index(error["column"])))
+
+
+def test_validate_columns_matches_baseline():
+    values = CSV_VALUES + [12, 12.5, datetime(2021, 1, 31)]
+    data = [{column: value for column in COLUMNS} for value in values]
+    assert validate_columns(data) == baseline_validate_columns(data)
+
+
+def test_validate_columns_run_length():
+    values = CSV_VALUES + [12, 12.5, datetime(2021, 1, 31)]
+    data = [{column: value for column in COLUMNS} for value in values]
+    report = validate_columns(data, run_length=True)
+    expected = baseline_validate_columns(data)
+    assert report["error_summary"]["total_errors"] == len(expected["type_errors"])
+    assert expand_runs(report.pop("type_errors")) == expected.pop("type_errors")
+    report.pop("error_summary")
+    assert report == expected
+
+
+def test_validate_columns_max_errors():
+    data = [{"nomEquipementPhysique": "", "quantite": "x"} for _ in range(10)]
+    report = validate_columns(data, max_errors=3)
+    assert [(error["row"], error["column"]) for error in report["type_errors"]] == [
+        (1, "nomEquipementPhysique"), (1, "quantite"), (2, "nomEquipementPhysique")
+    ]
+    assert "error_summary" not in report and report["is_valid"] is False
+    report = validate_columns(data, max_errors=3, run_length=True)
+    assert [error.get("count", 1) for error in report["type_errors"]] == [10, 10]
+    assert report["error_summary"]["total_errors"] == 20
+
+
+def test_validate_columns_without_data():
+    assert validate_columns([]) == baseline_validate_columns([])
+
+
+def test_unknown_type():
+    specs = {'code': {'required': False, 'type': 'hex'}}
+    for mode in ('csv', 'excel', 'lenient'):
+        error = compile_validators(specs, mode)['code']('ff', 2)
+        assert "Type inconnu 'hex'" in error["error"]
@@ -0,0 +1,23 @@
+import math
+from datetime import datetime
+
+import pandas as pd
+
+from models import ErrorCollector, G4IT_COLUMN_SPECS, compile_validators, validate_dataframe
+
+
+def test_vectorized_excel_matches_per_cell_validators():
+    df = pd.DataFrame({
+        'quantite': [1, 2.0, 2.5, 'abc', None, True, 7],
+        'modele': ['A', None, 'B', '', math.nan, 'C', 'D'],
+        'dateAchat': [datetime(2021, 1, 31), '2021-01-31', '2021-02-30', 'hier', None, '31/01/2021', 3],
+        'consoElecAnnuelle': [1.5, 'x', 3, None, 2, '4', 5.0],
+    })
+    validators = compile_validators(G4IT_COLUMN_SPECS, 'excel')
+    expected = ErrorCollector()
+    for column in df.columns:
+        for row, value in enumerate(df[column], start=2):
+            error = validators[column](value, row)
+            if error is not None:
+                expected.add(error)
+    assert validate_dataframe(df).errors == expected.errors
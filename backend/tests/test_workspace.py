@@ -0,0 +1,103 @@
+import io
+import os
+import time
+
+import pytest
+
+from models import Workspace
+
+
+def write(path, size):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return str(path)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    return Workspace(str(tmp_path / "workspace"), max_bytes=3000, default_ttl=60)
+
+
+def test_least_recently_used_entries_are_evicted(workspace):
+    paths = [workspace.register(write(os.path.join(workspace.directory, f"export-{i}.csv"), 1000))
+             for i in range(3)]
+    workspace.touch(paths[0])
+    workspace.register(write(os.path.join(workspace.directory, "export-3.csv"), 1000))
+    assert [os.path.exists(path) for path in paths] == [True, False, True]
+    stats = workspace.stats()
+    assert stats["size_bytes"] == 3000
+    assert stats["evicted_files"] == 1 and stats["evicted_bytes"] == 1000
+    assert stats["by_kind"] == {"export": {"files": 3, "size_bytes": 3000}}
+
+
+def test_pinned_entries_are_not_evicted(workspace):
+    pinned = workspace.register(write(os.path.join(workspace.directory, "upload_a.csv"), 2000), pinned=True)
+    other = workspace.register(write(os.path.join(workspace.directory, "upload_b.csv"), 1000))
+    workspace.register(write(os.path.join(workspace.directory, "upload_c.csv"), 1000))
+    assert os.path.exists(pinned) and not os.path.exists(other)
+    workspace.release(pinned)
+    workspace.register(write(os.path.join(workspace.directory, "upload_d.csv"), 1000))
+    assert not os.path.exists(pinned)
+
+
+def test_sweep_removes_expired_entries(workspace):
+    short = workspace.register(write(os.path.join(workspace.directory, "corrected_a.csv"), 10), ttl=5)
+    kept = workspace.register(write(os.path.join(workspace.directory, "corrected_b.csv"), 10))
+    gone = workspace.register(write(os.path.join(workspace.directory, "corrected_c.csv"), 10))
+    os.remove(gone)
+    assert workspace.sweep(time.time() + 30) == 1
+    assert not os.path.exists(short) and os.path.exists(kept)
+    stats = workspace.stats()
+    assert stats["files"] == 1 and stats["size_bytes"] == 10
+    assert stats["expired_files"] == 1 and stats["sweeps"] == 1
+
+
+def test_directories_are_tracked_as_a_whole(workspace, tmp_path):
+    session = os.path.join(workspace.directory, "session")
+    os.makedirs(session)
+    write(os.path.join(session, "data.npz"), 700)
+    write(os.path.join(session, "meta.json"), 300)
+    workspace.register(session, kind="session")
+    assert workspace.stats()["by_kind"]["session"] == {"files": 1, "size_bytes": 1000}
+    assert workspace.remove(session)
+    assert not os.path.exists(session)
+
+
+def test_existing_entries_are_adopted_oldest_first(tmp_path):
+    directory = tmp_path / "workspace"
+    directory.mkdir(mode=0o700)
+    now = time.time()
+    for index, age in enumerate((300, 100, 200)):
+        path = write(directory / f"export-{index}.csv", 1000)
+        os.utime(path, (now - age, now - age))
+    outside = write(tmp_path / "export-autre.csv", 1000)
+
+    workspace = Workspace(str(directory), max_bytes=2000, default_ttl=250)
+    # Le plus ancien est supprimé pour respecter le quota, puis l'expiration part de la date de modification
+    assert sorted(os.listdir(directory)) == ["export-1.csv", "export-2.csv"]
+    assert workspace.sweep(now) == 0
+    assert workspace.sweep(now + 100) == 1
+    assert os.listdir(directory) == ["export-1.csv"]
+    assert os.path.exists(outside)
+
+
+def test_workspace_refuses_untrusted_directory(tmp_path):
+    directory = tmp_path / "shared"
+    directory.mkdir()
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        Workspace(str(directory))
+
+
+def test_api_tracks_upload_sessions(api, client):
+    content = b"nomEquipementPhysique,modele\nServeur 1,R740\n"
+    response = client.post("/api/upload-sessions", files={"file": ("inventaire.csv", io.BytesIO(content))})
+    assert response.status_code == 200
+    session_id = response.json()["session_id"]
+    path = api.upload_sessions.path(session_id)
+    assert api.workspace.touch(path)
+    assert api.workspace.stats()["by_kind"]["session"]["files"] >= 1
+
+    assert client.delete(f"/api/upload-sessions/{session_id}").status_code == 200
+    assert not os.path.exists(path)
+    assert not api.workspace.touch(path)
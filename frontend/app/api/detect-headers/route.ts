@@ -8,20 +8,27 @@ export async function POST(req: NextRequest) {
     // Récupérer le FormData de la requête
     const formData = await req.formData();
 
-    // Vérifier si le fichier est présent
+    // Vérifier si le fichier (ou l'identifiant d'une session de téléversement) est présent
     const file = formData.get('file') as File;
-    if (!file) {
+    const sessionId = formData.get('session_id');
+    if (!file && !sessionId) {
       return NextResponse.json(
         { error: 'Aucun fichier fourni' },
         { status: 400 }
       );
     }
 
-    console.log('Fichier reçu pour détection des en-têtes:', file.name, file.size, file.type);
+    if (file) {
+      console.log('Fichier reçu pour détection des en-têtes:', file.name, file.size, file.type);
+    }
 
     // Créer un nouveau FormData pour l'envoyer au backend
     const backendFormData = new FormData();
-    backendFormData.append('file', file);
+    if (sessionId) {
+      backendFormData.append('session_id', sessionId);
+    } else {
+      backendFormData.append('file', file);
+    }
 
     console.log('Envoi au backend pour détection des en-têtes:', BACKEND_URL);
 
@@ -5,6 +5,9 @@ import * as XLSX from 'xlsx';
 
 const BACKEND_URL = process.env.BACKEND_URL || 'http://127.0.0.1:8001';
 
+// Formats produits par le backend ; seuls csv et xlsx peuvent être générés ici en secours
+const EXPORT_FORMATS = ['csv', 'xlsx', 'csv.gz', 'ndjson', 'parquet'];
+
 export async function POST(request: NextRequest) {
   try {
     // Récupérer les données du body
@@ -17,9 +20,9 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    if (!format || (format !== 'csv' && format !== 'xlsx')) {
+    if (!format || !EXPORT_FORMATS.includes(format)) {
       return NextResponse.json(
-        { error: 'Format non valide. Utilisez "csv" ou "xlsx"' },
+        { error: 'Format non valide. Utilisez "csv", "xlsx", "csv.gz", "ndjson" ou "parquet"' },
         { status: 400 }
       );
     }
@@ -38,13 +41,17 @@ export async function POST(request: NextRequest) {
       // Retourner directement la réponse du backend
       return new NextResponse(response.data, {
         headers: {
-          'Content-Type': format === 'csv' ? 'text/csv' : 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-          'Content-Disposition': `attachment; filename=export.${format}`
+          'Content-Type': response.headers['content-type'],
+          'Content-Disposition': response.headers['content-disposition'] || `attachment; filename=export.${format}`
         }
       });
     } catch (error) {
       console.error('Erreur lors de l\'appel au backend pour l\'export:', error);
 
+      if (format !== 'csv' && format !== 'xlsx') {
+        throw error;
+      }
+
       // Générer le fichier côté frontend en cas d'erreur
       const fileData = generateExportFile(equipments, format);
 
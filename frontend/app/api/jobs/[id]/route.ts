@@ -0,0 +1,50 @@
+import { NextRequest, NextResponse } from 'next/server';
+import axios from 'axios';
+
+const BACKEND_URL = process.env.BACKEND_URL || 'http://127.0.0.1:8001';
+
+type RouteContext = { params: Promise<{ id: string }> };
+
+function backendError(error: unknown, fallback: string) {
+  if (axios.isAxiosError(error)) {
+    const statusCode = error.response?.status || 500;
+    const errorMessage = error.response?.data?.detail || 'Erreur lors de la communication avec le backend';
+    return NextResponse.json(
+      { error: errorMessage },
+      { status: statusCode }
+    );
+  }
+
+  return NextResponse.json(
+    { error: fallback },
+    { status: 500 }
+  );
+}
+
+// État d'une tâche : progression, lignes par seconde, temps restant estimé, erreurs et résultat
+export async function GET(req: NextRequest, { params }: RouteContext) {
+  const { id } = await params;
+  try {
+    const response = await axios.get(`${BACKEND_URL}/api/jobs/${encodeURIComponent(id)}`, {
+      timeout: 10000 // 10 secondes de timeout
+    });
+    return NextResponse.json(response.data);
+  } catch (error) {
+    console.error('Erreur lors de la récupération de la tâche:', error);
+    return backendError(error, 'Une erreur s\'est produite lors de la récupération de la tâche');
+  }
+}
+
+// Annulation d'une tâche en attente ou en cours
+export async function DELETE(req: NextRequest, { params }: RouteContext) {
+  const { id } = await params;
+  try {
+    const response = await axios.delete(`${BACKEND_URL}/api/jobs/${encodeURIComponent(id)}`, {
+      timeout: 10000 // 10 secondes de timeout
+    });
+    return NextResponse.json(response.data);
+  } catch (error) {
+    console.error('Erreur lors de l\'annulation de la tâche:', error);
+    return backendError(error, 'Une erreur s\'est produite lors de l\'annulation de la tâche');
+  }
+}
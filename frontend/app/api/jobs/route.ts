@@ -0,0 +1,59 @@
+import { NextRequest, NextResponse } from 'next/server';
+import axios from 'axios';
+
+const BACKEND_URL = process.env.BACKEND_URL || 'http://127.0.0.1:8001';
+
+// Lance une validation en arrière-plan : la réponse contient seulement l'identifiant de la tâche,
+// la progression se suit ensuite avec GET /api/jobs/[id]
+export async function POST(req: NextRequest) {
+  try {
+    const formData = await req.formData();
+
+    const file = formData.get('file') as File;
+    if (!file) {
+      return NextResponse.json(
+        { error: 'Aucun fichier fourni' },
+        { status: 400 }
+      );
+    }
+
+    const backendFormData = new FormData();
+    backendFormData.append('file', file);
+    for (const field of ['max_errors', 'fail_fast']) {
+      const value = formData.get(field);
+      if (value !== null) {
+        backendFormData.append(field, value);
+      }
+    }
+
+    // Le délai ne couvre que le transfert du fichier, pas la validation
+    const response = await axios.post(
+      `${BACKEND_URL}/api/jobs/validate-file`,
+      backendFormData,
+      {
+        headers: {
+          'Content-Type': 'multipart/form-data',
+        },
+        timeout: 60000, // 60 secondes pour l'envoi du fichier
+      }
+    );
+
+    return NextResponse.json(response.data);
+  } catch (error) {
+    console.error('Erreur lors de la création de la tâche de validation:', error);
+
+    if (axios.isAxiosError(error)) {
+      const statusCode = error.response?.status || 500;
+      const errorMessage = error.response?.data?.detail || 'Erreur lors de la communication avec le backend';
+      return NextResponse.json(
+        { error: errorMessage },
+        { status: statusCode }
+      );
+    }
+
+    return NextResponse.json(
+      { error: 'Une erreur s\'est produite lors de la création de la tâche de validation' },
+      { status: 500 }
+    );
+  }
+}
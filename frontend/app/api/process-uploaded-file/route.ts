@@ -7,17 +7,32 @@ export async function POST(req: NextRequest) {
   try {
     const data = await req.formData();
     const file = data.get('file') as File;
-    
-    if (!file) {
+    const sessionId = data.get('session_id');
+    const source = data.get('source');
+
+    if (!file && !sessionId && !source) {
       return NextResponse.json(
         { error: 'Aucun fichier n\'a été fourni' },
         { status: 400 }
       );
     }
 
-    // Créer un FormData pour envoyer le fichier au backend
+    // Créer un FormData pour envoyer le fichier (ou la session de téléversement) au backend
     const formData = new FormData();
-    formData.append('file', file);
+    if (source) {
+      formData.append('source', source);
+    } else if (sessionId) {
+      formData.append('session_id', sessionId);
+    } else {
+      formData.append('file', file);
+    }
+
+    // Pagination, tri, filtres et champs demandés : transmis tels quels au backend
+    for (const key of ['page', 'limit', 'cursor', 'sort', 'search', 'type', 'model', 'datacenter', 'fields']) {
+      for (const value of data.getAll(key)) {
+        formData.append(key, value);
+      }
+    }
 
     // Envoyer le fichier au backend pour traitement
     const response = await axios.post(`${BACKEND_URL}/api/process-file-data`, formData, {
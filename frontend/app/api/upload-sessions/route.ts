@@ -0,0 +1,52 @@
+import { NextRequest, NextResponse } from 'next/server';
+import axios from 'axios';
+
+const BACKEND_URL = process.env.BACKEND_URL || 'http://127.0.0.1:8001';
+
+// Envoie le fichier une seule fois au backend : le session_id retourné remplace ensuite
+// le fichier dans detect-headers, validate-file et process-uploaded-file
+export async function POST(req: NextRequest) {
+  try {
+    const formData = await req.formData();
+
+    const file = formData.get('file') as File;
+    if (!file) {
+      return NextResponse.json(
+        { error: 'Aucun fichier fourni' },
+        { status: 400 }
+      );
+    }
+
+    const backendFormData = new FormData();
+    backendFormData.append('file', file);
+
+    const response = await axios.post(
+      `${BACKEND_URL}/api/upload-sessions`,
+      backendFormData,
+      {
+        headers: {
+          'Content-Type': 'multipart/form-data',
+        },
+        timeout: 60000, // 60 secondes : le fichier est lu entièrement à cette étape
+      }
+    );
+
+    return NextResponse.json(response.data);
+  } catch (error) {
+    console.error('Erreur lors de la création de la session de téléversement:', error);
+
+    if (axios.isAxiosError(error)) {
+      const statusCode = error.response?.status || 500;
+      const errorMessage = error.response?.data?.detail || 'Erreur lors de la communication avec le backend';
+      return NextResponse.json(
+        { error: errorMessage },
+        { status: statusCode }
+      );
+    }
+
+    return NextResponse.json(
+      { error: 'Une erreur s\'est produite lors de la création de la session de téléversement' },
+      { status: 500 }
+    );
+  }
+}
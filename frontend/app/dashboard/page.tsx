@@ -51,9 +51,19 @@ type ValidationReport = {
   typeErrors: {
     column: string;
     row: number;
+    // Dernière ligne et nombre de lignes d'une plage de lignes consécutives avec la même erreur
+    rowEnd?: number;
+    count: number;
     value: string;
     expectedType: string;
   }[];
+  // Compteurs exacts, même quand la liste des erreurs est tronquée (MAX_VALIDATION_ERRORS)
+  errorSummary: {
+    totalErrors: number;
+    truncated: boolean;
+    stoppedEarly: boolean;
+    byColumn: Record<string, { missing: number; type: number }>;
+  } | null;
   detectedColumns: string[];
 };
 
@@ -207,10 +217,20 @@ export default function Dashboard() {
             ? response.data.type_errors.map((error: any) => ({
                 column: error.column || '',
                 row: error.row || 0,
+                rowEnd: error.row_end,
+                count: error.count || 1,
                 value: error.value || '',
                 expectedType: error.expected_type || 'valide'
               }))
             : [],
+          errorSummary: response.data.error_summary
+            ? {
+                totalErrors: response.data.error_summary.total_errors || 0,
+                truncated: response.data.error_summary.truncated || false,
+                stoppedEarly: response.data.error_summary.stopped_early || false,
+                byColumn: response.data.error_summary.by_column || {}
+              }
+            : null,
           detectedColumns: response.data.detected_columns || []
         };
 
@@ -245,7 +265,9 @@ export default function Dashboard() {
                 column: error.column,
                 row: error.row,
                 value: error.value,
-                message: `Format invalide à la ligne ${error.row}. La valeur "${error.value}" n'est pas de type ${error.expectedType}.`,
+                message: error.rowEnd
+                  ? `Format invalide sur ${error.count} lignes consécutives (lignes ${error.row} à ${error.rowEnd}). La première valeur, "${error.value}", n'est pas de type ${error.expectedType}.`
+                  : `Format invalide à la ligne ${error.row}. La valeur "${error.value}" n'est pas de type ${error.expectedType}.`,
                 suggestions: [
                   `Corrigez la valeur en respectant le format ${error.expectedType}.`,
                   `Vérifiez si des caractères spéciaux ou espaces supplémentaires sont présents.`
@@ -431,6 +453,26 @@ export default function Dashboard() {
                                 Votre fichier contient des erreurs de format qui doivent être corrigées avant de continuer.
                               </p>
                             )}
+                            {validationReport.errorSummary && validationReport.errorSummary.totalErrors > 0 && (
+                              <div className="mt-2 text-amber-700 text-sm">
+                                <p>
+                                  {validationReport.errorSummary.totalErrors} erreur(s) de données au total
+                                  {validationReport.errorSummary.truncated &&
+                                    `, seules les ${validationReport.typeErrors.length} premières plages d'erreurs sont détaillées`}
+                                  .
+                                </p>
+                                <ul className="list-disc pl-5 mt-1">
+                                  {Object.entries(validationReport.errorSummary.byColumn).map(([column, counts]) => (
+                                    <li key={column}>
+                                      {column} : {counts.missing} valeur(s) obligatoire(s) manquante(s), {counts.type} valeur(s) au format invalide
+                                    </li>
+                                  ))}
+                                </ul>
+                                {validationReport.errorSummary.stoppedEarly && (
+                                  <p className="mt-1">La validation s'est arrêtée à la première valeur obligatoire manquante.</p>
+                                )}
+                              </div>
+                            )}
                             <div className="mt-3 flex gap-2">
                               {/* Autoriser l'accès au mapping pour tous les types d'erreurs tant qu'il y a des colonnes */}
                               {validationReport.detectedColumns && validationReport.detectedColumns.length > 0 && (